@@ -3,13 +3,15 @@
 # 모든 MVP 기능 및 선택 기능 구현 완료
 
 import os
+import re
 import json
-from copy import deepcopy
+import threading
+import time
 from datetime import date
+from typing import TYPE_CHECKING, Optional
 
 import pandas as pd
 import streamlit as st
-import plotly.express as px
 
 # ledger 패키지에서 필요한 함수들 import
 from ledger.services import (
@@ -17,67 +19,268 @@ from ledger.services import (
     calc_detailed_summary,
     calc_category_expense,
     calc_budget_status,
+    calc_expense_distribution,
+    BudgetMonitor,
+    CategoryMonthPivot,
 )
-from ledger.utils import format_currency
+from ledger import perf
+from ledger.perf import span
+from ledger.repository import CURRENCY_FIELD, DEFAULT_CURRENCY
+from ledger.utils import DATE_DIMENSION, compact_ticks, format_currency, format_currency_many
+
+# 나머지 기능 모듈(저장소/근사/분류/예측/환율/반복/검색/검증)은 쓰는 함수/탭 안에서 import한다
+# (처음 화면을 띄울 때 쓰지 않는 모듈까지 읽지 않도록)
+if TYPE_CHECKING:
+    from ledger.approx import ApproxLedger
+    from ledger.fx import FxRateTable
+    from ledger.recurring import RecurringDetector
+    from ledger.search import DescriptionIndex
+    from ledger.validation import QualityMonitor
 
 # =============================
 # (0) 기본 설정
 # =============================
 st.set_page_config(page_title="나만의 미니 가계부", layout="wide")
+perf.begin_capture()  # 이번 rerun 동안의 계측 구간 모으기 (맨 아래 성능 패널에서 사용)
+RERUN_STARTED = time.perf_counter()
+pd.set_option("mode.copy_on_write", True)  # 공용 DataFrame에서 파생된 df가 메모리를 공유하도록
 
 DATA_DIR = "data"
 os.makedirs(DATA_DIR, exist_ok=True)
 
 DATA_PATH = os.path.join(DATA_DIR, "ledger.csv")
 BUDGET_PATH = os.path.join(DATA_DIR, "budgets.json")
+PERF_SPANS_PATH = os.path.join(DATA_DIR, "perf_spans.jsonl")
+FX_RATES_PATH = os.path.join(DATA_DIR, "fx_rates.csv")  # 외화 거래 환산용 로컬 환율표 (date,currency,rate)
+PERF_DEBUG = os.environ.get(perf.ENV_VAR, "") == "1"  # 성능 패널 기본 표시 여부 (계측도 처음부터 켜짐)
+DOUBLE_SUBMIT_SECONDS = 5  # 같은 거래를 이 시간 안에 다시 등록하면 중복 클릭으로 본다
+APPROX_TIME_BUDGET = 0.5  # 근사 모드에서 rerun 1번에 쓰는 시간(초)
 
 
 # =============================
 # (1) 파일 처리 함수들 (F4. 저장/불러오기)
 # =============================
+# 모든 세션이 같은 LedgerStore(프로세스 공용)를 통해 읽고 쓴다.
+# - 쓰기는 세션이 마지막으로 본 버전(df_version)을 함께 보내는 compare-and-swap
+# - 다른 세션이 먼저 저장했으면 VersionConflictError -> 최신 변경분을 받아 다시 시도하도록 안내
+# - 화면용 DataFrame은 st.cache_resource로 프로세스에 1벌만 두고 세션은 참조만 한다
+COLUMNS = ["date", "type", "category", "description", "amount", "currency"]
+CURRENCIES = ["KRW", "USD", "JPY", "EUR", "CNY"]  # 등록 폼에서 고를 수 있는 통화
+
+
 def _ensure_ledger_file_exists() -> None:
     """CSV가 없으면 빈 CSV를 만들어서 앱이 항상 정상 실행되게 한다."""
     if not os.path.exists(DATA_PATH):
         # 헤더만 있는 CSV 파일 생성
         with open(DATA_PATH, 'w', encoding='utf-8-sig') as f:
-            f.write("date,type,category,description,amount\n")
+            f.write("date,type,category,description,amount,currency\n")
     else:
         # 파일이 비어있는지 확인
         if os.path.getsize(DATA_PATH) == 0:
             with open(DATA_PATH, 'w', encoding='utf-8-sig') as f:
-                f.write("date,type,category,description,amount\n")
+                f.write("date,type,category,description,amount,currency\n")
 
 
-def load_df() -> pd.DataFrame:
-    """CSV에서 거래 데이터를 읽어온다."""
+@st.cache_resource
+def get_ledger_store():
+    """프로세스 공용 저장소 (모든 세션이 같은 객체를 쓴다, 디스크 저장은 백그라운드)"""
+    from ledger.store import get_store
+
     _ensure_ledger_file_exists()
+    return get_store(DATA_PATH, write_behind=True, checkpoint=True)
 
-    try:
-        df = pd.read_csv(DATA_PATH, encoding="utf-8-sig")
-    except pd.errors.EmptyDataError:
-        # 파일이 비어있으면 헤더만 다시 쓰고 빈 DataFrame 반환
-        with open(DATA_PATH, 'w', encoding='utf-8-sig') as f:
-            f.write('date,type,category,description,amount\n')
-        df = pd.DataFrame(columns=["date", "type", "category", "description", "amount"])
-    except UnicodeDecodeError:
+
+class SharedLedgerFrame:
+    """
+    프로세스 공용 DataFrame (버전마다 1개만 만든다)
+
+    - 세션들은 같은 DataFrame 객체를 참조만 한다 (N개 세션 ≒ 데이터 1벌)
+    - 저장소가 버전 변경을 알려주면(invalidate) 다음 요청 때 변경분만 반영해서 새 DataFrame을 만든다
+    - 한 번 내준 DataFrame은 수정하지 않는다 (copy-on-write: 바꿀 때는 항상 새 객체)
+    """
+
+    def __init__(self, store, fx: Optional["FxRateTable"] = None):
+        self.store = store
+        self.fx = fx  # 피벗의 외화 행 원화 환산용
+        self._lock = threading.Lock()
+        self._version = -1
+        self._df = rows_to_df([])
+        self._rows: list[dict] = []  # self._version 시점의 저장소 행 (피벗 변경분 반영용)
+        self._pivot = CategoryMonthPivot(fx=fx)  # 카테고리 × 월 지출 피벗 (변경분만 더하고 뺀다)
+        self._stale = True
+        store.subscribe(self.invalidate)
+
+    def invalidate(self, version: int) -> None:
+        """저장소 쓰기/다시 읽기 알림"""
+        self._stale = True
+
+    def get(self) -> tuple[int, pd.DataFrame]:
+        """(버전, 공용 DataFrame)"""
+        if not self._stale and self._version == self.store.view().version:  # view(): 다른 프로세스 쓰기 확인
+            return self._version, self._df
+
+        with self._lock:
+            version, changes = self.store.changes_since(self._version)
+            if changes is None:
+                view = self.store.view()  # 변경 기록이 잘렸으면 전체 다시 만들기
+                version, df = view.version, rows_to_df(list(view.rows))
+                self._rows = list(view.rows)
+                self._pivot = CategoryMonthPivot.build(self._rows, fx=self.fx)
+            else:
+                df = apply_changes_df(self._df, changes)
+                self._rows = self._pivot.apply_changes(self._rows, changes)
+            self._version, self._df, self._stale = version, df, False
+            return self._version, self._df
+
+    def pivot_matrix(self) -> dict:
+        """최신 카테고리 × 월 지출 피벗 (CategoryMonthPivot.matrix 형식 + 환율이 없어 뺀 외화 행 수 "unconverted")"""
+        self.get()
+        with self._lock:
+            return dict(self._pivot.matrix(), unconverted=self._pivot.unconverted_count())
+
+
+@st.cache_resource
+def get_shared_ledger() -> SharedLedgerFrame:
+    return SharedLedgerFrame(get_ledger_store(), fx=get_fx_table())
+
+
+@st.cache_resource
+def get_budget_monitor() -> BudgetMonitor:
+    """
+    프로세스 공용 예산 카운터 ((월, 카테고리)별 지출)
+
+    저장소 쓰기마다 바뀐 행의 카운터만 갱신하고, 80%/100%를 넘으면 BudgetEvent를 남긴다.
+    세션은 자기 쓰기(버전)로 생긴 사건만 골라서 알림으로 보여준다.
+    """
+    monitor = BudgetMonitor(load_budgets(), fx=get_fx_table())  # 외화 지출은 원화로 환산해서 센다
+    get_ledger_store().add_change_hook(monitor.on_change, replay=True)
+    return monitor
+
+
+@st.cache_resource
+def get_recurring_detector() -> "RecurringDetector":
+    """프로세스 공용 반복 거래 탐지기 (저장소 쓰기마다 바뀐 묶음만 다시 검사)"""
+    from ledger.recurring import RecurringDetector
+
+    detector = RecurringDetector()
+    get_ledger_store().add_change_hook(detector.on_change, replay=True)
+    return detector
+
+
+@st.cache_resource
+def get_description_index() -> "DescriptionIndex":
+    """프로세스 공용 메모 검색 인덱스 (초성/오타 허용, 저장소 쓰기마다 바뀐 메모만 반영)"""
+    from ledger.search import DescriptionIndex
+
+    index = DescriptionIndex()
+    get_ledger_store().add_change_hook(index.on_change, replay=True)
+    return index
+
+
+@st.cache_resource
+def get_fx_table() -> "FxRateTable":
+    """프로세스 공용 환율표 (data/fx_rates.csv, (통화, 날짜)별 환율 캐시를 세션끼리 같이 쓴다)"""
+    from ledger.fx import FxRateTable
+
+    return FxRateTable.load(FX_RATES_PATH) if os.path.exists(FX_RATES_PATH) else FxRateTable()
+
+
+def to_reporting_currency(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    """
+    외화 행의 금액을 원화로 환산한 DataFrame + 환율이 없어 뺀 (통화 날짜) 목록
+
+    서로 다른 (통화, 날짜) 쌍마다 환율을 1번만 찾고, 행에는 한 번에 곱한다 (행마다 조회하지 않음).
+    """
+    foreign = df["currency"] != DEFAULT_CURRENCY
+    if not foreign.any():
+        return df, []
+
+    from ledger.fx import MissingRateError
+
+    table = get_fx_table()
+    pairs = df.loc[foreign, ["currency", "date"]].drop_duplicates()
+    rates, missing = [], []
+    for currency, day in pairs.itertuples(index=False):
         try:
-            df = pd.read_csv(DATA_PATH, encoding="utf-8")
-        except:
-            # 어떤 인코딩도 안되면 새로 생성
-            with open(DATA_PATH, 'w', encoding='utf-8-sig') as f:
-                f.write('date,type,category,description,amount\n')
-            df = pd.DataFrame(columns=["date", "type", "category", "description", "amount"])
-    except Exception as e:
-        # 그 외 모든 오류는 새 DataFrame으로
-        st.warning(f"CSV 파일 읽기 오류: {e}. 새로운 파일을 생성합니다.")
-        with open(DATA_PATH, 'w', encoding='utf-8-sig') as f:
-            f.write('date,type,category,description,amount\n')
-        df = pd.DataFrame(columns=["date", "type", "category", "description", "amount"])
+            rates.append(table.rate(currency, day))
+        except MissingRateError:
+            rates.append(float("nan"))
+            missing.append(f"{currency} {day}")
+    factor = df.loc[foreign, ["currency", "date"]].merge(
+        pairs.assign(rate=rates), how="left", on=["currency", "date"]
+    )["rate"].to_numpy()
+
+    amount = df["amount"].astype(float)
+    amount.loc[foreign] = amount.loc[foreign].to_numpy() * factor
+    out = df.assign(amount=amount, currency=DEFAULT_CURRENCY).dropna(subset=["amount"])  # 환율 없는 행은 뺀다
+    out["amount"] = out["amount"].round().astype(int)
+    return out, missing
+
+
+@st.cache_resource
+def get_approx_ledger() -> "ApproxLedger":
+    """프로세스 공용 근사 집계기 (읽은 구간을 보관하므로 rerun마다 이어서 정확해진다)"""
+    from ledger.approx import ApproxLedger
+
+    return ApproxLedger(DATA_PATH)
+
+
+def render_approx_summary(result) -> None:
+    """근사 요약 (추정값 ± 95% 범위, 읽은 비율)"""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("💰 총 수입", format_currency(result.income.value), delta=f"약 {result.income_count.value:,.0f}건")
+        st.caption(f"± {format_currency(result.income.error)}")
+    with col2:
+        st.metric("💸 총 지출", format_currency(result.expense.value), delta=f"약 {result.expense_count.value:,.0f}건")
+        st.caption(f"± {format_currency(result.expense.error)}")
+    with col3:
+        balance = result.balance
+        st.metric(
+            "💵 현재 잔액",
+            format_currency(balance.value),
+            delta="흑자" if balance.value >= 0 else "적자",
+            delta_color="normal" if balance.value >= 0 else "inverse",
+        )
+        st.caption(f"± {format_currency(balance.error)}")
+    st.write(f"**메모 종류:** 약 {result.distinct_descriptions.value:,.0f}개")
+    if result.complete:
+        st.caption("✅ 기간 전체를 읽은 정확한 값입니다.")
+    else:
+        st.caption(
+            f"≈ 근사값: {result.rows_read:,} / {result.rows_total:,}행({result.fraction:.1%}) 읽음, "
+            "±는 95% 범위 - 다시 볼 때마다 이어서 정확해집니다."
+        )
+
+
+@st.cache_data(max_entries=4)
+def month_end_forecast(version: int, today: date, budget_items: tuple) -> dict:
+    """저장소 버전 + 날짜 + 예산별 월말 예측 (같은 날 rerun은 캐시에서 바로)"""
+    from ledger.forecast import forecast_month_end
+
+    return forecast_month_end(
+        get_ledger_store().view().rows, today=today, budgets=dict(budget_items), fx=get_fx_table()
+    )
+
+
+@st.cache_resource
+def get_quality_monitor() -> "QualityMonitor":
+    """
+    프로세스 공용 데이터 품질 카운터 {오류 종류: 건수}
+
+    저장소 행은 이미 파싱하면서 깨진 행을 버린 뒤라, 처음 한 번은 원본 파일을 load_transactions와 같은 형식 판별로 검사한다.
+    이후에는 저장소 쓰기마다 바뀐 행만 검사한다. (write-behind 저장이 끝날 때마다 파일 전체를 다시 읽지 않는다)
+    """
+    from ledger.validation import QualityMonitor, load_validated
+
+    monitor = QualityMonitor(load_validated(DATA_PATH)[1])
+    get_ledger_store().add_change_hook(monitor.on_change)
+    return monitor
 
-    # 컬럼 보정
-    for col in ["date", "type", "category", "description", "amount"]:
-        if col not in df.columns:
-            df[col] = None
+
+def rows_to_df(rows: list[dict]) -> pd.DataFrame:
+    """저장소 행(dict 리스트)을 화면용 DataFrame으로 변환한다."""
+    df = pd.DataFrame(rows, columns=COLUMNS)
 
     # 타입 정리
     df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.date
@@ -85,41 +288,89 @@ def load_df() -> pd.DataFrame:
     df["category"] = df["category"].astype(str).fillna("")
     df["description"] = df["description"].astype(str).fillna("")
     df["amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0).astype(int)
-
-    # 날짜 최신순 정렬
-    df = df.sort_values(["date"], ascending=[False]).reset_index(drop=True)
+    df["currency"] = df["currency"].fillna("").astype(str).str.strip().str.upper().replace("", DEFAULT_CURRENCY)
     return df
 
 
-def save_df(df: pd.DataFrame) -> None:
-    """CSV로 저장한다."""
+def df_to_rows(df: pd.DataFrame) -> list[dict]:
+    """DataFrame을 저장소 행(dict 리스트)으로 변환한다."""
     if df is None or len(df) == 0:
-        # 빈 DataFrame이면 헤더만 저장
-        with open(DATA_PATH, 'w', encoding='utf-8-sig', newline='') as f:
-            f.write('date,type,category,description,amount\n')
-        return
-    
-    out = df.copy()
-    
-    # 날짜 처리: 이미 date 타입이면 그대로, 아니면 변환
-    if not out["date"].empty:
-        if pd.api.types.is_object_dtype(out["date"]) or pd.api.types.is_datetime64_any_dtype(out["date"]):
-            out["date"] = pd.to_datetime(out["date"], errors="coerce").dt.date
-    
+        return []
+
+    out = df[COLUMNS].copy()
+    out["date"] = pd.to_datetime(out["date"], errors="coerce").dt.date.astype(str)
     out["type"] = out["type"].astype(str).fillna("")
     out["category"] = out["category"].astype(str).fillna("")
     out["description"] = out["description"].astype(str).fillna("")
     out["amount"] = pd.to_numeric(out["amount"], errors="coerce").fillna(0).astype(int)
-    
-    # CSV 저장 (newline='' 추가로 줄바꿈 문제 방지)
-    out.to_csv(DATA_PATH, index=False, encoding="utf-8-sig", lineterminator='\n')
-    
-    # 저장 확인 (디버깅용)
-    if os.path.exists(DATA_PATH):
-        size = os.path.getsize(DATA_PATH)
-        if size > 50:  # 헤더만 있으면 약 40바이트
-            # 정상 저장됨
-            pass
+    rows = out.to_dict("records")
+    for row in rows:
+        if row[CURRENCY_FIELD] == DEFAULT_CURRENCY:
+            del row[CURRENCY_FIELD]  # 원화 거래는 currency 키 없이 (저장소 행과 같은 모양)
+    return rows
+
+
+def load_df() -> pd.DataFrame:
+    """공용 DataFrame을 받아오고 세션 버전을 맞춘다 (복사하지 않고 참조만)."""
+    version, df = get_shared_ledger().get()
+    st.session_state["df_version"] = version
+    return df
+
+
+def sync_df() -> None:
+    """다른 탭/사용자의 저장까지 반영된 최신 공용 DataFrame으로 세션을 맞춘다."""
+    if get_shared_ledger().get()[0] != st.session_state.get("df_version"):
+        st.session_state["df"] = load_df()
+
+
+def apply_changes_df(df: pd.DataFrame, changes: list) -> pd.DataFrame:
+    """저장소 변경 기록(ledger.store.Change)을 DataFrame에 순서대로 적용한다."""
+    for c in changes:
+        if c.op == "insert":
+            df = pd.concat([df.iloc[:c.position], rows_to_df(c.rows), df.iloc[c.position:]], ignore_index=True)
+        elif c.op == "delete":
+            df = df.drop(index=df.index[c.indices]).reset_index(drop=True)
+        elif c.op == "update":
+            positions = list(c.updates.keys())
+            new = rows_to_df(list(c.updates.values()))
+            new.index = df.index[positions]
+            df = df.copy()
+            df.loc[new.index, COLUMNS] = new
+        elif c.op == "replace":
+            df = rows_to_df(c.rows)
+    return df
+
+
+def commit(op: str, *args, record_history: bool = True) -> bool:
+    """
+    저장소에 변경을 쓰고(op: insert/delete/update/replace) 세션을 최신으로 맞춘다.
+    다른 세션이 먼저 저장했으면 False.
+    """
+    from ledger.store import VersionConflictError
+
+    store = get_ledger_store()
+    monitor = get_budget_monitor()  # 저장 전에 연결되어 있어야 이번 쓰기의 예산 사건을 받는다
+    if record_history:
+        push_history()  # Undo 가능하게
+    try:
+        with span("app.save_df", op=op):
+            version = getattr(store, op)(*args, expected_version=st.session_state["df_version"])
+    except VersionConflictError:
+        if record_history:
+            st.session_state["history"].pop()  # 저장 안 됐으므로 Undo 기록도 취소
+        sync_df()
+        st.warning("⚠️ 다른 탭/사용자가 먼저 저장했습니다. 최신 데이터로 갱신했으니 다시 시도해주세요.")
+        return False
+    sync_df()
+    for event in monitor.recent_events(version):  # 이번 쓰기로 80%/100%를 넘은(내려온) 예산
+        if event.escalated:
+            st.toast(f"{'🚨' if event.status == '초과' else '⚠️'} {event.month} {event.category} 예산 {event.ratio:.0%} 사용")
+    return True
+
+
+def save_df(df: pd.DataFrame) -> bool:
+    """전체를 df로 교체 저장한다 (Undo 등)."""
+    return commit("replace", df_to_rows(df), record_history=False)
 
 
 def load_budgets() -> dict:
@@ -148,22 +399,24 @@ def save_budgets(budgets: dict) -> None:
 # (2) 세션 히스토리 관리 (Undo 기능)
 # =============================
 def push_history():
-    """Undo를 위해 현재 df를 히스토리에 저장한다."""
-    st.session_state["history"].append(deepcopy(st.session_state["df"]))
+    """Undo를 위해 현재 df를 히스토리에 저장한다 (공용 df는 수정되지 않으므로 참조만 보관)."""
+    st.session_state["history"].append(st.session_state["df"])
 
 
 def pop_history():
     """Undo 실행: 히스토리에서 되돌린다."""
     if st.session_state["history"]:
-        st.session_state["df"] = st.session_state["history"].pop()
-        save_df(st.session_state["df"])
+        save_df(st.session_state["history"].pop())
 
 
 # =============================
 # (3) 세션 초기화
 # =============================
-if "df" not in st.session_state:
-    st.session_state["df"] = load_df()
+with span("app.load_df"):
+    if "df" not in st.session_state:
+        st.session_state["df"] = load_df()
+    else:
+        sync_df()  # 다른 세션의 저장분만 반영
 
 if "history" not in st.session_state:
     st.session_state["history"] = []
@@ -175,178 +428,23 @@ if "budgets" not in st.session_state:
 # =============================
 # (4) 다크 테마 CSS
 # =============================
-st.markdown(
-    """
-<style>
-.stApp {
-  background: radial-gradient(1200px 700px at 35% 0%, rgba(130, 88, 255, 0.35), rgba(10, 12, 18, 0.98) 60%);
-  color: #EDEDF4;
-}
-
-/* 전역 텍스트 색상 */
-h1, h2, h3, h4, h5, h6, p, div, span, label {
-  color: #EDEDF4 !important;
-}
-
-/* Selectbox 팝업 메뉴만 검은색 강제 적용 */
-[class*="st-emotion-cache"] [role="listbox"],
-[class*="st-emotion-cache"] [role="listbox"] *,
-ul[role="listbox"],
-ul[role="listbox"] *,
-div[data-baseweb="popover"],
-div[data-baseweb="popover"] * {
-  color: #1E1E1E !important;
-}
-
-:root {
-  --box-bg: rgba(58, 61, 70, 0.78);
-  --box-border: rgba(210, 210, 230, 0.18);
-  --box-radius: 26px;
-  --input-text-color: #1E1E1E;  /* 어두운 글자색 */
-}
-
-/* Text Input, Number Input, Date Input */
-div[data-testid="stTextInput"] input,
-div[data-testid="stNumberInput"] input,
-div[data-testid="stDateInput"] input {
-  background: rgba(255, 255, 255, 0.95) !important;  /* 밝은 배경 */
-  border: 1px solid var(--box-border) !important;
-  border-radius: var(--box-radius) !important;
-  color: var(--input-text-color) !important;  /* 어두운 글자 */
-  font-weight: 500;
-}
-
-/* Placeholder 텍스트도 보이게 */
-div[data-testid="stTextInput"] input::placeholder,
-div[data-testid="stNumberInput"] input::placeholder {
-  color: rgba(30, 30, 30, 0.5) !important;
-  opacity: 1;
-}
-
-/* Select Box (드롭다운) */
-div[data-baseweb="select"] > div {
-  background: rgba(255, 255, 255, 0.95) !important;  /* 밝은 배경 */
-  border: 1px solid var(--box-border) !important;
-  border-radius: var(--box-radius) !important;
-  color: var(--input-text-color) !important;  /* 어두운 글자 */
-}
-
-/* Select Box 내부 텍스트 */
-div[data-baseweb="select"] span {
-  color: var(--input-text-color) !important;
-}
-
-div[data-baseweb="select"] * {
-  color: var(--input-text-color) !important;
-}
-
-/* Select Box 드롭다운 메뉴 - 더 구체적으로 */
-div[role="listbox"] {
-  background: rgba(255, 255, 255, 0.98) !important;
-}
-
-div[role="listbox"] * {
-  color: var(--input-text-color) !important;
-}
-
-/* 드롭다운 옵션들 - 모든 가능한 선택자 */
-div[role="option"],
-li[role="option"],
-div[data-baseweb="menu-item"],
-ul[role="listbox"] li,
-div[role="listbox"] > div,
-div[role="listbox"] li {
-  color: var(--input-text-color) !important;  /* 검은색 글자 */
-  background: transparent !important;
-}
-
-div[role="option"] *,
-li[role="option"] *,
-div[data-baseweb="menu-item"] * {
-  color: var(--input-text-color) !important;
-}
-
-div[role="option"]:hover,
-li[role="option"]:hover,
-div[data-baseweb="menu-item"]:hover {
-  background: rgba(130, 88, 255, 0.15) !important;
-  color: var(--input-text-color) !important;  /* hover 시에도 검은색 */
-}
-
-div[role="option"]:hover *,
-li[role="option"]:hover *,
-div[data-baseweb="menu-item"]:hover * {
-  color: var(--input-text-color) !important;
-}
-
-/* 선택된 옵션 */
-div[role="option"][aria-selected="true"],
-li[role="option"][aria-selected="true"],
-div[data-baseweb="menu-item"][aria-selected="true"] {
-  background: rgba(130, 88, 255, 0.25) !important;
-  color: var(--input-text-color) !important;
-}
-
-div[role="option"][aria-selected="true"] *,
-li[role="option"][aria-selected="true"] *,
-div[data-baseweb="menu-item"][aria-selected="true"] * {
-  color: var(--input-text-color) !important;
-}
-
-/* 헤더 영역 스타일 추가 */
-.stApp > header {
-  background: transparent !important;
-}
-
-/* Streamlit 기본 헤더 숨기기 */
-header[data-testid="stHeader"] {
-  background: transparent !important;
-}
-
-/* 메인 컨텐츠 영역 */
-.main .block-container {
-  padding-top: 2rem;
-}
-
-/* Sidebar */
-section[data-testid="stSidebar"] {
-  background: rgba(10, 12, 18, 0.55) !important;
-}
-
-/* 사이드바 Input도 밝은 배경 */
-section[data-testid="stSidebar"] div[data-testid="stTextInput"] input,
-section[data-testid="stSidebar"] div[data-testid="stDateInput"] input {
-  background: rgba(255, 255, 255, 0.95) !important;
-  color: var(--input-text-color) !important;
-}
-
-section[data-testid="stSidebar"] div[data-baseweb="select"] > div {
-  background: rgba(255, 255, 255, 0.95) !important;
-  color: var(--input-text-color) !important;
-}
-
-section[data-testid="stSidebar"] div[data-baseweb="select"] span {
-  color: var(--input-text-color) !important;
-}
-
-/* Button */
-.stButton > button {
-  border-radius: 18px;
-  padding: 10px 16px;
-  border: 1px solid rgba(160,120,255,0.35);
-  background: rgba(128, 77, 255, 0.35);
-  color: #EDEDF4;
-  font-weight: 700;
-}
-
-.stButton > button:hover {
-  background: rgba(128, 77, 255, 0.55);
-  border: 1px solid rgba(160,120,255,0.55);
-}
-</style>
-""",
-    unsafe_allow_html=True,
-)
+# Streamlit은 매 rerun마다 스크립트 전체를 다시 실행하므로 CSS도 매번 주입해야 한다.
+# 파일 읽기/주석·공백 제거는 프로세스당 1번만 하고, rerun마다 보내는 양을 줄인다.
+THEME_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "theme.css")
+
+
+@st.cache_resource
+def load_theme_css() -> str:
+    """assets/theme.css를 읽어 축약한 <style> 태그를 돌려준다."""
+    with open(THEME_CSS_PATH, "r", encoding="utf-8") as f:
+        css = f.read()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)  # 주석 제거
+    css = re.sub(r"\s+", " ", css)  # 공백 축약
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return f"<style>{css.strip()}</style>"
+
+
+st.markdown(load_theme_css(), unsafe_allow_html=True)
 
 
 # =============================
@@ -391,9 +489,15 @@ with st.sidebar:
     )
 
     # D2. 메모 검색 (키워드 필터)
-    keyword = st.text_input("검색어", value="", placeholder="예) 점심, 지하철 ...")
+    keyword = st.text_input("검색어", value="", placeholder="예) 점심, 지하철, ㅈㅎㅊ ...")
+    smart_search = st.checkbox("초성/오타 허용 검색", value=True, help="ㅈㅎㅊ -> 지하철, 스타벜스 -> 스타벅스")
     
     type_filter = st.selectbox("구분", ["전체", "지출", "수입"], index=0)
+    approx_mode = st.checkbox(
+        "대용량 근사 모드",
+        value=False,
+        help="긴 기간은 월별 표본으로 먼저 보여주고 시간이 허락하는 만큼 정확해집니다 (구분/카테고리/검색어 필터가 없을 때)",
+    )
 
     # 카테고리 목록
     base_categories = ["식비", "교통", "통신", "생활", "기타"]
@@ -405,35 +509,56 @@ with st.sidebar:
 # =============================
 # (7) 필터 적용
 # =============================
-df_all = st.session_state["df"].copy()
-df_all["번호"] = range(len(df_all))
+with span("app.filter"):
+    df_all = st.session_state["df"].copy()
+    df_all["번호"] = range(len(df_all))  # 번호 = 저장소에서의 위치 (삭제/편집 시 사용)
+    df_all = df_all.sort_values(["date"], ascending=[False], kind="stable")  # 날짜 최신순 표시
 
-# D1. 기간 필터 적용
-df_f = df_all.dropna(subset=["date"]).copy()
-df_f = df_f[(df_f["date"] >= start_date) & (df_f["date"] <= end_date)].copy()
+    # D1. 기간 필터 적용
+    df_f = df_all.dropna(subset=["date"]).copy()
+    df_f = df_f[(df_f["date"] >= start_date) & (df_f["date"] <= end_date)].copy()
 
-# 구분 필터
-if type_filter != "전체":
-    df_f = df_f[df_f["type"] == type_filter].copy()
+    # 구분 필터
+    if type_filter != "전체":
+        df_f = df_f[df_f["type"] == type_filter].copy()
 
-# 카테고리 필터
-if category_filter != "전체":
-    df_f = df_f[df_f["category"] == category_filter].copy()
+    # 카테고리 필터
+    if category_filter != "전체":
+        df_f = df_f[df_f["category"] == category_filter].copy()
 
-# D2. 메모 검색 (키워드 필터)
-if keyword.strip():
-    df_f = df_f[df_f["description"].astype(str).str.contains(keyword.strip(), na=False)].copy()
+    # D2. 메모 검색 (키워드 필터)
+    if keyword.strip() and smart_search:
+        # 인덱스로 일치하는 메모 목록만 먼저 찾고, 행은 isin으로 한 번에 거른다
+        matched = get_description_index().search(keyword)
+        df_f = df_f[df_f["description"].astype(str).isin(matched)].copy()
+    elif keyword.strip():
+        df_f = df_f[df_f["description"].astype(str).str.contains(keyword.strip(), na=False)].copy()
+
+    # 근사 모드는 저장된 파일을 직접 표본 추출하므로 기간 외 필터가 없고 디스크 저장이 끝났을 때만 쓴다
+    use_approx = (
+        approx_mode
+        and type_filter == "전체"
+        and category_filter == "전체"
+        and not keyword.strip()
+        and get_ledger_store().save_status != "pending"
+        and bool((df_f["currency"] == DEFAULT_CURRENCY).all())  # 표본 집계는 환산하지 않으므로 원화만
+    )
+    approx_result = None
 
-# 화면용 컬럼명
-df_view = df_f.rename(
-    columns={
-        "date": "날짜",
-        "type": "구분",
-        "category": "카테고리",
-        "description": "내용",
-        "amount": "금액",
-    }
-)[["번호", "날짜", "구분", "카테고리", "내용", "금액"]].copy()
+    # 합계/차트용: 외화 행은 기준일 환율로 원화 환산 (목록 화면은 원래 통화 그대로)
+    df_report, missing_rates = to_reporting_currency(df_f)
+
+    # 화면용 컬럼명
+    df_view = df_f.rename(
+        columns={
+            "date": "날짜",
+            "type": "구분",
+            "category": "카테고리",
+            "description": "내용",
+            "amount": "금액",
+            "currency": "통화",
+        }
+    )[["번호", "날짜", "구분", "카테고리", "내용", "금액", "통화"]].copy()
 
 
 # =============================
@@ -450,7 +575,11 @@ with col_c:
     in_category = st.selectbox("카테고리", ["식비", "교통", "통신", "생활", "기타"], index=0, key="input_category")
 
 in_desc = st.text_input("내용", value="", placeholder="예) 지하철 / 점심 / 통신요금 ...")
-in_amount = st.number_input("금액(원)", min_value=0, step=1000, value=0)
+col_d, col_e = st.columns([2.4, 1.0])
+with col_d:
+    in_amount = st.number_input("금액", min_value=0, step=1000, value=0)
+with col_e:
+    in_currency = st.selectbox("통화", CURRENCIES, index=0, key="input_currency")
 
 if st.button("등록", key="register_btn"):
     # 금액 검증 (요구사항: 숫자가 아니면 추가 안됨)
@@ -458,37 +587,29 @@ if st.button("등록", key="register_btn"):
         st.error("❌ 금액은 0보다 커야 합니다!")
     else:
         try:
-            push_history()  # Undo 가능하게
-            
-            # 새 거래 생성
-            new_row = pd.DataFrame(
-                [
-                    {
-                        "date": in_date,
-                        "type": in_type,
-                        "category": in_category,
-                        "description": str(in_desc),
-                        "amount": int(in_amount),
-                    }
-                ]
-            )
-            
-            # DataFrame에 추가 (최신이 맨 위로)
-            st.session_state["df"] = pd.concat([new_row, st.session_state["df"]], ignore_index=True)
-            
-            # 즉시 CSV에 저장
-            save_df(st.session_state["df"])
-            
-            # 저장 확인
-            saved_df = load_df()
-            if len(saved_df) > 0:
-                st.success(f"✅ 저장 완료! (현재 {len(saved_df)}건)")
-                st.session_state["df"] = saved_df  # 저장된 데이터로 세션 업데이트
-            else:
-                st.error("❌ 저장은 했지만 불러오기에 실패했습니다.")
-            
-            # 화면 새로고침
-            st.rerun()
+            # 새 거래 생성 (최신이 맨 위로) -> 즉시 CSV에 저장
+            new_row = {
+                "date": in_date.isoformat(),
+                "type": in_type,
+                "category": in_category,
+                "description": str(in_desc),
+                "amount": int(in_amount),
+            }
+            if in_currency != DEFAULT_CURRENCY:
+                new_row[CURRENCY_FIELD] = in_currency
+            # "등록" 두 번 클릭 방지: 같은 거래를 방금 등록했으면 건너뜀
+            from ledger.dedupe import dedupe_key
+
+            key = dedupe_key(new_row)
+            last_key, last_at = st.session_state.get("last_insert", (None, 0.0))
+            if key == last_key and time.time() - last_at < DOUBLE_SUBMIT_SECONDS:
+                st.warning("⚠️ 방금 등록한 거래와 같아서 건너뛰었습니다.")
+            elif commit("insert", [new_row]):
+                st.session_state["last_insert"] = (key, time.time())
+                st.success(f"✅ 저장 완료! (현재 {len(st.session_state['df'])}건)")
+
+                # 화면 새로고침
+                st.rerun()
             
         except Exception as e:
             st.error(f"❌ 저장 중 오류 발생: {e}")
@@ -508,12 +629,21 @@ tab_summary, tab_data, tab_chart, tab_budget = st.tabs(["📈 요약 통계", "
 with tab_summary:
     st.markdown("## 📊 요약 통계")
     
+    if use_approx:
+        # 표본 결과를 먼저 그리고, 시간 예산 안에서 더 읽을 때마다 같은 자리에 다시 그린다
+        placeholder = st.empty()
+        for approx_result in get_approx_ledger().refine(start_date, end_date, time_budget=APPROX_TIME_BUDGET):
+            with placeholder.container():
+                render_approx_summary(approx_result)
+        st.markdown(f"**조회 기간:** {start_date} ~ {end_date}")
+
     # F2. 목록 조회: 거래가 없으면 안내 메시지
-    if len(df_f) == 0:
+    elif len(df_report) == 0:
         st.info("📭 등록된 거래가 없습니다. 새 거래를 등록해주세요!")
     else:
         # F3. 요약 통계: calc_summary() 사용
-        transactions_list = df_f.to_dict('records')
+        with span("app.to_records"):
+            transactions_list = df_report.to_dict('records')
         
         # 기본 요약
         income, expense, balance = calc_summary(transactions_list)
@@ -564,12 +694,49 @@ with tab_summary:
             else:
                 st.write("**평균 지출:** -")
         
+        # 지출 금액 분포 (스트리밍 분위수 스케치)
+        dist = calc_expense_distribution(transactions_list)
+        if dist["overall"]["count"] > 0:
+            col6, col7, col8 = st.columns(3)
+            with col6:
+                st.write(f"**지출 중앙값:** {format_currency(int(dist['overall']['median']))}")
+            with col7:
+                st.write(f"**지출 상위 10% (p90):** {format_currency(int(dist['overall']['p90']))}")
+            with col8:
+                st.write(f"**지출 상위 1% (p99):** {format_currency(int(dist['overall']['p99']))}")
+
+            with st.expander("카테고리별 지출 분포"):
+                st.dataframe(
+                    pd.DataFrame(
+                        [
+                            {
+                                "카테고리": category,
+                                "건수": stats["count"],
+                                "중앙값": format_currency(int(stats["median"])),
+                                "p90": format_currency(int(stats["p90"])),
+                                "최대": format_currency(int(stats["max"])),
+                            }
+                            for category, stats in dist["categories"].items()
+                        ]
+                    ),
+                    use_container_width=True,
+                    hide_index=True,
+                )
+
         # 기간 정보
         st.markdown(f"**조회 기간:** {start_date} ~ {end_date}")
         
         if keyword.strip():
             st.markdown(f"**검색어:** '{keyword.strip()}'")
 
+    if missing_rates:
+        st.warning(
+            f"⚠️ 환율이 없어 합계에서 뺀 외화 거래가 있습니다: {', '.join(missing_rates[:5])}"
+            f"{' 외' if len(missing_rates) > 5 else ''} ({FX_RATES_PATH}에 환율을 추가하세요)"
+        )
+    elif (df_f["currency"] != DEFAULT_CURRENCY).any():
+        st.caption("💱 외화 거래는 거래일(또는 직전 고시일) 환율로 원화 환산해서 합산했습니다.")
+
 
 # =============================
 # (9-2) F2. 데이터 탭 (목록 조회)
@@ -577,7 +744,22 @@ with tab_summary:
 with tab_data:
     st.markdown("## 📌 거래 목록 조회")
 
-    b1, b2, b3, b4 = st.columns(4)
+    # 저장은 백그라운드에서 처리되므로 디스크 반영 상태를 보여준다
+    save_status = get_ledger_store().save_status
+    if save_status == "pending":
+        st.caption("💾 디스크 저장 대기 중...")
+    elif save_status == "failed":
+        # 다른 프로세스가 먼저 저장했거나 디스크 오류 -> 저장 못 한 변경은 버리고 디스크 내용으로 다시 읽었다
+        st.error(f"❌ 마지막 변경을 디스크에 저장하지 못했습니다: {get_ledger_store().last_error} (다시 입력해주세요)")
+    else:
+        st.caption("✅ 디스크 저장 완료")
+
+    quality = get_quality_monitor().counts
+    if quality:
+        summary = ", ".join(f"{name} {n}건" for name, n in quality.items())
+        st.warning(f"⚠️ 데이터 품질 문제: {summary} (python main.py validate --quarantine 로 확인)")
+
+    b1, b2, b3, b4, b5, b6 = st.columns(6)
 
     with b1:
         if st.button("🧯 실행 취소(Undo)"):
@@ -587,10 +769,36 @@ with tab_data:
     with b2:
         if st.button("↩️ 마지막 1건 삭제"):
             if len(st.session_state["df"]) > 0:
-                push_history()
-                st.session_state["df"] = st.session_state["df"].iloc[1:].reset_index(drop=True)
-                save_df(st.session_state["df"])
-                st.warning("마지막 1건 삭제 완료")
+                if commit("delete", [0]):
+                    st.warning("마지막 1건 삭제 완료")
+                    st.rerun()
+
+    with b5:
+        if st.button("🏷️ 기타 자동 분류"):
+            # 규칙(data/category_rules.json 또는 기본 규칙)으로 "기타" 행만 다시 분류 -> 바뀐 행만 저장
+            from ledger.categorize import Categorizer, load_rules, recategorize
+
+            # 화면용 df는 날짜/금액을 고쳐 놓은 값(NaT, 0 등)이라 저장소 원본 행으로 분류해야 category만 바뀐다
+            # (행 위치는 저장소 기준, 세션이 본 버전과 다르면 commit이 충돌로 알려준다)
+            result = recategorize(list(get_ledger_store().view().rows), Categorizer(load_rules()))
+            if not result.changes:
+                st.info("자동 분류할 항목이 없습니다.")
+            elif commit("update", result.updates):
+                st.success(f"자동 분류 완료 ({len(result.changes)}건)")
+                st.rerun()
+
+    with b6:
+        if st.button("🔁 이번 달 고정 지출 채우기"):
+            # 매달/매주 반복되는 거래를 찾아 이번 달 말일까지 아직 없는 예정분을 한 번에 등록
+            from ledger.recurring import materialize_upcoming
+
+            rows = list(get_ledger_store().view().rows)
+            _, month_end = DATE_DIMENSION.month_range(DATE_DIMENSION.info(date.today()).month)
+            upcoming = materialize_upcoming(get_recurring_detector().patterns(), until=month_end, existing=rows)
+            if not upcoming:
+                st.info("채울 반복 거래가 없습니다.")
+            elif commit("insert", upcoming[::-1]):  # 최신이 위로
+                st.success(f"반복 거래 {len(upcoming)}건 등록 완료")
                 st.rerun()
 
     # F2. 목록 조회: 데이터가 없으면 안내 메시지
@@ -613,24 +821,15 @@ with tab_data:
                 if len(checked) == 0:
                     st.info("체크된 항목이 없습니다.")
                 else:
-                    push_history()
-                    del_numbers = checked["번호"].tolist()
+                    del_numbers = [int(n) for n in checked["번호"].tolist()]
 
-                    df_now = st.session_state["df"].copy()
-                    df_now["번호"] = range(len(df_now))
-                    df_now = df_now[~df_now["번호"].isin(del_numbers)].drop(columns=["번호"]).reset_index(drop=True)
-
-                    st.session_state["df"] = df_now
-                    save_df(st.session_state["df"])
-                    st.success(f"{len(del_numbers)}건 삭제 완료")
-                    st.rerun()
+                    if commit("delete", del_numbers):
+                        st.success(f"{len(del_numbers)}건 삭제 완료")
+                        st.rerun()
 
         with b4:
             if st.button("💾 수정사항 저장(편집 저장)"):
-                push_history()
-
-                df_now = st.session_state["df"].copy()
-                df_now["번호"] = range(len(df_now))
+                df_now = st.session_state["df"]
 
                 edited2 = edited.copy()
                 if "삭제" in edited2.columns:
@@ -643,28 +842,47 @@ with tab_data:
                         "카테고리": "category",
                         "내용": "description",
                         "금액": "amount",
+                        "통화": "currency",
                     }
                 )
 
+                # 실제로 바뀐 행만 변경분으로 보낸다
+                updates = {}
                 for _, row in edited2.iterrows():
                     n = int(row["번호"])
-                    mask = df_now["번호"] == n
-                    if mask.any():
-                        df_now.loc[mask, "date"] = row["date"]
-                        df_now.loc[mask, "type"] = str(row["type"])
-                        df_now.loc[mask, "category"] = str(row["category"])
-                        df_now.loc[mask, "description"] = str(row["description"])
-                        df_now.loc[mask, "amount"] = int(pd.to_numeric(row["amount"], errors="coerce") or 0)
-
-                df_now = df_now.drop(columns=["번호"]).reset_index(drop=True)
-                st.session_state["df"] = df_now
-                save_df(st.session_state["df"])
-                st.success("편집 저장 완료")
-                st.rerun()
+                    if n >= len(df_now):
+                        continue
+                    new_row = {
+                        "date": str(row["date"]),
+                        "type": str(row["type"]),
+                        "category": str(row["category"]),
+                        "description": str(row["description"]),
+                        "amount": int(pd.to_numeric(row["amount"], errors="coerce") or 0),
+                        "currency": str(row["currency"] or DEFAULT_CURRENCY).strip().upper(),
+                    }
+                    old = df_now.iloc[n]
+                    old_row = {
+                        "date": str(old["date"]),
+                        "type": str(old["type"]),
+                        "category": str(old["category"]),
+                        "description": str(old["description"]),
+                        "amount": int(old["amount"]),
+                        "currency": str(old["currency"]),
+                    }
+                    if new_row != old_row:
+                        if new_row["currency"] == DEFAULT_CURRENCY:
+                            del new_row["currency"]
+                        updates[n] = new_row
+
+                if not updates:
+                    st.info("변경된 항목이 없습니다.")
+                elif commit("update", updates):
+                    st.success(f"편집 저장 완료 ({len(updates)}건)")
+                    st.rerun()
 
         # D2. 검색어 통계
         if keyword.strip():
-            df_kw = df_f.copy()
+            df_kw = df_report.copy()
             df_kw = df_kw[df_kw["type"] == "지출"].copy()
 
             cnt = int(len(df_kw))
@@ -680,22 +898,33 @@ with tab_chart:
     st.markdown("## 📊 카테고리별 지출 통계")
 
     # type == "지출"만 대상
-    df_exp = df_f[df_f["type"] == "지출"].copy()
+    df_exp = df_report[df_report["type"] == "지출"].copy()
 
-    if len(df_exp) == 0:
+    no_expense = len(df_exp) == 0 if approx_result is None else not approx_result.category_expense
+    if no_expense:
         st.info("📭 표시할 지출 데이터가 없습니다.")
     else:
-        # F5. 카테고리별 지출 합계
-        transactions_list = df_exp.to_dict('records')
-        category_totals = calc_category_expense(transactions_list)
+        # F5. 카테고리별 지출 합계 (근사 모드면 요약 탭에서 구한 추정값 + 95% 범위를 오차 막대로)
+        if approx_result is not None:
+            category_totals = {c: int(e.value) for c, e in approx_result.category_expense.items()}
+            category_errors = {c: int(e.error) for c, e in approx_result.category_expense.items()}
+        else:
+            with span("app.to_records"):
+                transactions_list = df_exp.to_dict('records')
+            category_totals = calc_category_expense(transactions_list)
+            category_errors = {}
         
         # DataFrame으로 변환
         cat_sum = pd.DataFrame(
             list(category_totals.items()),
             columns=["category", "amount"]
         ).sort_values("amount", ascending=False)
+        cat_sum["error"] = cat_sum["category"].map(category_errors).fillna(0)
+        cat_sum["label"] = format_currency_many(cat_sum["amount"], compact=True)
+
+        # 그래프 시각화 (plotly는 import가 무거우므로 차트를 실제로 그릴 때만 불러온다)
+        import plotly.express as px
 
-        # 그래프 시각화
         color_seq = ["#9B7BFF", "#6FA8FF", "#58D6C9", "#FFC857", "#FF6B9E", "#B7B7C9"]
 
         fig = px.bar(
@@ -704,7 +933,8 @@ with tab_chart:
             y="amount",
             color="category",
             color_discrete_sequence=color_seq,
-            text="amount",
+            text="label",
+            error_y="error" if category_errors else None,
         )
 
         fig.update_layout(
@@ -718,13 +948,16 @@ with tab_chart:
             title={"text": "카테고리", "font": {"color": "#EDEDF4", "size": 16}},
             tickfont={"color": "#EDEDF4", "size": 14},
         )
+        # 축 눈금은 만원/억원 단위 라벨로
+        tickvals, ticktext = compact_ticks((cat_sum["amount"] + cat_sum["error"]).max())
         fig.update_yaxes(
             title={"text": "금액(원)", "font": {"color": "#EDEDF4", "size": 16}},
             tickfont={"color": "#EDEDF4", "size": 14},
-            tickformat=",d",
+            tickvals=tickvals,
+            ticktext=ticktext,
         )
         fig.update_traces(
-            texttemplate="%{text:,}",
+            texttemplate="%{text}",
             textposition="outside",
         )
 
@@ -742,6 +975,51 @@ with tab_chart:
             st.markdown(f"- {top_cat}에 총 {format_currency(top_amt)} 지출")
             st.markdown(f"- 전체 지출의 {top_pct}%를 차지합니다")
 
+    # 기간별 지출 추이 (날짜 열을 날짜 차원으로 한 번에 주/월/분기/연 키로 바꿔서 묶는다)
+    if len(df_exp) > 0:
+        st.markdown("### 📆 기간별 지출 추이")
+        unit = st.radio("단위", ["주", "월", "분기", "연"], index=1, horizontal=True, key="trend_period")
+        period = {"주": "week", "월": "month", "분기": "quarter", "연": "year"}[unit]
+        trend = (
+            df_exp.assign(period=DATE_DIMENSION.map_column(df_exp["date"], period))
+            .groupby("period", as_index=False)["amount"]
+            .sum()
+        )
+        import plotly.express as px
+
+        fig_trend = px.bar(trend, x="period", y="amount", labels={"period": unit, "amount": "금액(원)"})
+        fig_trend.update_layout(
+            template="plotly_dark",
+            plot_bgcolor="rgba(0,0,0,0)",
+            paper_bgcolor="rgba(0,0,0,0)",
+        )
+        tickvals, ticktext = compact_ticks(trend["amount"].max())
+        fig_trend.update_yaxes(tickvals=tickvals, ticktext=ticktext)
+        st.plotly_chart(fig_trend, use_container_width=True)
+
+    # 카테고리 × 월 히트맵 (기간 필터와 상관없이 전체 기간, 공용 피벗을 변경분으로 갱신)
+    pivot = get_shared_ledger().pivot_matrix()
+    if pivot["months"]:
+        st.markdown("### 🗓️ 카테고리 × 월 지출")
+        import plotly.express as px
+
+        fig_heat = px.imshow(
+            pivot["values"],
+            x=pivot["months"],
+            y=pivot["categories"],
+            color_continuous_scale="Purples",
+            aspect="auto",
+            labels={"x": "월", "y": "카테고리", "color": "금액(원)"},
+        )
+        fig_heat.update_layout(
+            template="plotly_dark",
+            plot_bgcolor="rgba(0,0,0,0)",
+            paper_bgcolor="rgba(0,0,0,0)",
+        )
+        st.plotly_chart(fig_heat, use_container_width=True)
+        if pivot["unconverted"]:
+            st.caption(f"⚠️ 환율이 없는 외화 지출 {pivot['unconverted']:,}건은 히트맵에 없습니다 ({FX_RATES_PATH}에 환율 추가).")
+
 
 # =============================
 # (9-4) D4. 예산 관제 탭 (지출 한도 알림)
@@ -749,9 +1027,8 @@ with tab_chart:
 with tab_budget:
     st.markdown("## 🚨 예산 관리 (지출 한도 알림)")
 
-    now = pd.Timestamp.today()
-    month_start = now.replace(day=1).date()
-    month_end = (now + pd.offsets.MonthEnd(0)).date()
+    month_key = DATE_DIMENSION.info(date.today()).month
+    month_start, month_end = DATE_DIMENSION.month_range(month_key)
     st.markdown(f"이번 달 기준: **{month_start} ~ {month_end}**")
 
     st.markdown("### 📌 카테고리별 예산 설정(원)")
@@ -764,28 +1041,33 @@ with tab_budget:
         with cols[i]:
             budgets[k] = st.number_input(k, min_value=0, step=10000, value=int(budgets.get(k, 0)), key=f"budget_{k}")
 
+    monitor = get_budget_monitor()
     if st.button("💾 예산 저장"):
         st.session_state["budgets"] = budgets
         save_budgets(budgets)
+        monitor.set_budgets(budgets)
         st.success("예산 저장 완료")
 
     st.markdown("---")
     st.markdown("### ✅ 이번 달 전체 관제")
 
-    # 이번 달 지출 계산
-    df_month = st.session_state["df"].copy()
-    df_month = df_month.dropna(subset=["date"])
-    df_month = df_month[(df_month["date"] >= month_start) & (df_month["date"] <= month_end)]
-    df_month_exp = df_month[df_month["type"] == "지출"].copy()
-
-    total_spent = int(df_month_exp["amount"].sum())
+    # 이번 달 지출: 공용 카운터에서 바로 읽는다 (저장할 때마다 바뀐 행만 반영되어 있음)
+    total_spent = monitor.spent(month_key)
     total_budget = int(budgets.get("전체", 0))
 
     # D4. 예산 관리: calc_budget_status 사용
     ratio, status, message = calc_budget_status(total_spent, total_budget)
-    
+    forecasts = month_end_forecast(st.session_state["df_version"], date.today(), tuple(sorted(budgets.items())))
+    total_forecast = forecasts["전체"]
+
     st.progress(min(1.0, ratio))
     st.markdown(f"**총 지출: {format_currency(total_spent)} / 총 예산: {format_currency(total_budget)}**")
+    st.caption(f"📈 월말 예상: {format_currency(total_forecast.projected)} (고정 지출 남은 것 {format_currency(total_forecast.recurring_pending)} 포함)")
+    skipped = monitor.unconverted_count(month_key)
+    if skipped:
+        st.warning(f"환율이 없는 외화 지출 {skipped:,}건은 예산 합계/월말 예상에서 빠졌습니다 ({FX_RATES_PATH}에 환율 추가).")
+    if status not in ("초과", "미설정") and total_forecast.status in ("경고", "초과"):
+        st.warning(total_forecast.message)  # 아직 넘지 않았지만 이 추세면 넘는다
 
     # D4. 지출 한도 알림
     if status == "초과":
@@ -801,10 +1083,12 @@ with tab_budget:
     st.markdown("### 📊 카테고리별 관제")
 
     for k in ["식비", "교통", "통신", "생활", "기타"]:
-        cat_spent = int(df_month_exp[df_month_exp["category"] == k]["amount"].sum())
+        cat_spent = monitor.spent(month_key, k)
         cat_budget = int(budgets.get(k, 0))
 
-        st.markdown(f"**{k} | 지출 {format_currency(cat_spent)} / 예산 {format_currency(cat_budget)}**")
+        cat_forecast = forecasts.get(k)
+        projected = f" (월말 예상 {format_currency(cat_forecast.projected)})" if cat_forecast else ""
+        st.markdown(f"**{k} | 지출 {format_currency(cat_spent)} / 예산 {format_currency(cat_budget)}**{projected}")
 
         # D4. 지출 한도 알림 (카테고리별)
         cat_ratio, cat_status, cat_message = calc_budget_status(cat_spent, cat_budget)
@@ -815,11 +1099,23 @@ with tab_budget:
             st.error(f"🚨 {k} 예산 초과!")
         elif cat_status == "경고":
             st.warning(f"⚠️ {k} {cat_message}")  # 80% 경고
+        elif cat_status == "정상" and cat_forecast and cat_forecast.status in ("경고", "초과"):
+            st.warning(f"📈 {k} {cat_forecast.message}")  # 지금은 정상이지만 월말 예상으로 미리 경고
         elif cat_status == "정상":
             st.success(f"✅ {k} 정상")
         else:
             st.info(f"{k} {cat_message}")
 
+    recent = monitor.recent_events()
+    if recent:
+        with st.expander(f"🔔 최근 예산 알림 ({len(recent)}건)"):
+            for e in reversed(recent):
+                arrow = "↑" if e.escalated else "↓"
+                st.markdown(
+                    f"- {e.month} **{e.category}** {e.previous} {arrow} {e.status} "
+                    f"({format_currency(e.spent)} / {format_currency(e.budget)}, {e.ratio:.0%})"
+                )
+
 
 # =============================
 # 하단 정보
@@ -832,4 +1128,40 @@ st.markdown(
 </div>
 """,
     unsafe_allow_html=True,
-)
\ No newline at end of file
+)
+
+
+# =============================
+# (10) 디버그: rerun 성능 패널 (사이드바)
+# =============================
+with st.sidebar:
+    st.markdown("---")
+    if st.checkbox("🐞 성능 패널", value=PERF_DEBUG, key="perf_panel"):
+        rerun_ms = (time.perf_counter() - RERUN_STARTED) * 1000
+        rerun_spans = perf.end_capture()
+        if not perf.is_enabled():
+            perf.set_enabled(True)  # 계측은 기본 꺼짐 - 패널을 처음 켠 rerun 다음부터 기록된다
+            st.caption("계측을 켰습니다. 다음 rerun부터 구간이 기록됩니다.")
+
+        st.markdown(f"**이번 rerun: {rerun_ms:,.1f}ms**")
+        breakdown = perf.summarize_spans(rerun_spans)
+        if breakdown:
+            st.dataframe(
+                pd.DataFrame(breakdown).rename(columns={"name": "구간", "count": "횟수", "total_ms": "합계(ms)"}),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        with st.expander("누적 히스토그램 (프로세스 전체)"):
+            stats = perf.stats()
+            if stats["histograms"]:
+                hist_df = pd.DataFrame.from_dict(stats["histograms"], orient="index")
+                st.dataframe(hist_df[["count", "avg_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"]].round(3))
+            if stats["counters"]:
+                st.json(stats["counters"])
+
+        if st.button("📝 스팬 JSONL 저장", key="perf_dump"):
+            n = perf.dump_spans_jsonl(PERF_SPANS_PATH)
+            st.success(f"{n}건 저장: {PERF_SPANS_PATH}")
+    else:
+        perf.end_capture()
@@ -0,0 +1,94 @@
+# benchmarks/bench_compression.py
+# 역할: 가계부 압축 저장 방식 비교 (파일 크기 / 저장 시간 / 로드 시간)
+#
+# 사용법:
+#   python benchmarks/bench_compression.py              # 10만 행
+#   python benchmarks/bench_compression.py --rows 500000 --repeat 3
+#
+# 같은 합성 가계부를 csv, csv.gz, csv.bz2, csv.xz로 저장/로드해서 비교한다.
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ledger.repository import load_transactions, save_transactions  # noqa: E402
+
+FORMATS = ["csv", "csv.gz", "csv.bz2", "csv.xz"]
+
+CATEGORIES = {
+    "지출": ["식비", "교통", "주거", "통신", "쇼핑", "의료", "문화", "기타"],
+    "수입": ["월급", "용돈", "부수입"],
+}
+DESCRIPTIONS = ["점심", "저녁", "지하철", "버스", "월세", "휴대폰 요금", "편의점", "병원", "영화", "커피"]
+
+
+def make_transactions(rows: int, seed: int = 0) -> list[dict]:
+    """합성 가계부 생성 (수입 10%, 지출 90%)"""
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    transactions = []
+    for i in range(rows):
+        t_type = "수입" if rng.random() < 0.1 else "지출"
+        transactions.append(
+            {
+                "date": (start + timedelta(days=i * 1500 // max(rows, 1))).isoformat(),
+                "type": t_type,
+                "category": rng.choice(CATEGORIES[t_type]),
+                "description": rng.choice(DESCRIPTIONS),
+                "amount": rng.randrange(1000, 3_000_000 if t_type == "수입" else 200_000, 100),
+            }
+        )
+    return transactions
+
+
+def measure(path: str, transactions: list[dict], repeat: int) -> tuple[int, float, float]:
+    """
+    저장/로드 시간 측정
+
+    Returns:
+        (파일 크기(bytes), 가장 빠른 저장 시간(ms), 가장 빠른 로드 시간(ms))
+    """
+    best_save = best_load = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        save_transactions(path, transactions)
+        best_save = min(best_save, (time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        loaded = load_transactions(path)
+        best_load = min(best_load, (time.perf_counter() - started) * 1000)
+        assert len(loaded) == len(transactions)
+    return os.path.getsize(path), best_save, best_load
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="가계부 압축 저장 방식 비교")
+    parser.add_argument("--rows", type=int, default=100_000, help="합성 가계부 행 수")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수(가장 빠른 값 사용)")
+    parser.add_argument("formats", nargs="*", default=FORMATS, help="비교할 확장자")
+    args = parser.parse_args(argv)
+
+    transactions = make_transactions(args.rows)
+    print(f"{args.rows:,}행")
+    print(f"{'format':<10} {'size(KB)':>10} {'ratio':>7} {'save(ms)':>10} {'load(ms)':>10}")
+    print("-" * 51)
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats:
+            size, save_ms, load_ms = measure(os.path.join(tmp, f"ledger.{fmt}"), transactions, args.repeat)
+            baseline = baseline or size
+            print(f"{fmt:<10} {size / 1024:>10.1f} {size / baseline:>7.2f} {save_ms:>10.1f} {load_ms:>10.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+# benchmarks/bench_format.py
+# 역할: 금액 문자열 변환 속도 비교 (format_currency 반복 호출 vs format_currency_many)
+#
+# 사용법:
+#   python benchmarks/bench_format.py                    # 100만 개, 서로 다른 금액 2만 개
+#   python benchmarks/bench_format.py --rows 200000 --distinct 200000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ledger.utils import format_currency, format_currency_many  # noqa: E402
+
+
+def best_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="금액 문자열 변환 속도 비교")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="금액 개수")
+    parser.add_argument("--distinct", type=int, default=20_000, help="서로 다른 금액 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수(가장 빠른 값 사용)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    pool = [rng.randint(1, 500) * 100 for _ in range(args.distinct)]
+    amounts = [rng.choice(pool) for _ in range(args.rows)]
+
+    single = best_ms(lambda: [format_currency(a) for a in amounts], args.repeat)
+    batch = best_ms(lambda: format_currency_many(amounts), args.repeat)
+    compact = best_ms(lambda: format_currency_many(amounts, compact=True), args.repeat)
+    assert format_currency_many(amounts) == [format_currency(a) for a in amounts]
+
+    print(f"{args.rows:,}개 / 서로 다른 금액 {len(set(pool)):,}개")
+    print(f"{'method':<28} {'ms':>10}")
+    print("-" * 40)
+    print(f"{'format_currency (1개씩)':<28} {single:>10.1f}")
+    print(f"{'format_currency_many':<28} {batch:>10.1f}")
+    print(f"{'format_currency_many compact':<28} {compact:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# benchmarks/bench_import_time.py
+# 역할: import 시간 측정 리포트 (앱 시작/rerun 비용 확인용)
+#
+# 사용법:
+#   python benchmarks/bench_import_time.py              # 기본 대상 전체
+#   python benchmarks/bench_import_time.py ledger pandas --top 15
+#
+# 각 대상을 새 파이썬 프로세스에서 `-X importtime`으로 import 해서
+# (1) 전체 import 시간과 (2) 누적 시간이 큰 하위 모듈 TOP N을 보여준다.
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TARGETS = [
+    "ledger",
+    "ledger.utils",
+    "ledger.services",
+    "ledger.store",
+    "pandas",
+    "streamlit",
+    "plotly.express",
+]
+
+
+def profile_import(module: str, repeat: int = 3) -> tuple[float, list[tuple[int, int, str]]]:
+    """
+    module을 새 프로세스에서 import
+
+    Returns:
+        (가장 빠른 전체 시간(ms), [(self us, cumulative us, 모듈명), ...])
+        import 실패 시 전체 시간은 -1
+    """
+    best_total = None
+    best_rows: list[tuple[int, int, str]] = []
+
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            return -1.0, []
+
+        rows = []
+        for line in proc.stderr.splitlines():
+            # "import time:      self [us] |   cumulative | imported package"
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+
+        total = sum(r[0] for r in rows) / 1000
+        if best_total is None or total < best_total:
+            best_total, best_rows = total, rows
+
+    return best_total or 0.0, best_rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="import 시간 측정 리포트")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS, help="측정할 모듈")
+    parser.add_argument("--top", type=int, default=10, help="누적 시간 TOP N 하위 모듈")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수(가장 빠른 값 사용)")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<20} {'total(ms)':>10}")
+    print("-" * 32)
+    details = {}
+    for module in args.modules:
+        total, rows = profile_import(module, args.repeat)
+        if total < 0:
+            print(f"{module:<20} {'(설치 안 됨)':>10}")
+            continue
+        print(f"{module:<20} {total:>10.1f}")
+        details[module] = rows
+
+    for module, rows in details.items():
+        print(f"\n[{module}] 누적 시간 TOP {args.top}")
+        for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[: args.top]:
+            print(f"  {cumulative_us / 1000:>8.1f}ms (self {self_us / 1000:>6.1f}ms) {name.strip()}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
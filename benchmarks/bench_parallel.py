@@ -0,0 +1,56 @@
+# benchmarks/bench_parallel.py
+# 역할: 병렬 집계(ledger.parallel) 속도 비교 - 직렬 vs 워커 수별
+#
+# 사용법:
+#   python benchmarks/bench_parallel.py                       # 200만 행, 워커 1/2/4/코어 수
+#   python benchmarks/bench_parallel.py --rows 10000000 --workers 1 8 16
+#
+# 합성 가계부 CSV를 만든 뒤 aggregate_file로 같은 파일을 워커 수만 바꿔가며 집계한다.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_compression import make_transactions  # noqa: E402
+from ledger.parallel import aggregate_file  # noqa: E402
+from ledger.repository import save_transactions  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="병렬 집계 속도 비교")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="합성 가계부 행 수")
+    parser.add_argument("--workers", type=int, nargs="*", default=None, help="비교할 워커 수 목록")
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, 2, 4, cores})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ledger.csv")
+        save_transactions(path, make_transactions(args.rows))
+        print(f"{args.rows:,}행 / {os.path.getsize(path) / 1024 / 1024:.1f}MB / CPU {cores}개")
+        print(f"{'workers':>8} {'time(s)':>9} {'speedup':>8}")
+        print("-" * 27)
+
+        baseline = None
+        expected = None
+        for workers in worker_counts:
+            started = time.perf_counter()
+            result = aggregate_file(path, workers=workers, min_rows=0)
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            expected = expected or result
+            assert result == expected, "워커 수에 따라 결과가 다릅니다"
+            print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# benchmarks/bench_search.py
+# 역할: 메모 검색 속도 비교 (행 전체 부분 문자열 검색 vs DescriptionIndex)
+#
+# 사용법:
+#   python benchmarks/bench_search.py                      # 100만 행, 서로 다른 메모 5만 개
+#   python benchmarks/bench_search.py --rows 200000 --distinct 20000
+#
+# 사이드바 검색어를 한 글자씩 입력하는 상황처럼 접두어를 늘려 가며 검색 시간을 잰다.
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ledger.search import DescriptionIndex, choseong  # noqa: E402
+
+SYLLABLES = "가나다라마바사아자차카타파하강남역삼성수지하철버스택시편의점커피스타벅투썸배달민족쿠팡마트"
+BRANCHES = ["", " 강남점", " 역삼점", " 본점", " 2호점", " 온라인"]
+
+
+def make_descriptions(distinct: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < distinct:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 6)))
+        names.add(name + rng.choice(BRANCHES))
+    return sorted(names)
+
+
+def best_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="메모 검색 속도 비교")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="행 수")
+    parser.add_argument("--distinct", type=int, default=50_000, help="서로 다른 메모 수")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수(가장 빠른 값 사용)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(1)
+    distinct = make_descriptions(args.distinct)
+    rows = [rng.choice(distinct) for _ in range(args.rows)]
+
+    started = time.perf_counter()
+    index = DescriptionIndex.build(rows)
+    print(f"{args.rows:,}행 / 메모 {len(index):,}개, 인덱스 생성 {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    target = distinct[len(distinct) // 2].split(" ")[0]
+    typo = target[:-1] + ("가" if target[-1] != "가" else "나")
+    queries = [target[:n] for n in range(1, len(target) + 1)] + [choseong(target), typo]
+
+    print(f"{'query':<14} {'scan(ms)':>10} {'index(ms)':>10} {'hits':>6}")
+    print("-" * 44)
+    for q in queries:
+        scan = best_ms(lambda: [d for d in rows if q in d], 1)
+        fast = best_ms(lambda: index.search(q), args.repeat)
+        print(f"{q:<14} {scan:>10.1f} {fast:>10.2f} {len(index.search(q)):>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,116 @@
 # ledger/__init__.py
 # 역할: ledger 패키지 초기화 및 주요 클래스/함수 export
+# 하위 모듈은 실제로 처음 사용할 때 import 한다 (module __getattr__, PEP 562)
+# -> `import ledger`나 `from ledger.utils import ...`가 다른 모듈까지 끌어오지 않아 시작이 빠르다.
 
-from .models import Transaction, validate_transaction_dict
-from .repository import load_transactions, save_transactions
-from .services import (
-    calc_summary,
-    calc_detailed_summary,
-    calc_category_expense,
-    calc_budget_status,
-    filter_transactions_by_period,
-    filter_transactions_by_type,
-    filter_transactions_by_category,
-    search_transactions,
-    get_top_expense_categories,
-)
-from .utils import format_currency, parse_date, validate_amount, get_month_range
-
-__all__ = [
+import importlib
+
+# export 이름 -> 정의된 하위 모듈
+_EXPORTS = {
     # Models
-    "Transaction",
-    "validate_transaction_dict",
+    "Transaction": "models",
+    "validate_transaction_dict": "models",
     # Repository
-    "load_transactions",
-    "save_transactions",
+    "load_transactions": "repository",
+    "save_transactions": "repository",
+    "iter_transactions": "repository",
+    "append_transactions": "repository",
+    "load_transactions_range": "repository",
+    "export_transactions": "repository",
+    "export_monthly_report": "repository",
+    # Store
+    "LedgerStore": "store",
+    "VersionConflictError": "store",
+    "get_store": "store",
+    # Checkpoint
+    "LedgerCheckpoint": "checkpoint",
+    "load_checkpoint": "checkpoint",
+    # Importer
+    "ImportResult": "importer",
+    "import_statement": "importer",
+    # Categorize
+    "Categorizer": "categorize",
+    "recategorize": "categorize",
+    # Dedupe
+    "find_duplicates": "dedupe",
+    "remove_duplicates": "dedupe",
+    # Validation
+    "ValidationReport": "validation",
+    "QualityMonitor": "validation",
+    "validate_transactions": "validation",
+    "load_validated": "validation",
     # Services
-    "calc_summary",
-    "calc_detailed_summary",
-    "calc_category_expense",
-    "calc_budget_status",
-    "filter_transactions_by_period",
-    "filter_transactions_by_type",
-    "filter_transactions_by_category",
-    "search_transactions",
-    "get_top_expense_categories",
+    "calc_summary": "services",
+    "calc_detailed_summary": "services",
+    "calc_category_expense": "services",
+    "calc_budget_status": "services",
+    "filter_transactions_by_period": "services",
+    "filter_transactions_by_type": "services",
+    "filter_transactions_by_category": "services",
+    "search_transactions": "services",
+    "get_top_expense_categories": "services",
+    "calc_expense_distribution": "services",
+    "calc_category_month_pivot": "services",
+    "calc_period_summary": "services",
+    "CategoryMonthPivot": "services",
+    "BudgetMonitor": "services",
+    "BudgetEvent": "services",
+    # Forecast (월말 예측)
+    "forecast_month_end": "forecast",
+    "DailySpendIndex": "forecast",
+    # Recurring (반복 거래)
+    "detect_recurring": "recurring",
+    "materialize_upcoming": "recurring",
+    "RecurringPattern": "recurring",
+    "RecurringDetector": "recurring",
+    # Search (메모 검색 인덱스)
+    "DescriptionIndex": "search",
+    "choseong": "search",
+    # Sketches
+    "KLLSketch": "sketches",
+    "SpendingDistribution": "sketches",
+    "HyperLogLog": "sketches",
+    # Approx (근사 집계 모드)
+    "ApproxLedger": "approx",
+    "ApproxSummary": "approx",
+    "Estimate": "approx",
+    # FX (외화 환산)
+    "FxRateTable": "fx",
+    "MissingRateError": "fx",
+    "convert_transactions": "fx",
+    "convert_available": "fx",
+    "amount_in": "fx",
+    # Parallel (병렬 집계)
+    "aggregate": "parallel",
+    "aggregate_file": "parallel",
+    # Perf (계측)
+    "timed": "perf",
+    "span": "perf",
     # Utils
-    "format_currency",
-    "parse_date",
-    "validate_amount",
-    "get_month_range",
-]
\ No newline at end of file
+    "format_currency": "utils",
+    "format_currency_many": "utils",
+    "format_currency_compact": "utils",
+    "parse_date": "utils",
+    "validate_amount": "utils",
+    "get_month_range": "utils",
+    "DateDimension": "utils",
+    "DATE_DIMENSION": "utils",
+    "period_key": "utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """처음 접근할 때 하위 모듈을 import하고, 이후에는 모듈 전역에 캐시된 값을 쓴다."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
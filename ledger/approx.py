@@ -0,0 +1,414 @@
+# ledger/approx.py
+# 역할: 아주 긴 기간(수년치, 수천만 행) 요약을 바로 보여주는 근사 집계 모드 (층화 표본 + 오차 범위)
+#
+# - 층(stratum) = 월. 날짜 인덱스(<파일>.idx)에 날짜별 바이트 구간과 행 수가 있으므로
+#   월별 행 수는 파일을 읽지 않고도 정확히 안다
+# - 표본 단위 = 인덱스의 구간(같은 날짜의 연속된 행 묶음, 날짜순 파일이면 하루치).
+#   월마다 구간을 무작위 순서로 읽어 parallel.LedgerAggregate로 집계하고
+#   비율 추정(ratio estimator)으로 월 합계를 추정한다: 월 합계 ≈ 월 행 수 × (읽은 합계 / 읽은 행 수)
+# - 카테고리는 읽기 전에는 모르므로 월 안에서 사후 층화한다 (카테고리별 합계도 같은 방식으로 추정)
+# - 오차 범위 = 95% 신뢰구간 반폭 (1.96 × 표준오차, 유한 모집단 보정 포함). 월끼리는 독립이라 분산을 더한다
+# - 점진적 정밀화: refine()은 시간 예산 안에서 "구간 1개를 더 읽으면 분산이 가장 많이 줄어드는 월"부터 읽고
+#   중간 결과를 계속 내준다. 모든 구간을 읽으면 오차 0인 정확한 값(services 함수와 같은 결과)이 된다.
+#   읽은 구간의 집계는 보관하므로 다시 호출하면 이어서 정밀해진다 (파일이 바뀌면 처음부터)
+# - 합계는 원화 기준(LedgerAggregate와 같은 규칙): 외화 행은 더하지 않고 건수(foreign_count)만 추정한다
+# - 서로 다른 메모 수는 HyperLogLog(sketches)로 센다 (읽은 행 기준 -> 다 읽으면 전체에 대한 근사)
+# - 압축 파일/비표준 형식은 바이트 위치로 건너뛸 수 없으므로 정확한 값을 한 번에 계산한다
+#
+# 사용 예)
+#   approx = ApproxLedger("data/ledger.csv")
+#   for result in approx.refine("2015-01-01", "2024-12-31", time_budget=0.5):
+#       print(result.expense)   # Estimate(value=..., error=...)
+
+import csv
+import heapq
+import io
+import math
+import mmap
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterator, Optional, Union
+
+from .csv_index import load_or_build_index, read_header
+from .parallel import LedgerAggregate
+from .perf import timed
+from .repository import FIELDNAMES, _parse_row, compression_of, iter_transactions, sniff_dialect
+from .sketches import HyperLogLog
+from .utils import month_key
+
+Z_95 = 1.96  # 95% 신뢰구간
+DEFAULT_TIME_BUDGET = 0.5  # 초
+DEFAULT_YIELD_INTERVAL = 0.1  # 중간 결과를 내주는 간격(초)
+MIN_CLUSTERS = 2  # 월마다 처음에 꼭 읽는 구간 수 (분산 계산에 2개 필요)
+METRICS = ("income", "expense", "income_count", "expense_count", "foreign_count")
+
+_MASK64 = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """근사값 + 95% 신뢰구간 반폭"""
+
+    value: float
+    error: float = 0.0
+    exact: bool = False
+
+    @property
+    def low(self) -> float:
+        return self.value - self.error
+
+    @property
+    def high(self) -> float:
+        return self.value + self.error
+
+    @property
+    def relative_error(self) -> float:
+        return self.error / abs(self.value) if self.value else 0.0
+
+
+@dataclass
+class ApproxSummary:
+    """근사 요약 (services.calc_detailed_summary / calc_category_expense에 대응)"""
+
+    income: Estimate
+    expense: Estimate
+    income_count: Estimate
+    expense_count: Estimate
+    category_expense: dict[str, Estimate] = field(default_factory=dict)  # 지출 큰 순
+    distinct_descriptions: Optional[Estimate] = None
+    rows_read: int = 0
+    rows_total: int = 0
+    foreign_count: Estimate = Estimate(0.0, 0.0, True)  # 합계에서 뺀 외화 행 수 (0보다 크면 화면에 표시)
+
+    @property
+    def complete(self) -> bool:
+        """모든 행을 읽었는지 (True면 오차 0인 정확한 값)"""
+        return self.rows_read >= self.rows_total
+
+    @property
+    def fraction(self) -> float:
+        """읽은 행 비율"""
+        return self.rows_read / self.rows_total if self.rows_total else 1.0
+
+    @property
+    def balance(self) -> Estimate:
+        """잔액 (수입/지출 오차를 독립으로 보고 합친 보수적 범위)"""
+        return Estimate(
+            self.income.value - self.expense.value,
+            math.hypot(self.income.error, self.expense.error),
+            self.income.exact and self.expense.exact,
+        )
+
+    def summary(self) -> tuple[int, int, int]:
+        """calc_summary와 같은 (총수입, 총지출, 잔액) - 반올림한 추정값"""
+        income, expense = round(self.income.value), round(self.expense.value)
+        return income, expense, income - expense
+
+
+def _priority(offset: int, seed: int) -> int:
+    """구간 읽는 순서 (바이트 위치의 해시 = 재현 가능한 무작위 순서, splitmix64)"""
+    z = (offset + (seed + 1) * 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _values(agg: LedgerAggregate) -> dict:
+    """구간 집계 -> {지표: 값} (카테고리 지출은 ("category", 이름) 키)"""
+    values = {name: getattr(agg, name) for name in METRICS}
+    for category, amount in agg.category_expense.items():
+        values[("category", category)] = amount
+    return values
+
+
+class _Cluster:
+    """읽은 구간 1개의 집계 (행 수, 지표별 값, 메모 HyperLogLog 레지스터)"""
+
+    __slots__ = ("rows", "values", "descriptions")
+
+    def __init__(self, rows: int, values: dict, descriptions: dict[int, int]):
+        self.rows = rows
+        self.values = values
+        self.descriptions = descriptions
+
+
+class _Stratum:
+    """
+    월 1개: 구간 목록(읽는 순서대로)과 지금까지 읽은 구간들의 합/제곱합
+
+    표본 = 읽는 순서의 앞에서부터 taken개 (무작위 순서의 앞부분 = 단순 무작위 표본)
+    """
+
+    def __init__(self, spans: list[list[int]], seed: int):
+        self.spans = sorted(spans, key=lambda span: _priority(span[0], seed))
+        self.clusters = len(self.spans)  # 전체 구간 수
+        self.rows = sum(span[2] for span in spans)  # 전체 행 수
+        self.taken = 0
+        self.n = 0  # 읽은 행 수
+        self.n_sq = 0  # 구간 행 수 제곱합
+        self.sums: dict = {}  # 지표 -> [합, 제곱합, 행 수와의 곱의 합]
+
+    @property
+    def complete(self) -> bool:
+        return self.taken >= self.clusters
+
+    def take(self, cluster: _Cluster) -> None:
+        rows = cluster.rows
+        self.taken += 1
+        self.n += rows
+        self.n_sq += rows * rows
+        for key, value in cluster.values.items():
+            acc = self.sums.get(key)
+            if acc is None:
+                acc = self.sums[key] = [0, 0, 0]
+            acc[0] += value
+            acc[1] += value * value
+            acc[2] += value * rows
+
+    def estimate(self, key) -> tuple[float, float]:
+        """지표 1개의 (월 합계 추정, 분산)"""
+        total, total_sq, cross = self.sums.get(key, (0, 0, 0))
+        if self.complete:
+            return total, 0.0
+        if self.n == 0:
+            return 0.0, 0.0
+        m, big_m = self.taken, self.clusters
+        ratio = total / self.n
+        value = self.rows * ratio
+        if m < 2:
+            return value, value * value  # 분산을 알 수 없음 -> 추정값만큼의 오차로 본다
+        # 잔차 e_c = t_c - ratio × n_c 의 표본 분산
+        s2 = max(0.0, (total_sq - 2 * ratio * cross + ratio * ratio * self.n_sq) / (m - 1))
+        return value, big_m * big_m * (1 - m / big_m) * s2 / m
+
+    def gain(self) -> float:
+        """구간 1개를 더 읽었을 때 지출 합계 분산이 줄어드는 양 (어림)"""
+        if self.complete:
+            return -1.0
+        if self.taken < MIN_CLUSTERS:
+            return math.inf
+        _, variance = self.estimate("expense")
+        m, big_m = self.taken, self.clusters
+        return variance / (1 - m / big_m) / (m + 1)
+
+
+class ApproxLedger:
+    """
+    가계부 CSV 파일의 근사 집계기 (읽은 구간 집계를 보관해서 호출할수록 정밀해진다)
+
+    Args:
+        file_path: 가계부 CSV 경로
+        seed: 구간 읽는 순서 시드
+        hll_precision: 메모 종류 수 HyperLogLog 정밀도
+    """
+
+    def __init__(self, file_path: str, seed: int = 0, hll_precision: int = 12):
+        self.file_path = file_path
+        self.seed = seed
+        self.hll_precision = hll_precision
+        self._hll = HyperLogLog(hll_precision)  # 해시 계산용 (레지스터는 구간별로 따로 보관)
+        self._stamp: Optional[tuple[int, int]] = None
+        self._index = None
+        self._fieldnames: list[str] = []
+        self._clusters: dict[int, _Cluster] = {}  # 구간 시작 위치 -> 읽은 집계
+        self._lock = threading.Lock()
+
+    def _sync(self) -> Optional[tuple[int, int]]:
+        """
+        인덱스 최신화 (파일이 바뀌면 보관한 집계를 버린다)
+
+        Returns:
+            파일 상태 (크기, 수정 시각) - 바이트 구간으로 읽을 수 없는 파일(압축/비표준 형식)이면 None
+        """
+        if compression_of(self.file_path):
+            return None
+        dialect = sniff_dialect(self.file_path)
+        if dialect is None or not dialect.is_standard:
+            return None
+        st = os.stat(self.file_path)
+        with self._lock:
+            if self._stamp != (st.st_size, st.st_mtime_ns):
+                self._index = load_or_build_index(self.file_path)
+                with open(self.file_path, "rb") as f:
+                    self._fieldnames, _ = read_header(f)
+                self._clusters.clear()
+                self._stamp = (st.st_size, st.st_mtime_ns)
+            return self._stamp
+
+    def _cached(self, offset: int) -> bool:
+        return offset in self._clusters
+
+    def _read(self, mm, span: list[int], stamp: tuple[int, int]) -> _Cluster:
+        offset, length, _rows = span
+        cluster = self._clusters.get(offset)
+        if cluster is not None:
+            return cluster
+        text = mm[offset:offset + length].decode("utf-8")
+        rows = [
+            tx for tx in (_parse_row(dict(zip(self._fieldnames, values))) for values in csv.reader(io.StringIO(text)))
+            if tx is not None
+        ]
+        agg = LedgerAggregate().update(rows)
+        cluster = _Cluster(len(rows), _values(agg), self._hll.sparse(t["description"] for t in rows))
+        with self._lock:
+            if self._stamp == stamp:  # 읽는 도중 파일이 바뀌었으면 보관하지 않는다
+                self._clusters[offset] = cluster
+        return cluster
+
+    def _strata(self, start: str, end: str) -> dict[str, _Stratum]:
+        months: dict[str, list[list[int]]] = {}
+        for key, spans in self._index.entries.items():
+            if start <= key <= end:
+                months.setdefault(month_key(key) or key, []).extend(spans)  # 날짜가 아닌 키는 따로 한 층
+        return {month: _Stratum(spans, self.seed) for month, spans in months.items()}
+
+    @staticmethod
+    def _result(strata: dict[str, _Stratum], distinct: HyperLogLog, rows_read: int) -> ApproxSummary:
+        complete = all(s.complete for s in strata.values())
+
+        def combine(key) -> Estimate:
+            value, variance = 0, 0.0
+            for stratum in strata.values():
+                v, var = stratum.estimate(key)
+                value += v
+                variance += var
+            if complete:
+                return Estimate(value, 0.0, True)
+            return Estimate(value, Z_95 * math.sqrt(variance))
+
+        categories = {key[1] for s in strata.values() for key in s.sums if isinstance(key, tuple)}
+        category_expense = {c: combine(("category", c)) for c in categories}
+        count = distinct.count()
+        return ApproxSummary(
+            income=combine("income"),
+            expense=combine("expense"),
+            income_count=combine("income_count"),
+            expense_count=combine("expense_count"),
+            category_expense=dict(sorted(category_expense.items(), key=lambda kv: kv[1].value, reverse=True)),
+            distinct_descriptions=Estimate(count, Z_95 * distinct.relative_error * count),
+            rows_read=rows_read,
+            rows_total=sum(s.rows for s in strata.values()),
+            foreign_count=combine("foreign_count"),
+        )
+
+    def _exact(self, start: str, end: str) -> ApproxSummary:
+        """바이트 구간으로 읽을 수 없는 파일: 스트리밍으로 전부 읽어서 정확한 값"""
+        agg = LedgerAggregate()
+        distinct = HyperLogLog(self.hll_precision)
+        for chunk in iter_transactions(self.file_path):
+            rows = [t for t in chunk if start <= t["date"] <= end]
+            agg.update(rows)
+            distinct.update(t["description"] for t in rows)
+        count = distinct.count()
+        return ApproxSummary(
+            income=Estimate(agg.income, 0.0, True),
+            expense=Estimate(agg.expense, 0.0, True),
+            income_count=Estimate(agg.income_count, 0.0, True),
+            expense_count=Estimate(agg.expense_count, 0.0, True),
+            category_expense={
+                c: Estimate(v, 0.0, True)
+                for c, v in sorted(agg.category_expense.items(), key=lambda kv: kv[1], reverse=True)
+            },
+            distinct_descriptions=Estimate(count, Z_95 * distinct.relative_error * count),
+            rows_read=agg.rows,
+            rows_total=agg.rows,
+            foreign_count=Estimate(agg.foreign_count, 0.0, True),
+        )
+
+    def refine(
+        self,
+        start_date: Union[str, date, None] = None,
+        end_date: Union[str, date, None] = None,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        yield_interval: float = DEFAULT_YIELD_INTERVAL,
+    ) -> Iterator[ApproxSummary]:
+        """
+        기간 요약을 점점 정밀하게 내준다
+
+        월마다 MIN_CLUSTERS개 구간을 읽은 첫 결과는 시간 예산과 관계없이 내주고,
+        이후 시간 예산이 남아 있는 동안 yield_interval마다 중간 결과를, 마지막에 최종 결과를 내준다.
+        모든 구간을 읽으면 바로 끝난다 (마지막 결과가 정확한 값).
+
+        Args:
+            start_date, end_date: 기간 (None이면 처음/끝까지, load_transactions_range와 같은 규칙)
+            time_budget: 이 호출에서 쓸 시간(초)
+            yield_interval: 중간 결과 간격(초)
+        """
+        start = str(start_date) if start_date else ""
+        end = str(end_date) if end_date else "9999-12-31"
+        deadline = time.perf_counter() + time_budget
+
+        empty = self._result({}, HyperLogLog(self.hll_precision), 0)
+        if not os.path.exists(self.file_path) or os.path.getsize(self.file_path) == 0:
+            yield empty
+            return
+        stamp = self._sync()
+        if stamp is None:
+            yield self._exact(start, end)
+            return
+        if [c for c in FIELDNAMES if c not in self._fieldnames]:
+            yield empty  # 컬럼 누락이면 로드 실패(load_transactions와 같은 규칙)
+            return
+        strata = self._strata(start, end)
+        if not strata:
+            yield empty
+            return
+
+        distinct = HyperLogLog(self.hll_precision)
+        rows_read = 0
+        with open(self.file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+
+            def take(stratum: _Stratum) -> None:
+                nonlocal rows_read
+                cluster = self._read(mm, stratum.spans[stratum.taken], stamp)
+                stratum.take(cluster)
+                distinct.merge_sparse(cluster.descriptions)
+                rows_read += cluster.rows
+
+            def take_cached(stratum: _Stratum) -> None:
+                # 이미 읽어 둔 구간은 공짜로 표본에 넣는다 (읽는 순서의 앞부분인 동안)
+                while not stratum.complete and self._cached(stratum.spans[stratum.taken][0]):
+                    take(stratum)
+
+            for stratum in strata.values():
+                take_cached(stratum)
+                while stratum.taken < min(MIN_CLUSTERS, stratum.clusters):
+                    take(stratum)
+                    take_cached(stratum)
+
+            heap = [(-s.gain(), month) for month, s in strata.items() if not s.complete]
+            heapq.heapify(heap)
+            yield self._result(strata, distinct, rows_read)
+
+            reported = rows_read
+            next_yield = time.perf_counter() + yield_interval
+            while heap and time.perf_counter() < deadline:
+                _, month = heapq.heappop(heap)
+                stratum = strata[month]
+                take(stratum)
+                take_cached(stratum)
+                if not stratum.complete:
+                    heapq.heappush(heap, (-stratum.gain(), month))
+                if heap and time.perf_counter() >= next_yield:
+                    yield self._result(strata, distinct, rows_read)
+                    reported = rows_read
+                    next_yield = time.perf_counter() + yield_interval
+
+        if rows_read != reported:  # 마지막으로 내준 결과 이후 더 읽었으면 최종 결과
+            yield self._result(strata, distinct, rows_read)
+
+    @timed("approx.estimate")
+    def estimate(
+        self,
+        start_date: Union[str, date, None] = None,
+        end_date: Union[str, date, None] = None,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+    ) -> ApproxSummary:
+        """시간 예산 안에서 가장 정밀한 결과 1개"""
+        result = None
+        for result in self.refine(start_date, end_date, time_budget, yield_interval=math.inf):
+            pass
+        return result
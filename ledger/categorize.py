@@ -0,0 +1,229 @@
+# ledger/categorize.py
+# 역할: 규칙 기반 자동 분류 (메모 키워드 / 금액 범위 / 구분 -> 카테고리)
+#
+# 모든 규칙의 키워드를 Aho–Corasick 오토마톤 1개로 컴파일해서,
+# 메모 한 줄을 한 번만 훑으면 어떤 규칙의 키워드가 들어있는지 한꺼번에 찾는다.
+# (규칙 수와 상관없이 메모 길이에 비례 -> 100만 행도 한 번의 선형 패스로 분류)
+#
+# 규칙 파일(JSON) 예:
+#   [{"category": "교통", "keywords": ["지하철", "버스", "택시"]},
+#    {"category": "생활", "keywords": ["마트"], "type": "지출", "min_amount": 50000}]
+#   - 위에 있는 규칙이 우선
+#   - keywords가 비어 있으면 금액/구분 조건만으로 판단
+
+import json
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .perf import timed
+
+DEFAULT_RULES_PATH = "data/category_rules.json"
+FALLBACK_CATEGORY = "기타"
+MAX_CACHED_DESCRIPTIONS = 100_000  # 메모별 매칭 결과 캐시 상한
+
+# 규칙 파일이 없을 때 쓰는 기본 규칙 (앱의 기본 카테고리 기준)
+DEFAULT_RULES = [
+    {"category": "식비", "keywords": ["점심", "저녁", "아침", "식당", "카페", "커피", "배달", "편의점", "베이커리"]},
+    {"category": "교통", "keywords": ["지하철", "버스", "택시", "주유", "교통", "톨게이트", "ktx", "srt"]},
+    {"category": "통신", "keywords": ["통신", "휴대폰", "핸드폰", "인터넷", "skt", "lg u+"]},
+    {"category": "생활", "keywords": ["마트", "관리비", "전기", "가스", "수도", "다이소", "세탁"]},
+]
+
+
+@dataclass
+class Rule:
+    """분류 규칙 1개"""
+
+    category: str
+    keywords: tuple[str, ...] = ()
+    type: Optional[str] = None  # "지출"/"수입" (None이면 상관없음)
+    min_amount: Optional[int] = None  # 이상
+    max_amount: Optional[int] = None  # 이하
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Rule":
+        if not str(data.get("category", "")).strip():
+            raise ValueError(f"규칙에 category가 없습니다: {data}")
+        return cls(
+            category=str(data["category"]).strip(),
+            keywords=tuple(str(k) for k in data.get("keywords", ()) if str(k).strip()),
+            type=data.get("type") or None,
+            min_amount=data.get("min_amount"),
+            max_amount=data.get("max_amount"),
+        )
+
+    def accepts(self, tx: dict) -> bool:
+        """키워드 외 조건(구분/금액)을 만족하는지"""
+        if self.type is not None and tx.get("type") != self.type:
+            return False
+        amount = tx.get("amount", 0)
+        if self.min_amount is not None and amount < self.min_amount:
+            return False
+        if self.max_amount is not None and amount > self.max_amount:
+            return False
+        return True
+
+
+class _Automaton:
+    """Aho–Corasick 다중 패턴 검색 (패턴 -> 규칙 번호들)"""
+
+    def __init__(self, patterns: Iterable[tuple[str, int]]):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[frozenset[int]] = [frozenset()]
+
+        outputs: list[set[int]] = [set()]
+        for pattern, rule_id in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(rule_id)
+
+        # 실패 링크: BFS 순서로 "가장 긴 접미사 상태"를 연결하고 출력도 합친다
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                outputs[nxt] |= outputs[self.fail[nxt]]
+        self.out = [frozenset(o) for o in outputs]
+
+    def search(self, text: str) -> set[int]:
+        """text에 들어있는 모든 패턴의 규칙 번호"""
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        found: set[int] = set()
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+class Categorizer:
+    """규칙 목록을 컴파일한 분류기"""
+
+    def __init__(self, rules: Iterable[Rule | dict]):
+        self.rules = [r if isinstance(r, Rule) else Rule.from_dict(r) for r in rules]
+        self._automaton = _Automaton(
+            (keyword.casefold(), i) for i, rule in enumerate(self.rules) for keyword in rule.keywords
+        )
+        self._always = [i for i, rule in enumerate(self.rules) if not rule.keywords]
+        self._matches: dict[str, tuple[int, ...]] = {}  # 메모 -> 후보 규칙 (같은 메모가 많아서 캐시)
+
+    def _candidates(self, description: str) -> tuple[int, ...]:
+        cached = self._matches.get(description)
+        if cached is None:
+            found = self._automaton.search(description.casefold())
+            cached = tuple(sorted(found.union(self._always)))
+            if len(self._matches) >= MAX_CACHED_DESCRIPTIONS:
+                self._matches.clear()
+            self._matches[description] = cached
+        return cached
+
+    def categorize(self, tx: dict) -> Optional[str]:
+        """
+        거래 1건의 카테고리 추천
+
+        Returns:
+            조건을 만족하는 첫 번째 규칙의 카테고리 (없으면 None)
+        """
+        for i in self._candidates(str(tx.get("description", ""))):
+            if self.rules[i].accepts(tx):
+                return self.rules[i].category
+        return None
+
+
+def load_rules(file_path: Optional[str] = None) -> list[Rule]:
+    """
+    규칙 파일(JSON) 읽기
+
+    Args:
+        file_path: 규칙 파일 경로 (None이면 DEFAULT_RULES_PATH, 파일이 없으면 DEFAULT_RULES)
+
+    Returns:
+        Rule 목록
+    """
+    path = file_path or DEFAULT_RULES_PATH
+    if not os.path.exists(path):
+        if file_path:
+            raise FileNotFoundError(f"규칙 파일이 없습니다: {file_path}")
+        return [Rule.from_dict(r) for r in DEFAULT_RULES]
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("rules", [])
+    return [Rule.from_dict(r) for r in data]
+
+
+@dataclass
+class CategoryChange:
+    """자동 분류로 바뀐 행 1개"""
+
+    index: int  # 원래 목록에서의 위치
+    old: str
+    new: str
+    description: str
+
+
+@dataclass
+class RecategorizeResult:
+    """일괄 재분류 결과"""
+
+    rows: list[dict] = field(default_factory=list)  # 재분류가 반영된 전체 목록 (바뀐 행만 새 dict)
+    changes: list[CategoryChange] = field(default_factory=list)
+
+    @property
+    def updates(self) -> dict[int, dict]:
+        """{위치: 새 행} (LedgerStore.update에 그대로 넘길 수 있음)"""
+        return {c.index: self.rows[c.index] for c in self.changes}
+
+
+@timed("categorize.recategorize")
+def recategorize(
+    transactions: list[dict],
+    categorizer: Optional[Categorizer] = None,
+    targets: Optional[Iterable[str]] = (FALLBACK_CATEGORY, ""),
+) -> RecategorizeResult:
+    """
+    거래 목록을 규칙으로 일괄 재분류
+
+    Args:
+        transactions: 거래 목록 (변경하지 않음)
+        categorizer: 분류기 (None이면 load_rules()의 기본 규칙)
+        targets: 이 카테고리인 행만 다시 분류 (None이면 전체)
+
+    Returns:
+        RecategorizeResult (바뀐 행 목록 포함)
+    """
+    categorizer = categorizer or Categorizer(load_rules())
+    target_set = None if targets is None else set(targets)
+    result = RecategorizeResult(rows=list(transactions))
+
+    for i, tx in enumerate(transactions):
+        old = str(tx.get("category", "")).strip()
+        if target_set is not None and old not in target_set:
+            continue
+        new = categorizer.categorize(tx)
+        if new is None or new == old:
+            continue
+        result.rows[i] = {**tx, "category": new}
+        result.changes.append(CategoryChange(index=i, old=old, new=new, description=str(tx.get("description", ""))))
+
+    return result
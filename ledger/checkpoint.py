@@ -0,0 +1,250 @@
+# ledger/checkpoint.py
+# 역할: 파싱된 가계부를 바이너리 스냅샷(<파일>.ckpt)으로 저장/복원
+# 시작할 때마다 CSV 전체를 다시 파싱하지 않도록 한다.
+# (집계/정렬은 저장소를 쓰는 쪽이 변경분으로 관리한다 - services.BudgetMonitor, CategoryMonthPivot 등)
+#
+# 시작 시 동작 (load_checkpoint):
+#   - 스냅샷의 원본 지문(fingerprint)이 현재 파일과 같으면 -> 그대로 사용 ("hit")
+#   - 파일이 뒤에만 늘어났으면(앞부분 지문 일치) -> 늘어난 바이트만 파싱해서 반영 ("replayed")
+#   - 그 외(중간 수정, 전체 재저장, 스냅샷 없음/깨짐) -> 전체 다시 만들기 ("rebuilt")
+#
+# 스냅샷 형식: pickle (표준 라이브러리, 로컬 파일 전용 - 신뢰할 수 없는 .ckpt 파일은 읽지 말 것)
+
+import csv
+import hashlib
+import io
+import os
+import pickle
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .perf import count, timed
+from .repository import (
+    CSV_FIELDNAMES,
+    CURRENCY_FIELD,
+    DEFAULT_CURRENCY,
+    FIELDNAMES,
+    _parse_row,
+    compression_of,
+    currency_of,
+    load_transactions,
+    sniff_dialect,
+)
+
+CHECKPOINT_SUFFIX = ".ckpt"
+CHECKPOINT_FORMAT = 3  # 2: 외화 거래 통화(currencies) 추가, 3: 쓰지 않는 정렬 인덱스/집계 제거
+SAMPLE_BYTES = 64 * 1024  # 지문 계산에 쓰는 앞/뒤 구간 크기
+
+
+def checkpoint_path(file_path: str) -> str:
+    """CSV 경로 -> 스냅샷 경로"""
+    return f"{file_path}{CHECKPOINT_SUFFIX}"
+
+
+def fingerprint(file_path: str, size: Optional[int] = None) -> dict:
+    """
+    파일 앞부분(0 ~ size 바이트)의 지문
+
+    전체를 해시하지 않고 처음/끝 SAMPLE_BYTES만 해시한다 (덧붙이기 감지용으로 충분하고 빠름).
+
+    Returns:
+        {"size": 크기, "mtime_ns": 수정 시각, "sample": 앞/뒤 구간 sha256}
+    """
+    st = os.stat(file_path)
+    size = st.st_size if size is None else size
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        digest.update(f.read(min(size, SAMPLE_BYTES)))
+        if size > SAMPLE_BYTES:
+            f.seek(max(SAMPLE_BYTES, size - SAMPLE_BYTES))
+            digest.update(f.read(size - f.tell()))
+    return {"size": size, "mtime_ns": st.st_mtime_ns, "sample": digest.hexdigest()}
+
+
+@dataclass
+class LedgerCheckpoint:
+    """
+    컬럼 형태의 가계부
+
+    - columns: {"date": [...], "type": [...], ...} (파일 순서)
+    - currencies: {행 위치: 통화 코드} (외화 거래만, 대부분 원화라 따로 적는다)
+    - source: 스냅샷을 만든 원본 파일 지문
+    - status: 이번 로드 결과 "hit" | "replayed" | "rebuilt" (저장되지 않음)
+    """
+
+    columns: dict = field(default_factory=lambda: {name: [] for name in FIELDNAMES})
+    currencies: dict = field(default_factory=dict)
+    source: dict = field(default_factory=dict)
+    status: str = "rebuilt"
+
+    def __len__(self) -> int:
+        return len(self.columns["date"])
+
+    def rows(self) -> list[dict]:
+        """파일 순서의 거래 dict 목록"""
+        rows = [dict(zip(FIELDNAMES, values)) for values in zip(*(self.columns[name] for name in FIELDNAMES))]
+        for i, currency in self.currencies.items():
+            rows[i][CURRENCY_FIELD] = currency
+        return rows
+
+    def extend(self, transactions: list[dict]) -> None:
+        """거래를 뒤에 추가"""
+        start = len(self)
+        for name in FIELDNAMES:
+            self.columns[name].extend(t[name] for t in transactions)
+        for i, t in enumerate(transactions, start):
+            if t.get(CURRENCY_FIELD):
+                currency = currency_of(t)
+                if currency != DEFAULT_CURRENCY:
+                    self.currencies[i] = currency  # 외화 거래만 위치를 적는다
+
+    def save(self, file_path: str) -> None:
+        """<파일>.ckpt로 저장 (임시 파일에 쓴 뒤 교체)"""
+        data = {
+            "format": CHECKPOINT_FORMAT,
+            "source": self.source,
+            "columns": self.columns,
+            "currencies": self.currencies,
+        }
+        tmp_path = checkpoint_path(file_path) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, checkpoint_path(file_path))
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional["LedgerCheckpoint"]:
+        """<파일>.ckpt 읽기 (없거나 깨졌으면 None)"""
+        try:
+            with open(checkpoint_path(file_path), "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("format") != CHECKPOINT_FORMAT:
+            return None
+        return cls(
+            columns=data["columns"],
+            currencies=data["currencies"],
+            source=data["source"],
+            status="hit",
+        )
+
+
+def _parse_bytes(data: bytes, fieldnames: Optional[list[str]] = None) -> list[dict]:
+    """
+    CSV 바이트 -> 거래 목록
+
+    fieldnames를 주면 헤더 없는 조각(덧붙인 부분)으로 보고 그 컬럼명으로 읽는다.
+    """
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8-sig"), newline=""), fieldnames=fieldnames)
+    if reader.fieldnames is None or any(c not in reader.fieldnames for c in FIELDNAMES):
+        return []
+    return [tx for tx in map(_parse_row, reader) if tx is not None]
+
+
+def _header(data: bytes) -> list[str]:
+    first = data.split(b"\n", 1)[0].decode("utf-8-sig").strip("\r")
+    return next(csv.reader([first]), [])
+
+
+@timed("checkpoint.build")
+def build_checkpoint(file_path: str) -> LedgerCheckpoint:
+    """원본 파일을 처음부터 읽어서 스냅샷을 새로 만든다 (저장은 하지 않음)"""
+    checkpoint = LedgerCheckpoint()
+    if not os.path.exists(file_path):
+        return checkpoint
+
+    dialect = sniff_dialect(file_path)
+    if compression_of(file_path) or dialect is None or not dialect.is_standard:
+        # 압축 파일/비표준 형식은 바이트 단위 덧붙이기 반영을 하지 않으므로 크기/시각만 기록
+        checkpoint.extend(load_transactions(file_path))
+        st = os.stat(file_path)
+        checkpoint.source = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sample": None}
+        return checkpoint
+
+    # 한 번 읽은 바이트로 파싱 + 지문 계산 (읽는 도중 파일이 바뀌어도 둘이 어긋나지 않게)
+    with open(file_path, "rb") as f:
+        data = f.read()
+    checkpoint.extend(_parse_bytes(data))
+    checkpoint.source = fingerprint(file_path, size=len(data))
+    checkpoint.source["header"] = _header(data)
+    return checkpoint
+
+
+def save_checkpoint(file_path: str, transactions: list[dict]) -> LedgerCheckpoint:
+    """
+    방금 파일에 쓴 거래 목록으로 스냅샷을 만들어 저장 (다시 파싱하지 않음)
+
+    호출자는 transactions가 file_path의 현재 내용과 같음을 보장해야 한다 (파일 잠금 안에서 호출).
+    """
+    checkpoint = LedgerCheckpoint()
+    checkpoint.extend(transactions)
+    if compression_of(file_path):
+        st = os.stat(file_path)
+        checkpoint.source = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sample": None}
+    else:
+        checkpoint.source = fingerprint(file_path)
+        checkpoint.source["header"] = list(CSV_FIELDNAMES)
+    _save_quietly(file_path, checkpoint)
+    return checkpoint
+
+
+def _replay_tail(file_path: str, checkpoint: LedgerCheckpoint) -> bool:
+    """스냅샷 이후 덧붙은 바이트만 읽어서 반영 (앞부분이 바뀌었으면 False)"""
+    source = checkpoint.source
+    if source.get("sample") is None or not source.get("header"):
+        return False
+    if fingerprint(file_path, size=source["size"])["sample"] != source["sample"]:
+        return False
+
+    with open(file_path, "rb") as f:
+        f.seek(source["size"])
+        tail = f.read()
+    checkpoint.extend(_parse_bytes(tail, fieldnames=source["header"]))
+    checkpoint.source = fingerprint(file_path, size=source["size"] + len(tail))
+    checkpoint.source["header"] = source["header"]
+    return True
+
+
+@timed("checkpoint.load")
+def load_checkpoint(file_path: str, save: bool = True) -> LedgerCheckpoint:
+    """
+    스냅샷 + 변경분으로 가계부 상태를 복원
+
+    Args:
+        file_path: 원본 CSV 경로
+        save: 다시 만들었거나 덧붙인 부분을 반영했으면 스냅샷을 갱신 저장할지
+
+    Returns:
+        LedgerCheckpoint (status로 hit/replayed/rebuilt 확인)
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return LedgerCheckpoint()  # 파일 없음(최초 실행)
+
+    checkpoint = LedgerCheckpoint.load(file_path)
+    if checkpoint is not None:
+        source = checkpoint.source
+        if source.get("size") == st.st_size and source.get("mtime_ns") == st.st_mtime_ns:
+            count("checkpoint.hit")
+            return checkpoint
+        if st.st_size > source.get("size", 0) and _replay_tail(file_path, checkpoint):
+            count("checkpoint.replayed")
+            checkpoint.status = "replayed"
+            if save:
+                _save_quietly(file_path, checkpoint)
+            return checkpoint
+
+    count("checkpoint.rebuilt")
+    checkpoint = build_checkpoint(file_path)
+    checkpoint.status = "rebuilt"
+    if save:
+        _save_quietly(file_path, checkpoint)
+    return checkpoint
+
+
+def _save_quietly(file_path: str, checkpoint: LedgerCheckpoint) -> None:
+    try:
+        checkpoint.save(file_path)
+    except OSError:
+        pass  # 스냅샷 저장 실패는 조회에 영향 없음
@@ -0,0 +1,167 @@
+# ledger/csv_index.py
+# 역할: 가계부 CSV의 "날짜 -> 바이트 위치" 사이드카 인덱스(<파일>.idx)
+# 특정 기간만 조회할 때 파일 처음부터 파싱하지 않고 해당 바이트 구간으로 바로 이동하기 위해 사용한다.
+#
+# 인덱스 형식(JSON):
+#   {"format": 1, "size": 파일크기, "mtime_ns": 수정시각, "header_end": 헤더 끝 위치, "date_column": 날짜 컬럼 위치,
+#    "entries": {"2024-01-15": [[offset, length, rows], ...], ...}}
+#   - 같은 날짜의 연속된 행은 구간 1개로 합친다 (날짜순으로 저장된 파일이면 날짜당 구간 1개)
+
+import bisect
+import csv
+import io
+import json
+import os
+from typing import Iterable, Optional
+
+INDEX_SUFFIX = ".idx"
+INDEX_FORMAT = 1
+BOM = b"\xef\xbb\xbf"
+
+
+def index_path(file_path: str) -> str:
+    """CSV 경로 -> 인덱스 경로"""
+    return f"{file_path}{INDEX_SUFFIX}"
+
+
+class DateOffsetIndex:
+    """날짜별 바이트 구간 목록"""
+
+    def __init__(self, header_end: int = 0, date_column: int = 0):
+        self.header_end = header_end
+        self.date_column = date_column
+        self.size = 0
+        self.mtime_ns = 0
+        self.entries: dict[str, list[list[int]]] = {}
+        self._last_key: Optional[str] = None  # 직전 행의 날짜 (연속 구간 합치기용)
+
+    def add(self, key: str, offset: int, length: int) -> None:
+        """행 1개(offset부터 length 바이트)를 key 날짜에 추가"""
+        spans = self.entries.setdefault(key, [])
+        if spans and self._last_key == key and spans[-1][0] + spans[-1][1] == offset:
+            spans[-1][1] += length
+            spans[-1][2] += 1
+        else:
+            spans.append([offset, length, 1])
+        self._last_key = key
+
+    def spans_between(self, start: str, end: str) -> list[list[int]]:
+        """start <= 날짜 <= end 인 구간 목록 (파일 순서대로)"""
+        keys = sorted(self.entries)
+        lo = bisect.bisect_left(keys, start)
+        hi = bisect.bisect_right(keys, end)
+        spans = [span for key in keys[lo:hi] for span in self.entries[key]]
+        return sorted(spans)
+
+    def row_count(self) -> int:
+        return sum(span[2] for spans in self.entries.values() for span in spans)
+
+    def stamp(self, file_path: str) -> None:
+        """현재 파일 크기/수정 시각을 기록 (쓰기 직후 호출)"""
+        st = os.stat(file_path)
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+
+    def matches(self, file_path: str) -> bool:
+        """인덱스가 파일의 현재 상태와 일치하는지"""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+    def save(self, file_path: str) -> None:
+        """<파일>.idx로 저장 (임시 파일에 쓴 뒤 교체)"""
+        data = {
+            "format": INDEX_FORMAT,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "header_end": self.header_end,
+            "date_column": self.date_column,
+            "last_key": self._last_key,
+            "entries": self.entries,
+        }
+        tmp_path = index_path(file_path) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, index_path(file_path))
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional["DateOffsetIndex"]:
+        """<파일>.idx 읽기 (없거나 깨졌으면 None)"""
+        try:
+            with open(index_path(file_path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("format") != INDEX_FORMAT:
+            return None
+
+        index = cls(header_end=data["header_end"], date_column=data["date_column"])
+        index.size = data["size"]
+        index.mtime_ns = data["mtime_ns"]
+        index.entries = data["entries"]
+        index._last_key = data.get("last_key")
+        return index
+
+
+def _iter_records(f, offset: int) -> Iterable[tuple[int, bytes]]:
+    """바이너리 파일에서 CSV 레코드 단위로 (시작 위치, 바이트) 반환 (따옴표 안 줄바꿈 처리)"""
+    pending = b""
+    start = offset
+    for line in f:
+        if not pending:
+            start = offset
+        offset += len(line)
+        pending += line
+        if pending.count(b'"') % 2 == 0:  # 따옴표가 닫혔으면 레코드 끝
+            yield start, pending
+            pending = b""
+    if pending:
+        yield start, pending
+
+
+def date_key(record: bytes, date_column: int) -> str:
+    """레코드 바이트에서 날짜(YYYY-MM-DD) 키 추출"""
+    if b'"' not in record:
+        fields = record.rstrip(b"\r\n").split(b",")
+        value = fields[date_column].decode("utf-8", "replace") if date_column < len(fields) else ""
+    else:
+        fields = next(csv.reader(io.StringIO(record.decode("utf-8", "replace"))), [])
+        value = fields[date_column] if date_column < len(fields) else ""
+    return value.strip()[:10]
+
+
+def read_header(f) -> tuple[list[str], int]:
+    """바이너리 파일 처음에서 헤더 읽기 -> (컬럼명 목록, 헤더 끝 위치)"""
+    f.seek(0)
+    first = f.readline()
+    body = first[len(BOM):] if first.startswith(BOM) else first
+    fieldnames = next(csv.reader(io.StringIO(body.decode("utf-8", "replace"))), [])
+    return [name.strip() for name in fieldnames], len(first)
+
+
+def build_index(file_path: str) -> DateOffsetIndex:
+    """파일을 한 번 훑어서 인덱스를 새로 만든다"""
+    with open(file_path, "rb") as f:
+        fieldnames, header_end = read_header(f)
+        date_column = fieldnames.index("date") if "date" in fieldnames else 0
+        index = DateOffsetIndex(header_end=header_end, date_column=date_column)
+        for offset, record in _iter_records(f, header_end):
+            if record.strip():
+                index.add(date_key(record, date_column), offset, len(record))
+    index.stamp(file_path)
+    return index
+
+
+def load_or_build_index(file_path: str) -> DateOffsetIndex:
+    """저장된 인덱스가 최신이면 그대로, 아니면 다시 만들어 저장"""
+    index = DateOffsetIndex.load(file_path)
+    if index is not None and index.matches(file_path):
+        return index
+    index = build_index(file_path)
+    try:
+        index.save(file_path)
+    except OSError:
+        pass  # 인덱스 저장 실패는 조회에 영향 없음
+    return index
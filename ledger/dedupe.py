@@ -0,0 +1,126 @@
+# ledger/dedupe.py
+# 역할: 중복 거래 찾기 (명세서 재가져오기, "등록" 버튼 두 번 클릭 등)
+#
+# 1) 정규화 키 해시: (날짜, 구분, 금액, 정리한 메모, 통화)가 같으면 중복
+#    - 메모는 유니코드 정규화(NFKC) + 대소문자/공백/문장부호 무시 ("GS25 편의점" == "gs25편의점")
+#    - 카테고리는 키에서 제외 (같은 거래를 다르게 분류한 경우도 중복으로 본다)
+# 2) 기간 정렬-병합(sort-merge): window_days > 0이면 (구분, 금액, 메모)로 정렬한 뒤
+#    날짜가 N일 이내로 이어지는 행을 한 묶음으로 본다 (카드 승인일/매입일 차이 등)
+#
+# 두 방법 모두 O(n log n) 이하 (해시는 O(n), 정렬-병합은 정렬 1번 + 선형 스캔)
+
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable, Optional
+
+from .models import CURRENCY_FIELD, normalize_currency
+from .perf import timed
+
+_STRIP_CATEGORIES = ("Z", "P", "C")  # 공백/문장부호/제어문자
+
+
+def normalize_description(text: str) -> str:
+    """메모 정규화 (비교용)"""
+    text = unicodedata.normalize("NFKC", str(text or "")).casefold()
+    return "".join(ch for ch in text if unicodedata.category(ch)[0] not in _STRIP_CATEGORIES)
+
+
+def dedupe_key(tx: dict) -> tuple:
+    """중복 판정용 키 (날짜, 구분, 금액, 정리한 메모, 통화)"""
+    return (
+        str(tx.get("date", "")).strip()[:10],
+        str(tx.get("type", "")).strip(),
+        int(tx.get("amount", 0)),
+        normalize_description(tx.get("description", "")),
+        normalize_currency(tx.get(CURRENCY_FIELD)),  # 같은 숫자라도 통화가 다르면 다른 거래
+    )
+
+
+@dataclass
+class DuplicateCluster:
+    """중복으로 판단한 거래 묶음"""
+
+    indices: list[int] = field(default_factory=list)  # 원래 목록에서의 위치 (오름차순)
+    key: tuple = ()  # 대표 키 (첫 번째 행 기준)
+
+    @property
+    def keep(self) -> int:
+        """남길 행 (파일에서 가장 앞에 있는 행)"""
+        return self.indices[0]
+
+    @property
+    def extras(self) -> list[int]:
+        """지워도 되는 나머지 행"""
+        return self.indices[1:]
+
+
+def _ordinal(value: str, cache: dict[str, Optional[int]]) -> Optional[int]:
+    # 같은 날짜 문자열이 많으므로 변환 결과를 재사용
+    if value not in cache:
+        try:
+            cache[value] = date.fromisoformat(value).toordinal()
+        except ValueError:
+            cache[value] = None
+    return cache[value]
+
+
+@timed("dedupe.find_duplicates")
+def find_duplicates(transactions: list[dict], window_days: int = 0) -> list[DuplicateCluster]:
+    """
+    중복 거래 묶음 찾기
+
+    Args:
+        transactions: 거래 목록
+        window_days: 0이면 날짜까지 같은 것만, N이면 날짜가 N일 이내로 이어지는 것까지 중복
+
+    Returns:
+        2건 이상인 DuplicateCluster 목록 (첫 행 위치 순)
+    """
+    keys = [dedupe_key(t) for t in transactions]
+
+    if window_days <= 0:
+        # 정확히 같은 키: 해시 그룹핑 O(n)
+        groups: dict[tuple, list[int]] = {}
+        for i, key in enumerate(keys):
+            groups.setdefault(key, []).append(i)
+        clusters = [DuplicateCluster(indices=idx, key=keys[idx[0]]) for idx in groups.values() if len(idx) > 1]
+    else:
+        # 날짜를 뺀 키로 정렬 -> 같은 키 안에서 날짜 간격이 window_days 이하인 동안 같은 묶음
+        cache: dict[str, Optional[int]] = {}
+        days = [_ordinal(key[0], cache) for key in keys]
+        order = sorted(
+            (i for i in range(len(keys)) if days[i] is not None),
+            key=lambda i: (keys[i][1:], days[i], i),
+        )
+
+        clusters = []
+        current: list[int] = []
+        for i in order:
+            prev = current[-1] if current else None
+            if prev is not None and keys[prev][1:] == keys[i][1:] and days[i] - days[prev] <= window_days:
+                current.append(i)
+                continue
+            if len(current) > 1:
+                clusters.append(current)
+            current = [i]
+        if len(current) > 1:
+            clusters.append(current)
+        clusters = [DuplicateCluster(indices=sorted(idx), key=keys[min(idx)]) for idx in clusters]
+
+    clusters.sort(key=lambda c: c.keep)
+    return clusters
+
+
+def remove_duplicates(
+    transactions: list[dict], clusters: Iterable[DuplicateCluster]
+) -> tuple[list[dict], list[int]]:
+    """
+    각 묶음에서 첫 행만 남기고 나머지를 지운다
+
+    Returns:
+        (남은 거래 목록, 지운 행 위치 목록)
+    """
+    removed = sorted({i for c in clusters for i in c.extras})
+    removed_set = set(removed)
+    return [t for i, t in enumerate(transactions) if i not in removed_set], removed
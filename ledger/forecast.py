@@ -0,0 +1,280 @@
+# ledger/forecast.py
+# 역할: 월말 지출 예측 (burn rate) - 예산을 실제로 넘기 전에 "이 추세면 넘는다"를 알려준다
+#
+# 1) 일별 지출 인덱스(DailySpendIndex): 월 -> 일(1~말일) -> 카테고리 벡터
+#    거래를 한 번만 훑어서 만들고, 누적 합계는 날짜 순으로 "카테고리 벡터끼리 더하기"로
+#    모든 카테고리를 한꺼번에 계산한다 (카테고리마다 다시 필터링하지 않음)
+# 2) 예측 방법
+#    "linear"   지금까지 쓴 돈 / 지난 일수 × 말일
+#    "seasonal" 지난 몇 달의 "그 날짜까지 쓴 비율"(월급날/주말 패턴 등)로 나눠서 월말 추정
+#               (카테고리 이력이 없으면 전체 비율, 그것도 없으면 linear)
+# 3) 고정 지출(recurring.detect_recurring의 월 단위 반복 거래) 반영
+#    고정 지출은 burn rate에서 빼고, 이번 달에 아직 안 나간 것은 예상액에 그대로 더한다
+#
+# 금액은 원화 기준: 외화 행은 fx 환율표로 먼저 환산하고, 환율이 없는 행은 예측에서 빼고
+# 이번 달에 빠진 건수를 CategoryForecast.unconverted로 알려준다 (외화 금액을 원화처럼 더하지 않음)
+#
+# 결과는 calc_budget_status로 판정하므로 "경고"(예상 80%)/"초과"(예상 100%) 기준이 예산 관제와 같다.
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Iterable, Optional
+
+from .dedupe import normalize_description
+from .fx import FxRateTable, convert_available
+from .perf import timed
+from .recurring import RecurringPattern, detect_recurring
+from .services import BUDGET_TOTAL, calc_budget_status
+from .utils import DATE_DIMENSION, month_key
+
+DEFAULT_HISTORY_MONTHS = 3  # seasonal 비율을 만들 지난 달 수
+MIN_SEASONAL_FRACTION = 0.05  # 누적 비율이 이보다 작으면(월초) seasonal 대신 linear
+METHODS = ("linear", "seasonal")
+
+
+@dataclass
+class CategoryForecast:
+    """카테고리 1개의 월말 예측"""
+
+    category: str
+    spent: int  # 오늘까지 지출
+    projected: int  # 월말 예상 지출
+    recurring_pending: int  # 이번 달에 아직 안 나간 고정 지출
+    budget: int
+    ratio: float  # 예상 / 예산
+    status: str  # calc_budget_status 기준 ("미설정"/"정상"/"경고"/"초과")
+    message: str
+    method: str  # 실제로 쓴 방법 ("linear"/"seasonal")
+    unconverted: int = 0  # 이번 달 지출 중 환율이 없어 예측에서 뺀 외화 행 수
+
+
+class DailySpendIndex:
+    """
+    월별 일별 지출 인덱스 {월: [1일 벡터, 2일 벡터, ...]}
+
+    벡터는 categories 순서의 금액 리스트이며, 카테고리가 늘어나면 뒤에 붙는다.
+    """
+
+    def __init__(self, transaction_type: str = "지출"):
+        self.transaction_type = transaction_type
+        self.categories: list[str] = []
+        self._position: dict[str, int] = {}
+        self._days: dict[str, list[list[int]]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        transactions: Iterable[dict],
+        months: Optional[Iterable[str]] = None,
+        exclude: Optional[Callable[[dict], bool]] = None,
+        **kwargs,
+    ) -> "DailySpendIndex":
+        """
+        Args:
+            transactions: 거래 목록
+            months: 이 월("YYYY-MM")만 담는다 (None이면 전체)
+            exclude: True를 돌려주는 행은 담지 않는다 (고정 지출 등)
+        """
+        index = cls(**kwargs)
+        wanted = None if months is None else set(months)
+        for t in transactions:
+            if str(t.get("type", "")).strip() != index.transaction_type:
+                continue
+            day = DATE_DIMENSION.info(t.get("date"))
+            if day is None or (wanted is not None and day.month not in wanted):
+                continue
+            if exclude is not None and exclude(t):
+                continue
+            index.add(day.month, day.day, str(t.get("category", "")).strip() or "기타", int(t.get("amount", 0)))
+        return index
+
+    def _slot(self, category: str) -> int:
+        slot = self._position.get(category)
+        if slot is None:
+            slot = self._position[category] = len(self.categories)
+            self.categories.append(category)
+        return slot
+
+    def add(self, month: str, day: int, category: str, amount: int) -> None:
+        slot = self._slot(category)
+        days = self._days.get(month)
+        if days is None:
+            days = self._days[month] = [[] for _ in range(DATE_DIMENSION.days_in_month(month))]
+        if not 1 <= day <= len(days):
+            return
+        vector = days[day - 1]
+        if len(vector) <= slot:
+            vector.extend([0] * (slot + 1 - len(vector)))
+        vector[slot] += amount
+
+    def months(self) -> list[str]:
+        return sorted(self._days)
+
+    def cumulative(self, month: str) -> list[list[int]]:
+        """일별 누적 지출 [일][카테고리] (데이터가 없는 달은 0 벡터들)"""
+        width = len(self.categories)
+        days = self._days.get(month) or [[] for _ in range(DATE_DIMENSION.days_in_month(month))]
+        result = []
+        running = [0] * width
+        for vector in days:
+            if vector:
+                running = [a + b for a, b in zip(running, vector + [0] * (width - len(vector)))]
+            result.append(running)
+        return result
+
+
+def _monthly_recurring(transactions: list[dict], current: str, today: date) -> list[RecurringPattern]:
+    """지난 달까지의 거래에서 찾은, 아직 이어지는 월 단위 지출 반복 거래"""
+    before = [t for t in transactions if (month_key(t.get("date")) or current) < current]
+    return [
+        p for p in detect_recurring(before)
+        if p.type == "지출" and p.period == "monthly" and p.is_active(today)
+    ]
+
+
+def _matcher(patterns: list[RecurringPattern]) -> Callable[[dict], bool]:
+    """행이 반복 거래 중 하나에 해당하는지 (메모로 먼저 추려서 행마다 전체 패턴을 보지 않음)"""
+    by_description: dict[str, list[RecurringPattern]] = {}
+    for p in patterns:
+        by_description.setdefault(normalize_description(p.description), []).append(p)
+
+    def match(t: dict) -> bool:
+        candidates = by_description.get(normalize_description(t.get("description", "")))
+        return bool(candidates) and any(p.matches(t) for p in candidates)
+
+    return match
+
+
+def _forecast_message(status: str, projected: int, budget: int) -> str:
+    if status == "초과":
+        return f"📈 이 추세면 월말에 예산을 {projected - budget:,}원 초과합니다."
+    if status == "경고":
+        return f"⚠️ 이 추세면 월말에 예산의 {projected / budget:.0%}를 씁니다."
+    if status == "정상":
+        return "👍 이 추세면 예산 안에서 마무리됩니다."
+    return "예산을 설정하면 월말 예측 경고를 볼 수 있습니다."
+
+
+@timed("forecast.forecast_month_end")
+def forecast_month_end(
+    transactions: Iterable[dict],
+    today: Optional[date] = None,
+    budgets: Optional[dict] = None,
+    method: str = "seasonal",
+    history_months: int = DEFAULT_HISTORY_MONTHS,
+    fx: Optional[FxRateTable] = None,
+) -> dict[str, CategoryForecast]:
+    """
+    카테고리별 월말 지출 예측
+
+    Args:
+        transactions: 거래 목록 (현재 달 + 지난 history_months개월만 사용)
+        today: 기준일 (이 날까지 지출한 것으로 본다, None이면 오늘)
+        budgets: {"전체": 금액, 카테고리: 금액} (없는 카테고리는 "미설정")
+        method: "linear" 또는 "seasonal"
+        history_months: seasonal 비율을 만들 지난 달 수
+        fx: 외화 행을 원화로 환산할 환율표 (None이면 외화 행은 모두 빠진다)
+
+    Returns:
+        {카테고리: CategoryForecast} - "전체"(BUDGET_TOTAL)는 카테고리 예측의 합
+    """
+    if method not in METHODS:
+        raise ValueError(f"알 수 없는 예측 방법: {method} ({', '.join(METHODS)})")
+    today = today or date.today()
+    budgets = budgets or {}
+    current = month_key(today)
+    history = [DATE_DIMENSION.shift_month(current, -i) for i in range(1, history_months + 1)]
+
+    rows, skipped = convert_available(transactions, fx)
+    unconverted: dict[str, int] = {}
+    for t in skipped:
+        if str(t.get("type", "")).strip() == "지출" and month_key(t.get("date")) == current:
+            category = str(t.get("category", "")).strip() or "기타"
+            unconverted[category] = unconverted.get(category, 0) + 1
+    recurring = _monthly_recurring(rows, current, today)
+    is_recurring = _matcher(recurring)
+
+    # 고정 지출을 뺀 "변동 지출" 인덱스 1개 + 이번 달 실제 지출 인덱스 1개
+    variable = DailySpendIndex.build(rows, months=[current, *history], exclude=is_recurring)
+    actual = DailySpendIndex.build(rows, months=[current])
+
+    day = min(today.day, DATE_DIMENSION.days_in_month(current))
+    days_total = DATE_DIMENSION.days_in_month(current)
+    categories = list(
+        dict.fromkeys([*variable.categories, *actual.categories, *(p.category for p in recurring), *unconverted])
+    )
+
+    def vector(index: DailySpendIndex, month: str, at_day: int) -> list[int]:
+        cum = index.cumulative(month)
+        values = cum[min(at_day, len(cum)) - 1] if cum else []
+        lookup = dict(zip(index.categories, values))
+        return [lookup.get(c, 0) for c in categories]
+
+    spent = vector(actual, current, day)
+    variable_spent = vector(variable, current, day)
+
+    # seasonal 비율: Σ(지난 달 그 날짜까지 누적) / Σ(지난 달 합계) - 모든 카테고리를 벡터로 한 번에
+    part = [0] * len(categories)
+    whole = [0] * len(categories)
+    for month in history:
+        d = DATE_DIMENSION.days_in_month(month)
+        part = [a + b for a, b in zip(part, vector(variable, month, min(day, d)))]
+        whole = [a + b for a, b in zip(whole, vector(variable, month, d))]
+    overall = sum(part) / sum(whole) if sum(whole) else None
+
+    # 이번 달에 아직 안 나간 고정 지출
+    until = today.isoformat()
+    paid_rows = [t for t in rows if current <= str(t.get("date", ""))[:10] <= until]
+    month_end = date(today.year, today.month, days_total)
+    pending = dict.fromkeys(categories, 0)
+    for p in recurring:
+        due = p.occurrences_after(p.last, month_end)
+        if due and month_key(due[-1]) == current and not any(p.matches(t) for t in paid_rows):
+            pending[p.category] += p.amount
+
+    result: dict[str, CategoryForecast] = {}
+    for i, category in enumerate(categories):
+        used = method
+        fraction = None
+        if method == "seasonal":
+            fraction = part[i] / whole[i] if whole[i] else overall
+            if fraction is None or fraction < MIN_SEASONAL_FRACTION:
+                used = "linear"
+        if used == "seasonal":
+            projected_variable = variable_spent[i] / min(1.0, fraction)
+        else:
+            projected_variable = variable_spent[i] * days_total / day
+
+        projected = int(round(spent[i] - variable_spent[i] + projected_variable)) + pending[category]
+        budget = int(budgets.get(category, 0))
+        ratio, status, _ = calc_budget_status(projected, budget)
+        result[category] = CategoryForecast(
+            category=category,
+            spent=spent[i],
+            projected=projected,
+            recurring_pending=pending[category],
+            budget=budget,
+            ratio=ratio,
+            status=status,
+            message=_forecast_message(status, projected, budget),
+            method=used,
+            unconverted=unconverted.get(category, 0),
+        )
+
+    total_spent = sum(f.spent for f in result.values())
+    total_projected = sum(f.projected for f in result.values())
+    total_budget = int(budgets.get(BUDGET_TOTAL, 0))
+    ratio, status, _ = calc_budget_status(total_projected, total_budget)
+    result[BUDGET_TOTAL] = CategoryForecast(
+        category=BUDGET_TOTAL,
+        spent=total_spent,
+        projected=total_projected,
+        recurring_pending=sum(pending.values()),
+        budget=total_budget,
+        ratio=ratio,
+        status=status,
+        message=_forecast_message(status, total_projected, total_budget),
+        method=method,
+        unconverted=sum(unconverted.values()),
+    )
+    return result
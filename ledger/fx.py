@@ -0,0 +1,324 @@
+# ledger/fx.py
+# 역할: 외화 거래(USD/JPY 카드 결제 등)를 한 통화로 환산 - 로컬 환율표 + 기준일(as-of) 환율 + 일괄 환산
+#
+# - 환율표 파일(CSV, 기본 data/fx_rates.csv): date,currency,rate
+#   rate는 그 통화 1단위의 원화 값 (예: 2024-01-02,USD,1300.5 / 2024-01-02,JPY,9.12)
+# - 통화별로 날짜순 배열(dates, rates)에 올려 두고 bisect로 "그 날짜 또는 그 전의 가장 최근 환율"을 찾는다
+#   (주말/공휴일처럼 고시가 없는 날은 직전 영업일 환율)
+# - 일괄 환산은 (통화, 날짜) 쌍마다 환율을 한 번만 찾는다
+#   같은 날 같은 통화 결제가 많아도 조회는 1번, 행마다는 곱셈만 한다
+#   찾은 값은 (통화, 날짜, 보고 통화) 캐시에 남겨 다음 호출에서도 재사용 (환율표가 바뀌면 비움)
+# - 원화 -> 원화(같은 통화끼리)는 조회 없이 1.0
+#
+# 사용 예)
+#   table = FxRateTable.load()                           # data/fx_rates.csv (없으면 빈 표)
+#   rows_krw = convert_transactions(rows, table)         # 원화로 환산한 거래 목록
+#   income, expense, balance = calc_summary(rows_krw)
+#
+# 환율이 없는 외화 행을 원화처럼 더하면 안 되는 집계(예산/예측/월별 리포트)는
+#   convert_available(rows, table) -> (환산한 행, 빠진 외화 행)  또는 행 1건씩 amount_in(t, table)
+# 으로 환산할 수 있는 행만 더하고, 빠진 행 수를 따로 보여준다.
+
+import csv
+import os
+import threading
+from bisect import bisect_right, insort
+from datetime import date
+from typing import Iterable, Optional, Sequence, Union
+
+from .perf import timed
+from .models import CURRENCY_FIELD, DEFAULT_CURRENCY, normalize_currency
+
+DEFAULT_FX_PATH = "data/fx_rates.csv"
+FX_FIELDNAMES = ["date", "currency", "rate"]
+
+
+class MissingRateError(LookupError):
+    """기준일 또는 그 전의 환율이 환율표에 없음"""
+
+    def __init__(self, currency: str, day: str):
+        super().__init__(f"{currency} 환율이 없습니다: {day} 또는 그 이전 (환율표에 추가하세요)")
+        self.currency = currency
+        self.day = day
+
+
+def _day(value: Union[str, date]) -> str:
+    """날짜 인자 -> "YYYY-MM-DD" 문자열 (CSV와 같은 형식, 문자열 비교가 날짜 순서와 같음)"""
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).strip()[:10]
+
+
+class FxRateTable:
+    """
+    통화별 날짜순 환율표 (원화 기준) + (통화, 날짜, 보고 통화) 환율 캐시
+
+    여러 스레드(앱 세션)에서 같이 써도 되도록 변경/캐시 갱신은 잠금 안에서 한다.
+    """
+
+    def __init__(self, rates: Iterable[tuple] = ()):
+        self._dates: dict[str, list[str]] = {}  # 통화 -> 고시일 (오름차순)
+        self._rates: dict[str, list[float]] = {}  # 통화 -> 원화 환율 (고시일과 같은 순서)
+        self._cache: dict[tuple[str, str, str], float] = {}  # (통화, 날짜, 보고 통화) -> 환율
+        self._lock = threading.Lock()
+        self.update(rates)
+
+    @classmethod
+    @timed("fx.load")
+    def load(cls, file_path: Optional[str] = None) -> "FxRateTable":
+        """
+        환율표 파일(CSV) 읽기
+
+        Args:
+            file_path: 환율표 경로 (None이면 DEFAULT_FX_PATH, 파일이 없으면 빈 표)
+
+        Returns:
+            FxRateTable (날짜/환율이 깨진 줄은 건너뜀)
+        """
+        path = file_path or DEFAULT_FX_PATH
+        if not os.path.exists(path):
+            if file_path:
+                raise FileNotFoundError(f"환율표 파일이 없습니다: {file_path}")
+            return cls()
+
+        rates = []
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    rates.append((row["date"], row["currency"], float(row["rate"])))
+                except (KeyError, TypeError, ValueError):
+                    continue
+        return cls(rates)
+
+    def save(self, file_path: str = DEFAULT_FX_PATH) -> None:
+        """환율표를 CSV로 저장 (통화, 날짜 순)"""
+        if os.path.dirname(file_path):
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with self._lock:
+            rows = [
+                (day, currency, rate)
+                for currency in sorted(self._dates)
+                for day, rate in zip(self._dates[currency], self._rates[currency])
+            ]
+        with open(file_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(FX_FIELDNAMES)
+            writer.writerows(rows)
+
+    def update(self, rates: Iterable[tuple]) -> "FxRateTable":
+        """
+        환율 추가 ((날짜, 통화, 원화 환율) 목록, 같은 날짜는 덮어쓴다) -> self
+
+        한 번에 많이 넣으면 통화별로 모아서 한 번만 정렬한다.
+        """
+        merged: dict[str, dict[str, float]] = {}
+        for day, currency, rate in rates:
+            currency, rate = normalize_currency(currency), float(rate)
+            if currency == DEFAULT_CURRENCY:
+                continue  # 원화 환율은 항상 1
+            if rate <= 0:
+                raise ValueError(f"환율은 0보다 커야 합니다: {currency} {day} {rate}")
+            merged.setdefault(currency, {})[_day(day)] = rate
+        if not merged:
+            return self
+
+        with self._lock:
+            for currency, by_day in merged.items():
+                dates, values = self._dates.get(currency, []), self._rates.get(currency, [])
+                if len(by_day) == 1 and dates:
+                    # 하루치 추가(매일 고시 1건)는 정렬된 배열에 끼워 넣기만
+                    (day, rate), = by_day.items()
+                    i = bisect_right(dates, day)
+                    if i and dates[i - 1] == day:
+                        values[i - 1] = rate
+                    else:
+                        insort(dates, day)
+                        values.insert(i, rate)
+                    continue
+                combined = dict(zip(dates, values))
+                combined.update(by_day)
+                ordered = sorted(combined.items())
+                self._dates[currency] = [d for d, _ in ordered]
+                self._rates[currency] = [r for _, r in ordered]
+            self._cache.clear()  # 예전 환율로 찾아 둔 값 버림
+        return self
+
+    def __len__(self) -> int:
+        """환율 고시 건수"""
+        return sum(len(dates) for dates in self._dates.values())
+
+    @property
+    def currencies(self) -> list[str]:
+        """환율이 있는 통화 (원화 제외)"""
+        return sorted(self._dates)
+
+    def _to_base(self, currency: str, day: str) -> float:
+        """그 날짜 또는 그 전의 가장 최근 원화 환율"""
+        if currency == DEFAULT_CURRENCY:
+            return 1.0
+        dates = self._dates.get(currency)
+        i = bisect_right(dates, day) if dates else 0
+        if i == 0:
+            raise MissingRateError(currency, day)
+        return self._rates[currency][i - 1]
+
+    def rate(self, currency: str, day: Union[str, date], to: str = DEFAULT_CURRENCY) -> float:
+        """
+        기준일 환율 (currency 1단위 = to 몇 단위)
+
+        Raises:
+            MissingRateError: 기준일 또는 그 전의 환율이 없는 통화
+        """
+        currency, to, day = normalize_currency(currency), normalize_currency(to), _day(day)
+        if currency == to:
+            return 1.0
+        key = (currency, day, to)
+        value = self._cache.get(key)
+        if value is None:
+            with self._lock:
+                value = self._to_base(currency, day) / self._to_base(to, day)
+                self._cache[key] = value
+        return value
+
+    def rates_for(
+        self, currencies: Iterable, dates: Iterable, to: str = DEFAULT_CURRENCY
+    ) -> list[float]:
+        """
+        행별 환율을 한 번에 구한다 (서로 다른 (통화, 날짜) 쌍마다 rate()는 1번만)
+
+        Args:
+            currencies: 행별 통화 코드 (비어 있으면 원화)
+            dates: 행별 날짜 ("YYYY-MM-DD..." 또는 date)
+            to: 보고 통화
+
+        Returns:
+            행 순서의 환율 목록
+        """
+        pairs = list(zip(currencies, dates))
+        factors = {pair: self.rate(pair[0], pair[1], to) for pair in set(pairs)}
+        return [factors[pair] for pair in pairs]
+
+    @timed("fx.convert_amounts")
+    def convert_amounts(
+        self,
+        amounts: Sequence[int],
+        currencies: Iterable,
+        dates: Iterable,
+        to: str = DEFAULT_CURRENCY,
+    ) -> list[int]:
+        """
+        금액을 보고 통화로 일괄 환산 (정수로 반올림)
+
+        Returns:
+            행 순서의 환산 금액 목록
+        """
+        return [round(int(a) * f) for a, f in zip(amounts, self.rates_for(currencies, dates, to))]
+
+
+@timed("fx.convert_transactions")
+def convert_transactions(
+    transactions: Iterable[dict], table: FxRateTable, to: str = DEFAULT_CURRENCY
+) -> list[dict]:
+    """
+    거래 목록을 한 통화로 환산 (합계/카테고리별 집계 전에 한 번 호출)
+
+    이미 보고 통화인 행은 그대로(복사 없이) 두고, 외화 행만 금액을 바꾼 새 dict로 만든다.
+    결과를 calc_summary / calc_category_expense 등에 그대로 넘기면 된다.
+
+    Args:
+        transactions: 거래 목록
+        table: 환율표
+        to: 보고 통화 (기본 원화)
+
+    Returns:
+        보고 통화 기준 거래 목록 (원화면 currency 키 없음)
+
+    Raises:
+        MissingRateError: 환율표에 없는 외화 거래가 있으면
+    """
+    to = normalize_currency(to)
+    rows = list(transactions)
+    codes: dict = {}  # 원래 값 -> 정리한 통화 코드 (행마다 문자열을 정리하지 않음)
+    foreign: list[int] = []
+    currencies: list[str] = []
+    for i, t in enumerate(rows):
+        raw = t.get(CURRENCY_FIELD)
+        code = codes.get(raw)
+        if code is None:
+            code = codes[raw] = normalize_currency(raw)
+        if code != to:
+            foreign.append(i)
+            currencies.append(code)
+    if not foreign:
+        return rows  # 원화만 쓰는 가계부는 조회/복사 없음
+
+    factors = table.rates_for(currencies, (str(rows[i].get("date", "")) for i in foreign), to)
+    result = list(rows)
+    for i, factor in zip(foreign, factors):
+        row = dict(rows[i])
+        row.pop(CURRENCY_FIELD, None)
+        row["amount"] = round(int(row.get("amount", 0)) * factor)
+        if to != DEFAULT_CURRENCY:
+            row[CURRENCY_FIELD] = to
+        result[i] = row
+    return result
+
+
+def _factor(t: dict, table: Optional[FxRateTable], to: str) -> Optional[float]:
+    """거래 1건의 환율 (이미 보고 통화면 1.0, 환율표가 없거나 환율이 없는 외화면 None)"""
+    raw = t.get(CURRENCY_FIELD)
+    currency = normalize_currency(raw) if raw else DEFAULT_CURRENCY
+    if currency == to:
+        return 1.0
+    if table is None:
+        return None
+    try:
+        return table.rate(currency, str(t.get("date", "")), to)
+    except MissingRateError:
+        return None
+
+
+def amount_in(t: dict, table: Optional[FxRateTable], to: str = DEFAULT_CURRENCY) -> Optional[int]:
+    """
+    거래 1건의 금액을 보고 통화로 (행을 하나씩 더하고 빼는 증분 집계용)
+
+    Args:
+        t: 거래 dict
+        table: 환율표 (None이면 보고 통화 행만 환산할 수 있다)
+        to: 보고 통화
+
+    Returns:
+        환산 금액 (정수로 반올림), 환산할 수 없는 외화 행이면 None
+    """
+    factor = _factor(t, table, normalize_currency(to))
+    if factor is None:
+        return None
+    amount = int(t.get("amount", 0))
+    return amount if factor == 1.0 else round(amount * factor)
+
+
+def convert_available(
+    transactions: Iterable[dict], table: Optional[FxRateTable], to: str = DEFAULT_CURRENCY
+) -> tuple[list[dict], list[dict]]:
+    """
+    환산할 수 있는 행만 보고 통화로 바꾸고, 환산할 수 없는 외화 행은 따로 돌려준다
+
+    convert_transactions와 달리 환율이 없어도 멈추지 않는다. 빠진 행은 합계에 넣지 말고
+    건수를 화면/출력에 따로 보여준다 (외화 금액을 원화처럼 더하지 않기 위해).
+
+    Args:
+        transactions: 거래 목록
+        table: 환율표 (None이면 외화 행은 모두 빠진다)
+        to: 보고 통화
+
+    Returns:
+        (보고 통화 기준 거래 목록, 빠진 외화 행 목록)
+    """
+    to = normalize_currency(to)
+    rows: list[dict] = []
+    skipped: list[dict] = []
+    for t in transactions:
+        (rows if _factor(t, table, to) is not None else skipped).append(t)
+    if table is None:
+        return rows, skipped  # 남은 행은 모두 이미 보고 통화
+    return convert_transactions(rows, table, to), skipped
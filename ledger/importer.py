@@ -0,0 +1,282 @@
+# ledger/importer.py
+# 역할: 은행/카드 명세서 파일을 가계부 CSV로 한 번에 가져오는 "일괄 가져오기" 파이프라인
+# 원본 파일을 한 줄씩 스트리밍으로 읽고, 배치 단위로 검증/중복 제거 후 마지막에 한 번만 저장한다.
+
+import csv
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from .dedupe import dedupe_key
+from .models import validate_transaction_dict
+from .repository import CSV_FIELDNAMES, CURRENCY_FIELD, DEFAULT_CURRENCY, normalize_currency
+from .store import get_store
+from .utils import parse_date
+
+if TYPE_CHECKING:
+    from .categorize import Categorizer
+
+# 명세서마다 다른 컬럼명을 표준 컬럼(CSV_FIELDNAMES)으로 매핑
+DEFAULT_COLUMN_MAP = {
+    # 날짜
+    "날짜": "date",
+    "거래일": "date",
+    "거래일자": "date",
+    "거래일시": "date",
+    "이용일": "date",
+    "이용일자": "date",
+    "승인일자": "date",
+    # 구분
+    "구분": "type",
+    "입출금구분": "type",
+    "거래구분": "type",
+    # 카테고리
+    "카테고리": "category",
+    "분류": "category",
+    "업종": "category",
+    # 내용
+    "내용": "description",
+    "적요": "description",
+    "메모": "description",
+    "가맹점": "description",
+    "가맹점명": "description",
+    "이용가맹점": "description",
+    # 금액
+    "금액": "amount",
+    "거래금액": "amount",
+    "이용금액": "amount",
+    "승인금액": "amount",
+    # 통화 (해외 이용분)
+    "통화": "currency",
+    "결제통화": "currency",
+    "현지통화": "currency",
+}
+
+# 명세서의 구분 표기를 가계부 구분("지출"/"수입")으로 통일
+TYPE_ALIASES = {
+    "지출": "지출",
+    "출금": "지출",
+    "결제": "지출",
+    "승인": "지출",
+    "수입": "수입",
+    "입금": "수입",
+    "환불": "수입",
+    "취소": "수입",
+}
+
+DEFAULT_BATCH_SIZE = 5000  # 한 번에 검증할 행 수
+
+
+@dataclass
+class ImportResult:
+    """일괄 가져오기 결과"""
+
+    total_rows: int = 0  # 원본에서 읽은 행 수
+    imported: int = 0  # 실제로 추가된 행 수
+    invalid: int = 0  # 검증 실패로 버린 행 수
+    duplicates: int = 0  # 기존 데이터/파일 내부 중복으로 버린 행 수
+    categorized: int = 0  # "기타"로 들어와서 규칙으로 자동 분류한 행 수
+    elapsed: float = 0.0  # 소요 시간(초)
+    invalid_rows: list[int] = field(default_factory=list)  # 검증 실패 행 번호(1부터, 헤더 제외)
+
+    @property
+    def rows_per_sec(self) -> float:
+        """처리량(초당 행 수)"""
+        if self.elapsed <= 0:
+            return float(self.total_rows)
+        return self.total_rows / self.elapsed
+
+
+def build_column_map(
+    source_columns: Iterable[str], column_map: Optional[dict[str, str]] = None
+) -> dict[str, str]:
+    """
+    원본 컬럼명 -> 표준 컬럼명 매핑을 만든다
+
+    Args:
+        source_columns: 원본 파일의 헤더
+        column_map: 사용자 지정 매핑 (기본 매핑보다 우선)
+
+    Returns:
+        {"거래일자": "date", ...} 형태의 dict (매핑되지 않는 컬럼은 제외)
+    """
+    mapping = dict(DEFAULT_COLUMN_MAP)
+    mapping.update({name: name for name in CSV_FIELDNAMES})
+    if column_map:
+        mapping.update(column_map)
+
+    result = {}
+    for col in source_columns:
+        key = str(col or "").strip().lstrip("\ufeff")
+        target = mapping.get(key)
+        # 같은 표준 컬럼에 여러 원본 컬럼이 걸리면 앞의 것을 사용
+        if target in CSV_FIELDNAMES and target not in result.values():
+            result[col] = target
+    return result
+
+
+def normalize_row(raw: dict, column_map: dict[str, str]) -> dict:
+    """
+    원본 한 행을 표준 거래 dict로 정리한다 (검증은 하지 않음)
+
+    - 금액의 쉼표/"원"/공백을 제거하고, 음수 금액은 지출로 본다
+    - 날짜는 "YYYY-MM-DD" 문자열로 통일한다
+    - 구분이 없으면 "지출", 카테고리가 없으면 "기타"
+    """
+    row = {target: str(raw.get(source) or "").strip() for source, target in column_map.items()}
+
+    amount_text = row.get("amount", "").replace(",", "").replace("원", "").replace(" ", "")
+    t_type = TYPE_ALIASES.get(row.get("type", ""), row.get("type", ""))
+    try:
+        amount = int(float(amount_text))
+    except ValueError:
+        amount = amount_text  # 검증 단계에서 걸러진다
+    else:
+        if amount < 0:
+            amount = -amount
+            t_type = t_type or "지출"
+
+    parsed = parse_date(row.get("date", "")[:10])
+
+    tx = {
+        "date": parsed.isoformat() if parsed else row.get("date", ""),
+        "type": t_type or "지출",
+        "category": row.get("category", "") or "기타",
+        "description": row.get("description", ""),
+        "amount": amount,
+        "_date_ok": parsed is not None,
+    }
+    currency = normalize_currency(row.get("currency"))
+    if currency != DEFAULT_CURRENCY:
+        tx[CURRENCY_FIELD] = currency  # 원화는 키 없이 (저장소 규칙과 같게)
+    return tx
+
+
+def row_key(tx: dict) -> tuple:
+    """중복 판정용 키 (dedupe.dedupe_key: 날짜, 구분, 금액, 정리한 메모)"""
+    return dedupe_key(tx)
+
+
+def iter_source_rows(
+    source_path: str,
+    encoding: str = "utf-8-sig",
+    delimiter: str = ",",
+    column_map: Optional[dict[str, str]] = None,
+) -> Iterator[dict]:
+    """
+    원본 명세서를 한 줄씩 읽어 표준 dict로 돌려준다 (파일 전체를 메모리에 올리지 않음)
+    """
+    with open(source_path, "r", encoding=encoding, newline="") as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        if reader.fieldnames is None:
+            return
+        mapping = build_column_map(reader.fieldnames, column_map)
+        missing = [c for c in ("date", "amount") if c not in mapping.values()]
+        if missing:
+            raise ValueError(f"필수 컬럼을 찾을 수 없습니다: {missing} (원본 헤더: {reader.fieldnames})")
+
+        for raw in reader:
+            yield normalize_row(raw, mapping)
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    """rows를 size개씩 묶어서 돌려준다"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validate_batch(batch: list[dict]) -> tuple[list[dict], list[int]]:
+    """
+    배치 단위 검증 (validate_transaction_dict와 같은 규칙 + 날짜 파싱 여부)
+
+    Returns:
+        (유효한 거래 목록, 배치 내 실패 위치 목록)
+    """
+    valid = []
+    failed = []
+    for i, row in enumerate(batch):
+        date_ok = row.pop("_date_ok", True)
+        if date_ok and validate_transaction_dict(row):
+            row["amount"] = int(row["amount"])
+            valid.append(row)
+        else:
+            failed.append(i)
+    return valid, failed
+
+
+def import_statement(
+    source_path: str,
+    ledger_path: str,
+    column_map: Optional[dict[str, str]] = None,
+    encoding: str = "utf-8-sig",
+    delimiter: str = ",",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    categorizer: Optional["Categorizer"] = None,
+) -> ImportResult:
+    """
+    은행/카드 명세서를 가계부 CSV로 일괄 가져오기
+
+    1) 원본을 스트리밍으로 읽으며 컬럼을 CSV_FIELDNAMES로 매핑
+    2) batch_size 단위로 검증 (categorizer가 있으면 "기타" 행을 자동 분류)
+    3) 기존 거래의 키별 개수(해시 인덱스)로 중복 제거 - 가계부에 이미 있는 개수만큼만 건너뛴다
+       (같은 날 같은 금액의 커피 2잔처럼 명세서 안에서 똑같은 행은 그대로 가져온다)
+    4) 마지막에 저장소(LedgerStore)로 한 번만 추가 (파일 잠금 + 버전 확인,
+       읽은 뒤 다른 곳에서 저장했으면 VersionConflictError)
+
+    Args:
+        source_path: 명세서 CSV 경로
+        ledger_path: 가계부 CSV 경로
+        column_map: 원본 컬럼명 -> 표준 컬럼명 추가 매핑
+        encoding: 원본 인코딩 (국내 은행 파일은 "cp949"인 경우가 많음)
+        delimiter: 원본 구분자
+        batch_size: 검증 배치 크기
+        dry_run: True면 저장하지 않고 결과만 계산
+        categorizer: 카테고리가 없거나 "기타"인 행에 적용할 자동 분류기
+
+    Returns:
+        ImportResult
+    """
+    started = time.perf_counter()
+    result = ImportResult()
+
+    store = get_store(ledger_path)
+    version, existing = store.snapshot()
+    remaining = Counter(row_key(t) for t in existing)  # 해시 인덱스: 키 -> 아직 짝을 못 찾은 기존 행 수
+    new_rows: list[dict] = []
+
+    rows = iter_source_rows(source_path, encoding=encoding, delimiter=delimiter, column_map=column_map)
+    for batch in _batches(rows, max(1, batch_size)):
+        offset = result.total_rows
+        result.total_rows += len(batch)
+
+        valid, failed = validate_batch(batch)
+        result.invalid += len(failed)
+        result.invalid_rows.extend(offset + i + 1 for i in failed)
+
+        for tx in valid:
+            if categorizer is not None and tx["category"] == "기타":
+                category = categorizer.categorize(tx)
+                if category:
+                    tx["category"] = category
+                    result.categorized += 1
+            key = row_key(tx)
+            if remaining[key] > 0:
+                remaining[key] -= 1  # 기존 행 1개와 짝지음
+                result.duplicates += 1
+                continue
+            new_rows.append(tx)
+
+    result.imported = len(new_rows)
+    if new_rows and not dry_run:
+        store.insert(new_rows, expected_version=version, position=len(existing))  # 기존 행 뒤에 추가
+
+    result.elapsed = time.perf_counter() - started
+    return result
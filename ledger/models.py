@@ -5,6 +5,14 @@ from dataclasses import dataclass
 from datetime import date
 from typing import Optional
 
+DEFAULT_CURRENCY = "KRW"  # 기본 통화 (통화가 비어 있으면 원화)
+CURRENCY_FIELD = "currency"  # 거래 dict/CSV의 통화 컬럼 (선택, 원화 거래는 키가 없다)
+
+
+def normalize_currency(value) -> str:
+    """통화 코드 정리 ("usd " -> "USD", 비어 있으면 기본 통화)"""
+    return str(value or "").strip().upper() or DEFAULT_CURRENCY
+
 
 @dataclass
 class Transaction:
@@ -14,7 +22,8 @@ class Transaction:
     type: str  # "지출" 또는 "수입"
     category: str  # 카테고리 (식비, 교통, 통신, 생활, 기타 등)
     description: str  # 내용/메모
-    amount: int  # 금액(원 단위, 정수)
+    amount: int  # 금액(통화의 최소 단위가 아니라 표시 단위 정수: 원, 달러, 엔)
+    currency: str = DEFAULT_CURRENCY  # 통화 코드 (선택, 기본 원화)
 
     def __post_init__(self):
         """데이터 유효성 검증"""
@@ -30,6 +39,11 @@ class Transaction:
         if not self.category or self.category.strip() == "":
             self.category = "기타"
 
+        # 통화 코드는 대문자 3글자 (비어 있으면 원화)
+        self.currency = normalize_currency(self.currency)
+        if len(self.currency) != 3 or not self.currency.isalpha():
+            raise ValueError(f"잘못된 통화 코드: {self.currency}")
+
     def to_dict(self) -> dict:
         """Transaction을 dict로 변환 (CSV 저장용)"""
         return {
@@ -38,6 +52,7 @@ class Transaction:
             "category": self.category,
             "description": self.description,
             "amount": self.amount,
+            CURRENCY_FIELD: self.currency,
         }
 
     @classmethod
@@ -49,6 +64,7 @@ class Transaction:
             category=data["category"],
             description=data["description"],
             amount=data["amount"],
+            currency=data.get(CURRENCY_FIELD) or DEFAULT_CURRENCY,
         )
 
 
@@ -73,4 +89,9 @@ def validate_transaction_dict(data: dict) -> bool:
     except (ValueError, TypeError):
         return False
 
+    # currency 값 검증 (선택 키)
+    currency = str(data.get(CURRENCY_FIELD) or DEFAULT_CURRENCY).strip()
+    if len(currency) != 3 or not currency.isalpha():
+        return False
+
     return True
\ No newline at end of file
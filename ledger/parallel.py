@@ -0,0 +1,266 @@
+# ledger/parallel.py
+# 역할: 여러 CPU 코어로 나눠서 집계하는 map-reduce 실행 모드
+#
+# - 거래 목록/청크(배치)/CSV 파일을 조각으로 나눠 ProcessPoolExecutor의 워커에서 부분 집계(map)하고
+#   결과를 LedgerAggregate.merge로 합친다(reduce, 결합 법칙이 성립하므로 순서 상관없음)
+# - CSV 파일은 날짜 인덱스(<파일>.idx)의 레코드 시작 위치로 바이트 구간을 나눠서
+#   각 워커가 자기 구간만 직접 읽는다 (행 dict를 프로세스 간에 복사하지 않아 가장 빠름)
+# - 입력이 작으면(min_rows 미만) 프로세스를 띄우는 비용이 더 크므로 그냥 현재 프로세스에서 계산
+#
+# 결과는 services.calc_summary / calc_detailed_summary / calc_category_expense와 같은 형식이다.
+# 합계는 한 통화(기본 원화) 기준이다. 다른 통화 행은 합계에 더하지 않고 통화별 칸(foreign_*)에
+# 따로 모으므로, 외화가 섞인 파일이면 foreign_count로 "n건은 합계에 없음"을 보여줄 수 있다
+# (환산해서 합치려면 fx.convert_transactions로 먼저 바꾼 행을 넣는다).
+#
+# 사용 예)
+#   agg = aggregate_file("data/ledger.csv", workers=8)
+#   income, expense, balance = agg.summary()
+
+import csv
+import io
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .csv_index import load_or_build_index
+from .models import CURRENCY_FIELD, DEFAULT_CURRENCY, normalize_currency
+from .perf import timed
+from .repository import FIELDNAMES, _parse_row, compression_of, iter_transactions, sniff_dialect
+
+DEFAULT_MIN_ROWS = 200_000  # 이보다 적으면 직렬 계산
+DEFAULT_BATCH_ROWS = 100_000  # 거래 목록을 워커에 나눠줄 때 한 조각의 행 수
+AVG_ROW_BYTES = 48  # 파일 크기로 행 수를 어림할 때 쓰는 평균 행 길이
+
+
+@dataclass
+class LedgerAggregate:
+    """부분 집계 결과 (합치기 가능)"""
+
+    income: int = 0
+    expense: int = 0
+    income_count: int = 0
+    expense_count: int = 0
+    category_expense: dict[str, int] = field(default_factory=dict)
+    rows: int = 0  # 읽은 행 수
+    currency: str = DEFAULT_CURRENCY  # 합계 통화 (이 통화 행만 income/expense에 더한다)
+    foreign_count: int = 0  # 합계에서 뺀 다른 통화 행 수
+    foreign_income: dict[str, int] = field(default_factory=dict)  # {통화: 수입 합계 (그 통화 금액)}
+    foreign_expense: dict[str, int] = field(default_factory=dict)  # {통화: 지출 합계 (그 통화 금액)}
+
+    def update(self, transactions: Iterable[dict]) -> "LedgerAggregate":
+        """거래를 부분 집계에 더한다 (services 함수와 같은 규칙, 다른 통화 행은 통화별 칸에)"""
+        categories = self.category_expense
+        base = self.currency
+        for t in transactions:
+            self.rows += 1
+            t_type = str(t.get("type", "")).strip()
+            amount = int(t.get("amount", 0))
+            raw = t.get(CURRENCY_FIELD)
+            currency = normalize_currency(raw) if raw else DEFAULT_CURRENCY
+            if currency != base:
+                self.foreign_count += 1
+                bucket = self.foreign_income if t_type == "수입" else self.foreign_expense if t_type == "지출" else None
+                if bucket is not None:
+                    bucket[currency] = bucket.get(currency, 0) + amount
+                continue
+            if t_type == "수입":
+                self.income += amount
+                self.income_count += 1
+            elif t_type == "지출":
+                self.expense += amount
+                self.expense_count += 1
+                category = str(t.get("category", "기타")).strip() or "기타"
+                categories[category] = categories.get(category, 0) + amount
+        return self
+
+    def merge(self, other: "LedgerAggregate") -> "LedgerAggregate":
+        """다른 부분 집계를 더한다 (self를 바꾸고 반환)"""
+        if other.currency != self.currency:
+            raise ValueError(f"합계 통화가 다른 집계는 합칠 수 없습니다: {self.currency} / {other.currency}")
+        self.income += other.income
+        self.expense += other.expense
+        self.income_count += other.income_count
+        self.expense_count += other.expense_count
+        self.rows += other.rows
+        for category, amount in other.category_expense.items():
+            self.category_expense[category] = self.category_expense.get(category, 0) + amount
+        self.foreign_count += other.foreign_count
+        for mine, theirs in ((self.foreign_income, other.foreign_income), (self.foreign_expense, other.foreign_expense)):
+            for currency, amount in theirs.items():
+                mine[currency] = mine.get(currency, 0) + amount
+        return self
+
+    def summary(self) -> tuple[int, int, int]:
+        """calc_summary와 같은 (총수입, 총지출, 잔액)"""
+        return self.income, self.expense, self.income - self.expense
+
+    def detailed_summary(self) -> dict:
+        """calc_detailed_summary와 같은 형식"""
+        return {
+            "total_income": self.income,
+            "total_expense": self.expense,
+            "balance": self.income - self.expense,
+            "income_count": self.income_count,
+            "expense_count": self.expense_count,
+            "avg_income": self.income // self.income_count if self.income_count > 0 else 0,
+            "avg_expense": self.expense // self.expense_count if self.expense_count > 0 else 0,
+        }
+
+
+# ----- 워커에서 실행되는 함수 (pickle 가능하도록 모듈 최상위에 둔다) -----
+def _aggregate_rows(transactions: list[dict]) -> LedgerAggregate:
+    return LedgerAggregate().update(transactions)
+
+
+def _aggregate_byte_range(file_path: str, fieldnames: list[str], start: int, end: int) -> LedgerAggregate:
+    """CSV 파일의 [start, end) 구간(레코드 경계)만 읽어서 집계"""
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8"), newline=""), fieldnames=fieldnames)
+    return LedgerAggregate().update(tx for tx in map(_parse_row, reader) if tx is not None)
+
+
+def _mp_context():
+    # 스레드(write-behind 등)가 도는 프로세스에서 fork는 위험하므로 forkserver/spawn 사용
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _workers(workers: Optional[int]) -> int:
+    return max(1, workers if workers is not None else (os.cpu_count() or 1))
+
+
+def _reduce(futures: Iterable[Future]) -> LedgerAggregate:
+    total = LedgerAggregate()
+    for future in futures:
+        total.merge(future.result())
+    return total
+
+
+@timed("parallel.aggregate_chunks")
+def aggregate_chunks(chunks: Iterable[list[dict]], workers: Optional[int] = None) -> LedgerAggregate:
+    """
+    청크(배치) 단위 입력을 워커에 나눠서 집계 (iter_transactions 결과 등)
+
+    동시에 처리 중인 청크는 workers * 2개까지만 유지한다 (메모리 일정).
+
+    Args:
+        chunks: 거래 목록 청크들
+        workers: 워커 수 (None이면 CPU 코어 수, 1이면 직렬)
+
+    Returns:
+        LedgerAggregate
+    """
+    workers = _workers(workers)
+    if workers == 1:
+        total = LedgerAggregate()
+        for chunk in chunks:
+            total.update(chunk)
+        return total
+
+    total = LedgerAggregate()
+    pending: set[Future] = set()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as pool:
+        for chunk in chunks:
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total.merge(_reduce(done))
+            pending.add(pool.submit(_aggregate_rows, chunk))
+        total.merge(_reduce(pending))
+    return total
+
+
+@timed("parallel.aggregate")
+def aggregate(
+    transactions: list[dict],
+    workers: Optional[int] = None,
+    min_rows: int = DEFAULT_MIN_ROWS,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> LedgerAggregate:
+    """
+    메모리에 있는 거래 목록을 병렬 집계 (작으면 직렬)
+
+    Args:
+        transactions: 거래 목록
+        workers: 워커 수 (None이면 CPU 코어 수)
+        min_rows: 이보다 적으면 직렬 계산
+        batch_rows: 워커 한 번에 넘길 행 수
+    """
+    workers = _workers(workers)
+    if workers == 1 or len(transactions) < min_rows:
+        return LedgerAggregate().update(transactions)
+
+    size = max(1, min(batch_rows, -(-len(transactions) // workers)))
+    chunks = (transactions[i:i + size] for i in range(0, len(transactions), size))
+    return aggregate_chunks(chunks, workers=workers)
+
+
+def _split_points(file_path: str, parts: int) -> tuple[list[str], list[tuple[int, int]]]:
+    """날짜 인덱스의 레코드 시작 위치로 파일 본문을 parts개 구간으로 나눈다"""
+    index = load_or_build_index(file_path)
+    with open(file_path, "rb") as f:
+        first = f.readline()
+    fieldnames = next(csv.reader([first.decode("utf-8-sig").strip("\r\n")]), [])
+    size = os.path.getsize(file_path)
+
+    starts = sorted(span[0] for spans in index.entries.values() for span in spans)
+    if not starts:
+        return fieldnames, []
+    body_start = index.header_end
+    step = (size - body_start) / parts
+
+    bounds = [body_start]
+    for i in range(1, parts):
+        target = body_start + step * i
+        # target 이후 첫 레코드 시작 위치 (이진 탐색)
+        lo, hi = 0, len(starts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if starts[mid] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(starts) and starts[lo] > bounds[-1]:
+            bounds.append(starts[lo])
+    bounds.append(size)
+    return [name.strip() for name in fieldnames], list(zip(bounds, bounds[1:]))
+
+
+@timed("parallel.aggregate_file")
+def aggregate_file(
+    file_path: str,
+    workers: Optional[int] = None,
+    min_rows: int = DEFAULT_MIN_ROWS,
+) -> LedgerAggregate:
+    """
+    가계부 CSV 파일을 병렬 집계
+
+    각 워커가 자기 바이트 구간만 직접 읽어서 파싱/집계한다.
+    압축 파일, 비표준 형식(cp949 등), 작은 파일(어림 행 수 < min_rows)은 청크 읽기로 직렬 계산한다.
+
+    Args:
+        file_path: 가계부 CSV 경로
+        workers: 워커 수 (None이면 CPU 코어 수)
+        min_rows: 어림 행 수가 이보다 적으면 직렬 계산
+    """
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return LedgerAggregate()
+
+    workers = _workers(workers)
+    estimated_rows = os.path.getsize(file_path) // AVG_ROW_BYTES
+    if workers == 1 or compression_of(file_path) or estimated_rows < min_rows:
+        return aggregate_chunks(iter_transactions(file_path), workers=1)
+    dialect = sniff_dialect(file_path)
+    if dialect is None or not dialect.is_standard:
+        return aggregate_chunks(iter_transactions(file_path), workers=1)
+
+    fieldnames, ranges = _split_points(file_path, workers * 4)  # 구간을 넉넉히 나눠 워커 부하를 고르게
+    if any(c not in fieldnames for c in FIELDNAMES):
+        return LedgerAggregate()  # iter_transactions와 같은 규칙: 컬럼 누락이면 빈 결과
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as pool:
+        futures = [pool.submit(_aggregate_byte_range, file_path, fieldnames, start, end) for start, end in ranges]
+        return _reduce(futures)
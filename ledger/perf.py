@@ -0,0 +1,232 @@
+# ledger/perf.py
+# 역할: 핫패스 계측(instrumentation) - 실행 시간 측정, 카운터, 히스토그램, 스팬 기록
+#
+# 사용 예)
+#   @timed("repository.load_transactions")     # 함수 전체 시간 측정
+#   with span("app.filter"):                    # 코드 블록 시간 측정
+#   count("store.conflict")                     # 횟수 세기
+#
+#   begin_capture()  ...  spans = end_capture()  # 한 번의 rerun 동안 생긴 스팬만 모으기
+#   dump_spans_jsonl("data/perf_spans.jsonl")   # 오프라인 분석용 저장
+#
+# 기본은 꺼짐: 환경 변수 LEDGER_PERF_DEBUG=1 또는 set_enabled(True)로 켠다.
+# 꺼져 있으면 timed/span/count는 bool 1번 확인 후 바로 원래 일만 한다 (잠금/객체 생성 없음).
+
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterator, Optional
+
+MAX_RECENT_SPANS = 10_000  # 메모리에 보관할 최근 스팬 수
+ENV_VAR = "LEDGER_PERF_DEBUG"  # "1"이면 처음부터 계측을 켠다
+
+# 히스토그램 버킷 상한(ms): 0.01ms ~ 약 10초까지 2배씩
+BUCKET_BOUNDS_MS = [0.01 * (2 ** i) for i in range(21)]
+
+
+@dataclass
+class Span:
+    """측정 구간 1건"""
+
+    name: str
+    start: float  # time.time() 기준 시작 시각(초)
+    duration_ms: float
+    thread: str
+    attrs: dict = field(default_factory=dict)
+
+
+class Histogram:
+    """구간별 실행 시간 분포 (2배 간격 버킷 + 합계/최소/최대)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)  # 마지막 = 상한 초과
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1  # ms 이상인 첫 상한 (없으면 마지막 = 상한 초과)
+
+    def percentile(self, q: float) -> float:
+        """버킷 상한 기준 근사 백분위수 (q: 0~1)"""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min(BUCKET_BOUNDS_MS[i], self.max_ms) if i < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "min_ms": self.min_ms if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+        }
+
+
+_lock = threading.Lock()
+_enabled = os.environ.get(ENV_VAR, "") == "1"
+_histograms: dict[str, Histogram] = {}
+_counters: dict[str, int] = {}
+_recent: deque = deque(maxlen=MAX_RECENT_SPANS)
+_local = threading.local()  # 스레드(= Streamlit 세션 실행)별 capture 버퍼
+
+
+def set_enabled(enabled: bool) -> None:
+    """계측 전체 켜기/끄기 (끄면 timed/span/count는 bool 확인 1번뿐)"""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def record(name: str, duration_ms: float, start: Optional[float] = None, **attrs) -> None:
+    """측정값 1건 기록 (히스토그램 + 최근 스팬 + 현재 capture)"""
+    item = Span(
+        name=name,
+        start=start if start is not None else time.time() - duration_ms / 1000,
+        duration_ms=duration_ms,
+        thread=threading.current_thread().name,
+        attrs=attrs,
+    )
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(duration_ms)
+        _recent.append(item)
+
+    captured = getattr(_local, "captured", None)
+    if captured is not None:
+        captured.append(item)
+
+
+_NULL_SPAN = nullcontext()  # 꺼져 있을 때 span()이 돌려주는 공용 객체
+
+
+def span(name: str, **attrs):
+    """with 블록의 실행 시간을 name으로 기록 (꺼져 있으면 아무것도 만들지 않는다)"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _span(name, attrs)
+
+
+@contextmanager
+def _span(name: str, attrs: dict) -> Iterator[None]:
+    wall = time.time()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - started) * 1000, start=wall, **attrs)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """함수 실행 시간을 기록하는 데코레이터 (name 생략 시 "모듈.함수")"""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            wall = time.time()
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(span_name, (time.perf_counter() - started) * 1000, start=wall)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, n: int = 1) -> None:
+    """카운터 증가"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def begin_capture() -> None:
+    """현재 스레드에서 이후에 생기는 스팬을 모으기 시작 (Streamlit rerun 시작 시 호출)"""
+    _local.captured = []
+
+
+def end_capture() -> list[Span]:
+    """모은 스팬을 돌려주고 capture 종료"""
+    captured = getattr(_local, "captured", None) or []
+    _local.captured = None
+    return captured
+
+
+def summarize_spans(spans: list[Span]) -> list[dict]:
+    """스팬 목록을 이름별 {name, count, total_ms}로 묶어 시간 큰 순으로 정렬"""
+    totals: dict[str, dict] = {}
+    for s in spans:
+        row = totals.setdefault(s.name, {"name": s.name, "count": 0, "total_ms": 0.0})
+        row["count"] += 1
+        row["total_ms"] += s.duration_ms
+    return sorted(totals.values(), key=lambda r: r["total_ms"], reverse=True)
+
+
+def stats() -> dict:
+    """프로세스 누적 통계 {"histograms": {이름: {...}}, "counters": {이름: 값}}"""
+    with _lock:
+        return {
+            "histograms": {name: h.to_dict() for name, h in sorted(_histograms.items())},
+            "counters": dict(sorted(_counters.items())),
+        }
+
+
+def recent_spans() -> list[Span]:
+    with _lock:
+        return list(_recent)
+
+
+def dump_spans_jsonl(file_path: str, spans: Optional[list[Span]] = None, append: bool = True) -> int:
+    """
+    스팬을 JSON Lines 파일로 저장 (spans 생략 시 최근 스팬 전체)
+
+    Returns:
+        저장한 스팬 수
+    """
+    spans = recent_spans() if spans is None else spans
+    if os.path.dirname(file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "a" if append else "w", encoding="utf-8") as f:
+        for s in spans:
+            f.write(json.dumps(asdict(s), ensure_ascii=False) + "\n")
+    return len(spans)
+
+
+def reset() -> None:
+    """누적 통계/최근 스팬 초기화"""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _recent.clear()
@@ -0,0 +1,315 @@
+# ledger/recurring.py
+# 역할: 반복 거래(구독/통신비/월세 등) 찾기 + 다가올 반복 거래 행 미리 만들기
+#
+# 1) 묶기: (구분, 카테고리, 정리한 메모, 통화)로 모은 뒤, 금액으로 정렬해서
+#    이웃한 금액 차이가 amount_tolerance(기본 10%) 이내인 동안 같은 금액대(band)로 본다
+#    (요금이 조금씩 바뀌는 통신비도 한 묶음, 같은 가게의 5천원/5만원 결제는 다른 묶음)
+# 2) 주기 검사: 금액대별로 날짜를 정렬해 간격(일)을 구하고 주/월/연 주기에 맞는지 본다
+#    (한 번 건너뛴 달처럼 주기의 배수인 간격도 맞는 것으로 본다)
+# 3) 증분: RecurringDetector.update(새 거래)/remove/on_change는 행이 바뀐 묶음만 다시 검사한다
+#    (새 달 명세서를 가져올 때마다 전체를 다시 정렬하지 않음, LedgerStore.add_change_hook으로 연결 가능)
+#
+# 정렬 기반이라 전체 O(n log n).
+#
+# 사용 예)
+#   patterns = detect_recurring(rows)
+#   new_rows = materialize_upcoming(patterns, until=date(2024, 5, 31), existing=rows)
+
+import calendar
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Iterable, Optional, Sequence
+
+from .dedupe import dedupe_key, normalize_description
+from .models import CURRENCY_FIELD, DEFAULT_CURRENCY, normalize_currency
+from .perf import timed
+
+DEFAULT_MIN_OCCURRENCES = 3  # 이보다 적게 나온 묶음은 반복으로 보지 않는다
+DEFAULT_AMOUNT_TOLERANCE = 0.1  # 같은 금액대로 볼 이웃 금액 차이 (10%)
+MIN_CONFIDENCE = 0.75  # 주기에 맞는 간격 비율이 이 이상이어야 반복
+
+# 주기 이름 -> (평균 간격(일), 허용 오차(일))
+PERIODS = {
+    "weekly": (7.0, 1),
+    "monthly": (30.44, 3),
+    "yearly": (365.25, 5),
+}
+
+
+@dataclass
+class RecurringPattern:
+    """반복 거래 1개 (금액대 1개)"""
+
+    type: str
+    category: str
+    description: str  # 가장 최근 행의 메모
+    amount: int  # 가장 최근 금액
+    period: str  # "weekly" | "monthly" | "yearly"
+    dates: list[date] = field(default_factory=list)  # 나온 날짜 (오름차순)
+    confidence: float = 1.0  # 주기에 맞는 간격 비율
+    currency: str = DEFAULT_CURRENCY  # 금액의 통화 (외화 구독은 그 통화 그대로)
+
+    @property
+    def count(self) -> int:
+        return len(self.dates)
+
+    @property
+    def last(self) -> date:
+        return self.dates[-1]
+
+    @property
+    def interval_days(self) -> float:
+        return PERIODS[self.period][0]
+
+    def occurrences_after(self, after: date, until: date) -> list[date]:
+        """마지막 발생일 기준으로 (after, until] 사이의 예정일"""
+        result = []
+        step = 1
+        while True:
+            nxt = self._shift(step)
+            if nxt > until:
+                return result
+            if nxt > after:
+                result.append(nxt)
+            step += 1
+
+    def next_date(self) -> date:
+        """다음 예정일"""
+        return self._shift(1)
+
+    def is_active(self, today: date) -> bool:
+        """아직 이어지는지 (마지막 발생 후 주기의 1.5배가 지나지 않음)"""
+        return (today - self.last).days <= self.interval_days * 1.5
+
+    def matches(self, tx: dict, amount_tolerance: float = DEFAULT_AMOUNT_TOLERANCE) -> bool:
+        """같은 반복 거래의 행인지 (메모/카테고리/구분/통화 + 금액대)"""
+        return (
+            str(tx.get("type", "")).strip() == self.type
+            and normalize_currency(tx.get(CURRENCY_FIELD)) == self.currency
+            and (str(tx.get("category", "")).strip() or "기타") == self.category
+            and normalize_description(tx.get("description", "")) == normalize_description(self.description)
+            and abs(int(tx.get("amount", 0)) - self.amount) <= self.amount * amount_tolerance
+        )
+
+    def _shift(self, steps: int) -> date:
+        last = self.last
+        if self.period == "weekly":
+            return last + timedelta(days=7 * steps)
+        months = steps if self.period == "monthly" else 12 * steps
+        index = last.year * 12 + (last.month - 1) + months
+        year, month = index // 12, index % 12 + 1
+        # 말일 결제(31일 등)는 짧은 달에서 그 달 말일로
+        day = min(self._anchor_day(), calendar.monthrange(year, month)[1])
+        return date(year, month, day)
+
+    def _anchor_day(self) -> int:
+        # 최근 3번 중 가장 늦은 날 (31일 결제가 2월에 28일로 당겨진 경우 원래 날짜로 복귀)
+        return max(d.day for d in self.dates[-3:])
+
+
+def _period_of(days: list[int]) -> Optional[tuple[str, float]]:
+    """날짜 서수(오름차순)의 간격이 맞는 주기와 맞는 비율"""
+    gaps = [b - a for a, b in zip(days, days[1:]) if b > a]
+    if not gaps:
+        return None
+    median = sorted(gaps)[len(gaps) // 2]
+    for name, (interval, tolerance) in PERIODS.items():
+        if abs(median - interval) > tolerance:
+            continue
+        fitting = 0
+        for gap in gaps:
+            k = max(1, round(gap / interval))
+            if abs(gap - k * interval) <= tolerance * k:
+                fitting += 1
+        return name, fitting / len(gaps)
+    return None
+
+
+class RecurringDetector:
+    """
+    증분 반복 거래 탐지기
+
+    update()/remove()로 거래를 넣고 빼며, patterns()는 마지막 호출 이후 행이 바뀐 묶음만 다시 검사한다.
+    """
+
+    def __init__(
+        self,
+        min_occurrences: int = DEFAULT_MIN_OCCURRENCES,
+        amount_tolerance: float = DEFAULT_AMOUNT_TOLERANCE,
+    ):
+        self.min_occurrences = min_occurrences
+        self.amount_tolerance = amount_tolerance
+        self._groups: dict[tuple, list[tuple[int, int, str]]] = {}  # 키 -> [(날짜 서수, 금액, 메모)]
+        self._patterns: dict[tuple, list[RecurringPattern]] = {}  # 키 -> 검사 결과 (캐시)
+        self._dirty: set[tuple] = set()
+        self._ordinals: dict[str, Optional[int]] = {}  # 날짜 문자열 변환 캐시
+        self._lock = threading.Lock()  # 저장소 hook(쓰기 스레드)과 patterns()(읽기) 사이
+
+    def _entry(self, t: dict) -> Optional[tuple[tuple, tuple[int, int, str]]]:
+        description = str(t.get("description", ""))
+        normalized = normalize_description(description)
+        if not normalized:
+            return None  # 메모 없는 행은 무엇이 반복되는지 알 수 없다
+        text = str(t.get("date", "")).strip()[:10]
+        if text not in self._ordinals:
+            try:
+                self._ordinals[text] = date.fromisoformat(text).toordinal()
+            except ValueError:
+                self._ordinals[text] = None
+        day = self._ordinals[text]
+        if day is None:
+            return None
+        key = (
+            str(t.get("type", "")).strip(),
+            str(t.get("category", "")).strip() or "기타",
+            normalized,
+            normalize_currency(t.get(CURRENCY_FIELD)),  # 같은 숫자라도 통화가 다르면 다른 반복
+        )
+        return key, (day, int(t.get("amount", 0)), description)
+
+    def update(self, transactions: Iterable[dict]) -> "RecurringDetector":
+        """거래 추가 (self 반환)"""
+        with self._lock:
+            for t in transactions:
+                entry = self._entry(t)
+                if entry is not None:
+                    self._groups.setdefault(entry[0], []).append(entry[1])
+                    self._dirty.add(entry[0])
+        return self
+
+    def remove(self, transactions: Iterable[dict]) -> "RecurringDetector":
+        """거래 삭제 (묶음 안에서 같은 행 1개씩 지운다)"""
+        with self._lock:
+            for t in transactions:
+                entry = self._entry(t)
+                rows = self._groups.get(entry[0]) if entry is not None else None
+                if rows and entry[1] in rows:
+                    rows.remove(entry[1])
+                    self._dirty.add(entry[0])
+                    if not rows:
+                        del self._groups[entry[0]]
+        return self
+
+    def on_change(self, rows_before: Sequence[dict], change) -> None:
+        """저장소 변경 1건(ledger.store.Change) 반영 (LedgerStore.add_change_hook에 넘길 수 있음)"""
+        if change.op == "insert":
+            self.update(change.rows)
+        elif change.op == "delete":
+            self.remove(rows_before[i] for i in change.indices)
+        elif change.op == "update":
+            self.remove(rows_before[i] for i in change.updates)
+            self.update(change.updates.values())
+        elif change.op == "replace":
+            with self._lock:
+                self._dirty.update(self._groups)
+                self._groups.clear()
+            self.update(change.rows)
+
+    def _bands(self, rows: list[tuple[int, int, str]]) -> list[list[tuple[int, int, str]]]:
+        """금액으로 정렬해서 이웃 금액 차이가 허용 범위인 동안 한 금액대"""
+        rows = sorted(rows, key=lambda r: (r[1], r[0]))
+        bands: list[list[tuple[int, int, str]]] = []
+        for row in rows:
+            if bands and row[1] - bands[-1][-1][1] <= abs(bands[-1][-1][1]) * self.amount_tolerance:
+                bands[-1].append(row)
+            else:
+                bands.append([row])
+        return bands
+
+    def _evaluate(self, key: tuple) -> list[RecurringPattern]:
+        patterns = []
+        for band in self._bands(self._groups.get(key, [])):
+            if len(band) < self.min_occurrences:
+                continue
+            band.sort()
+            found = _period_of([r[0] for r in band])
+            if found is None or found[1] < MIN_CONFIDENCE:
+                continue
+            last = band[-1]
+            patterns.append(RecurringPattern(
+                type=key[0],
+                category=key[1],
+                description=last[2],
+                amount=last[1],
+                period=found[0],
+                dates=[date.fromordinal(r[0]) for r in band],
+                confidence=found[1],
+                currency=key[3],
+            ))
+        return patterns
+
+    def patterns(self) -> list[RecurringPattern]:
+        """반복 거래 목록 (다음 예정일 순)"""
+        with self._lock:
+            for key in self._dirty:
+                self._patterns[key] = self._evaluate(key)
+                if not self._patterns[key]:
+                    del self._patterns[key]
+            self._dirty.clear()
+            result = [p for patterns in self._patterns.values() for p in patterns]
+        result.sort(key=lambda p: (p.next_date(), p.category, p.description))
+        return result
+
+
+@timed("recurring.detect_recurring")
+def detect_recurring(
+    transactions: Iterable[dict],
+    min_occurrences: int = DEFAULT_MIN_OCCURRENCES,
+    amount_tolerance: float = DEFAULT_AMOUNT_TOLERANCE,
+) -> list[RecurringPattern]:
+    """
+    전체 거래에서 반복 거래 찾기
+
+    Args:
+        transactions: 거래 목록 (이터레이터도 가능)
+        min_occurrences: 최소 발생 횟수
+        amount_tolerance: 같은 금액대로 볼 이웃 금액 차이 비율
+
+    Returns:
+        RecurringPattern 목록 (다음 예정일 순)
+    """
+    return RecurringDetector(min_occurrences, amount_tolerance).update(transactions).patterns()
+
+
+@timed("recurring.materialize_upcoming")
+def materialize_upcoming(
+    patterns: Iterable[RecurringPattern],
+    until: date,
+    existing: Iterable[dict] = (),
+    today: Optional[date] = None,
+) -> list[dict]:
+    """
+    다가올 반복 거래 행을 한 번에 만든다 (저장은 호출하는 쪽에서)
+
+    Args:
+        patterns: detect_recurring 결과
+        until: 이 날짜까지의 예정분
+        existing: 이미 있는 거래 (같은 날짜/구분/금액/메모 행이 있으면 만들지 않음)
+        today: 기준일 (끊긴 반복은 건너뜀, None이면 오늘)
+
+    Returns:
+        새 거래 dict 목록 (날짜 순)
+    """
+    today = today or date.today()
+    present = {dedupe_key(t) for t in existing}
+    rows = []
+    for pattern in patterns:
+        if not pattern.is_active(today):
+            continue
+        for day in pattern.occurrences_after(pattern.last, until):
+            row = {
+                "date": day.isoformat(),
+                "type": pattern.type,
+                "category": pattern.category,
+                "description": pattern.description,
+                "amount": pattern.amount,
+            }
+            if pattern.currency != DEFAULT_CURRENCY:
+                row[CURRENCY_FIELD] = pattern.currency  # 외화 구독이 원화 금액으로 바뀌지 않도록
+            key = dedupe_key(row)
+            if key not in present:
+                present.add(key)
+                rows.append(row)
+    rows.sort(key=lambda r: r["date"])
+    return rows
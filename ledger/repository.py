@@ -4,72 +4,870 @@
 
 import os  # # 파일 존재 여부/경로 처리
 import csv  # # CSV 읽기/쓰기
+import json  # # JSONL 내보내기
+import sys  # # stdout 내보내기
+import atexit  # # 종료 시 남은 저장 작업 처리
+import queue  # # write-behind 큐
+import threading  # # write-behind 저장 스레드
+import time  # # 버스트 병합 대기
+import io  # # CSV 한 줄 인코딩
+import gzip  # # 압축 저장 (.gz)
+import bz2  # # 압축 저장 (.bz2)
+import lzma  # # 압축 저장 (.xz)
+import mmap  # # 인덱스 구간 바로 읽기
+from collections import defaultdict  # # 월별 리포트 집계
+from dataclasses import dataclass  # # 파일 형식(dialect) 판별 결과
+from operator import itemgetter  # # 필요한 컬럼만 꺼내기
+from datetime import date  # # 날짜 필터 인자 처리
+from typing import IO, Iterator, Optional, Union
+
+from .models import CURRENCY_FIELD, DEFAULT_CURRENCY, normalize_currency  # # 통화 규칙(도메인 모델과 같이 씀)
+from .csv_index import DateOffsetIndex, index_path, load_or_build_index, read_header
+from .fx import FxRateTable, amount_in
+from .perf import timed
+from .utils import month_key  # # 날짜 차원의 월 키
+from .services import (
+    filter_transactions_by_category,
+    filter_transactions_by_period,
+    filter_transactions_by_type,
+    search_transactions,
+)
 
 # # 거래 데이터의 "표준 컬럼" 약속(팀 공용 규격)
-FIELDNAMES = ["date", "type", "category", "description", "amount"]  # # CSV 헤더 순서
+FIELDNAMES = ["date", "type", "category", "description", "amount"]  # # CSV 헤더 순서 (필수 컬럼)
+# # 선택 컬럼: 없어도 읽을 수 있다 (예전 5컬럼 파일 호환). 통화가 비어 있으면 기본 통화(원화)
+OPTIONAL_FIELDNAMES = [CURRENCY_FIELD]
+CSV_FIELDNAMES = FIELDNAMES + OPTIONAL_FIELDNAMES  # # 저장할 때 쓰는 헤더
+
+DEFAULT_CHUNK_SIZE = 10_000  # # 청크 단위 읽기 기본 크기(행)
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")  # # 지원하는 내보내기 형식
+
+
+# # 쓰기 알림(invalidation) 구독자: 저장 직후 callback(절대경로)이 호출된다
+_write_listeners: list = []
+
+
+def add_write_listener(callback) -> None:
+    # # 공용 캐시(LedgerStore 등)가 "파일이 바뀌었다"는 알림을 받기 위해 등록
+    if callback not in _write_listeners:
+        _write_listeners.append(callback)
+
+
+def remove_write_listener(callback) -> None:
+    if callback in _write_listeners:
+        _write_listeners.remove(callback)
+
+
+def _notify_write(file_path: str) -> None:
+    # # 쓰기 경로가 끝날 때마다 호출 (구독자 오류가 저장을 망치지 않게 무시)
+    path = os.path.abspath(file_path)
+    for callback in list(_write_listeners):
+        try:
+            callback(path)
+        except Exception:
+            pass
 
 
+def currency_of(t: dict) -> str:
+    # # 거래의 통화 (원화 거래는 dict에 currency 키가 없다)
+    return normalize_currency(t.get(CURRENCY_FIELD))
+
+
+def _with_currency(tx: dict, value) -> dict:
+    # # 기본 통화가 아닐 때만 currency 키를 붙인다 (원화만 쓰는 가계부의 dict 모양은 그대로)
+    currency = normalize_currency(value)
+    if currency != DEFAULT_CURRENCY:
+        tx[CURRENCY_FIELD] = currency
+    return tx
+
+
+def _parse_row(row: dict) -> Optional[dict]:
+    # # CSV 한 줄(dict) -> 표준 거래 dict (금액이 깨졌으면 None)
+    try:
+        amount = int(str(row["amount"]).strip())  # # 금액 문자열 -> int
+    except Exception:
+        # # 금액이 깨졌으면 그 줄은 스킵(앱이 죽지 않게)
+        return None
+
+    return _with_currency({
+        "date": str(row["date"]).strip(),  # # 날짜 문자열
+        "type": str(row["type"]).strip(),  # # "지출"/"수입"
+        "category": str(row["category"]).strip(),  # # 카테고리
+        "description": str(row["description"]).strip(),  # # 메모
+        "amount": amount,  # # 정수 금액
+    }, row.get(CURRENCY_FIELD))  # # 통화 (선택 컬럼)
+
+
+def _parse_values(values: tuple) -> Optional[dict]:
+    # # FIELDNAMES(+통화 컬럼이 있으면 currency) 순서의 값 튜플 -> 표준 거래 dict
+    # # (_parse_row와 같은 규칙, dict를 거치지 않아 빠름)
+    if len(values) == len(FIELDNAMES):
+        t_date, t_type, category, description, amount = values
+        currency = None
+    else:
+        t_date, t_type, category, description, amount, currency = values
+    try:
+        amount = int(amount.strip())
+    except ValueError:
+        return None
+    tx = {
+        "date": t_date.strip(),
+        "type": t_type.strip(),
+        "category": category.strip(),
+        "description": description.strip(),
+        "amount": amount,
+    }
+    return _with_currency(tx, currency) if currency else tx
+
+
+def iter_transactions(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list[dict]]:
+    # # 의사코드:
+    # # 1) file_path가 없거나 컬럼이 규격과 다르면 아무것도 내보내지 않음
+    # # 2) CSV를 한 줄씩 읽어서 chunk_size개가 모이면 리스트로 내보냄(yield)
+    # # 3) 파일 전체를 메모리에 올리지 않으므로 큰 파일도 일정한 메모리로 처리 가능
+
+    if not os.path.exists(file_path):  # # 파일 없으면(최초 실행)
+        return
+
+    chunk_size = max(1, int(chunk_size))
+
+    # # 형식(인코딩/구분자/헤더 위치/컬럼 위치)은 첫 블록으로 한 번만 판별하고, 나머지는 그대로 스트리밍
+    # # (BOM, 빈 컬럼, 헤더에 섞인 쓰레기 컬럼/줄이 있어도 표준 컬럼만 골라 읽는다)
+    dialect = sniff_dialect(file_path)
+    if dialect is None:
+        return  # # 표준 컬럼을 찾을 수 없으면 로드 실패(팀 규격 위반)
+
+    pick = itemgetter(*dialect.positions)
+    width = max(dialect.positions) + 1
+
+    # # 압축 파일(.gz/.bz2/.xz)도 풀면서 한 줄씩 읽는다 (전체를 풀어두지 않음)
+    with _open_text(file_path, dialect.encoding) as f:  # # CSV 열기
+        for _ in range(dialect.skip_lines + 1):  # # 쓰레기 줄 + 헤더 건너뛰기
+            f.readline()
+        reader = csv.reader(f, delimiter=dialect.delimiter)
+
+        chunk: list[dict] = []
+        for values in reader:  # # 각 거래(한 줄) 읽기
+            if len(values) < width:
+                continue  # # 빈 줄/잘린 줄
+            tx = _parse_values(pick(values))
+            if tx is None:
+                continue
+            chunk.append(tx)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+@timed("repository.load_transactions")
 def load_transactions(file_path: str) -> list[dict]:
     # # 의사코드:
     # # 1) file_path가 없으면 빈 리스트 반환
-    # # 2) CSV를 열어서 DictReader로 한 줄씩 읽음
+    # # 2) 형식을 판별하고 CSV를 한 줄씩 읽음 (iter_transactions 재사용)
     # # 3) amount는 int로 변환 (CSV는 전부 문자열이기 때문)
     # # 4) 표준 dict 형태로 리스트 반환
 
-    if not os.path.exists(file_path):  # # 파일 없으면(최초 실행)
-        return []  # # 거래 없음
-
     transactions: list[dict] = []  # # 거래 목록 담을 리스트
+    for chunk in iter_transactions(file_path):
+        transactions.extend(chunk)  # # 리스트에 추가
 
-    with open(file_path, "r", encoding="utf-8", newline="") as f:  # # CSV 열기
-        reader = csv.DictReader(f)  # # {"date": "...", "type": "..."} 형태로 읽힘
+    return transactions  # # 거래 목록 반환
 
-        # # CSV 컬럼이 표준 규격과 다른 경우 최소 방어
-        if reader.fieldnames is None:
-            return []  # # 비정상 파일이면 빈 리스트
-        missing = [c for c in FIELDNAMES if c not in reader.fieldnames]
-        if missing:
-            return []  # # 컬럼 누락이면 로드 실패(팀 규격 위반)
 
-        for row in reader:  # # 각 거래(한 줄) 읽기
-            try:
-                amount = int(str(row["amount"]).strip())  # # 금액 문자열 -> int
-            except Exception:
-                # # 금액이 깨졌으면 그 줄은 스킵(앱이 죽지 않게)
+def normalize_transaction(t: dict) -> dict:
+    # # dict 키가 혹시 빠졌더라도 앱이 안 죽게 기본값 처리 (저장 규격으로 정리)
+    return _with_currency({
+        "date": str(t.get("date", "")).strip(),
+        "type": str(t.get("type", "")).strip(),
+        "category": str(t.get("category", "")).strip(),
+        "description": str(t.get("description", "")).strip(),
+        "amount": int(t.get("amount", 0)),  # # int 보장
+    }, t.get(CURRENCY_FIELD))  # # 원화면 currency 키 없음 (저장 시 빈 칸)
+
+
+# # 압축 저장: 확장자로 방식을 고른다 (표준 라이브러리만 사용, 스트리밍 압축/해제)
+_COMPRESSION_OPENERS = {
+    ".gz": lambda path, mode: gzip.open(path, mode, compresslevel=6),
+    ".bz2": lambda path, mode: bz2.open(path, mode),
+    ".xz": lambda path, mode: lzma.open(path, mode),
+    ".lzma": lambda path, mode: lzma.open(path, mode),
+}
+
+
+def compression_of(file_path: str) -> Optional[str]:
+    # # "ledger.csv.gz" -> ".gz", 압축이 아니면 None
+    ext = os.path.splitext(str(file_path))[1].lower()
+    return ext if ext in _COMPRESSION_OPENERS else None
+
+
+def _open_binary(file_path: str, mode: str) -> IO:
+    # # 압축 파일이면 압축/해제 스트림, 아니면 일반 파일 ("rb" | "wb" | "ab")
+    ext = compression_of(file_path)
+    if ext is None:
+        return open(file_path, mode)
+    return _COMPRESSION_OPENERS[ext](file_path, mode)
+
+
+def _open_text(file_path: str, encoding: str = "utf-8-sig") -> IO:
+    # # 읽기용 텍스트 스트림 (utf-8-sig: 앱(app.py)이 BOM을 붙여 저장하므로 BOM 유무와 상관없이 읽는다)
+    return io.TextIOWrapper(_open_binary(file_path, "rb"), encoding=encoding, newline="")
+
+
+# =============================
+# 파일 형식 판별 (sniff): 첫 블록만 보고 인코딩/BOM, 구분자, 헤더 위치, 컬럼 위치를 정한다
+# =============================
+SNIFF_BYTES = 64 * 1024  # # 판별에 쓰는 첫 블록 크기
+SNIFF_MAX_LINES = 20  # # 헤더를 찾을 최대 줄 수 (그 앞은 쓰레기 줄로 보고 건너뜀)
+_DELIMITERS = (",", "\t", ";", "|")
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+# # 헤더 이름 정리: 대소문자/공백 무시 + 한글 헤더 허용
+_HEADER_ALIASES = {
+    "날짜": "date",
+    "구분": "type",
+    "카테고리": "category",
+    "분류": "category",
+    "내용": "description",
+    "메모": "description",
+    "금액": "amount",
+    "통화": "currency",
+}
+
+
+@dataclass(frozen=True)
+class CsvDialect:
+    # # 판별 결과: 이대로 파일 전체를 한 번에 스트리밍으로 읽는다 (재시도 없음)
+    encoding: str  # # "utf-8-sig" | "utf-8" | "cp949"
+    delimiter: str
+    skip_lines: int  # # 헤더 앞에 있는 쓰레기 줄 수
+    header: tuple  # # 원본 헤더 (정리 전)
+    positions: tuple  # # FIELDNAMES 순서대로 원본 컬럼 위치 (통화 컬럼이 있으면 그 위치가 마지막에 붙음)
+
+    @property
+    def extra_columns(self) -> int:
+        # # 표준 컬럼 외에 붙어 있는 컬럼 수 (빈 컬럼, 헤더에 섞인 쓰레기 등)
+        return len(self.header) - len(self.positions)
+
+    @property
+    def has_currency(self) -> bool:
+        # # 선택 컬럼(currency)이 있는 파일인지
+        return len(self.positions) > len(FIELDNAMES)
+
+    @property
+    def is_standard(self) -> bool:
+        # # 바이트 위치 인덱스/덧붙이기를 그대로 쓸 수 있는 형식인지 (utf-8, 쉼표, 첫 줄 헤더, 표준 이름)
+        names = [str(h).strip() for h in self.header]
+        return (
+            self.encoding in ("utf-8", "utf-8-sig")
+            and self.delimiter == ","
+            and self.skip_lines == 0
+            and all(c in names for c in FIELDNAMES)
+        )
+
+
+def _header_name(value: str) -> str:
+    name = str(value).strip().lstrip("\ufeff").strip().casefold()
+    return _HEADER_ALIASES.get(name, name)
+
+
+def _find_columns(fields: list[str]) -> Optional[tuple]:
+    # # 헤더 후보 한 줄 -> FIELDNAMES 순서의 컬럼 위치 (하나라도 없으면 None)
+    # # 통화 컬럼이 있으면 그 위치를 마지막에 덧붙인다
+    positions = {}
+    for i, value in enumerate(fields):
+        positions.setdefault(_header_name(value), i)
+    if any(c not in positions for c in FIELDNAMES):
+        return None
+    return tuple(positions[c] for c in FIELDNAMES if c in positions) + tuple(
+        positions[c] for c in OPTIONAL_FIELDNAMES if c in positions
+    )
+
+
+def sniff_dialect(file_path: str) -> Optional[CsvDialect]:
+    # # 의사코드:
+    # # 1) 첫 블록(SNIFF_BYTES)만 읽는다
+    # # 2) 인코딩: BOM이 있으면 utf-8-sig, utf-8로 풀리면 utf-8, 아니면 cp949(국내 엑셀 저장 파일)
+    # # 3) 앞쪽 SNIFF_MAX_LINES줄 중 표준 컬럼이 모두 있는 첫 줄 = 헤더 (구분자는 , 탭 ; | 순서로 시도)
+    # # 4) 헤더를 못 찾으면 None (읽을 수 없는 파일)
+
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return None
+    with _open_binary(file_path, "rb") as f:
+        block = f.read(SNIFF_BYTES)
+    if len(block) == SNIFF_BYTES and b"\n" in block:
+        block = block[: block.rindex(b"\n") + 1]  # # 잘린 마지막 줄(멀티바이트 문자 포함) 제외
+
+    if block.startswith(_UTF8_BOM):
+        encoding, text = "utf-8-sig", block[len(_UTF8_BOM):].decode("utf-8", "replace")
+    else:
+        try:
+            encoding, text = "utf-8", block.decode("utf-8")
+        except UnicodeDecodeError:
+            encoding, text = "cp949", block.decode("cp949", "replace")
+
+    for line_no, line in enumerate(text.splitlines()[:SNIFF_MAX_LINES]):
+        for delimiter in _DELIMITERS:
+            if delimiter not in line:
                 continue
+            fields = next(csv.reader([line], delimiter=delimiter), [])
+            positions = _find_columns(fields)
+            if positions is not None:
+                return CsvDialect(encoding, delimiter, line_no, tuple(fields), positions)
+    return None
 
-            tx = {
-                "date": str(row["date"]).strip(),  # # 날짜 문자열
-                "type": str(row["type"]).strip(),  # # "지출"/"수입"
-                "category": str(row["category"]).strip(),  # # 카테고리
-                "description": str(row["description"]).strip(),  # # 메모
-                "amount": amount,  # # 정수 금액
-            }
-            transactions.append(tx)  # # 리스트에 추가
 
-    return transactions  # # 거래 목록 반환
+def _fsync_path(file_path: str) -> None:
+    # # 닫힌 파일을 다시 열어 OS 버퍼까지 디스크에 내려쓴다 (압축 스트림은 닫혀야 내용이 완성됨)
+    with open(file_path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def _remove_index(file_path: str) -> None:
+    # # 압축 파일은 바이트 위치가 의미 없으므로 예전 인덱스가 남아 있으면 지운다
+    try:
+        os.remove(index_path(file_path))
+    except OSError:
+        pass
+
+
+class _CsvLineEncoder:
+    # # 거래 1건 -> CSV 한 줄(bytes). 바이트 위치를 세면서 써야 인덱스를 만들 수 있다.
+    def __init__(self, fieldnames: list[str] = CSV_FIELDNAMES):
+        self.buffer = io.StringIO()
+        # # 기본 줄바꿈 \r\n 유지, 원화 거래의 통화 칸은 빈 칸
+        self.writer = csv.DictWriter(self.buffer, fieldnames=fieldnames, restval="")
+
+    def encode(self, row: dict) -> bytes:
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.writer.writerow(row)
+        return self.buffer.getvalue().encode("utf-8")
+
+    def header(self) -> bytes:
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.writer.writeheader()
+        return self.buffer.getvalue().encode("utf-8")
 
 
-def save_transactions(file_path: str, transactions: list[dict]) -> None:
+def _save_index(file_path: str, index: DateOffsetIndex) -> None:
+    # # 인덱스 저장 실패는 본 데이터 저장에 영향을 주지 않게 무시
+    try:
+        index.stamp(file_path)
+        index.save(file_path)
+    except OSError:
+        pass
+
+
+@timed("repository.save_transactions")
+def save_transactions(file_path: str, transactions: list[dict], fsync: bool = False) -> None:
     # # 의사코드:
     # # 1) data/ 폴더가 없으면 생성
     # # 2) CSV를 write 모드로 열어서(덮어쓰기)
-    # # 3) header 작성 후, 모든 거래를 순서대로 저장
+    # # 3) BOM + header 작성 후, 모든 거래를 순서대로 저장
+    # # 4) fsync=True면 OS 버퍼까지 디스크에 내려쓴 뒤 반환 (내구성 보장)
+    # # 5) 쓰면서 센 바이트 위치로 날짜 인덱스(<파일>.idx)도 같이 저장 (압축 파일은 제외)
 
     # # 폴더 자동 생성 (ex: data/ledger.csv)
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if os.path.dirname(file_path):  # # 현재 폴더에 저장하는 경우는 생략
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-    with open(file_path, "w", encoding="utf-8", newline="") as f:  # # 덮어쓰기 저장
-        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)  # # 표준 헤더 고정
-        writer.writeheader()  # # 첫 줄 헤더 쓰기
+    encoder = _CsvLineEncoder()
+    with _open_binary(file_path, "wb") as f:  # # 덮어쓰기 저장 (utf-8, 표준 헤더 고정, 확장자에 따라 압축)
+        header = _UTF8_BOM + encoder.header()  # # BOM을 붙여야 엑셀에서 한글이 깨지지 않는다 (인덱스 위치도 BOM 포함)
+        f.write(header)  # # 첫 줄 헤더 쓰기
+        index = DateOffsetIndex(header_end=len(header), date_column=FIELDNAMES.index("date"))
+        offset = len(header)
 
         for t in transactions:  # # 거래 하나씩 저장
-            # # dict 키가 혹시 빠졌더라도 앱이 안 죽게 기본값 처리
-            row = {
-                "date": str(t.get("date", "")).strip(),
-                "type": str(t.get("type", "")).strip(),
-                "category": str(t.get("category", "")).strip(),
-                "description": str(t.get("description", "")).strip(),
-                "amount": int(t.get("amount", 0)),  # # int 보장
-            }
-            writer.writerow(row)  # # 한 줄 저장
\ No newline at end of file
+            row = normalize_transaction(t)
+            line = encoder.encode(row)
+            f.write(line)  # # 한 줄 저장
+            index.add(row["date"][:10], offset, len(line))
+            offset += len(line)
+
+    if fsync:
+        _fsync_path(file_path)
+
+    if compression_of(file_path):
+        _remove_index(file_path)
+    else:
+        _save_index(file_path, index)
+    _notify_write(file_path)  # # 공용 캐시 무효화 알림
+
+
+@timed("repository.append_transactions")
+def append_transactions(file_path: str, transactions: list[dict], fsync: bool = False) -> None:
+    # # 의사코드:
+    # # 1) 파일이 없으면 save_transactions로 새로 만든다
+    # # 2) 기존 인덱스가 최신이면 이어서 갱신, 아니면 파일을 한 번 훑어서 다시 만든다
+    # # 3) 파일 끝에 줄만 덧붙인다 (전체 다시 쓰기 없음)
+
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        save_transactions(file_path, transactions, fsync=fsync)
+        return
+
+    dialect = sniff_dialect(file_path)
+    if dialect is not None and not compression_of(file_path) and not dialect.is_standard:
+        # # 비표준 형식(cp949, 세미콜론 구분, 헤더 앞 쓰레기 줄 등)에 그대로 덧붙이면 파일이 섞이므로
+        # # 한 번 표준 형식으로 다시 저장한다 (이후 덧붙이기는 다시 빠른 경로)
+        save_transactions(file_path, load_transactions(file_path) + list(transactions), fsync=fsync)
+        return
+
+    rows = [normalize_transaction(t) for t in transactions]
+    if dialect is not None and not dialect.has_currency:
+        if any(CURRENCY_FIELD in row for row in rows):
+            # # 예전 5컬럼 파일에 외화 거래가 들어오면 통화 컬럼이 있는 헤더로 한 번 다시 저장한다
+            save_transactions(file_path, load_transactions(file_path) + rows, fsync=fsync)
+            return
+        encoder = _CsvLineEncoder(FIELDNAMES)  # # 원화 거래만이면 기존 헤더 그대로 덧붙인다
+    else:
+        encoder = _CsvLineEncoder()
+
+    if compression_of(file_path):
+        # # 압축 파일: 새 압축 블록(member/stream)을 끝에 이어 붙인다 (읽을 때 이어서 풀림)
+        with _open_binary(file_path, "ab") as f:
+            for row in rows:
+                f.write(encoder.encode(row))
+        if fsync:
+            _fsync_path(file_path)
+        _notify_write(file_path)
+        return
+
+    index = load_or_build_index(file_path)
+    with open(file_path, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+        f.seek(offset - 1)
+        if f.read(1) not in (b"\n", b"\r"):  # # 마지막 줄에 줄바꿈이 없으면 먼저 붙인다
+            f.write(b"\r\n")
+            offset += 2
+
+        for row in rows:
+            line = encoder.encode(row)
+            f.write(line)
+            index.add(row["date"][:10], offset, len(line))
+            offset += len(line)
+
+    if fsync:
+        _fsync_path(file_path)
+
+    _save_index(file_path, index)
+    _notify_write(file_path)
+
+
+@timed("repository.load_transactions_range")
+def load_transactions_range(
+    file_path: str,
+    start_date: Union[str, date, None] = None,
+    end_date: Union[str, date, None] = None,
+) -> list[dict]:
+    # # 의사코드:
+    # # 1) 날짜 인덱스(<파일>.idx)를 읽는다 (없거나 오래됐으면 한 번 훑어서 다시 만듦)
+    # # 2) 기간에 해당하는 바이트 구간만 mmap으로 잘라서 디코딩/파싱
+    # # 3) 결과는 파일 순서 그대로 (load_transactions + 기간 필터와 같은 결과)
+
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return []
+
+    start = _date_arg(start_date) or ""
+    end = _date_arg(end_date) or "9999-12-31"
+    dialect = sniff_dialect(file_path)
+    if dialect is None:
+        return []
+    if compression_of(file_path) or not dialect.is_standard:
+        # # 압축 파일/비표준 형식은 바이트 위치로 건너뛸 수 없으므로 스트리밍으로 읽으면서 필터
+        return [
+            t for chunk in iter_transactions(file_path)
+            for t in filter_transactions_by_period(chunk, start, end)
+        ]
+
+    index = load_or_build_index(file_path)
+    spans = index.spans_between(start, end)
+    if not spans:
+        return []
+
+    transactions: list[dict] = []
+    with open(file_path, "rb") as f:
+        fieldnames, _ = read_header(f)
+        if [c for c in FIELDNAMES if c not in fieldnames]:
+            return []  # # 컬럼 누락이면 로드 실패(팀 규격 위반)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset, length, _rows in spans:
+                text = mm[offset:offset + length].decode("utf-8")
+                for values in csv.reader(io.StringIO(text)):
+                    tx = _parse_row(dict(zip(fieldnames, values)))
+                    if tx is not None:
+                        transactions.append(tx)
+
+    return transactions
+
+
+# =============================
+# 비동기 저장 (write-behind): UI는 큐에 넣기만 하고 디스크 쓰기는 백그라운드 스레드가 담당
+# =============================
+class WriteBehindWriter:
+    """
+    백그라운드 저장 스레드 + 크기 제한 큐
+
+    - submit(key, write_fn): 저장 작업을 큐에 넣고 바로 반환 (큐가 가득 차면 잠시 대기 = backpressure,
+      block=False면 기다리지 않고 None 반환 -> 호출자가 직접 쓴다)
+    - 같은 key(보통 파일 경로)로 연달아 들어온 작업은 마지막 것 1개만 실행 (버스트 병합)
+    - flush(): 지금까지 넣은 작업이 모두 디스크에 쓰일 때까지 대기 (내구성 배리어)
+    - 프로세스 종료 시(atexit) 남은 작업을 모두 쓴다
+    """
+
+    def __init__(self, max_pending: int = 1024, coalesce_delay: float = 0.05):
+        self.coalesce_delay = coalesce_delay  # # 버스트를 모으기 위해 첫 작업 후 기다리는 시간(초)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._cond = threading.Condition()
+        self._submit_lock = threading.Lock()  # # 번호 매기기 + 큐 넣기를 한 번에 (큐 순서 = 번호 순서, 저장 스레드는 잡지 않음)
+        self._submitted = 0  # # 지금까지 넣은 작업 번호
+        self._completed = 0  # # 이 번호까지는 디스크 반영 완료
+        self._pending_keys: dict[str, int] = {}  # # key -> 마지막으로 넣은 작업 번호
+        self._errors: list[BaseException] = []
+        self.flush_count = 0  # # 실제 디스크 쓰기 묶음 횟수(병합 확인용)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="ledger-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, key: str, write_fn, block: bool = True) -> Optional[int]:
+        """저장 작업 넣기 -> 작업 번호 (block=False인데 큐가 가득 차 있으면 넣지 않고 None)"""
+        if self._closed:  # # 종료 후에는 그냥 바로 쓴다
+            write_fn()
+            return 0
+        with self._submit_lock:
+            with self._cond:
+                self._submitted += 1
+                seq = self._submitted
+                previous = self._pending_keys.get(key)
+                self._pending_keys[key] = seq
+            try:
+                self._queue.put((seq, key, write_fn), block=block)  # # 가득 차면 여기서 대기 (_cond는 놓은 상태)
+            except queue.Full:
+                with self._cond:  # # 넣지 못한 번호는 되돌린다 (다른 submit은 _submit_lock 때문에 끼어들 수 없음)
+                    self._submitted -= 1
+                    if previous is not None and previous > self._completed:
+                        self._pending_keys[key] = previous
+                    else:
+                        del self._pending_keys[key]
+                return None
+        return seq
+
+    def status(self, key: Optional[str] = None) -> str:
+        """저장 상태: "pending"(아직 디스크에 안 씀) 또는 "flushed"(반영 완료)"""
+        with self._cond:
+            if key is None:
+                return "pending" if self._completed < self._submitted else "flushed"
+            return "pending" if key in self._pending_keys else "flushed"
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        지금까지 넣은 작업이 모두 끝날 때까지 대기
+
+        Returns:
+            시간 안에 끝났으면 True
+        Raises:
+            백그라운드 저장 중 발생한 첫 번째 오류
+        """
+        with self._cond:
+            target = self._submitted
+            done = self._cond.wait_for(lambda: self._completed >= target, timeout)
+            if self._errors:
+                error = self._errors.pop(0)
+                raise error
+        return done
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """남은 작업을 모두 쓰고 스레드 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)  # # 종료 신호
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            if batch[0] is not None and self.coalesce_delay > 0:
+                time.sleep(self.coalesce_delay)  # # 뒤따라오는 작업을 조금 더 모은다
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            latest: dict[str, tuple[int, object]] = {}
+            max_seq = None
+            for item in batch:
+                if item is None:
+                    stop = True
+                    continue
+                seq, key, write_fn = item
+                if key not in latest or seq > latest[key][0]:
+                    latest[key] = (seq, write_fn)  # # 같은 key는 번호가 큰 것이 이김
+                max_seq = seq if max_seq is None else max(max_seq, seq)
+
+            for key, (seq, write_fn) in latest.items():
+                try:
+                    write_fn()
+                except BaseException as e:  # # 오류는 flush()에서 호출자에게 전달
+                    with self._cond:
+                        self._errors.append(e)
+
+            if max_seq is not None:
+                with self._cond:
+                    self._completed = max(self._completed, max_seq)
+                    self._pending_keys = {k: s for k, s in self._pending_keys.items() if s > max_seq}
+                    self.flush_count += 1
+                    self._cond.notify_all()
+
+
+_write_behind: Optional[WriteBehindWriter] = None
+_write_behind_lock = threading.Lock()
+
+
+def get_write_behind() -> WriteBehindWriter:
+    # # 프로세스 공용 write-behind 저장 스레드 (처음 호출 시 생성)
+    global _write_behind
+    with _write_behind_lock:
+        if _write_behind is None or _write_behind._closed:
+            _write_behind = WriteBehindWriter()
+        return _write_behind
+
+
+# =============================
+# 스트리밍 내보내기 (청크 읽기 -> 서비스 필터 -> 점진적 쓰기)
+# =============================
+class _CsvExportWriter:
+    """CSV 점진적 쓰기 (헤더 1번 + 청크마다 행 추가)"""
+
+    binary = False
+
+    def __init__(self, stream: IO, fieldnames: list[str]):
+        self.writer = csv.DictWriter(stream, fieldnames=fieldnames, lineterminator="\n")
+        self.writer.writeheader()
+
+    def write(self, rows: list[dict]) -> None:
+        self.writer.writerows(rows)
+
+    def close(self) -> None:
+        pass
+
+
+class _JsonlExportWriter:
+    """JSON Lines 점진적 쓰기 (한 줄 = 한 거래)"""
+
+    binary = False
+
+    def __init__(self, stream: IO, fieldnames: list[str]):
+        self.stream = stream
+        self.fieldnames = fieldnames
+
+    def write(self, rows: list[dict]) -> None:
+        self.stream.writelines(
+            json.dumps({k: r.get(k) for k in self.fieldnames}, ensure_ascii=False) + "\n"
+            for r in rows
+        )
+
+    def close(self) -> None:
+        pass
+
+
+class _ParquetExportWriter:
+    """Parquet 점진적 쓰기 (청크 1개 = row group 1개, pyarrow 필요)"""
+
+    binary = True
+
+    def __init__(self, stream: IO, fieldnames: list[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:  # # 선택 의존성
+            raise ImportError("Parquet 내보내기에는 pyarrow가 필요합니다. (uv pip install pyarrow)") from e
+
+        self.pa = pa
+        self.fieldnames = fieldnames
+        self.schema = pa.schema([
+            (name, pa.int64() if name in ("amount", "income", "expense", "balance", "count") else pa.string())
+            for name in fieldnames
+        ])
+        self.writer = pq.ParquetWriter(stream, self.schema)
+
+    def write(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        columns = {name: [r.get(name) for r in rows] for name in self.fieldnames}
+        self.writer.write_table(self.pa.table(columns, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+_EXPORT_WRITERS = {
+    "csv": _CsvExportWriter,
+    "jsonl": _JsonlExportWriter,
+    "parquet": _ParquetExportWriter,
+}
+
+
+def _open_export_stream(out: Union[str, IO, None], binary: bool) -> tuple[IO, bool]:
+    """내보낼 대상 열기 -> (스트림, 직접 닫아야 하는지)"""
+    if out is None or out == "-":  # # 표준 출력
+        return (sys.stdout.buffer if binary else sys.stdout), False
+    if not isinstance(out, str):  # # 이미 열린 파일 객체
+        return out, False
+
+    if os.path.dirname(out):
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+    if binary:
+        return open(out, "wb"), True
+    # # "report.csv.gz"처럼 압축 확장자면 압축하면서 쓴다
+    return io.TextIOWrapper(_open_binary(out, "wb"), encoding="utf-8", newline=""), True
+
+
+def _filter_chunk(
+    chunk: list[dict],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    transaction_type: Optional[str],
+    category: Optional[str],
+    keyword: Optional[str],
+) -> list[dict]:
+    """청크 하나에 서비스 계층 필터를 순서대로 적용"""
+    if start_date is not None or end_date is not None:
+        chunk = filter_transactions_by_period(chunk, start_date or "", end_date or "9999-12-31")
+    if transaction_type:
+        chunk = filter_transactions_by_type(chunk, transaction_type)
+    if category:
+        chunk = filter_transactions_by_category(chunk, category)
+    if keyword:
+        chunk = search_transactions(chunk, keyword)
+    return chunk
+
+
+def _date_arg(value: Union[str, date, None]) -> Optional[str]:
+    """날짜 필터 인자를 CSV와 같은 "YYYY-MM-DD" 문자열로 맞춘다 (문자열 비교가 날짜 순서와 같음)"""
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def _write_stream(rows_iter, out, fmt: str, fieldnames: list[str]) -> int:
+    """청크 이터레이터를 형식별 writer로 흘려보내고 쓴 행 수를 반환"""
+    if fmt not in _EXPORT_WRITERS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (가능: {', '.join(EXPORT_FORMATS)})")
+
+    writer_cls = _EXPORT_WRITERS[fmt]
+    stream, should_close = _open_export_stream(out, writer_cls.binary)
+    written = 0
+    try:
+        writer = writer_cls(stream, fieldnames)
+        for rows in rows_iter:
+            writer.write(rows)
+            written += len(rows)
+        writer.close()
+        stream.flush()
+    finally:
+        if should_close:
+            stream.close()
+    return written
+
+
+@timed("repository.export_transactions")
+def export_transactions(
+    file_path: str,
+    out: Union[str, IO, None] = None,
+    fmt: str = "csv",
+    start_date: Union[str, date, None] = None,
+    end_date: Union[str, date, None] = None,
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    keyword: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    필터링된 거래 목록을 스트리밍으로 내보낸다 (메모리 사용량 = 청크 1개 분량)
+
+    Args:
+        file_path: 가계부 CSV 경로
+        out: 출력 파일 경로, 열린 파일 객체, 또는 None/"-"(표준 출력)
+        fmt: "csv" | "jsonl" | "parquet"
+        start_date, end_date: 기간 필터 (포함)
+        transaction_type: "지출" 또는 "수입"
+        category: 카테고리 필터
+        keyword: 내용 검색어
+        chunk_size: 한 번에 처리할 행 수
+
+    Returns:
+        내보낸 행 수
+    """
+    start, end = _date_arg(start_date), _date_arg(end_date)
+    chunks = (
+        _filter_chunk(chunk, start, end, transaction_type, category, keyword)
+        for chunk in iter_transactions(file_path, chunk_size)
+    )
+    return _write_stream(chunks, out, fmt, CSV_FIELDNAMES)
+
+
+MONTHLY_REPORT_FIELDS = ["month", "income", "expense", "balance", "count", "unconverted"]
+
+
+@timed("repository.export_monthly_report")
+def export_monthly_report(
+    file_path: str,
+    out: Union[str, IO, None] = None,
+    fmt: str = "csv",
+    start_date: Union[str, date, None] = None,
+    end_date: Union[str, date, None] = None,
+    category: Optional[str] = None,
+    keyword: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fx: Optional[FxRateTable] = None,
+) -> int:
+    """
+    월별 수입/지출/잔액 리포트를 스트리밍 집계로 내보낸다
+
+    원본은 청크 단위로만 읽고, 메모리에는 "월 개수"만큼의 합계만 유지한다.
+    금액은 원화 기준: 외화 행은 fx 환율표로 환산하고, 환산할 수 없으면 합계에서 빼고 unconverted에 센다.
+
+    Returns:
+        내보낸 월(행) 수
+    """
+    start, end = _date_arg(start_date), _date_arg(end_date)
+    totals = defaultdict(lambda: {"income": 0, "expense": 0, "count": 0, "unconverted": 0})
+
+    for chunk in iter_transactions(file_path, chunk_size):
+        for t in _filter_chunk(chunk, start, end, None, category, keyword):
+            month = month_key(t["date"]) or t["date"]  # # 날짜로 읽을 수 없으면 원래 값 그대로 한 줄
+            row = totals[month]
+            row["count"] += 1
+            amount = amount_in(t, fx)  # # 원화 금액 (환율이 없는 외화면 None)
+            if amount is None:
+                row["unconverted"] += 1
+            elif t["type"] == "수입":
+                row["income"] += amount
+            elif t["type"] == "지출":
+                row["expense"] += amount
+
+    report = [
+        {
+            "month": month,
+            "income": v["income"],
+            "expense": v["expense"],
+            "balance": v["income"] - v["expense"],
+            "count": v["count"],
+            "unconverted": v["unconverted"],
+        }
+        for month, v in sorted(totals.items())
+    ]
+    return _write_stream([report], out, fmt, MONTHLY_REPORT_FIELDS)
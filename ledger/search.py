@@ -0,0 +1,289 @@
+# ledger/search.py
+# 역할: 메모 검색 인덱스 - 부분 문자열 / 초성("ㅈㅎㅊ" -> "지하철") / 오타 허용(fuzzy) 검색
+#
+# - 행이 아니라 "서로 다른 메모"만 색인한다 (같은 메모가 많아서 훨씬 작다)
+#   검색 결과는 원래 메모 문자열 집합이므로 화면에서는 df["description"].isin(결과)로 거른다
+# - 메모는 normalize(dedupe.normalize_description 기반)로 정리(대소문자/공백/문장부호 무시)한 뒤
+#   1-gram/2-gram 역색인과 초성 문자열의 1-gram/2-gram 역색인을 만든다
+#   -> 검색어의 n-gram 목록(posting)을 교집합해서 후보만 확인한다 (전체 메모를 훑지 않음)
+# - 오타 허용: 편집 거리 k 이내면 검색어 2-gram 중 최소 (개수 - 2k)개는 메모에도 있다 (q-gram 필터)
+#   후보만 "메모의 아무 부분 문자열과의 편집 거리"(Sellers 알고리즘)로 확인한다
+# - 행 추가/삭제/수정은 add/remove/on_change로 바뀐 메모만 반영한다 (LedgerStore.add_change_hook 연결 가능)
+#
+# 사용 예)
+#   index = DescriptionIndex.build(t["description"] for t in rows)
+#   index.search("ㅈㅎㅊ")   # ["지하철", "지하철 환승", ...]
+#   index.search("스타벅")    # 부분 문자열
+#   index.search("스타벜스")  # 오타 허용 -> "스타벅스 강남점"
+
+import threading
+from typing import Iterable, Optional, Sequence
+
+from .dedupe import normalize_description
+from .perf import timed
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = frozenset(CHOSEONG)
+_JUNGSEONG_COUNT_X_JONGSEONG = 21 * 28  # 초성 1개당 음절 수
+
+
+def choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꾼다 (한글이 아닌 글자는 그대로) - "지하철" -> "ㅈㅎㅊ" """
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // _JUNGSEONG_COUNT_X_JONGSEONG])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+# NFKC(normalize_description)는 호환 자모 "ㅈ"(U+3148)를 첫소리 자모(U+110C)로 바꾸므로 다시 되돌린다
+_CONJOINING_TO_COMPAT = str.maketrans({chr(0x1100 + i): ch for i, ch in enumerate(CHOSEONG)})
+
+
+def normalize(text: str) -> str:
+    """검색용 정리 (normalize_description + 초성은 호환 자모로)"""
+    return normalize_description(text).translate(_CONJOINING_TO_COMPAT)
+
+
+def has_choseong(query: str) -> bool:
+    """검색어에 초성(자음만) 글자가 있는지"""
+    return any(ch in _CHOSEONG_SET for ch in query)
+
+
+def _grams(text: str) -> set[str]:
+    """1-gram + 2-gram"""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _query_grams(text: str) -> set[str]:
+    """후보를 가장 잘 좁히는 n-gram (2글자 이상이면 2-gram만)"""
+    if len(text) < 2:
+        return set(text)
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _char_match(q: str, ch: str) -> bool:
+    """검색어 글자 1개 비교 (초성 글자는 그 초성으로 시작하는 음절과 같다고 본다)"""
+    return q == ch or (q in _CHOSEONG_SET and choseong(ch) == q)
+
+
+def _contains(query: str, text: str) -> bool:
+    """초성이 섞인 검색어의 부분 문자열 일치"""
+    n = len(query)
+    for start in range(len(text) - n + 1):
+        if all(_char_match(q, text[start + i]) for i, q in enumerate(query)):
+            return True
+    return False
+
+
+def substring_distance(query: str, text: str, limit: int) -> int:
+    """
+    query와 text의 "아무 부분 문자열" 사이의 최소 편집 거리 (Sellers 알고리즘)
+
+    limit을 넘는 것이 확실해지면 limit + 1을 바로 돌려준다.
+    """
+    prev = [0] * (len(text) + 1)  # 0행: text 어디서든 시작할 수 있음
+    for i, qc in enumerate(query, 1):
+        cur = [i] + [0] * len(text)
+        for j, tc in enumerate(text, 1):
+            cur[j] = min(prev[j - 1] + (qc != tc), prev[j] + 1, cur[j - 1] + 1)
+        prev = cur
+        if min(prev) > limit:
+            return limit + 1
+    return min(prev)
+
+
+def default_max_distance(query: str) -> int:
+    """검색어 길이별 허용 오타 수 (짧은 검색어는 오타 허용 안 함)"""
+    if len(query) < 4:
+        return 0
+    return 1 if len(query) < 7 else 2
+
+
+class DescriptionIndex:
+    """
+    서로 다른 메모의 검색 인덱스 (행 추가/삭제 시 바뀐 메모만 반영)
+
+    정리한 메모(normalize) 1개에 원래 메모 여러 개("GS25 편의점", "gs25편의점")가 묶일 수 있으며
+    검색 결과는 원래 메모 문자열 목록이다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._ids: dict[str, int] = {}  # 정리한 메모 -> 번호
+        self._keys: list[Optional[str]] = []  # 번호 -> 정리한 메모 (지워진 번호는 None)
+        self._initials: list[str] = []  # 번호 -> 초성 문자열
+        self._originals: list[dict[str, int]] = []  # 번호 -> {원래 메모: 행 수}
+        self._by_original: dict[str, int] = {}  # 원래 메모 -> 번호 (같은 메모를 다시 정리하지 않게)
+        self._counts: list[int] = []  # 번호 -> 행 수 (결과 정렬용)
+        self._grams: dict[str, set[int]] = {}  # n-gram -> 번호들
+        self._initial_grams: dict[str, set[int]] = {}  # 초성 n-gram -> 번호들
+        self._free: list[int] = []  # 다시 쓸 번호
+
+    @classmethod
+    def build(cls, descriptions: Iterable[str]) -> "DescriptionIndex":
+        index = cls()
+        index.add(descriptions)
+        return index
+
+    def __len__(self) -> int:
+        """색인된 (정리한) 메모 수"""
+        return len(self._ids)
+
+    # ----- 변경 -----
+    def add(self, descriptions: Iterable[str]) -> None:
+        with self._lock:
+            for description in descriptions:
+                description = str(description or "")
+                i = self._by_original.get(description)
+                if i is None:
+                    key = normalize(description)
+                    if not key:
+                        continue
+                    i = self._ids.get(key)
+                    if i is None:
+                        i = self._insert_key(key)
+                    self._by_original[description] = i
+                originals = self._originals[i]
+                originals[description] = originals.get(description, 0) + 1
+                self._counts[i] += 1
+
+    def remove(self, descriptions: Iterable[str]) -> None:
+        with self._lock:
+            for description in descriptions:
+                description = str(description or "")
+                i = self._by_original.get(description)
+                if i is None:
+                    continue
+                originals = self._originals[i]
+                originals[description] -= 1
+                self._counts[i] -= 1
+                if originals[description] <= 0:
+                    del originals[description]
+                    del self._by_original[description]
+                if not originals:
+                    self._delete_key(i)
+
+    def on_change(self, rows_before: Sequence[dict], change) -> None:
+        """저장소 변경 1건(ledger.store.Change) 반영 (LedgerStore.add_change_hook에 넘길 수 있음)"""
+        if change.op == "insert":
+            self.add(t.get("description", "") for t in change.rows)
+        elif change.op == "delete":
+            self.remove(rows_before[i].get("description", "") for i in change.indices)
+        elif change.op == "update":
+            self.remove(rows_before[i].get("description", "") for i in change.updates)
+            self.add(t.get("description", "") for t in change.updates.values())
+        elif change.op == "replace":
+            with self._lock:
+                self._clear()
+            self.add(t.get("description", "") for t in change.rows)
+
+    def _insert_key(self, key: str) -> int:
+        initials = choseong(key)
+        if self._free:
+            i = self._free.pop()
+            self._keys[i], self._initials[i], self._originals[i], self._counts[i] = key, initials, {}, 0
+        else:
+            i = len(self._keys)
+            self._keys.append(key)
+            self._initials.append(initials)
+            self._originals.append({})
+            self._counts.append(0)
+        self._ids[key] = i
+        for gram in _grams(key):
+            self._grams.setdefault(gram, set()).add(i)
+        for gram in _grams(initials):
+            self._initial_grams.setdefault(gram, set()).add(i)
+        return i
+
+    def _delete_key(self, i: int) -> None:
+        key, initials = self._keys[i], self._initials[i]
+        for postings, text in ((self._grams, key), (self._initial_grams, initials)):
+            for gram in _grams(text):
+                ids = postings.get(gram)
+                if ids is not None:
+                    ids.discard(i)
+                    if not ids:
+                        del postings[gram]
+        del self._ids[key]
+        self._keys[i] = None
+        self._initials[i] = ""
+        self._originals[i] = {}
+        self._free.append(i)
+
+    # ----- 검색 -----
+    @staticmethod
+    def _intersect(postings: dict[str, set[int]], grams: set[str]) -> set[int]:
+        lists = sorted((postings.get(g, set()) for g in grams), key=len)
+        if not lists:
+            return set()
+        result = set(lists[0])
+        for ids in lists[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def _fuzzy(self, query: str, max_distance: int) -> dict[int, int]:
+        """q-gram 필터로 후보를 줄인 뒤 부분 문자열 편집 거리 확인 -> {번호: 거리}"""
+        grams = [query[i:i + 2] for i in range(len(query) - 1)]
+        need = len(grams) - 2 * max_distance
+        if need < 1:
+            return {}
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for i in self._grams.get(gram, ()):
+                counts[i] = counts.get(i, 0) + 1
+        result = {}
+        for i, n in counts.items():
+            if n >= need:
+                distance = substring_distance(query, self._keys[i], max_distance)
+                if distance <= max_distance:
+                    result[i] = distance
+        return result
+
+    @timed("search.search")
+    def search(self, query: str, fuzzy: bool = True, max_distance: Optional[int] = None) -> list[str]:
+        """
+        메모 검색
+
+        Args:
+            query: 검색어 (초성만/초성 섞인 검색어 가능: "ㅈㅎㅊ", "지ㅎ철")
+            fuzzy: 오타 허용 여부 (초성 검색에는 적용 안 함)
+            max_distance: 허용 오타 수 (None이면 검색어 길이로 결정)
+
+        Returns:
+            일치하는 원래 메모 목록 (정확히 포함 -> 오타 적은 순, 같은 순위는 사용 빈도 순)
+        """
+        q = normalize(query)
+        if not q:
+            return []
+
+        with self._lock:
+            if has_choseong(q):
+                initials = choseong(q)
+                candidates = self._intersect(self._initial_grams, _query_grams(initials))
+                if initials == q:  # 초성만: 초성 문자열끼리 비교
+                    ranked = {i: 0 for i in candidates if q in self._initials[i]}
+                else:
+                    ranked = {i: 0 for i in candidates if _contains(q, self._keys[i])}
+            else:
+                candidates = self._intersect(self._grams, _query_grams(q))
+                ranked = {i: 0 for i in candidates if q in self._keys[i]}
+                if fuzzy:
+                    limit = default_max_distance(q) if max_distance is None else max_distance
+                    if limit > 0:
+                        for i, distance in self._fuzzy(q, limit).items():
+                            ranked.setdefault(i, distance)
+
+            counts, keys = self._counts, self._keys
+            order = sorted(ranked, key=lambda i: (ranked[i], -counts[i], keys[i]))
+            return [description for i in order for description in self._originals[i]]
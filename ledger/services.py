@@ -2,10 +2,17 @@
 # 역할: 비즈니스 로직 (계산/통계) 담당
 # UI(app.py)는 여기 함수들을 호출만 한다.
 
-from collections import defaultdict
-from typing import Optional
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Iterable, Optional, Sequence
 
+from .fx import FxRateTable, amount_in
+from .perf import timed
+from .utils import DATE_DIMENSION, PERIODS, month_key
 
+
+@timed("services.calc_summary")
 def calc_summary(transactions: list[dict]) -> tuple[int, int, int]:
     """
     거래 목록에서 총 수입, 총 지출, 잔액을 계산
@@ -39,6 +46,7 @@ def calc_summary(transactions: list[dict]) -> tuple[int, int, int]:
     return income, expense, balance
 
 
+@timed("services.calc_detailed_summary")
 def calc_detailed_summary(transactions: list[dict]) -> dict:
     """
     거래 목록의 상세 통계를 계산
@@ -85,6 +93,7 @@ def calc_detailed_summary(transactions: list[dict]) -> dict:
     }
 
 
+@timed("services.calc_category_expense")
 def calc_category_expense(transactions: list[dict]) -> dict[str, int]:
     """
     카테고리별 지출 합계를 계산 (지출만 대상)
@@ -116,6 +125,7 @@ def calc_category_expense(transactions: list[dict]) -> dict[str, int]:
     return dict(totals)
 
 
+@timed("services.calc_budget_status")
 def calc_budget_status(
     spent: int, budget: int
 ) -> tuple[float, str, str]:
@@ -160,6 +170,7 @@ def calc_budget_status(
     return ratio, status, message
 
 
+@timed("services.filter_transactions_by_period")
 def filter_transactions_by_period(
     transactions: list[dict],
     start_date,
@@ -182,6 +193,7 @@ def filter_transactions_by_period(
     ]
 
 
+@timed("services.filter_transactions_by_type")
 def filter_transactions_by_type(
     transactions: list[dict],
     transaction_type: str
@@ -202,6 +214,7 @@ def filter_transactions_by_type(
     ]
 
 
+@timed("services.filter_transactions_by_category")
 def filter_transactions_by_category(
     transactions: list[dict],
     category: str
@@ -222,9 +235,11 @@ def filter_transactions_by_category(
     ]
 
 
+@timed("services.search_transactions")
 def search_transactions(
     transactions: list[dict],
-    keyword: str
+    keyword: str,
+    fuzzy: bool = False,
 ) -> list[dict]:
     """
     내용(description)으로 거래 검색
@@ -232,6 +247,7 @@ def search_transactions(
     Args:
         transactions: 거래 목록
         keyword: 검색 키워드
+        fuzzy: True면 초성("ㅈㅎㅊ")/오타 허용 검색 (search.DescriptionIndex 사용)
     
     Returns:
         검색 결과 거래 목록
@@ -239,6 +255,12 @@ def search_transactions(
     if not keyword.strip():
         return transactions
 
+    if fuzzy:
+        from .search import DescriptionIndex  # 초성/오타 검색을 쓸 때만 불러온다
+
+        matched = set(DescriptionIndex.build(t.get("description", "") for t in transactions).search(keyword))
+        return [t for t in transactions if str(t.get("description", "") or "") in matched]
+
     keyword_lower = keyword.strip().lower()
     return [
         t for t in transactions
@@ -246,6 +268,7 @@ def search_transactions(
     ]
 
 
+@timed("services.get_top_expense_categories")
 def get_top_expense_categories(
     transactions: list[dict],
     limit: int = 5
@@ -270,4 +293,468 @@ def get_top_expense_categories(
         key=lambda x: x[1],
         reverse=True
     )
-    return sorted_items[:limit]
\ No newline at end of file
+    return sorted_items[:limit]
+
+
+@timed("services.calc_period_summary")
+def calc_period_summary(transactions: Iterable[dict], period: str = "month") -> dict[str, dict]:
+    """
+    기간(일/주/월/분기/연)별 수입/지출 합계
+
+    날짜 묶기는 utils.DATE_DIMENSION을 거친다 (같은 날짜 문자열은 한 번만 해석).
+
+    Args:
+        transactions: 거래 목록
+        period: "day" | "week" | "month" | "quarter" | "year" (주는 ISO 주 "2024-W03")
+
+    Returns:
+        {기간 키: {"income": 수입, "expense": 지출, "balance": 잔액, "count": 건수}} (기간 순)
+    """
+    if period not in PERIODS:
+        raise ValueError(f"알 수 없는 기간 단위입니다: {period} (가능: {', '.join(PERIODS)})")
+    totals: dict[str, dict] = {}
+    for t in transactions:
+        key = DATE_DIMENSION.period_key(t.get("date"), period)
+        if key is None:
+            continue
+        row = totals.get(key)
+        if row is None:
+            row = totals[key] = {"income": 0, "expense": 0, "balance": 0, "count": 0}
+        t_type = str(t.get("type", "")).strip()
+        amount = int(t.get("amount", 0))
+        if t_type == "수입":
+            row["income"] += amount
+            row["balance"] += amount
+        elif t_type == "지출":
+            row["expense"] += amount
+            row["balance"] -= amount
+        row["count"] += 1
+    return dict(sorted(totals.items()))
+
+
+@timed("services.calc_expense_distribution")
+def calc_expense_distribution(
+    transactions: Iterable[dict],
+    k: Optional[int] = None,
+    transaction_type: Optional[str] = "지출",
+) -> dict:
+    """
+    거래 금액 분포 통계 (중앙값/p90/p99 + 카테고리별 히스토그램)
+
+    전체를 정렬하지 않고 KLL 스케치로 근사한다 (sketches.py 참고).
+    청크가 여러 개면 SpendingDistribution을 직접 써서 update_many/merge로 합친다.
+
+    Args:
+        transactions: 거래 목록 (이터레이터도 가능)
+        k: 스케치 정확도 (순위 오차 ≈ 3.3 / k, None이면 sketches.DEFAULT_K)
+        transaction_type: 대상 구분 (None이면 전체)
+
+    Returns:
+        {
+            "overall": {"count", "total", "mean", "min", "max", "median", "p90", "p99"},
+            "categories": {카테고리: {... + "histogram": [{"lower", "upper", "count"}, ...]}}
+        }
+    """
+    from .sketches import DEFAULT_K, SpendingDistribution  # 분포 통계를 쓸 때만 불러온다
+
+    dist = SpendingDistribution(transaction_type=transaction_type, k=k or DEFAULT_K).update_many(transactions)
+    return {"overall": dist.summary(), "categories": dist.category_summary()}
+
+
+def _add_count(counts: dict, key, delta: int) -> None:
+    """건수 카운터에 더하고 0이 되면 키를 지운다"""
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+class CategoryMonthPivot:
+    """
+    카테고리 × 월 금액 피벗 (히트맵용)
+
+    - build/add 한 번의 group-by 패스로 전체 행렬을 만든다 (카테고리별/월별로 다시 필터링하지 않음)
+    - 행이 추가/삭제되면 해당 칸만 더하고 뺀다 (add/remove/apply_changes)
+    - 지난 달(마감된 달)의 열은 한 번 만든 값을 캐시해 두고, 그 달의 행이 바뀔 때만 다시 만든다
+      (이번 달 열은 자주 바뀌므로 매번 만든다)
+    - 금액은 원화 기준: 외화 행은 fx 환율표로 환산하고, 환산할 수 없으면 칸에 넣지 않고 월별 건수만 센다
+    """
+
+    def __init__(
+        self,
+        transaction_type: Optional[str] = "지출",
+        today: Optional[date] = None,
+        fx: Optional[FxRateTable] = None,
+    ):
+        self.transaction_type = transaction_type
+        self.today = today
+        self.fx = fx
+        self._cells: dict[str, dict[str, int]] = {}  # {"YYYY-MM": {카테고리: 합계}}
+        self._closed_columns: dict[str, tuple] = {}  # {"YYYY-MM": (카테고리 순서, 열 값)} 마감된 달만
+        self._unconverted: dict[str, int] = {}  # {"YYYY-MM": 환산하지 못해 뺀 외화 행 수}
+
+    @classmethod
+    def build(cls, transactions: Iterable[dict], **kwargs) -> "CategoryMonthPivot":
+        pivot = cls(**kwargs)
+        pivot.add(transactions)
+        return pivot
+
+    def _current_month(self) -> str:
+        return month_key(self.today or date.today())
+
+    def _apply(self, transactions: Iterable[dict], sign: int) -> None:
+        cells = self._cells
+        touched = set()
+        for t in transactions:
+            if self.transaction_type is not None and str(t.get("type", "")).strip() != self.transaction_type:
+                continue
+            month = month_key(t.get("date"))
+            if month is None:
+                continue
+            value = amount_in(t, self.fx)
+            if value is None:
+                _add_count(self._unconverted, month, sign)
+                continue
+            category = str(t.get("category", "")).strip() or "기타"
+            column = cells.get(month)
+            if column is None:
+                column = cells[month] = {}
+            amount = column.get(category, 0) + sign * value
+            if amount or sign > 0:
+                column[category] = amount
+            else:
+                column.pop(category, None)
+            touched.add(month)
+
+        for month in touched:
+            self._closed_columns.pop(month, None)
+            if not cells.get(month):
+                cells.pop(month, None)
+
+    def add(self, transactions: Iterable[dict]) -> None:
+        """행 추가 반영"""
+        self._apply(transactions, 1)
+
+    def remove(self, transactions: Iterable[dict]) -> None:
+        """행 삭제 반영"""
+        self._apply(transactions, -1)
+
+    def apply_changes(self, rows_before: list[dict], changes: list) -> list[dict]:
+        """
+        저장소 변경 기록(ledger.store.Change)을 반영
+
+        Args:
+            rows_before: 변경 전 행 목록 (수정하지 않음)
+            changes: 순서대로 적용할 변경 기록
+
+        Returns:
+            변경 후 행 목록 (다음 apply_changes의 rows_before로 사용)
+        """
+        rows = list(rows_before)
+        for c in changes:
+            if c.op == "insert":
+                self.add(c.rows)
+                rows[c.position:c.position] = c.rows
+            elif c.op == "delete":
+                self.remove(rows[i] for i in c.indices)
+                for i in reversed(c.indices):
+                    del rows[i]
+            elif c.op == "update":
+                self.remove(rows[i] for i in c.updates)
+                self.add(c.updates.values())
+                for i, row in c.updates.items():
+                    rows[i] = row
+            elif c.op == "replace":
+                self._cells.clear()
+                self._closed_columns.clear()
+                self._unconverted.clear()
+                self.add(c.rows)
+                rows = list(c.rows)
+        return rows
+
+    def months(self) -> list[str]:
+        return sorted(self._cells)
+
+    def unconverted_count(self, month: Optional[str] = None) -> int:
+        """환율이 없어 합계에서 뺀 외화 행 수 (month를 주면 그 달만)"""
+        if month is not None:
+            return self._unconverted.get(month, 0)
+        return sum(self._unconverted.values())
+
+    def categories(self) -> list[str]:
+        """카테고리 목록 (전체 합계 큰 순)"""
+        totals: dict[str, int] = defaultdict(int)
+        for column in self._cells.values():
+            for category, amount in column.items():
+                totals[category] += amount
+        return sorted(totals, key=lambda c: (-totals[c], c))
+
+    def _column(self, month: str, categories: tuple, closed: bool) -> tuple:
+        cached = self._closed_columns.get(month)
+        if cached is not None and cached[0] == categories:
+            return cached[1]
+        column = self._cells.get(month, {})
+        values = tuple(column.get(c, 0) for c in categories)
+        if closed:
+            self._closed_columns[month] = (categories, values)
+        return values
+
+    def matrix(self, months: Optional[list[str]] = None) -> dict:
+        """
+        피벗 행렬
+
+        Args:
+            months: 보여줄 월 목록 (None이면 데이터가 있는 전체 월)
+
+        Returns:
+            {"months": [...], "categories": [...], "values": [[카테고리별 월 값], ...]}
+            values[i][j] = categories[i]의 months[j] 합계 (원화, 뺀 외화 행 수는 unconverted_count)
+        """
+        months = self.months() if months is None else list(months)
+        categories = tuple(self.categories())
+        current = self._current_month()
+        columns = [self._column(m, categories, closed=m < current) for m in months]
+        values = [list(row) for row in zip(*columns)] if columns else [[] for _ in categories]
+        return {"months": months, "categories": list(categories), "values": values}
+
+
+@timed("services.calc_category_month_pivot")
+def calc_category_month_pivot(
+    transactions: Iterable[dict], transaction_type: Optional[str] = "지출", fx: Optional[FxRateTable] = None
+) -> dict:
+    """
+    카테고리 × 월 피벗을 한 번의 패스로 계산
+
+    Returns:
+        CategoryMonthPivot.matrix() 형식
+    """
+    return CategoryMonthPivot.build(transactions, transaction_type=transaction_type, fx=fx).matrix()
+
+
+BUDGET_TOTAL = "전체"  # 월 전체 예산 키
+BUDGET_THRESHOLDS = (0.8, 1.0)  # calc_budget_status의 "경고"/"초과" 경계
+_STATUS_LEVEL = {"미설정": 0, "정상": 0, "경고": 1, "초과": 2}
+
+
+@dataclass
+class BudgetEvent:
+    """예산 임계값(80%/100%)을 넘었거나 다시 내려온 사건"""
+
+    month: str  # "YYYY-MM"
+    category: str  # BUDGET_TOTAL("전체")이면 월 전체
+    previous: str  # 이전 상태
+    status: str  # 새 상태 ("정상"/"경고"/"초과")
+    spent: int
+    budget: int
+    ratio: float
+    message: str
+    version: Optional[int] = None  # 이 사건을 만든 저장소 변경 버전 (알 수 없으면 None)
+
+    @property
+    def threshold(self) -> Optional[float]:
+        """넘은(또는 내려온) 경계 중 가장 높은 값 (0.8 또는 1.0)"""
+        low, high = sorted((_STATUS_LEVEL[self.previous], _STATUS_LEVEL[self.status]))
+        return BUDGET_THRESHOLDS[high - 1] if high > low else None
+
+    @property
+    def escalated(self) -> bool:
+        """임계값을 위로 넘었는지 (False면 삭제/수정으로 다시 내려온 것)"""
+        return _STATUS_LEVEL[self.status] > _STATUS_LEVEL[self.previous]
+
+
+class BudgetMonitor:
+    """
+    (월, 카테고리)별 지출 카운터 + 예산 임계값 사건 알림
+
+    - 행이 추가/삭제/수정되면 그 행의 (월, 카테고리)와 (월, "전체") 카운터만 더하고 빼서
+      그 키들만 calc_budget_status로 다시 평가한다 (변경 1행당 O(1), 전체를 다시 필터링하지 않음)
+    - 상태가 "정상" <-> "경고"(80%) <-> "초과"(100%) 사이에서 바뀌면 BudgetEvent를 구독자에게 보낸다
+    - 예산은 월마다 같은 값({"전체": 금액, 카테고리: 금액})을 쓴다
+    - 예산은 원화 기준: 외화 행은 fx 환율표로 환산해서 더하고, 환산할 수 없으면 더하지 않고
+      (월, 카테고리)별 건수만 센다 (unconverted_count로 화면에 "n건 빠짐" 표시)
+
+    사용 예)
+        monitor = BudgetMonitor({"전체": 1000000, "식비": 300000})
+        monitor.subscribe(lambda e: print(e.month, e.category, e.status))
+        store.add_change_hook(monitor.on_change, replay=True)
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[dict] = None,
+        transaction_type: str = "지출",
+        max_events: int = 100,
+        fx: Optional[FxRateTable] = None,
+    ):
+        self.transaction_type = transaction_type
+        self.budgets: dict[str, int] = {k: int(v) for k, v in (budgets or {}).items()}
+        self.fx = fx
+        self._spent: dict[tuple[str, str], int] = {}  # {(월, 카테고리): 원화 합계}
+        self._unconverted: dict[tuple[str, str], int] = {}  # {(월, 카테고리): 환산하지 못해 뺀 외화 행 수}
+        self._states: dict[tuple[str, str], str] = {}  # {(월, 카테고리): 마지막 상태} "정상"/"미설정"은 저장 안 함
+        self._subscribers: list[Callable[[BudgetEvent], None]] = []
+        self._recent: deque[BudgetEvent] = deque(maxlen=max_events)  # 최근 사건 (구독하지 않은 쪽이 나중에 확인)
+
+    # ----- 구독 -----
+    def subscribe(self, callback: Callable[[BudgetEvent], None]) -> None:
+        """임계값 사건마다 callback(BudgetEvent) 호출"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[BudgetEvent], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    # ----- 카운터 -----
+    def _apply(self, transactions: Iterable[dict], sign: int, touched: set) -> None:
+        spent = self._spent
+        for t in transactions:
+            if str(t.get("type", "")).strip() != self.transaction_type:
+                continue
+            month = month_key(t.get("date"))
+            if month is None:
+                continue
+            category = str(t.get("category", "")).strip() or "기타"
+            value = amount_in(t, self.fx)
+            if value is None:
+                _add_count(self._unconverted, (month, category), sign)
+                _add_count(self._unconverted, (month, BUDGET_TOTAL), sign)
+                continue
+            amount = sign * value
+            for key in ((month, category), (month, BUDGET_TOTAL)):
+                value = spent.get(key, 0) + amount
+                if value:
+                    spent[key] = value
+                else:
+                    spent.pop(key, None)
+                touched.add(key)
+
+    def _evaluate(self, keys: Iterable[tuple[str, str]], version: Optional[int], emit: bool = True) -> list[BudgetEvent]:
+        events = []
+        for key in keys:
+            month, category = key
+            spent = self._spent.get(key, 0)
+            budget = self.budgets.get(category, 0)
+            ratio, status, message = calc_budget_status(spent, budget)
+            previous = self._states.get(key, "정상")
+            if _STATUS_LEVEL[status] == _STATUS_LEVEL[previous]:
+                continue
+            if _STATUS_LEVEL[status]:
+                self._states[key] = status
+            else:
+                self._states.pop(key, None)
+            events.append(BudgetEvent(month, category, previous, status, spent, budget, ratio, message, version))
+
+        if emit:
+            self._recent.extend(events)
+            for event in events:
+                for callback in list(self._subscribers):
+                    try:
+                        callback(event)
+                    except Exception:
+                        pass
+        return events
+
+    def add(self, transactions: Iterable[dict], version: Optional[int] = None) -> list[BudgetEvent]:
+        """행 추가 반영 -> 발생한 사건 목록"""
+        touched: set = set()
+        self._apply(transactions, 1, touched)
+        return self._evaluate(touched, version)
+
+    def remove(self, transactions: Iterable[dict], version: Optional[int] = None) -> list[BudgetEvent]:
+        """행 삭제 반영 -> 발생한 사건 목록"""
+        touched: set = set()
+        self._apply(transactions, -1, touched)
+        return self._evaluate(touched, version)
+
+    def update(
+        self, old_rows: Iterable[dict], new_rows: Iterable[dict], version: Optional[int] = None
+    ) -> list[BudgetEvent]:
+        """행 수정 반영 (빼고 더한 뒤 한 번만 평가하므로 같은 키 안의 수정은 사건이 흔들리지 않는다)"""
+        touched: set = set()
+        self._apply(old_rows, -1, touched)
+        self._apply(new_rows, 1, touched)
+        return self._evaluate(touched, version)
+
+    def reset(self, transactions: Iterable[dict]) -> None:
+        """카운터를 처음부터 다시 만든다 (사건은 보내지 않음)"""
+        self._spent.clear()
+        self._unconverted.clear()
+        self._states.clear()
+        touched: set = set()
+        self._apply(transactions, 1, touched)
+        self._evaluate(touched, None, emit=False)
+
+    def set_budgets(self, budgets: dict) -> None:
+        """예산 변경 (사건은 보내지 않고 상태만 다시 평가)"""
+        self.budgets = {k: int(v) for k, v in budgets.items()}
+        self._evaluate(set(self._spent) | set(self._states), None, emit=False)
+
+    # ----- 저장소 연결 -----
+    def on_change(self, rows_before: Sequence[dict], change) -> list[BudgetEvent]:
+        """
+        저장소 변경 1건(ledger.store.Change) 반영 (LedgerStore.add_change_hook에 그대로 넘길 수 있음)
+
+        Args:
+            rows_before: 변경 전 행 목록 (delete/update 대상 행을 위치로 찾는 데만 사용)
+            change: 변경 기록
+
+        Returns:
+            발생한 사건 목록 (replace는 전체를 다시 세고, 이전 상태와 달라진 키를 모두 알린다)
+        """
+        if change.op == "insert":
+            return self.add(change.rows, change.version)
+        if change.op == "delete":
+            return self.remove((rows_before[i] for i in change.indices), change.version)
+        if change.op == "update":
+            return self.update((rows_before[i] for i in change.updates), change.updates.values(), change.version)
+        if change.op == "replace":
+            self._spent.clear()
+            self._unconverted.clear()
+            touched: set = set(self._states)
+            self._apply(change.rows, 1, touched)
+            return self._evaluate(touched, change.version)
+        raise ValueError(f"알 수 없는 변경 종류: {change.op}")
+
+    def apply_changes(self, rows_before: list[dict], changes: list) -> list[dict]:
+        """
+        변경 기록 여러 건을 순서대로 반영 (CategoryMonthPivot.apply_changes와 같은 사용법)
+
+        Returns:
+            변경 후 행 목록
+        """
+        rows = list(rows_before)
+        for c in changes:
+            self.on_change(rows, c)
+            if c.op == "insert":
+                rows[c.position:c.position] = c.rows
+            elif c.op == "delete":
+                for i in reversed(c.indices):
+                    del rows[i]
+            elif c.op == "update":
+                for i, row in c.updates.items():
+                    rows[i] = row
+            elif c.op == "replace":
+                rows = list(c.rows)
+        return rows
+
+    # ----- 조회 -----
+    def spent(self, month: str, category: str = BUDGET_TOTAL) -> int:
+        """(월, 카테고리) 지출 합계"""
+        return self._spent.get((month, category), 0)
+
+    def unconverted_count(self, month: str, category: str = BUDGET_TOTAL) -> int:
+        """(월, 카테고리)에서 환율이 없어 지출 합계에 넣지 못한 외화 행 수"""
+        return self._unconverted.get((month, category), 0)
+
+    def status(self, month: str, category: str = BUDGET_TOTAL) -> tuple[float, str, str]:
+        """(월, 카테고리)의 calc_budget_status 결과 (진행률, 상태, 메시지)"""
+        return calc_budget_status(self.spent(month, category), self.budgets.get(category, 0))
+
+    def recent_events(self, version: Optional[int] = None) -> list[BudgetEvent]:
+        """최근 사건 (version을 주면 그 저장소 변경으로 생긴 것만)"""
+        return [e for e in self._recent if version is None or e.version == version]
+
+    def alerts(self, month: Optional[str] = None) -> dict[tuple[str, str], str]:
+        """현재 "경고"/"초과" 상태인 키 {(월, 카테고리): 상태} (month를 주면 그 달만)"""
+        return {k: s for k, s in self._states.items() if month is None or k[0] == month}
@@ -0,0 +1,361 @@
+# ledger/sketches.py
+# 역할: 합칠 수 있는(mergeable) 스트리밍 분포 통계 - 분위수(KLL 스케치) + 금액 구간 히스토그램
+#       + 서로 다른 값 개수(HyperLogLog)
+#
+# - 전체 데이터를 정렬하지 않고 청크 단위로 넣으면서 중앙값/p90/p99를 근사한다
+# - 파티션/워커 프로세스별로 만든 스케치를 merge()로 합칠 수 있다 (pickle 가능한 순수 파이썬 객체)
+# - 정확도는 k로 조절: 순위(rank) 오차 ≈ 3.3 / k  (k=200 -> 약 1.65%)
+#   데이터가 스케치 용량보다 적으면 압축이 일어나지 않아 정확한 값이 나온다
+# - HyperLogLog: 메모/가맹점 종류 수를 2**p 바이트로 센다. 상대 오차 ≈ 1.04 / sqrt(2**p) (p=12 -> 약 1.6%)
+#
+# 사용 예)
+#   dist = SpendingDistribution()
+#   for chunk in iter_transactions(path):
+#       dist.update_many(chunk)
+#   dist.summary()["p90"]
+
+import hashlib
+import math
+import random
+from typing import Iterable, Optional
+
+DEFAULT_K = 200
+RANK_ERROR_FACTOR = 3.3  # 순위 오차 ≈ RANK_ERROR_FACTOR / k (경험적 값)
+
+# 금액 히스토그램 구간 경계(원): 1-2-5 간격, 1,000원 ~ 10억원
+HISTOGRAM_BOUNDS = [m * 10 ** e for e in range(3, 10) for m in (1, 2, 5)]
+
+DEFAULT_HLL_PRECISION = 12  # HyperLogLog 레지스터 수 = 2**p
+
+
+def k_for_error(rank_error: float) -> int:
+    """원하는 순위 오차(예: 0.01 = 1%)에 필요한 k"""
+    if not 0 < rank_error < 1:
+        raise ValueError(f"rank_error는 0과 1 사이여야 합니다: {rank_error}")
+    return max(8, math.ceil(RANK_ERROR_FACTOR / rank_error))
+
+
+class KLLSketch:
+    """
+    KLL 분위수 스케치 (Karnin–Lang–Liberty)
+
+    높이 h의 compactor에 있는 값은 가중치 2**h를 가진다.
+    compactor가 가득 차면 정렬 후 짝/홀수 번째 중 하나(무작위)만 위 단계로 올린다.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, c: float = 2 / 3, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError(f"k는 8 이상이어야 합니다: {k}")
+        self.k = k
+        self.c = c
+        self.n = 0  # 넣은 값 개수
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.compactors: list[list[float]] = []
+        self._size = 0
+        self._max_size = 0
+        self._rng = random.Random(seed)
+        self._grow()
+
+    @property
+    def rank_error(self) -> float:
+        """근사 순위 오차"""
+        return RANK_ERROR_FACTOR / self.k
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self.compactors) - height - 1
+        return int(math.ceil(self.c ** depth * self.k)) + 1
+
+    def _grow(self) -> None:
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def update(self, value: float) -> None:
+        """값 1개 추가"""
+        self.n += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.compactors[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update_many(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.update(value)
+
+    def _compress(self) -> None:
+        for h in range(len(self.compactors)):
+            items = self.compactors[h]
+            if len(items) < self._capacity(h):
+                continue
+            if h + 1 >= len(self.compactors):
+                self._grow()
+
+            items.sort()
+            leftover = items.pop() if len(items) % 2 else None
+            self.compactors[h + 1].extend(items[self._rng.random() < 0.5::2])
+            items.clear()
+            if leftover is not None:
+                items.append(leftover)
+
+            self._size = sum(len(c) for c in self.compactors)
+            if self._size < self._max_size:
+                break
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """다른 스케치를 합친다 (self를 바꾸고 반환)"""
+        if other.n == 0:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for h, items in enumerate(other.compactors):
+            self.compactors[h].extend(items)
+        self.n += other.n
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._size = sum(len(c) for c in self.compactors)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _weighted(self) -> list[tuple[float, int]]:
+        items = [(value, 1 << h) for h, values in enumerate(self.compactors) for value in values]
+        items.sort()
+        return items
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수 (0 <= q <= 1, 값이 없으면 None)"""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Iterable[float]) -> list[Optional[float]]:
+        """여러 분위수를 한 번에 (정렬은 스케치 크기만큼만)"""
+        qs = list(qs)
+        if self.n == 0:
+            return [None] * len(qs)
+        items = self._weighted()
+        total = sum(w for _, w in items)
+
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+                continue
+            if q >= 1:
+                results.append(self.max)
+                continue
+            target = q * total
+            seen = 0
+            for value, weight in items:
+                seen += weight
+                if seen >= target:
+                    results.append(value)
+                    break
+            else:
+                results.append(self.max)
+        return results
+
+    def rank(self, value: float) -> float:
+        """value 이하인 값의 비율 (0~1)"""
+        if self.n == 0:
+            return 0.0
+        items = self._weighted()
+        total = sum(w for _, w in items)
+        return sum(w for v, w in items if v <= value) / total
+
+
+class Histogram:
+    """금액 구간별 건수 (구간 경계가 고정이라 그대로 더해서 합칠 수 있음)"""
+
+    def __init__(self, bounds: Optional[list[int]] = None):
+        self.bounds = list(bounds or HISTOGRAM_BOUNDS)
+        self.counts = [0] * (len(self.bounds) + 1)  # 마지막 = 상한 초과
+
+    def update(self, value: float) -> None:
+        lo, hi = 0, len(self.bounds)
+        while lo < hi:  # value < bounds[i]인 첫 i (이진 탐색)
+            mid = (lo + hi) // 2
+            if value < self.bounds[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        self.counts[lo] += 1
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        if other.bounds != self.bounds:
+            raise ValueError("구간 경계가 다른 히스토그램은 합칠 수 없습니다.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        return self
+
+    def rows(self) -> list[dict]:
+        """[{"lower": 이상, "upper": 미만(None=끝없음), "count": 건수}, ...] (빈 구간 제외)"""
+        lowers = [0] + self.bounds
+        uppers = self.bounds + [None]
+        return [
+            {"lower": lo, "upper": up, "count": n}
+            for lo, up, n in zip(lowers, uppers, self.counts)
+            if n
+        ]
+
+
+class HyperLogLog:
+    """
+    서로 다른 값 개수 근사 (HyperLogLog)
+
+    값의 64비트 해시에서 앞 p비트로 레지스터를 고르고, 나머지 비트의 "처음 1이 나오는 위치"의 최댓값을 기록한다.
+    해시는 blake2b라서 프로세스가 달라도 같은 값 -> 같은 레지스터 (워커별 스케치를 merge 가능).
+    """
+
+    def __init__(self, p: int = DEFAULT_HLL_PRECISION):
+        if not 4 <= p <= 18:
+            raise ValueError(f"p는 4 이상 18 이하여야 합니다: {p}")
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    @property
+    def relative_error(self) -> float:
+        """근사 상대 오차 (표준오차)"""
+        return 1.04 / math.sqrt(self.m)
+
+    def _position(self, value: str) -> tuple[int, int]:
+        """값 -> (레지스터 번호, 순위)"""
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        x = int.from_bytes(digest, "big")
+        bits = 64 - self.p
+        rest = x & ((1 << bits) - 1)
+        return x >> bits, bits - rest.bit_length() + 1
+
+    def add(self, value: str) -> None:
+        index, rank = self._position(value)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> "HyperLogLog":
+        for value in values:
+            self.add(value)
+        return self
+
+    def sparse(self, values: Iterable[str]) -> dict[int, int]:
+        """값들의 {레지스터 번호: 순위} (스케치를 바꾸지 않음, 적은 값의 결과를 작게 보관할 때)"""
+        result: dict[int, int] = {}
+        for value in values:
+            index, rank = self._position(value)
+            if rank > result.get(index, 0):
+                result[index] = rank
+        return result
+
+    def merge_sparse(self, sparse: dict[int, int]) -> "HyperLogLog":
+        """sparse() 결과를 합친다"""
+        registers = self.registers
+        for index, rank in sparse.items():
+            if rank > registers[index]:
+                registers[index] = rank
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """다른 스케치를 합친다 (self를 바꾸고 반환)"""
+        if other.p != self.p:
+            raise ValueError("정밀도(p)가 다른 HyperLogLog는 합칠 수 없습니다.")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        """서로 다른 값 개수 추정"""
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # 작은 값 보정 (linear counting)
+        return int(round(estimate))
+
+
+class _Stats:
+    """합계/건수 + 분위수 스케치 + 히스토그램 묶음"""
+
+    def __init__(self, k: int, seed: Optional[int]):
+        self.total = 0
+        self.sketch = KLLSketch(k=k, seed=seed)
+        self.histogram = Histogram()
+
+    def update(self, amount: int) -> None:
+        self.total += amount
+        self.sketch.update(amount)
+        self.histogram.update(amount)
+
+    def merge(self, other: "_Stats") -> None:
+        self.total += other.total
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+
+    def summary(self) -> dict:
+        count = self.sketch.n
+        median, p90, p99 = self.sketch.quantiles([0.5, 0.9, 0.99])
+        return {
+            "count": count,
+            "total": self.total,
+            "mean": self.total / count if count else 0.0,
+            "min": self.sketch.min,
+            "max": self.sketch.max,
+            "median": median,
+            "p90": p90,
+            "p99": p99,
+        }
+
+
+class SpendingDistribution:
+    """
+    거래 금액 분포 (전체 + 카테고리별)
+
+    Args:
+        transaction_type: 대상 구분 ("지출"/"수입", None이면 전체)
+        k: 스케치 정확도 (k_for_error로 계산 가능)
+        seed: 압축 시 무작위 선택 시드 (재현이 필요할 때)
+    """
+
+    def __init__(self, transaction_type: Optional[str] = "지출", k: int = DEFAULT_K, seed: Optional[int] = None):
+        self.transaction_type = transaction_type
+        self.k = k
+        self.seed = seed
+        self.overall = _Stats(k, seed)
+        self.categories: dict[str, _Stats] = {}
+
+    def update(self, tx: dict) -> None:
+        if self.transaction_type is not None and str(tx.get("type", "")).strip() != self.transaction_type:
+            return
+        amount = int(tx.get("amount", 0))
+        category = str(tx.get("category", "")).strip() or "기타"
+        self.overall.update(amount)
+        stats = self.categories.get(category)
+        if stats is None:
+            stats = self.categories[category] = _Stats(self.k, self.seed)
+        stats.update(amount)
+
+    def update_many(self, transactions: Iterable[dict]) -> "SpendingDistribution":
+        for tx in transactions:
+            self.update(tx)
+        return self
+
+    def merge(self, other: "SpendingDistribution") -> "SpendingDistribution":
+        """다른 파티션/프로세스의 결과를 합친다 (self를 바꾸고 반환)"""
+        self.overall.merge(other.overall)
+        for category, stats in other.categories.items():
+            mine = self.categories.get(category)
+            if mine is None:
+                mine = self.categories[category] = _Stats(self.k, self.seed)
+            mine.merge(stats)
+        return self
+
+    def summary(self) -> dict:
+        """전체 분포 {"count", "total", "mean", "min", "max", "median", "p90", "p99"}"""
+        return self.overall.summary()
+
+    def category_summary(self) -> dict[str, dict]:
+        """카테고리별 분포 (summary 항목 + "histogram") - 합계 큰 순"""
+        result = {}
+        for category, stats in sorted(self.categories.items(), key=lambda kv: kv[1].total, reverse=True):
+            result[category] = {**stats.summary(), "histogram": stats.histogram.rows()}
+        return result
@@ -0,0 +1,496 @@
+# ledger/store.py
+# 역할: 여러 세션(브라우저 탭/사용자)이 함께 쓰는 프로세스 공용 가계부 저장소
+# - 파일 잠금(advisory lock)으로 다른 프로세스와의 동시 쓰기를 막고
+# - 버전 번호(version)로 compare-and-swap 쓰기를 하며
+# - 세션은 "마지막으로 본 버전 이후의 변경분(delta)"만 받아서 반영한다.
+
+import functools
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, Sequence
+
+from .checkpoint import load_checkpoint, save_checkpoint
+from .perf import count, span
+from .repository import (
+    WriteBehindWriter,
+    add_write_listener,
+    get_write_behind,
+    load_transactions,
+    normalize_transaction,
+    remove_write_listener,
+    save_transactions,
+)
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:  # Windows
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+DEFAULT_MAX_LOG = 1000  # 메모리에 보관할 변경 기록 개수
+DEFAULT_CHECKPOINT_EVERY = 100  # 스냅샷을 갱신하는 쓰기 간격(건)
+DEFAULT_CHECKPOINT_INTERVAL = 300.0  # 또는 마지막 스냅샷 후 이 시간(초)이 지난 첫 쓰기에서 갱신
+
+
+class VersionConflictError(Exception):
+    """다른 세션이 먼저 저장해서 기대한 버전과 현재 버전이 다를 때 발생"""
+
+    def __init__(self, expected: int, actual: int):
+        super().__init__(f"버전 충돌: 기대 {expected}, 현재 {actual}. 최신 데이터를 받은 뒤 다시 시도하세요.")
+        self.expected = expected
+        self.actual = actual
+
+
+@dataclass
+class Change:
+    """변경 기록 한 건 (version: 이 변경이 적용된 뒤의 버전)"""
+
+    version: int
+    op: str  # "insert" | "delete" | "update" | "replace"
+    position: int = 0  # insert 위치
+    rows: list[dict] = field(default_factory=list)  # insert/replace 대상 행
+    indices: list[int] = field(default_factory=list)  # delete 대상 위치(오름차순)
+    updates: dict[int, dict] = field(default_factory=dict)  # update 대상 {위치: 새 행}
+
+
+@dataclass(frozen=True)
+class LedgerView:
+    """
+    저장소의 특정 버전을 가리키는 읽기 전용 뷰 (copy-on-write)
+
+    rows는 저장소와 공유되므로 복사 비용이 없다. 저장소는 쓰기 때마다 새 리스트를 만들기 때문에
+    한 번 받은 뷰의 내용은 바뀌지 않는다. 수정이 필요하면 mutable_rows()로 복사본을 받는다.
+    """
+
+    version: int
+    rows: Sequence[dict]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def mutable_rows(self) -> list[dict]:
+        """수정용 복사본 (행 dict까지 복사)"""
+        return [dict(r) for r in self.rows]
+
+
+def apply_changes(rows: list[dict], changes: list[Change]) -> list[dict]:
+    """
+    변경 기록을 순서대로 rows에 적용한다 (rows를 직접 수정하고 그대로 반환)
+
+    저장소와 세션이 같은 규칙으로 적용하므로 위치(index)가 항상 일치한다.
+    """
+    for change in changes:
+        if change.op == "insert":
+            rows[change.position:change.position] = change.rows
+        elif change.op == "delete":
+            for i in reversed(change.indices):
+                del rows[i]
+        elif change.op == "update":
+            for i, row in change.updates.items():
+                rows[i] = row
+        elif change.op == "replace":
+            rows[:] = change.rows
+        else:
+            raise ValueError(f"알 수 없는 변경 종류: {change.op}")
+    return rows
+
+
+@contextmanager
+def file_lock(file_path: str) -> Iterator[None]:
+    """
+    file_path 옆의 ".lock" 파일에 배타적 advisory lock을 건다
+
+    POSIX는 fcntl.flock, Windows는 msvcrt.locking을 사용하고
+    둘 다 없으면 잠금 없이 진행한다(같은 프로세스 안에서는 threading lock이 보호).
+    """
+    lock_path = f"{file_path}.lock"
+    if os.path.dirname(lock_path):
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:  # pragma: no cover - Windows
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:  # pragma: no cover - Windows
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_disk_version(file_path: str) -> int:
+    """".version" 사이드카 파일의 버전 (없으면 0)"""
+    try:
+        with open(f"{file_path}.version", "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _write_disk_version(file_path: str, version: int) -> None:
+    """버전을 임시 파일에 쓴 뒤 교체 (중간에 죽어도 깨진 버전 파일이 남지 않게)"""
+    tmp_path = f"{file_path}.version.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(str(version))
+    os.replace(tmp_path, f"{file_path}.version")
+
+
+class LedgerStore:
+    """
+    프로세스 공용 가계부 저장소
+
+    - 모든 쓰기는 expected_version을 받아 compare-and-swap으로 처리한다
+    - 버전은 "<파일>.version"에도 기록되어 다른 프로세스의 쓰기를 감지한다
+    - changes_since(version)으로 변경분만 가져갈 수 있다
+      (add_change_hook으로 등록하면 쓰기마다 변경분을 바로 받는다)
+    - write_behind를 주면 쓰기는 메모리에만 반영하고 디스크 저장은 백그라운드 스레드가 한다
+      (save_status로 "pending"/"flushed"/"failed" 확인, flush()로 디스크 반영까지 대기)
+      저장 직전에 파일 잠금 안에서 디스크 버전을 다시 확인해서, 그 사이 다른 프로세스가 먼저 썼으면
+      덮어쓰지 않고 실패시킨다 (last_error에 VersionConflictError, 다음 읽기에서 디스크 내용으로 다시 읽음)
+    - checkpoint=True면 스냅샷(<파일>.ckpt)으로 시작하고, 스냅샷은 checkpoint_every번 쓸 때마다
+      (또는 checkpoint_interval초가 지난 첫 쓰기에서) 갱신한다. 쓸 때마다 전체를 pickle하지 않기 위해서이며,
+      그 사이에 종료하면 다음 시작은 스냅샷이 맞지 않아 CSV를 한 번 다시 읽는다 (결과는 같음)
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        max_log: int = DEFAULT_MAX_LOG,
+        write_behind: Optional[WriteBehindWriter] = None,
+        checkpoint: bool = False,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+    ):
+        self.file_path = file_path
+        self.max_log = max_log
+        self._write_behind = write_behind
+        self._checkpoint = checkpoint
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.checkpoint_interval = checkpoint_interval
+        self._writes_since_checkpoint = 0  # 마지막 스냅샷 이후 디스크에 쓴 횟수
+        self._checkpoint_at = time.monotonic()  # 마지막 스냅샷 시각
+        self._write_key = os.path.abspath(file_path)
+        self._pending = False  # 메모리에는 있지만 아직 디스크에 안 쓴 변경이 있는지
+        self._flushed_version = 0  # 디스크에 있다고 알고 있는 버전 (읽거나 직접 쓴 버전)
+        self._epoch = 0  # 다시 읽을 때마다 증가 (그 전에 넣은 저장 작업은 버려진 변경)
+        self._last_error: Optional[BaseException] = None  # 마지막 백그라운드 저장 실패
+        self._lock = threading.RLock()
+        self._rows: list[dict] = []
+        self._log: list[Change] = []
+        self._version = 0
+        self._log_base = 0  # 이 버전 이후의 변경만 기록에 남아 있음
+        self._loaded_mtime: Optional[int] = None  # 마지막으로 읽은/쓴 시점의 파일 수정 시각
+        self._dirty = False  # 저장소를 거치지 않은 쓰기 알림을 받았는지
+        self._own_write = False  # 지금 저장소 자신이 쓰는 중인지
+        self._listeners: list[Callable[[int], None]] = []
+        self._change_hooks: list[Callable[[Sequence[dict], Change], None]] = []
+        self._reload()
+
+        # 저장소를 거치지 않는 쓰기(일괄 가져오기 등)도 알림으로 감지
+        # (WeakMethod: 저장소가 사라지면 구독도 같이 사라지게)
+        abs_path = os.path.abspath(file_path)
+        weak_self = weakref.WeakMethod(self._on_repository_write)
+
+        def _listener(path: str) -> None:
+            method = weak_self()
+            if method is None:
+                remove_write_listener(_listener)
+            elif path == abs_path:
+                method()
+
+        add_write_listener(_listener)
+
+    # ----- 읽기 -----
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def snapshot(self) -> tuple[int, list[dict]]:
+        """(현재 버전, 전체 행 복사본)"""
+        with self._lock:
+            self._refresh_if_stale()
+            return self._version, list(self._rows)
+
+    def view(self) -> LedgerView:
+        """현재 버전의 읽기 전용 뷰 (복사 없음)"""
+        with self._lock:
+            self._refresh_if_stale()
+            return LedgerView(self._version, self._rows)
+
+    def subscribe(self, callback: Callable[[int], None]) -> None:
+        """버전이 바뀔 때마다(쓰기/다시 읽기) callback(새 버전) 호출"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[int], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def add_change_hook(self, hook: Callable[[Sequence[dict], Change], None], replay: bool = False) -> None:
+        """
+        쓰기/다시 읽기마다 hook(변경 전 행, Change)를 저장소 잠금 안에서 바로 호출한다 (예: BudgetMonitor.on_change)
+
+        subscribe와 달리 무엇이 바뀌었는지를 함께 넘기므로 받는 쪽이 변경분만 반영할 수 있다.
+        다시 읽기는 op="replace" 변경으로 전달된다.
+        replay=True면 등록하면서 현재 전체 행을 replace 변경으로 한 번 넘긴다 (빠지는 변경 없이 시작).
+        """
+        with self._lock:
+            self._refresh_if_stale()
+            self._change_hooks.append(hook)
+            if replay:
+                hook([], Change(version=self._version, op="replace", rows=self._rows))
+
+    def remove_change_hook(self, hook: Callable[[Sequence[dict], Change], None]) -> None:
+        with self._lock:
+            if hook in self._change_hooks:
+                self._change_hooks.remove(hook)
+
+    def changes_since(self, version: int) -> tuple[int, Optional[list[Change]]]:
+        """
+        version 이후의 변경 기록
+
+        Returns:
+            (현재 버전, 변경 목록) - 기록이 이미 잘려서 이어 붙일 수 없으면 변경 목록은 None
+            (이때는 snapshot()으로 전체를 다시 받아야 한다)
+        """
+        with self._lock:
+            self._refresh_if_stale()
+            if version == self._version:
+                return self._version, []
+            if version < self._log_base or version > self._version:
+                return self._version, None
+            return self._version, [c for c in self._log if c.version > version]
+
+    @property
+    def save_status(self) -> str:
+        """"pending"(디스크 저장 대기 중), "flushed"(디스크 반영 완료), "failed"(저장 실패, last_error 참고)"""
+        if self._pending:
+            return "pending"
+        return "failed" if self._last_error is not None else "flushed"
+
+    @property
+    def last_error(self) -> Optional[BaseException]:
+        """마지막 백그라운드 저장 실패 (다른 프로세스가 먼저 씀 = VersionConflictError, 디스크 오류 등)"""
+        return self._last_error
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """대기 중인 저장이 디스크에 반영될 때까지 기다린다 (write-behind가 아니면 즉시 True)"""
+        if self._write_behind is None:
+            return True
+        return self._write_behind.flush(timeout)
+
+    # ----- 쓰기 (compare-and-swap) -----
+    def insert(self, rows: list[dict], expected_version: int, position: int = 0) -> int:
+        """position 위치에 행 추가 (기본: 맨 앞 = 최신이 위로)"""
+        new_rows = [normalize_transaction(r) for r in rows]
+        return self._commit(expected_version, "insert", position=position, rows=new_rows)
+
+    def delete(self, indices: list[int], expected_version: int) -> int:
+        """위치 목록의 행 삭제"""
+        return self._commit(expected_version, "delete", indices=sorted(set(indices)))
+
+    def update(self, updates: dict[int, dict], expected_version: int) -> int:
+        """{위치: 새 행} 형태로 행 수정"""
+        new_updates = {int(i): normalize_transaction(r) for i, r in updates.items()}
+        return self._commit(expected_version, "update", updates=new_updates)
+
+    def replace(self, rows: list[dict], expected_version: int) -> int:
+        """전체 교체 (Undo 등)"""
+        return self._commit(expected_version, "replace", rows=[normalize_transaction(r) for r in rows])
+
+    # ----- 내부 -----
+    def _mtime(self) -> int:
+        try:
+            return os.stat(self.file_path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _on_repository_write(self) -> None:
+        if not self._own_write:
+            self._dirty = True
+
+    def _run_change_hooks(self, rows_before: Sequence[dict], change: Change) -> None:
+        for hook in list(self._change_hooks):
+            try:
+                hook(rows_before, change)
+            except Exception:
+                pass
+
+    def _notify(self) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(self._version)
+            except Exception:
+                pass
+
+    def _is_stale(self) -> bool:
+        if self._dirty:
+            return True
+        if self._pending:
+            # 아직 디스크에 안 쓴 변경이 있으면 메모리가 최신 (단, 그 사이 다른 프로세스가 썼으면 충돌)
+            return _read_disk_version(self.file_path) != self._flushed_version
+        return _read_disk_version(self.file_path) != self._version or self._mtime() != self._loaded_mtime
+
+    def _write_to_disk(self, rows: list[dict], version: int, fsync: bool = False) -> None:
+        """CSV + 버전 파일 쓰기 (호출자가 file_lock을 잡고 있어야 함)"""
+        self._own_write = True
+        try:
+            save_transactions(self.file_path, rows, fsync=fsync)
+        finally:
+            self._own_write = False
+        _write_disk_version(self.file_path, version)
+        if self._checkpoint:
+            self._writes_since_checkpoint += 1
+            if (
+                self._writes_since_checkpoint >= self.checkpoint_every
+                or time.monotonic() - self._checkpoint_at >= self.checkpoint_interval
+            ):
+                save_checkpoint(self.file_path, rows)
+                self._writes_since_checkpoint = 0
+                self._checkpoint_at = time.monotonic()
+
+    def _fail_flush(self, error: BaseException) -> None:
+        """백그라운드 저장 실패: 오류를 남기고 다음 읽기에서 디스크 내용으로 다시 읽게 한다"""
+        count("store.flush_failed")
+        self._last_error = error
+        self._pending = False
+        self._dirty = True
+
+    def _flush_to_disk(self, rows: list[dict], version: int, epoch: int) -> None:
+        """
+        write-behind 스레드에서 실행되는 저장 작업
+
+        파일 잠금 안에서 디스크 버전을 다시 읽어 compare-and-swap을 한 번 더 한다.
+        (_reload/_flushed_version 변경은 모두 파일 잠금 안에서만 일어나므로 여기서는 self._lock 없이 읽어도 된다.
+         self._lock -> file_lock 순서를 지키는 _commit과 교착되지 않도록 self._lock은 잡지 않는다)
+        """
+        with span("store.flush"), file_lock(self.file_path):
+            if epoch != self._epoch:
+                return  # 그 사이 디스크에서 다시 읽으면서 이 변경은 이미 버려짐 (_reload에서 오류 기록)
+            if version <= self._flushed_version:
+                return  # 큐가 가득 차 _commit이 더 새 버전을 직접 썼다
+            disk_version = _read_disk_version(self.file_path)
+            if disk_version != self._flushed_version:
+                error = VersionConflictError(self._flushed_version, disk_version)
+                self._fail_flush(error)
+                raise error  # WriteBehindWriter.flush()가 다시 올려준다
+            try:
+                self._write_to_disk(rows, version, fsync=True)
+            except BaseException as e:
+                self._fail_flush(e)
+                raise
+            mtime = self._mtime()
+            self._flushed_version = version
+        with self._lock:
+            self._loaded_mtime = mtime
+            if version == self._version:
+                self._pending = False
+                self._last_error = None
+
+    def _reload(self) -> None:
+        """디스크에서 전체를 다시 읽는다 (변경 기록은 이어 붙일 수 없으므로 비움)"""
+        count("store.reload")
+        disk_version = _read_disk_version(self.file_path)
+        if disk_version == self._version and self._loaded_mtime is not None:
+            # 버전은 그대로인데 파일이 바뀜 = 직접 편집 -> 세션들이 알아채도록 버전을 올린다
+            disk_version += 1
+            _write_disk_version(self.file_path, disk_version)
+        if self._pending:
+            # 디스크에 못 쓴 변경이 있는데 다른 프로세스가 먼저 씀 -> 그 변경은 버리고 실패로 알린다
+            count("store.flush_failed")
+            self._last_error = VersionConflictError(self._flushed_version, disk_version)
+            self._pending = False
+        self._epoch += 1
+        rows_before = self._rows
+        if self._checkpoint:
+            self._rows = load_checkpoint(self.file_path).rows()  # 다시 만들었으면 스냅샷도 갱신됨
+            self._writes_since_checkpoint = 0
+            self._checkpoint_at = time.monotonic()
+        else:
+            self._rows = load_transactions(self.file_path)
+        self._loaded_mtime = self._mtime()
+        self._dirty = False
+        self._version = disk_version
+        self._flushed_version = disk_version
+        self._log = []
+        self._log_base = self._version
+        self._run_change_hooks(rows_before, Change(version=self._version, op="replace", rows=self._rows))
+        self._notify()
+
+    def _refresh_if_stale(self) -> None:
+        """다른 프로세스가 쓰거나 파일이 직접 편집됐으면 다시 읽는다"""
+        if self._is_stale():
+            with file_lock(self.file_path):
+                if self._is_stale():
+                    self._reload()
+
+    def _commit(self, expected_version: int, op: str, **kwargs) -> int:
+        with span(f"store.{op}"), self._lock, file_lock(self.file_path):
+            if self._is_stale():
+                self._reload()
+            if expected_version != self._version:
+                count("store.conflict")
+                raise VersionConflictError(expected_version, self._version)
+
+            change = Change(version=self._version + 1, op=op, **kwargs)
+            rows = apply_changes(list(self._rows), [change])
+            # 큐에 넣을 때 기다리지 않는다: 잠금을 쥔 채 가득 찬 큐를 기다리면
+            # 저장 스레드(_flush_to_disk)도 file_lock/self._lock을 기다려 서로 멈춘다 -> 가득 차면 여기서 직접 쓴다
+            queued = self._write_behind is not None and self._write_behind.submit(
+                self._write_key, functools.partial(self._flush_to_disk, rows, change.version, self._epoch), block=False
+            ) is not None
+            if queued:
+                self._pending = True
+            else:
+                self._write_to_disk(rows, change.version)
+                self._loaded_mtime = self._mtime()
+                self._flushed_version = change.version
+                self._pending = False  # 큐에 남은 이전 버전은 _flush_to_disk에서 건너뛴다
+                self._last_error = None
+
+            rows_before, self._rows = self._rows, rows
+            self._version = change.version
+            self._log.append(change)
+            if len(self._log) > self.max_log:
+                dropped = self._log[: len(self._log) - self.max_log]
+                self._log = self._log[len(dropped):]
+                self._log_base = dropped[-1].version
+            self._run_change_hooks(rows_before, change)
+            self._notify()
+            return self._version
+
+
+_STORES: dict[str, LedgerStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(file_path: str, write_behind: bool = False, checkpoint: bool = False) -> LedgerStore:
+    """
+    파일 경로별로 프로세스 안에서 하나만 존재하는 LedgerStore를 돌려준다
+
+    write_behind=True면 처음 만들 때 공용 write-behind 저장 스레드를 붙인다.
+    checkpoint=True면 스냅샷(<파일>.ckpt)으로 빠르게 시작한다.
+    """
+    key = os.path.abspath(file_path)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = LedgerStore(
+                file_path,
+                write_behind=get_write_behind() if write_behind else None,
+                checkpoint=checkpoint,
+            )
+            _STORES[key] = store
+        return store
@@ -1,8 +1,15 @@
 # ledger/utils.py
-# 역할: 공용 유틸리티 함수 (형식 변환, 검증 등)
+# 역할: 공용 유틸리티 함수 (형식 변환, 검증 등) + 날짜 차원(date dimension)
+#
+# 날짜 차원: 날짜 1개 -> 주/월/분기/연도/요일/공휴일/월 시작·끝 서수를 미리 계산해 둔 표
+# - 연도 단위로 한 번에 만들고(1년 = 365행), 원래 값(문자열/date) -> 행 조회도 캐시한다
+#   -> 같은 날짜 문자열을 다시 파싱하지 않는다 (거래 수가 많아도 서로 다른 날짜는 수천 개뿐)
+# - 기간 묶기(월별/주별/분기별 합계)는 모두 period_key / DateDimension.map_column을 거친다
 
-from datetime import date, datetime
-from typing import Optional, Union
+import calendar
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Optional, Union
 
 
 def format_currency(amount: Union[int, float]) -> str:
@@ -27,6 +34,92 @@ def format_currency(amount: Union[int, float]) -> str:
         return "0원"
 
 
+# 차트 축/라벨용 짧은 단위 (큰 단위부터)
+COMPACT_UNITS = ((100_000_000, "억원"), (10_000, "만원"))
+_FORMAT_CACHE_LIMIT = 100_000  # 서로 다른 금액 문자열 캐시 최대 크기
+_FORMAT_CACHES: dict[bool, dict] = {False: {}, True: {}}  # compact 여부 -> {금액: 문자열}
+
+
+def format_currency_compact(amount: Union[int, float], digits: int = 1) -> str:
+    """
+    금액을 만원/억원 단위의 짧은 문자열로 변환 (차트 축/막대 라벨용)
+
+    Args:
+        amount: 금액
+        digits: 소수점 자릿수 (끝의 0은 지운다)
+
+    Examples:
+        >>> format_currency_compact(1500000)
+        '150만원'
+        >>> format_currency_compact(250000000)
+        '2.5억원'
+        >>> format_currency_compact(9000)
+        '9,000원'
+    """
+    try:
+        value = int(amount)
+    except (ValueError, TypeError):
+        return "0원"
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    for unit, suffix in COMPACT_UNITS:
+        if value >= unit:
+            text = f"{value / unit:,.{digits}f}"
+            if digits:
+                text = text.rstrip("0").rstrip(".")
+            return f"{sign}{text}{suffix}"
+    return f"{sign}{value:,}원"
+
+
+def format_currency_many(amounts, compact: bool = False):
+    """
+    금액 여러 개를 한 번에 변환 (표/차트 라벨용)
+
+    서로 다른 금액마다 1번만 변환하고 결과를 캐시한다 (같은 금액이 반복되는 열에서 빠름).
+    compact=False면 각 값의 결과가 format_currency와 글자 하나까지 같다.
+
+    Args:
+        amounts: 금액 목록 또는 pandas Series
+        compact: True면 만원/억원 단위 (format_currency_compact)
+
+    Returns:
+        pandas Series면 같은 index의 Series, 아니면 list
+    """
+    convert = format_currency_compact if compact else format_currency
+    cache = _FORMAT_CACHES[compact]
+
+    def get(value) -> str:
+        try:
+            return cache[value]
+        except KeyError:
+            text = convert(value)
+            if len(cache) < _FORMAT_CACHE_LIMIT:
+                cache[value] = text
+            return text
+        except TypeError:  # 해시할 수 없는 값
+            return convert(value)
+
+    if hasattr(amounts, "unique") and hasattr(amounts, "map"):  # pandas Series: 고유값 표를 만들어 map
+        # NaN은 표에서 찾지 못할 수 있으므로 format_currency(NaN)과 같은 "0원"으로 채운다
+        return amounts.map({value: get(value) for value in amounts.unique()}).fillna("0원")
+    return [get(value) for value in amounts]
+
+
+def compact_ticks(max_value: Union[int, float], count: int = 5) -> tuple[list[int], list[str]]:
+    """
+    0 ~ max_value 축 눈금 (1/2/5 간격) 값과 만원/억원 라벨
+
+    plotly: fig.update_yaxes(tickvals=values, ticktext=labels)
+    """
+    if not max_value or max_value <= 0:
+        return [0], ["0원"]
+    raw = max_value / max(1, count)
+    magnitude = 10 ** (len(str(int(raw))) - 1)
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    values = list(range(0, int(max_value) + step, step))
+    return values, format_currency_many(values, compact=True)
+
+
 def parse_date(date_input: Union[str, date, datetime]) -> Optional[date]:
     """
     다양한 형식의 날짜 입력을 date 객체로 변환
@@ -109,19 +202,7 @@ def get_month_range(year: int, month: int) -> tuple[date, date]:
         >>> get_month_range(2024, 1)
         (datetime.date(2024, 1, 1), datetime.date(2024, 1, 31))
     """
-    start = date(year, month, 1)
-
-    # 마지막 날 계산
-    if month == 12:
-        end = date(year + 1, 1, 1)
-    else:
-        end = date(year, month + 1, 1)
-
-    # 하루 빼서 해당 월의 마지막 날로
-    from datetime import timedelta
-    end = end - timedelta(days=1)
-
-    return start, end
+    return DATE_DIMENSION.month_range(f"{year:04d}-{month:02d}")
 
 
 def safe_str(value: any, default: str = "") -> str:
@@ -157,4 +238,209 @@ def safe_int(value: any, default: int = 0) -> int:
     try:
         return int(value)
     except (ValueError, TypeError):
-        return default
\ No newline at end of file
+        return default
+
+
+# =============================
+# 날짜 차원 (date dimension)
+# =============================
+PERIODS = ("day", "week", "month", "quarter", "year")  # period_key에 쓸 수 있는 단위
+
+# 양력 고정 공휴일 (월, 일) - 설날/추석 등 음력 공휴일과 대체 공휴일은 DateDimension(holidays=...)로 추가
+FIXED_HOLIDAYS = frozenset({(1, 1), (3, 1), (5, 5), (6, 6), (8, 15), (10, 3), (10, 9), (12, 25)})
+
+_CACHE_LIMIT = 200_000  # 원래 값 -> 날짜 행 캐시 최대 크기 (깨진 날짜 문자열이 끝없이 쌓이지 않게)
+
+
+@dataclass(frozen=True)
+class DateInfo:
+    """날짜 차원의 행 1개"""
+
+    date: date
+    key: str  # "YYYY-MM-DD"
+    ordinal: int
+    year: int
+    quarter: str  # "YYYY-Qn"
+    month: str  # "YYYY-MM"
+    week: str  # ISO 주 "YYYY-Www" (연초/연말은 연도가 달력과 다를 수 있음)
+    day: int  # 일 (1~31)
+    weekday: int  # 0=월 ... 6=일
+    is_weekend: bool
+    is_holiday: bool
+    month_start: int  # 그 달 1일의 서수
+    month_end: int  # 그 달 말일의 서수
+
+    @property
+    def days_in_month(self) -> int:
+        return self.month_end - self.month_start + 1
+
+    def period(self, period: str) -> str:
+        """기간 키 ("day"/"week"/"month"/"quarter"/"year")"""
+        if period == "day":
+            return self.key
+        if period == "year":
+            return f"{self.year:04d}"
+        return getattr(self, period)
+
+
+class DateDimension:
+    """
+    날짜 차원 표 (연도 단위로 미리 계산, 조회는 캐시)
+
+    Args:
+        holidays: 고정 공휴일 외에 공휴일로 볼 날짜들 (설날/추석/대체 공휴일 등, date 또는 "YYYY-MM-DD")
+    """
+
+    def __init__(self, holidays: Iterable[Union[str, date]] = ()):
+        self.holidays = {d if isinstance(d, date) else date.fromisoformat(str(d)) for d in holidays}
+        self._days: dict[int, DateInfo] = {}  # 서수 -> 행
+        self._years: set[int] = set()
+        self._lookup: dict[Any, Optional[DateInfo]] = {}  # 원래 값 -> 행 (변환 실패는 None)
+        self._months: dict[str, tuple[date, date]] = {}  # "YYYY-MM" -> (1일, 말일)
+
+    def _build_year(self, year: int) -> None:
+        first = date(year, 1, 1).toordinal()
+        last = date(year, 12, 31).toordinal()
+        for ordinal in range(first, last + 1):
+            d = date.fromordinal(ordinal)
+            iso_year, iso_week, iso_weekday = d.isocalendar()
+            month_start = d.replace(day=1).toordinal()
+            self._days[ordinal] = DateInfo(
+                date=d,
+                key=d.isoformat(),
+                ordinal=ordinal,
+                year=year,
+                quarter=f"{year:04d}-Q{(d.month - 1) // 3 + 1}",
+                month=f"{year:04d}-{d.month:02d}",
+                week=f"{iso_year:04d}-W{iso_week:02d}",
+                day=d.day,
+                weekday=iso_weekday - 1,
+                is_weekend=iso_weekday >= 6,
+                is_holiday=(d.month, d.day) in FIXED_HOLIDAYS or d in self.holidays,
+                month_start=month_start,
+                month_end=month_start + calendar.monthrange(year, d.month)[1] - 1,
+            )
+        self._years.add(year)
+
+    def _row(self, d: date) -> DateInfo:
+        if d.year not in self._years:
+            self._build_year(d.year)
+        return self._days[d.toordinal()]
+
+    def info(self, value: Union[str, date, datetime, None]) -> Optional[DateInfo]:
+        """
+        날짜 값 -> 날짜 차원 행 (변환할 수 없으면 None)
+
+        문자열은 앞 10글자 ISO 형식("2024-01-15", 시간이 붙어 있어도 됨)을 먼저 보고, 아니면 parse_date 형식들을 시도한다.
+        """
+        try:
+            return self._lookup[value]
+        except KeyError:
+            pass
+        except TypeError:  # 해시할 수 없는 값
+            return None
+
+        if isinstance(value, datetime):
+            d: Optional[date] = value.date()
+        elif isinstance(value, date):
+            d = value
+        elif isinstance(value, str):
+            text = value.strip()
+            try:
+                d = date.fromisoformat(text[:10])
+            except ValueError:
+                d = parse_date(text)
+        else:
+            d = None
+        result = self._row(d) if d is not None else None
+        if len(self._lookup) < _CACHE_LIMIT:
+            self._lookup[value] = result
+        return result
+
+    def period_key(self, value: Union[str, date, datetime, None], period: str = "month") -> Optional[str]:
+        """날짜 값 -> 기간 키 ("2024-01", "2024-W03", "2024-Q1", ...) (변환할 수 없으면 None)"""
+        if period not in PERIODS:
+            raise ValueError(f"알 수 없는 기간 단위입니다: {period} (가능: {', '.join(PERIODS)})")
+        row = self.info(value)
+        return row.period(period) if row is not None else None
+
+    def map_column(self, values, field: str = "month"):
+        """
+        날짜 열 전체를 한 번에 변환 (서로 다른 값마다 1번만 조회)
+
+        Args:
+            values: 날짜 값 목록 또는 pandas Series
+            field: 기간 단위(PERIODS) 또는 DateInfo 속성 이름 ("weekday", "is_holiday", "ordinal", ...)
+
+        Returns:
+            pandas Series면 같은 index의 Series, 아니면 list (변환할 수 없는 값은 None)
+        """
+        if field in PERIODS:
+            def get(value):
+                row = self.info(value)
+                return row.period(field) if row is not None else None
+        elif field in DateInfo.__dataclass_fields__ or field == "days_in_month":
+            def get(value):
+                row = self.info(value)
+                return getattr(row, field) if row is not None else None
+        else:
+            raise ValueError(f"알 수 없는 날짜 속성입니다: {field}")
+
+        if hasattr(values, "unique") and hasattr(values, "map"):  # pandas Series: 고유값 표를 만들어 map
+            return values.map({value: get(value) for value in values.unique()})
+        table: dict = {}
+        result = []
+        for value in values:
+            try:
+                mapped = table[value]
+            except KeyError:
+                mapped = table[value] = get(value)
+            except TypeError:
+                mapped = None
+            result.append(mapped)
+        return result
+
+    def month_range(self, month: str) -> tuple[date, date]:
+        """"YYYY-MM" -> (1일, 말일)"""
+        cached = self._months.get(month)
+        if cached is None:
+            first = date(int(month[:4]), int(month[5:7]), 1)
+            row = self._row(first)
+            cached = self._months[month] = (first, date.fromordinal(row.month_end))
+        return cached
+
+    def days_in_month(self, month: str) -> int:
+        """"YYYY-MM"의 일 수"""
+        return self.month_range(month)[1].day
+
+    @staticmethod
+    def shift_month(month: str, delta: int) -> str:
+        """"YYYY-MM"에서 delta개월 이동"""
+        index = int(month[:4]) * 12 + int(month[5:7]) - 1 + delta
+        return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+    def days_between(self, start: Union[str, date], end: Union[str, date]) -> list[DateInfo]:
+        """start ~ end(포함) 날짜 행 목록"""
+        first, last = self.info(start), self.info(end)
+        if first is None or last is None:
+            return []
+        return [self._row(first.date + timedelta(days=i)) for i in range(last.ordinal - first.ordinal + 1)]
+
+
+DATE_DIMENSION = DateDimension()  # 공용 날짜 차원 (고정 공휴일만)
+
+
+def date_info(value: Union[str, date, datetime, None]) -> Optional[DateInfo]:
+    """DATE_DIMENSION.info"""
+    return DATE_DIMENSION.info(value)
+
+
+def period_key(value: Union[str, date, datetime, None], period: str = "month") -> Optional[str]:
+    """DATE_DIMENSION.period_key - 날짜 값 -> "2024-01" / "2024-W03" / "2024-Q1" 등"""
+    return DATE_DIMENSION.period_key(value, period)
+
+
+def month_key(value: Union[str, date, datetime, None]) -> Optional[str]:
+    """날짜 값 -> "YYYY-MM" (변환할 수 없으면 None)"""
+    row = DATE_DIMENSION.info(value)
+    return row.month if row is not None else None
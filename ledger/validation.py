@@ -0,0 +1,260 @@
+# ledger/validation.py
+# 역할: 컬럼 단위(column-wise) 일괄 검증 + 데이터 품질 리포트 + 격리(quarantine) 파일
+#
+# validate_transaction_dict처럼 한 행씩 검사하지 않고, 컬럼별로 "서로 다른 값"만 한 번씩 검사한 뒤
+# 잘못된 값 집합에 속하는 행 위치를 한 번에 모은다. (날짜/구분/카테고리는 값이 많이 겹쳐서 훨씬 빠르다)
+#
+# 오류 종류:
+#   "missing_column"  필수 컬럼 없음 (모든 행)
+#   "type"            구분이 "지출"/"수입"이 아님
+#   "amount"          금액이 정수가 아님
+#   "negative_amount" 금액이 음수
+#   "date"            날짜가 YYYY-MM-DD 형식이 아니거나 없는 날짜
+#   "category"        카테고리가 비어 있음
+#   "currency"        통화 코드가 영문 3글자가 아님 (선택 컬럼, 빈 칸은 원화)
+#
+# QualityMonitor: 파일은 처음에 한 번만 검사하고, 이후에는 저장소 변경분(LedgerStore.add_change_hook)의 행만 검사한다
+
+import csv
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional, Sequence
+
+from .perf import timed
+from .repository import CSV_FIELDNAMES, CURRENCY_FIELD, DEFAULT_CURRENCY, FIELDNAMES, _open_text, sniff_dialect
+
+VALID_TYPES = frozenset({"지출", "수입"})
+ERROR_CLASSES = ("missing_column", "type", "amount", "negative_amount", "date", "category", "currency")
+QUARANTINE_FIELDS = ["row", "errors", *CSV_FIELDNAMES]
+
+
+@dataclass
+class ValidationReport:
+    """검증 결과 (rows: 검사한 행 수, errors: {오류 종류: [행 위치(0부터), ...]})"""
+
+    rows: int = 0
+    errors: dict[str, list[int]] = field(default_factory=dict)
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """{오류 종류: 건수} (오류가 있는 종류만)"""
+        return {name: len(indices) for name, indices in self.errors.items() if indices}
+
+    @property
+    def invalid_indices(self) -> list[int]:
+        """오류가 하나라도 있는 행 위치 (오름차순)"""
+        return sorted({i for indices in self.errors.values() for i in indices})
+
+    @property
+    def valid_count(self) -> int:
+        return self.rows - len(self.invalid_indices)
+
+    @property
+    def ok(self) -> bool:
+        return not any(self.errors.values())
+
+    def errors_by_row(self) -> dict[int, list[str]]:
+        """{행 위치: [오류 종류, ...]}"""
+        result: dict[int, list[str]] = {}
+        for name in ERROR_CLASSES:
+            for i in self.errors.get(name, ()):
+                result.setdefault(i, []).append(name)
+        return result
+
+
+def _bad_positions(column: list, is_bad) -> list[int]:
+    """서로 다른 값만 검사하고, 잘못된 값에 해당하는 행 위치를 모은다"""
+    bad_values = {v for v in set(column) if is_bad(v)}
+    if not bad_values:
+        return []
+    return [i for i, v in enumerate(column) if v in bad_values]
+
+
+def _is_bad_date(value) -> bool:
+    text = str(value).strip()
+    if len(text) != 10:
+        return True
+    try:
+        date.fromisoformat(text)
+    except ValueError:
+        return True
+    return False
+
+
+def _is_bad_currency(value) -> bool:
+    text = str(value or "").strip()
+    return bool(text) and not (len(text) == 3 and text.isascii() and text.isalpha())
+
+
+def _amount_class(value) -> Optional[str]:
+    """금액 값의 오류 종류 (정상이면 None)"""
+    if isinstance(value, bool):
+        return "amount"
+    if isinstance(value, int):
+        return "negative_amount" if value < 0 else None
+    try:
+        amount = int(str(value).strip())
+    except (ValueError, TypeError):
+        return "amount"
+    return "negative_amount" if amount < 0 else None
+
+
+@timed("validation.validate_columns")
+def validate_columns(columns: dict[str, list]) -> ValidationReport:
+    """
+    컬럼 형태 데이터 검증 ({"date": [...], "type": [...], ...})
+
+    Returns:
+        ValidationReport
+    """
+    rows = max((len(col) for col in columns.values()), default=0)
+    report = ValidationReport(rows=rows, errors={name: [] for name in ERROR_CLASSES})
+
+    missing = [name for name in FIELDNAMES if name not in columns]
+    if missing:
+        report.errors["missing_column"] = list(range(rows))
+        return report
+
+    report.errors["type"] = _bad_positions(columns["type"], lambda v: str(v).strip() not in VALID_TYPES)
+    report.errors["date"] = _bad_positions(columns["date"], _is_bad_date)
+    report.errors["category"] = _bad_positions(columns["category"], lambda v: not str(v or "").strip())
+    if CURRENCY_FIELD in columns:
+        report.errors["currency"] = _bad_positions(columns[CURRENCY_FIELD], _is_bad_currency)
+
+    amounts = columns["amount"]
+    classes = {v: _amount_class(v) for v in set(amounts)}
+    if any(classes.values()):
+        for i, v in enumerate(amounts):
+            name = classes[v]
+            if name:
+                report.errors[name].append(i)
+    return report
+
+
+def validate_transactions(transactions: list[dict]) -> ValidationReport:
+    """거래 dict 목록 검증 (컬럼으로 바꾼 뒤 validate_columns)"""
+    keys = [name for name in FIELDNAMES if all(name in t for t in transactions)] if transactions else FIELDNAMES
+    columns = {name: [t[name] for t in transactions] for name in keys}
+    if any(CURRENCY_FIELD in t for t in transactions):
+        columns[CURRENCY_FIELD] = [t.get(CURRENCY_FIELD, "") for t in transactions]
+    return validate_columns(columns)
+
+
+def write_quarantine(quarantine_path: str, rows: list[dict], report: ValidationReport, append: bool = True) -> int:
+    """
+    검증에 실패한 행을 격리 파일(CSV)로 저장 (row: 원래 위치(1부터, 헤더 제외), errors: 오류 종류)
+
+    Returns:
+        저장한 행 수
+    """
+    by_row = report.errors_by_row()
+    if not by_row:
+        return 0
+    if os.path.dirname(quarantine_path):
+        os.makedirs(os.path.dirname(quarantine_path), exist_ok=True)
+
+    new_file = not append or not os.path.exists(quarantine_path) or os.path.getsize(quarantine_path) == 0
+    with open(quarantine_path, "a" if append else "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=QUARANTINE_FIELDS, extrasaction="ignore")
+        if new_file:
+            writer.writeheader()
+        for i in sorted(by_row):
+            writer.writerow({**rows[i], "row": i + 1, "errors": ";".join(by_row[i])})
+    return len(by_row)
+
+
+@timed("validation.load_validated")
+def load_validated(file_path: str, quarantine_path: Optional[str] = None) -> tuple[list[dict], ValidationReport]:
+    """
+    가계부 CSV를 원본 문자열 그대로 읽어 일괄 검증 -> (정상 행 목록, 리포트)
+
+    load_transactions는 금액이 깨진 행을 조용히 버리지만, 여기서는 모든 오류를 리포트에 남기고
+    quarantine_path를 주면 버린 행을 그 파일에 따로 모아 둔다.
+    파일 형식(인코딩/구분자/헤더 위치/예전 컬럼명)은 load_transactions와 같은 sniff_dialect로 판별한다.
+    """
+    if not os.path.exists(file_path):
+        return [], ValidationReport()
+
+    dialect = sniff_dialect(file_path)
+    if dialect is None:
+        # 표준 컬럼을 찾을 수 없는 파일: 첫 줄을 헤더로 보고 읽어서 모든 행을 missing_column으로
+        with _open_text(file_path) as f:
+            reader = csv.DictReader(f)
+            fieldnames = [name.strip() for name in (reader.fieldnames or [])]
+            raw = [
+                {name.strip(): (value or "").strip() for name, value in row.items() if name}
+                for row in reader
+            ]
+    else:
+        # 표준 컬럼 위치만 골라 읽는다 (load_transactions와 달리 잘린 줄도 버리지 않고 검사)
+        fieldnames = CSV_FIELDNAMES[: len(dialect.positions)]
+        named = list(zip(fieldnames, dialect.positions))
+        with _open_text(file_path, dialect.encoding) as f:
+            for _ in range(dialect.skip_lines + 1):  # 쓰레기 줄 + 헤더 건너뛰기
+                f.readline()
+            raw = [
+                {name: values[i].strip() if i < len(values) else "" for name, i in named}
+                for values in csv.reader(f, delimiter=dialect.delimiter)
+                if any(v.strip() for v in values)  # 빈 줄은 행이 아님
+            ]
+
+    columns = {name: [r.get(name, "") for r in raw] for name in CSV_FIELDNAMES if name in fieldnames}
+    report = validate_columns(columns)
+    if report.rows == 0 and raw:
+        report.rows = len(raw)
+        report.errors["missing_column"] = list(range(len(raw)))
+
+    bad = set(report.invalid_indices)
+    kept = [r for i, r in enumerate(raw) if i not in bad]
+    valid = [{**{name: r[name] for name in FIELDNAMES}, "amount": int(r["amount"])} for r in kept]
+    if CURRENCY_FIELD in columns:
+        # 원화(빈 칸/KRW)는 키 없이, 외화만 currency 키 (load_transactions와 같은 모양)
+        for t, r in zip(valid, kept):
+            currency = r.get(CURRENCY_FIELD, "").upper()
+            if currency and currency != DEFAULT_CURRENCY:
+                t[CURRENCY_FIELD] = currency
+    if quarantine_path:
+        write_quarantine(quarantine_path, raw, report)
+    return valid, report
+
+
+class QualityMonitor:
+    """
+    증분 데이터 품질 카운터 {오류 종류: 건수}
+
+    처음 리포트(보통 load_validated로 원본 파일을 한 번 검사한 결과)에서 시작해서
+    on_change로 받은 변경분의 행만 검사해 더하고 뺀다. (저장할 때마다 파일 전체를 다시 읽지 않는다)
+    replace(다시 읽기/전체 교체)는 새 행 전체를 메모리에서 다시 센다.
+    """
+
+    def __init__(self, report: Optional[ValidationReport] = None):
+        self._counts: dict[str, int] = dict(report.counts) if report is not None else {}
+        self._lock = threading.Lock()  # 저장소 hook(쓰기 스레드)과 counts(읽기) 사이
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """{오류 종류: 건수} (오류가 있는 종류만, ERROR_CLASSES 순서)"""
+        with self._lock:
+            return {name: self._counts[name] for name in ERROR_CLASSES if self._counts.get(name, 0) > 0}
+
+    def _add(self, rows: list[dict], sign: int) -> None:
+        if not rows:
+            return
+        for name, n in validate_transactions(rows).counts.items():
+            self._counts[name] = max(0, self._counts.get(name, 0) + sign * n)
+
+    def on_change(self, rows_before: Sequence[dict], change) -> None:
+        """저장소 변경 1건(ledger.store.Change) 반영 (LedgerStore.add_change_hook에 넘길 수 있음)"""
+        with self._lock:
+            if change.op == "insert":
+                self._add(list(change.rows), 1)
+            elif change.op == "delete":
+                self._add([rows_before[i] for i in change.indices], -1)
+            elif change.op == "update":
+                self._add([rows_before[i] for i in change.updates], -1)
+                self._add(list(change.updates.values()), 1)
+            elif change.op == "replace":
+                self._counts = {}
+                self._add(list(change.rows), 1)
@@ -1,6 +1,379 @@
-def main():
-    print("Hello from project01!")
+# main.py
+# 역할: 가계부 명령줄(CLI) 진입점 (UI 없이 파일 작업을 할 때 사용)
+# 예) python main.py import 카드명세서.csv --encoding cp949
+
+import argparse
+import sys
+
+DEFAULT_LEDGER_PATH = "data/ledger.csv"
+
+
+def _parse_column_map(pairs: list[str]) -> dict[str, str]:
+    """["원본컬럼=date", ...] -> {"원본컬럼": "date", ...}"""
+    result = {}
+    for pair in pairs or []:
+        if "=" not in pair:
+            raise SystemExit(f"--map 형식 오류: {pair} (예: --map 거래처=description)")
+        source, target = pair.split("=", 1)
+        result[source.strip()] = target.strip()
+    return result
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    """명세서 일괄 가져오기"""
+    from ledger.importer import import_statement
+
+    categorizer = None
+    if args.auto_category:
+        from ledger.categorize import Categorizer, load_rules
+
+        categorizer = Categorizer(load_rules(args.rules))
+
+    result = import_statement(
+        args.source,
+        args.ledger,
+        column_map=_parse_column_map(args.map),
+        encoding=args.encoding,
+        delimiter=args.delimiter,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        categorizer=categorizer,
+    )
+
+    print(f"읽은 행: {result.total_rows:,}")
+    print(f"추가: {result.imported:,}")
+    print(f"중복 제외: {result.duplicates:,}")
+    print(f"검증 실패: {result.invalid:,}")
+    if categorizer is not None:
+        print(f"자동 분류: {result.categorized:,}")
+    if result.invalid_rows:
+        preview = ", ".join(str(n) for n in result.invalid_rows[:10])
+        print(f"  실패 행 번호(앞 10개): {preview}")
+    print(f"소요 시간: {result.elapsed:.3f}초 ({result.rows_per_sec:,.0f} rows/sec)")
+    if args.dry_run:
+        print("(dry-run: 저장하지 않았습니다)")
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """필터링된 거래 목록/월별 리포트 스트리밍 내보내기"""
+    from ledger.fx import FxRateTable
+    from ledger.repository import export_monthly_report, export_transactions
+
+    common = dict(
+        out=args.output,
+        fmt=args.format,
+        start_date=args.start,
+        end_date=args.end,
+        category=args.category,
+        keyword=args.keyword,
+        chunk_size=args.chunk_size,
+    )
+    if args.report == "monthly":
+        try:
+            fx = FxRateTable.load(args.fx_rates)  # 외화 거래는 거래일 환율로 원화 환산
+        except FileNotFoundError as e:
+            print(f"오류: {e}", file=sys.stderr)
+            return 1
+        count = export_monthly_report(args.ledger, fx=fx, **common)
+    else:
+        count = export_transactions(args.ledger, transaction_type=args.type, **common)
+
+    # 표준 출력으로 내보낼 때는 데이터와 섞이지 않게 stderr로 안내
+    print(f"{count:,}행 내보내기 완료", file=sys.stderr)
+    return 0
+
+
+def cmd_categorize(args: argparse.Namespace) -> int:
+    """규칙으로 기존 거래 일괄 재분류"""
+    from ledger.categorize import Categorizer, load_rules, recategorize
+    from ledger.store import get_store
+
+    store = get_store(args.ledger)
+    version, rows = store.snapshot()
+    result = recategorize(rows, Categorizer(load_rules(args.rules)), targets=None if args.all else ("기타", ""))
+
+    for change in result.changes[: args.show]:
+        print(f"{change.index + 1:>6}  {change.old or '-'} -> {change.new}  {change.description}")
+    if len(result.changes) > args.show:
+        print(f"  ... 외 {len(result.changes) - args.show:,}건")
+    print(f"재분류: {len(result.changes):,}건 / 전체 {len(rows):,}건")
+
+    if result.changes and not args.dry_run:
+        store.update(result.updates, expected_version=version)
+    elif args.dry_run:
+        print("(dry-run: 저장하지 않았습니다)")
+    return 0
+
+
+def cmd_dedupe(args: argparse.Namespace) -> int:
+    """중복 거래 찾기/지우기"""
+    from ledger.dedupe import find_duplicates
+    from ledger.store import get_store
+
+    store = get_store(args.ledger)
+    version, rows = store.snapshot()
+    clusters = find_duplicates(rows, window_days=args.window)
+
+    for cluster in clusters[: args.show]:
+        print(f"[{len(cluster.indices)}건] 남김 {cluster.keep + 1}번, 중복 {', '.join(str(i + 1) for i in cluster.extras)}번")
+        for i in cluster.indices:
+            t = rows[i]
+            print(f"    {i + 1:>6}  {t['date']} {t['type']} {t['category']} {t['description']} {t['amount']:,}")
+    if len(clusters) > args.show:
+        print(f"  ... 외 {len(clusters) - args.show:,}묶음")
+
+    extras = sorted(i for c in clusters for i in c.extras)
+    print(f"중복 묶음: {len(clusters):,}개 / 지울 수 있는 행: {len(extras):,}건")
+    if args.remove and extras:
+        store.delete(extras, expected_version=version)
+        print(f"{len(extras):,}건 삭제 완료")
+    return 0
+
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    """가계부 데이터 품질 검사"""
+    from ledger.validation import load_validated
+
+    _, report = load_validated(args.ledger, quarantine_path=args.quarantine)
+
+    print(f"검사한 행: {report.rows:,}")
+    print(f"정상: {report.valid_count:,}")
+    for name, n in report.counts.items():
+        preview = ", ".join(str(i + 1) for i in report.errors[name][:10])
+        print(f"  {name}: {n:,}건 (행 번호 앞 10개: {preview})")
+    if args.quarantine and not report.ok:
+        print(f"격리 파일: {args.quarantine}")
+    return 0 if report.ok else 1
+
+
+def cmd_recurring(args: argparse.Namespace) -> int:
+    """반복 거래 찾기 (+ --materialize: 예정분 등록)"""
+    from datetime import date
+
+    from ledger.recurring import detect_recurring, materialize_upcoming
+    from ledger.store import get_store
+
+    store = get_store(args.ledger)
+    version, rows = store.snapshot()
+    patterns = detect_recurring(rows, min_occurrences=args.min_count)
+
+    today = date.today()
+    for p in patterns:
+        state = "" if p.is_active(today) else " (끊김)"
+        print(
+            f"  {p.period:<7} {p.category} {p.description} {p.amount:,}{'원' if p.currency == 'KRW' else ' ' + p.currency} "
+            f"x{p.count} 마지막 {p.last} 다음 {p.next_date()}{state}"
+        )
+    print(f"반복 거래: {len(patterns):,}개")
+
+    if args.materialize:
+        until = date.fromisoformat(args.until) if args.until else today
+        upcoming = materialize_upcoming(patterns, until=until, existing=rows, today=today)
+        for t in upcoming:
+            print(f"    + {t['date']} {t['category']} {t['description']} {t['amount']:,}")
+        if upcoming and not args.dry_run:
+            store.insert(upcoming[::-1], expected_version=version)  # 최신이 위로
+        print(f"예정 거래 {len(upcoming):,}건{' (저장 안 함)' if args.dry_run else ' 등록'}")
+    return 0
+
+
+def cmd_budget(args: argparse.Namespace) -> int:
+    """예산 관제: 이번 달(또는 --month) 상태, --history면 임계값을 넘은 시점, --forecast면 월말 예상"""
+    import json
+    import os
+    from datetime import date
+
+    from ledger.fx import FxRateTable
+    from ledger.repository import iter_transactions
+    from ledger.services import BudgetMonitor
+    from ledger.utils import month_key
+
+    budgets = {}
+    if os.path.exists(args.budgets):
+        with open(args.budgets, "r", encoding="utf-8") as f:
+            budgets = json.load(f)
+    try:
+        fx = FxRateTable.load(args.fx_rates)  # 외화 지출은 거래일 환율로 원화 환산
+    except FileNotFoundError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+    monitor = BudgetMonitor(budgets, fx=fx)
+    month = args.month or month_key(date.today())
+
+    if args.history:
+        # 그 달 거래를 날짜순으로 한 건씩 넣으면 임계값을 넘은 날이 나온다
+        rows = [t for chunk in iter_transactions(args.ledger) for t in chunk if t["date"].startswith(month)]
+        for t in sorted(rows, key=lambda t: t["date"]):
+            for e in monitor.add([t]):
+                print(f"  {t['date']} {e.category}: {e.previous} -> {e.status} ({e.spent:,} / {e.budget:,}, {e.ratio:.0%})")
+    else:
+        for chunk in iter_transactions(args.ledger):
+            monitor.add(chunk)
+
+    forecasts = {}
+    if args.forecast:
+        from ledger.forecast import forecast_month_end
+
+        today = date.today()
+        if args.month and args.month != month_key(today):
+            raise SystemExit("--forecast는 이번 달에만 쓸 수 있습니다.")
+        rows = [t for chunk in iter_transactions(args.ledger) for t in chunk]
+        forecasts = forecast_month_end(rows, today=today, budgets=budgets, fx=fx)
+
+    print(f"[{month}]")
+    skipped = monitor.unconverted_count(month)
+    if skipped:
+        print(f"  (환율이 없어 지출에서 뺀 외화 거래 {skipped:,}건 - 환율표에 추가하세요)")
+    exceeded = False
+    for category in sorted(budgets, key=lambda c: (c != "전체", c)):
+        ratio, status, _ = monitor.status(month, category)
+        exceeded |= status == "초과"
+        line = f"  {category}: {monitor.spent(month, category):,} / {int(budgets[category]):,} ({ratio:.0%}, {status})"
+        if category in forecasts:
+            f = forecasts[category]
+            line += f" -> 월말 예상 {f.projected:,} ({f.ratio:.0%}, {f.status})"
+        print(line)
+    return 1 if exceeded else 0
+
+
+def cmd_summary(args: argparse.Namespace) -> int:
+    """기간 요약 (수입/지출/카테고리별 지출), --approx면 표본으로 먼저 근사하고 시간 예산 안에서 정밀화"""
+    from ledger.utils import format_currency
+
+    if not args.approx:
+        from ledger.fx import FxRateTable, MissingRateError, convert_transactions
+        from ledger.parallel import LedgerAggregate
+        from ledger.repository import DEFAULT_CURRENCY, load_transactions_range
+
+        # 외화 거래는 거래일 환율로 보고 통화(--currency)로 환산한 뒤 합산
+        rows = load_transactions_range(args.ledger, args.start, args.end)
+        try:
+            rows = convert_transactions(rows, FxRateTable.load(args.fx_rates), to=args.currency)
+        except (FileNotFoundError, MissingRateError) as e:
+            print(f"오류: {e}", file=sys.stderr)
+            return 1
+
+        currency = args.currency.strip().upper()
+        money = format_currency if currency == DEFAULT_CURRENCY else (lambda v: f"{int(v):,} {currency}")
+        agg = LedgerAggregate(currency=currency).update(rows)
+        print(f"수입 {money(agg.income)} ({agg.income_count:,}건) / 지출 {money(agg.expense)} ({agg.expense_count:,}건)")
+        for category, amount in sorted(agg.category_expense.items(), key=lambda kv: kv[1], reverse=True):
+            print(f"  {category}: {money(amount)}")
+        return 0
+
+    from ledger.approx import ApproxLedger
+
+    result = None
+    for result in ApproxLedger(args.ledger).refine(args.start, args.end, time_budget=args.time_budget):
+        print(
+            f"  [{result.fraction:6.1%} 읽음] 지출 {format_currency(result.expense.value)}"
+            f" ± {format_currency(result.expense.error)}",
+            file=sys.stderr,
+        )
+    if result is None:
+        return 0
+    income, expense = result.income, result.expense
+    note = "정확한 값" if result.complete else f"근사, 95% 범위, {result.rows_read:,} / {result.rows_total:,}행 읽음"
+    print(f"[{note}]")
+    print(f"수입 {format_currency(income.value)} ± {format_currency(income.error)}")
+    print(f"지출 {format_currency(expense.value)} ± {format_currency(expense.error)}")
+    for category, e in result.category_expense.items():
+        print(f"  {category}: {format_currency(e.value)} ± {format_currency(e.error)}")
+    print(f"메모 종류(HyperLogLog): 약 {result.distinct_descriptions.value:,.0f}개")
+    if result.foreign_count.value:
+        print(f"(외화 거래 약 {result.foreign_count.value:,.0f}건은 합계에 없음 - 환산하려면 --approx 없이 실행)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="project01", description="나만의 미니 가계부 CLI")
+    sub = parser.add_subparsers(dest="command")
+
+    p_import = sub.add_parser("import", help="은행/카드 명세서 CSV 일괄 가져오기")
+    p_import.add_argument("source", help="명세서 CSV 경로")
+    p_import.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="가계부 CSV 경로")
+    p_import.add_argument("--encoding", default="utf-8-sig", help="명세서 인코딩 (예: cp949)")
+    p_import.add_argument("--delimiter", default=",", help="명세서 구분자")
+    p_import.add_argument("--batch-size", type=int, default=5000, help="검증 배치 크기")
+    p_import.add_argument("--map", action="append", metavar="원본=표준", help="컬럼 매핑 추가 (여러 번 지정 가능)")
+    p_import.add_argument("--dry-run", action="store_true", help="저장하지 않고 결과만 확인")
+    p_import.add_argument("--auto-category", action="store_true", help='"기타" 행을 규칙으로 자동 분류')
+    p_import.add_argument("--rules", help="분류 규칙 JSON 경로 (기본: data/category_rules.json 또는 내장 규칙)")
+    p_import.set_defaults(func=cmd_import)
+
+    p_cat = sub.add_parser("categorize", help="규칙으로 기존 거래 자동 분류")
+    p_cat.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="가계부 CSV 경로")
+    p_cat.add_argument("--rules", help="분류 규칙 JSON 경로 (기본: data/category_rules.json 또는 내장 규칙)")
+    p_cat.add_argument("--all", action="store_true", help='"기타"뿐 아니라 모든 행을 다시 분류')
+    p_cat.add_argument("--show", type=int, default=20, help="화면에 보여줄 변경 건수")
+    p_cat.add_argument("--dry-run", action="store_true", help="저장하지 않고 결과만 확인")
+    p_cat.set_defaults(func=cmd_categorize)
+
+    p_dedupe = sub.add_parser("dedupe", help="중복 거래 찾기/지우기")
+    p_dedupe.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="가계부 CSV 경로")
+    p_dedupe.add_argument("--window", type=int, default=0, help="날짜 차이 허용 일수 (0이면 같은 날짜만)")
+    p_dedupe.add_argument("--show", type=int, default=20, help="화면에 보여줄 묶음 수")
+    p_dedupe.add_argument("--remove", action="store_true", help="각 묶음의 첫 행만 남기고 삭제")
+    p_dedupe.set_defaults(func=cmd_dedupe)
+
+    p_validate = sub.add_parser("validate", help="가계부 데이터 품질 검사 (오류 종류별 건수/행 번호)")
+    p_validate.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="가계부 CSV 경로")
+    p_validate.add_argument("--quarantine", help="오류 행을 따로 모아 둘 CSV 경로")
+    p_validate.set_defaults(func=cmd_validate)
+
+    p_rec = sub.add_parser("recurring", help="반복 거래(구독/통신비 등) 찾기, 예정분 등록")
+    p_rec.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="가계부 CSV 경로")
+    p_rec.add_argument("--min-count", type=int, default=3, help="최소 반복 횟수")
+    p_rec.add_argument("--materialize", action="store_true", help="--until까지의 예정 거래를 등록")
+    p_rec.add_argument("--until", help="예정 거래를 만들 마지막 날짜 (YYYY-MM-DD, 기본: 오늘)")
+    p_rec.add_argument("--dry-run", action="store_true", help="저장하지 않고 결과만 확인")
+    p_rec.set_defaults(func=cmd_recurring)
+
+    p_budget = sub.add_parser("budget", help="예산 관제 (카테고리별 지출/예산, 초과면 종료 코드 1)")
+    p_budget.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="가계부 CSV 경로")
+    p_budget.add_argument("--budgets", default="data/budgets.json", help="예산 JSON 경로")
+    p_budget.add_argument("--month", help="대상 월 (YYYY-MM, 기본: 이번 달)")
+    p_budget.add_argument("--history", action="store_true", help="날짜순으로 80%%/100%%를 넘은 시점 출력")
+    p_budget.add_argument("--forecast", action="store_true", help="이번 달 월말 예상 지출도 출력")
+    p_budget.add_argument("--fx-rates", help="환율표 CSV 경로 (기본: data/fx_rates.csv, 외화 지출 원화 환산)")
+    p_budget.set_defaults(func=cmd_budget)
+
+    p_summary = sub.add_parser("summary", help="기간 요약 (--approx: 대용량 파일을 표본으로 빠르게 근사)")
+    p_summary.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="가계부 CSV 경로")
+    p_summary.add_argument("--start", help="시작일 (YYYY-MM-DD)")
+    p_summary.add_argument("--end", help="종료일 (YYYY-MM-DD)")
+    p_summary.add_argument("--approx", action="store_true", help="층화 표본 근사 (오차 범위 표시, 시간 예산 안에서 정밀화)")
+    p_summary.add_argument("--time-budget", type=float, default=1.0, help="--approx 시간 예산(초)")
+    p_summary.add_argument("--currency", default="KRW", help="보고 통화 (외화 거래는 거래일 환율로 환산, --approx 제외)")
+    p_summary.add_argument("--fx-rates", help="환율표 CSV 경로 (기본: data/fx_rates.csv, date,currency,rate)")
+    p_summary.set_defaults(func=cmd_summary)
+
+    p_export = sub.add_parser("export", help="거래 목록/월별 리포트 내보내기 (CSV, JSONL, Parquet)")
+    p_export.add_argument("--ledger", default=DEFAULT_LEDGER_PATH, help="가계부 CSV 경로")
+    p_export.add_argument("-o", "--output", default="-", help="출력 파일 경로 (기본: 표준 출력)")
+    p_export.add_argument("--format", choices=["csv", "jsonl", "parquet"], default="csv", help="출력 형식")
+    p_export.add_argument("--report", choices=["monthly"], help="거래 목록 대신 리포트 내보내기")
+    p_export.add_argument("--start", help="시작일 (YYYY-MM-DD)")
+    p_export.add_argument("--end", help="종료일 (YYYY-MM-DD)")
+    p_export.add_argument("--type", choices=["지출", "수입"], help="구분 필터")
+    p_export.add_argument("--category", help="카테고리 필터")
+    p_export.add_argument("--keyword", help="내용 검색어")
+    p_export.add_argument("--chunk-size", type=int, default=10_000, help="청크 크기(행)")
+    p_export.add_argument("--fx-rates", help="월별 리포트 환율표 CSV 경로 (기본: data/fx_rates.csv)")
+    p_export.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, "func", None):
+        parser.print_help()
+        return 0
+    return args.func(args)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# tests/test_approx.py
+# 역할: 근사 집계 모드(층화 표본 + 오차 범위, 점진적 정밀화) 테스트
+
+import os
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from ledger.approx import ApproxLedger
+from ledger.parallel import LedgerAggregate
+from ledger.repository import load_transactions_range, save_transactions
+
+CATEGORIES = ["식비", "교통", "통신", "생활", "기타"]
+
+
+def _rows(days: int = 400, seed: int = 3) -> list[dict]:
+    """날짜순, 하루 5~30건"""
+    rng = random.Random(seed)
+    rows = []
+    for d in range(days):
+        day = (date(2022, 1, 1) + timedelta(days=d)).isoformat()
+        for _ in range(rng.randint(5, 30)):
+            rows.append({
+                "date": day,
+                "type": "수입" if rng.random() < 0.05 else "지출",
+                "category": rng.choice(CATEGORIES),
+                "description": f"가게 {rng.randint(1, 500)}",
+                "amount": rng.randint(1_000, 90_000),
+            })
+    return rows
+
+
+class TestApproxLedger(unittest.TestCase):
+    """근사 집계 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "ledger.csv")
+        save_transactions(cls.path, _rows())
+        cls.exact = LedgerAggregate().update(load_transactions_range(cls.path, "2022-02-10", "2022-12-31"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_first_result_is_sampled_with_error_bars(self):
+        """시간 예산 0이면 월마다 구간 2개만 읽은 근사값, 오차 범위 안에 실제 값"""
+        result = ApproxLedger(self.path).estimate("2022-02-10", "2022-12-31", time_budget=0)
+
+        self.assertFalse(result.complete)
+        self.assertLess(result.fraction, 0.1)
+        self.assertEqual(result.rows_total, self.exact.rows)
+        self.assertGreater(result.expense.error, 0)
+        self.assertLessEqual(result.expense.low, self.exact.expense)
+        self.assertGreaterEqual(result.expense.high, self.exact.expense)
+        self.assertEqual(set(result.category_expense), set(CATEGORIES))
+
+    def test_refines_to_exact(self):
+        """중간 결과는 점점 많이 읽고, 다 읽으면 services와 같은 정확한 값 (오차 0)"""
+        approx = ApproxLedger(self.path)
+        results = list(approx.refine("2022-02-10", "2022-12-31", time_budget=60, yield_interval=0))
+
+        read = [r.rows_read for r in results]
+        self.assertEqual(read, sorted(read))
+        final = results[-1]
+        self.assertTrue(final.complete)
+        self.assertEqual(final.summary(), self.exact.summary())
+        self.assertEqual(final.expense_count.value, self.exact.expense_count)
+        self.assertEqual({c: e.value for c, e in final.category_expense.items()}, self.exact.category_expense)
+        self.assertTrue(all(e.exact and e.error == 0 for e in final.category_expense.values()))
+        self.assertAlmostEqual(final.distinct_descriptions.value, 500, delta=final.distinct_descriptions.error)
+
+        # 읽은 구간은 보관하므로 다시 물으면 바로 정확한 값
+        again = approx.estimate("2022-02-10", "2022-12-31", time_budget=0)
+        self.assertTrue(again.complete)
+
+    def test_file_change_resets(self):
+        """파일이 바뀌면 보관한 집계를 버리고 새 내용으로 계산"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ledger.csv")
+            save_transactions(path, _rows(days=40))
+            approx = ApproxLedger(path)
+            approx.estimate(time_budget=60)
+
+            rows = _rows(days=40, seed=9)
+            save_transactions(path, rows)
+            os.utime(path, ns=(0, 0))  # 같은 크기로 덮어써도 수정 시각으로 구분
+            result = approx.estimate(time_budget=60)
+            self.assertEqual(result.summary(), LedgerAggregate().update(rows).summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/test_categorize.py
+# 역할: 규칙 기반 자동 분류 테스트
+
+import json
+import os
+import tempfile
+import unittest
+
+from ledger.categorize import Categorizer, Rule, load_rules, recategorize
+
+
+def _tx(desc: str, amount: int = 10000, t_type: str = "지출", category: str = "기타") -> dict:
+    return {"date": "2024-01-15", "type": t_type, "category": category, "description": desc, "amount": amount}
+
+
+class TestCategorizer(unittest.TestCase):
+    """Categorizer 테스트"""
+
+    def setUp(self):
+        self.categorizer = Categorizer([
+            {"category": "교통", "keywords": ["지하철", "버스"]},
+            {"category": "생활", "keywords": ["마트"], "min_amount": 50000},
+            {"category": "식비", "keywords": ["마트", "편의점"]},
+            {"category": "월급", "type": "수입", "min_amount": 1000000},
+        ])
+
+    def test_keyword_match(self):
+        """메모에 들어있는 키워드로 분류 (대소문자/위치 무관)"""
+        self.assertEqual(self.categorizer.categorize(_tx("출근 지하철 2호선")), "교통")
+        self.assertEqual(self.categorizer.categorize(_tx("GS편의점")), "식비")
+        self.assertIsNone(self.categorizer.categorize(_tx("알 수 없음")))
+
+    def test_rule_order_and_conditions(self):
+        """조건을 만족하는 첫 번째 규칙이 이김"""
+        self.assertEqual(self.categorizer.categorize(_tx("이마트", amount=80000)), "생활")
+        self.assertEqual(self.categorizer.categorize(_tx("이마트", amount=8000)), "식비")
+        self.assertEqual(self.categorizer.categorize(_tx("1월 급여", amount=3000000, t_type="수입")), "월급")
+
+    def test_overlapping_keywords(self):
+        """겹치는 키워드도 모두 찾음 (Aho–Corasick 실패 링크)"""
+        categorizer = Categorizer([Rule("A", ("hers",)), Rule("B", ("she",)), Rule("C", ("his",))])
+        self.assertEqual(categorizer._automaton.search("ushers"), {0, 1})
+
+
+class TestRecategorize(unittest.TestCase):
+    """recategorize 함수 테스트"""
+
+    def test_reports_changed_rows(self):
+        """"기타" 행만 다시 분류하고 바뀐 행을 알려줌"""
+        rows = [_tx("지하철"), _tx("버스", category="식비"), _tx("???")]
+        result = recategorize(rows, Categorizer([{"category": "교통", "keywords": ["지하철", "버스"]}]))
+
+        self.assertEqual([(c.index, c.old, c.new) for c in result.changes], [(0, "기타", "교통")])
+        self.assertEqual(result.updates, {0: {**rows[0], "category": "교통"}})
+        self.assertEqual(rows[0]["category"], "기타")  # 원본은 그대로
+
+    def test_all_targets(self):
+        """targets=None이면 모든 행 대상"""
+        rows = [_tx("버스", category="식비")]
+        result = recategorize(rows, Categorizer([{"category": "교통", "keywords": ["버스"]}]), targets=None)
+        self.assertEqual(result.rows[0]["category"], "교통")
+
+    def test_load_rules_file(self):
+        """규칙 파일 읽기 ({"rules": [...]} 형식 포함)"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rules.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"rules": [{"category": "교통", "keywords": ["택시"]}]}, f, ensure_ascii=False)
+            self.assertEqual(load_rules(path), [Rule("교통", ("택시",))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/test_checkpoint.py
+# 역할: 스냅샷(checkpoint) 저장/복원 및 변경분 반영 테스트
+
+import os
+import tempfile
+import unittest
+
+from ledger.checkpoint import LedgerCheckpoint, checkpoint_path, load_checkpoint
+from ledger.repository import append_transactions, load_transactions, save_transactions
+from ledger.store import LedgerStore
+
+SAMPLE = [
+    {"date": "2024-02-03", "type": "지출", "category": "교통", "description": "지하철", "amount": 1500},
+    {"date": "2024-01-15", "type": "지출", "category": "식비", "description": "점심", "amount": 10000},
+    {"date": "2024-01-20", "type": "수입", "category": "월급", "description": "1월 급여", "amount": 3000000},
+]
+
+
+class TestCheckpoint(unittest.TestCase):
+    """load_checkpoint 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ledger.csv")
+        save_transactions(self.path, SAMPLE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rebuild_then_hit(self):
+        """처음엔 새로 만들고, 다음부터는 스냅샷을 그대로 사용"""
+        first = load_checkpoint(self.path)
+        self.assertEqual(first.status, "rebuilt")
+        self.assertTrue(os.path.exists(checkpoint_path(self.path)))
+
+        second = load_checkpoint(self.path)
+        self.assertEqual(second.status, "hit")
+        self.assertEqual(second.rows(), SAMPLE)
+
+    def test_replay_appended_rows(self):
+        """덧붙인 행만 반영 = 전체 다시 읽은 결과"""
+        load_checkpoint(self.path)
+        extra = {"date": "2024-01-31", "type": "지출", "category": "식비", "description": "저녁, 2인", "amount": 20000}
+        append_transactions(self.path, [extra])
+
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual(checkpoint.status, "replayed")
+        self.assertEqual(checkpoint.rows(), load_transactions(self.path))
+        self.assertEqual(load_checkpoint(self.path).status, "hit")
+
+    def test_foreign_currency_rows(self):
+        """외화 행은 통화를 보존한다 (스냅샷 복원 후에도)"""
+        load_checkpoint(self.path)
+        extra = {"date": "2024-01-31", "type": "지출", "category": "식비", "description": "cafe", "amount": 7, "currency": "USD"}
+        append_transactions(self.path, [extra])
+
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual(checkpoint.rows(), load_transactions(self.path))
+        self.assertEqual(checkpoint.currencies, {3: "USD"})
+        self.assertEqual(load_checkpoint(self.path).rows()[-1], extra)
+
+    def test_rewrite_rebuilds(self):
+        """앞부분이 바뀌면 전체 다시 만들기"""
+        load_checkpoint(self.path)
+        save_transactions(self.path, SAMPLE[1:])
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual(checkpoint.status, "rebuilt")
+        self.assertEqual(checkpoint.rows(), SAMPLE[1:])
+
+    def test_corrupt_snapshot_ignored(self):
+        """깨진 스냅샷은 무시"""
+        with open(checkpoint_path(self.path), "wb") as f:
+            f.write(b"not a pickle")
+        self.assertIsNone(LedgerCheckpoint.load(self.path))
+        self.assertEqual(load_checkpoint(self.path).rows(), SAMPLE)
+
+    def test_store_checkpoints_on_cadence(self):
+        """저장소는 checkpoint_every번 쓸 때마다 스냅샷을 갱신하고, 그 사이에는 다시 만들어도 결과가 같다"""
+        store = LedgerStore(self.path, checkpoint=True, checkpoint_every=2)
+        store.insert([SAMPLE[0]], expected_version=store.version)
+
+        checkpoint = load_checkpoint(self.path, save=False)
+        self.assertEqual(checkpoint.status, "rebuilt")  # 1번째 쓰기: 스냅샷은 그대로
+        self.assertEqual(checkpoint.rows(), load_transactions(self.path))
+
+        store.insert([SAMPLE[1]], expected_version=store.version)
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual(checkpoint.status, "hit")  # 2번째 쓰기에서 갱신
+        self.assertEqual(checkpoint.rows(), load_transactions(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
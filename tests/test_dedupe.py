@@ -0,0 +1,56 @@
+# tests/test_dedupe.py
+# 역할: 중복 거래 찾기 테스트
+
+import unittest
+
+from ledger.dedupe import dedupe_key, find_duplicates, normalize_description, remove_duplicates
+
+
+def _tx(day: str, desc: str, amount: int = 4500, category: str = "식비") -> dict:
+    return {"date": day, "type": "지출", "category": category, "description": desc, "amount": amount}
+
+
+class TestDedupeKey(unittest.TestCase):
+    """정규화 키 테스트"""
+
+    def test_normalize_description(self):
+        """대소문자/공백/문장부호/전각 문자 무시"""
+        self.assertEqual(normalize_description(" GS25  편의점! "), normalize_description("ｇｓ２５편의점"))
+
+    def test_category_ignored(self):
+        """카테고리만 다르면 같은 키"""
+        self.assertEqual(dedupe_key(_tx("2024-01-15", "커피")), dedupe_key(_tx("2024-01-15", "커피", category="기타")))
+
+
+class TestFindDuplicates(unittest.TestCase):
+    """find_duplicates 테스트"""
+
+    def setUp(self):
+        self.rows = [
+            _tx("2024-01-15", "스타벅스 커피"),
+            _tx("2024-01-15", "점심", amount=9000),
+            _tx("2024-01-15", "스타벅스커피"),  # 0번과 중복
+            _tx("2024-01-17", "스타벅스 커피"),  # 2일 차이
+            _tx("2024-01-25", "스타벅스 커피"),  # 10일 차이
+        ]
+
+    def test_exact(self):
+        """같은 날짜만 중복"""
+        clusters = find_duplicates(self.rows)
+        self.assertEqual([c.indices for c in clusters], [[0, 2]])
+
+    def test_window(self):
+        """N일 이내로 이어지면 같은 묶음"""
+        clusters = find_duplicates(self.rows, window_days=3)
+        self.assertEqual([c.indices for c in clusters], [[0, 2, 3]])
+        self.assertEqual(clusters[0].keep, 0)
+
+    def test_remove(self):
+        """각 묶음의 첫 행만 남김"""
+        rows, removed = remove_duplicates(self.rows, find_duplicates(self.rows, window_days=3))
+        self.assertEqual(removed, [2, 3])
+        self.assertEqual(len(rows), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
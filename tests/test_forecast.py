@@ -0,0 +1,98 @@
+# tests/test_forecast.py
+# 역할: 월말 지출 예측 테스트
+
+import unittest
+from datetime import date
+
+from ledger.forecast import DailySpendIndex, forecast_month_end
+from ledger.fx import FxRateTable
+
+
+def _tx(day: str, amount: int, category: str = "식비", description: str = "점심") -> dict:
+    return {"date": day, "type": "지출", "category": category, "description": description, "amount": amount}
+
+
+def _history() -> list[dict]:
+    """1~3월: 식비는 매일(1~14일 1만원, 15~28일 5천원), 통신은 매달 5일 5.5만원"""
+    rows = []
+    for month in ("2024-01", "2024-02", "2024-03"):
+        rows.append(_tx(f"{month}-05", 55000, "통신", "SKT 요금"))
+        for d in range(1, 29):
+            rows.append(_tx(f"{month}-{d:02d}", 10000 if d < 15 else 5000))
+    return rows
+
+
+class TestDailySpendIndex(unittest.TestCase):
+    """일별 지출 인덱스 테스트"""
+
+    def test_cumulative_vectors(self):
+        """누적 합계를 모든 카테고리 벡터로 한 번에"""
+        index = DailySpendIndex.build([
+            _tx("2024-02-01", 1000),
+            _tx("2024-02-03", 500, "교통"),
+            _tx("2024-02-03", 2000),
+            {"date": "2024-02-02", "type": "수입", "category": "월급", "description": "", "amount": 9},
+        ])
+        cum = index.cumulative("2024-02")
+        self.assertEqual(index.categories, ["식비", "교통"])
+        self.assertEqual(len(cum), 29)  # 2024년 2월
+        self.assertEqual(cum[0], [1000, 0])
+        self.assertEqual(cum[2], [3000, 500])
+        self.assertEqual(cum[-1], [3000, 500])
+
+
+class TestForecastMonthEnd(unittest.TestCase):
+    """월말 예측 테스트"""
+
+    def setUp(self):
+        self.rows = _history() + [_tx("2024-04-01", 10000), _tx("2024-04-02", 10000)]
+        self.today = date(2024, 4, 2)
+
+    def test_seasonal_uses_history_shape(self):
+        """월초에 많이 쓰는 패턴이면 linear보다 낮게 예측"""
+        seasonal = forecast_month_end(self.rows, today=self.today)
+        linear = forecast_month_end(self.rows, today=self.today, method="linear")
+
+        self.assertEqual(seasonal["식비"].method, "seasonal")
+        self.assertEqual(seasonal["식비"].projected, 210000)  # 지난 달 2일까지 비율 = 2만/21만
+        self.assertEqual(linear["식비"].projected, 300000)  # 2만 / 2일 × 30일
+
+    def test_recurring_pending_added(self):
+        """아직 안 나간 고정 지출은 그대로 더하고, 매일 나오는 지출은 고정으로 보지 않는다"""
+        result = forecast_month_end(self.rows, today=self.today)
+        self.assertEqual(result["통신"].recurring_pending, 55000)
+        self.assertEqual(result["통신"].projected, 55000)
+        self.assertEqual(result["식비"].recurring_pending, 0)
+
+        paid = forecast_month_end(self.rows + [_tx("2024-04-05", 55000, "통신", "SKT  요금")], today=date(2024, 4, 5))
+        self.assertEqual(paid["통신"].recurring_pending, 0)
+        self.assertEqual(paid["통신"].projected, 55000)
+
+    def test_warns_before_exceeding(self):
+        """실제 지출은 정상이어도 예상으로 경고/초과"""
+        result = forecast_month_end(self.rows, today=self.today, budgets={"전체": 300000, "식비": 250000, "통신": 50000})
+        self.assertEqual(result["식비"].spent, 20000)
+        self.assertEqual((result["식비"].status, result["통신"].status), ("경고", "초과"))
+        self.assertEqual(result["전체"].projected, 265000)
+        self.assertEqual(result["전체"].status, "경고")
+
+    def test_foreign_currency(self):
+        """외화 지출은 환율로 환산해서 예측하고, 환율이 없으면 예측에서 빼고 건수를 알려준다"""
+        usd = dict(_tx("2024-04-02", 10, "쇼핑", "온라인 결제"), currency="USD")  # 10달러
+        result = forecast_month_end(self.rows + [usd], today=self.today, method="linear")
+        self.assertEqual(result["쇼핑"].spent, 0)  # 10을 원화 10원처럼 더하지 않는다
+        self.assertEqual((result["쇼핑"].unconverted, result["전체"].unconverted), (1, 1))
+
+        fx = FxRateTable([("2024-04-01", "USD", 1300.0)])
+        result = forecast_month_end(self.rows + [usd], today=self.today, method="linear", fx=fx)
+        self.assertEqual(result["쇼핑"].spent, 13000)
+        self.assertEqual(result["쇼핑"].projected, 195000)  # 1.3만 / 2일 × 30일
+        self.assertEqual(result["전체"].unconverted, 0)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            forecast_month_end(self.rows, method="arima")
+
+
+if __name__ == "__main__":
+    unittest.main()
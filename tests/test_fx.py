@@ -0,0 +1,101 @@
+# tests/test_fx.py
+# 역할: 환율표 / 기준일 환율 / 일괄 환산 테스트
+
+import os
+import tempfile
+import unittest
+
+from ledger.fx import FxRateTable, MissingRateError, convert_transactions
+from ledger.services import calc_category_expense, calc_summary
+
+RATES = [
+    ("2024-01-02", "USD", 1300.0),
+    ("2024-01-05", "USD", 1320.0),
+    ("2024-01-02", "jpy", 9.0),  # 소문자 통화도 정리
+]
+
+
+def _tx(day: str, amount: int, currency: str = "", t_type: str = "지출", category: str = "식비") -> dict:
+    row = {"date": day, "type": t_type, "category": category, "description": "", "amount": amount}
+    if currency:
+        row["currency"] = currency
+    return row
+
+
+class TestFxRateTable(unittest.TestCase):
+    """환율표 테스트"""
+
+    def setUp(self):
+        self.table = FxRateTable(RATES)
+
+    def test_as_of_lookup(self):
+        """고시가 없는 날은 직전 고시일 환율, 첫 고시일 전은 MissingRateError"""
+        self.assertEqual(self.table.rate("USD", "2024-01-04"), 1300.0)
+        self.assertEqual(self.table.rate("USD", "2024-01-05"), 1320.0)
+        self.assertEqual(self.table.rate("KRW", "2000-01-01"), 1.0)
+        self.assertAlmostEqual(self.table.rate("USD", "2024-01-03", to="JPY"), 1300.0 / 9.0)
+        with self.assertRaises(MissingRateError):
+            self.table.rate("USD", "2024-01-01")
+
+    def test_update_clears_cache(self):
+        """환율을 고치면 캐시해 둔 값도 바뀐다 (하루치 끼워 넣기)"""
+        self.assertEqual(self.table.rate("USD", "2024-01-04"), 1300.0)
+        self.table.update([("2024-01-03", "USD", 1310.0)])
+        self.assertEqual(self.table.rate("USD", "2024-01-04"), 1310.0)
+        self.assertEqual(len(self.table), 4)
+
+    def test_convert_amounts_resolves_pairs_once(self):
+        """같은 (통화, 날짜) 쌍은 환율을 한 번만 찾는다"""
+        calls = []
+        original = self.table.rate
+
+        def counting_rate(currency, day, to="KRW"):
+            calls.append((currency, day))
+            return original(currency, day, to)
+
+        self.table.rate = counting_rate
+        amounts = self.table.convert_amounts([10, 20, 1000, 5], ["USD", "USD", "JPY", "USD"], ["2024-01-02"] * 4)
+        self.assertEqual(amounts, [13000, 26000, 9000, 6500])
+        self.assertEqual(sorted(calls), [("JPY", "2024-01-02"), ("USD", "2024-01-02")])
+
+    def test_save_load_round_trip(self):
+        """CSV로 저장한 환율표를 다시 읽으면 같은 환율"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fx_rates.csv")
+            self.table.save(path)
+            loaded = FxRateTable.load(path)
+        self.assertEqual(loaded.currencies, ["JPY", "USD"])
+        self.assertEqual(loaded.rate("USD", "2024-01-09"), 1320.0)
+
+
+class TestConvertTransactions(unittest.TestCase):
+    """거래 목록 환산 테스트"""
+
+    def test_summary_in_one_currency(self):
+        """외화 거래를 원화로 환산한 뒤 합계/카테고리별 합계"""
+        rows = [
+            _tx("2024-01-03", 10000),
+            _tx("2024-01-06", 20, "USD", category="쇼핑"),
+            _tx("2024-01-03", 1000, "JPY"),
+            _tx("2024-01-10", 500000, t_type="수입", category="월급"),
+        ]
+        converted = convert_transactions(rows, FxRateTable(RATES))
+
+        self.assertIs(converted[0], rows[0])  # 원화 행은 복사하지 않는다
+        self.assertNotIn("currency", converted[1])
+        self.assertEqual(calc_summary(converted), (500000, 10000 + 26400 + 9000, 500000 - 45400))
+        self.assertEqual(calc_category_expense(converted), {"식비": 19000, "쇼핑": 26400})
+
+    def test_to_foreign_currency(self):
+        """보고 통화를 달러로 하면 원화 행도 환산하고 currency 키가 붙는다"""
+        converted = convert_transactions([_tx("2024-01-05", 13200)], FxRateTable(RATES), to="usd")
+        self.assertEqual((converted[0]["amount"], converted[0]["currency"]), (10, "USD"))
+
+    def test_missing_rate(self):
+        """환율표에 없는 통화는 MissingRateError"""
+        with self.assertRaises(MissingRateError):
+            convert_transactions([_tx("2024-01-05", 10, "EUR")], FxRateTable(RATES))
+
+
+if __name__ == "__main__":
+    unittest.main()
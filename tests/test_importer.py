@@ -0,0 +1,92 @@
+# tests/test_importer.py
+# 역할: 명세서 일괄 가져오기 파이프라인 테스트
+
+import os
+import tempfile
+import unittest
+
+from ledger.categorize import Categorizer
+from ledger.importer import build_column_map, import_statement, normalize_row
+from ledger.repository import load_transactions, save_transactions
+
+
+class TestNormalizeRow(unittest.TestCase):
+    """원본 행 정리 테스트"""
+
+    def test_bank_columns(self):
+        """은행 컬럼명 매핑 + 금액/구분 정리"""
+        mapping = build_column_map(["거래일자", "적요", "거래금액"])
+        row = normalize_row({"거래일자": "2024.01.15", "적요": "점심", "거래금액": "-12,000원"}, mapping)
+
+        self.assertEqual(row["date"], "2024-01-15")
+        self.assertEqual(row["type"], "지출")
+        self.assertEqual(row["category"], "기타")
+        self.assertEqual(row["amount"], 12000)
+
+
+class TestImportStatement(unittest.TestCase):
+    """import_statement 함수 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ledger = os.path.join(self.tmp.name, "ledger.csv")
+        self.source = os.path.join(self.tmp.name, "card.csv")
+        save_transactions(self.ledger, [
+            {"date": "2024-01-10", "type": "지출", "category": "식비", "description": "점심", "amount": 10000},
+        ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_import_with_dedupe_and_invalid(self):
+        """중복/오류 행은 제외하고 나머지만 추가"""
+        with open(self.source, "w", encoding="utf-8-sig") as f:
+            f.write("날짜,구분,카테고리,내용,금액\n")
+            f.write("2024-01-10,지출,식비,점심,10000\n")  # 기존과 중복
+            f.write("2024-01-11,지출,교통,지하철,1500\n")
+            f.write("2024-01-11,지출,교통,지하철,1500\n")  # 명세서 안의 같은 행은 둘 다 가져온다
+            f.write("잘못된날짜,지출,식비,저녁,9000\n")
+            f.write("2024-01-12,입금,,월급,3000000\n")
+
+        result = import_statement(self.source, self.ledger, batch_size=2)
+
+        self.assertEqual(result.total_rows, 5)
+        self.assertEqual(result.imported, 3)
+        self.assertEqual(result.duplicates, 1)
+        self.assertEqual(result.invalid, 1)
+        self.assertEqual(result.invalid_rows, [4])
+        self.assertGreater(result.rows_per_sec, 0)
+
+        rows = load_transactions(self.ledger)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[-1]["type"], "수입")
+
+        # 같은 명세서를 다시 가져오면 이미 있는 개수만큼 건너뛰어 아무것도 추가되지 않는다
+        again = import_statement(self.source, self.ledger)
+        self.assertEqual((again.imported, again.duplicates), (0, 4))
+        self.assertEqual(len(load_transactions(self.ledger)), 4)
+
+    def test_dry_run(self):
+        """dry-run이면 저장하지 않음"""
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write("date,amount,description\n2024-02-01,5000,커피\n")
+
+        result = import_statement(self.source, self.ledger, dry_run=True)
+
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(len(load_transactions(self.ledger)), 1)
+
+    def test_auto_category(self):
+        """categorizer를 주면 "기타" 행만 자동 분류"""
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write("date,category,description,amount\n2024-02-01,,스타벅스 커피,5000\n2024-02-02,교통,커피,4000\n")
+
+        categorizer = Categorizer([{"category": "식비", "keywords": ["커피"]}])
+        result = import_statement(self.source, self.ledger, categorizer=categorizer)
+
+        self.assertEqual(result.categorized, 1)
+        self.assertEqual([t["category"] for t in load_transactions(self.ledger)], ["식비", "식비", "교통"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -58,6 +58,14 @@ class TestTransaction(unittest.TestCase):
         )
         self.assertEqual(tx.category, "기타")
 
+    def test_currency(self):
+        """통화는 기본 원화, 소문자는 대문자로, 잘못된 코드는 ValueError"""
+        tx = Transaction(date=date(2024, 1, 15), type="지출", category="쇼핑", description="amazon", amount=25, currency="usd")
+        self.assertEqual(tx.currency, "USD")
+        self.assertEqual(Transaction.from_dict({**tx.to_dict(), "currency": ""}).currency, "KRW")
+        with self.assertRaises(ValueError):
+            Transaction(date=date(2024, 1, 15), type="지출", category="쇼핑", description="", amount=25, currency="달러")
+
     def test_to_dict(self):
         """dict 변환"""
         tx = Transaction(
@@ -0,0 +1,68 @@
+# tests/test_parallel.py
+# 역할: 병렬(map-reduce) 집계 테스트 - 결과가 직렬 services 함수와 같아야 한다
+
+import os
+import tempfile
+import unittest
+
+from ledger.parallel import LedgerAggregate, aggregate, aggregate_chunks, aggregate_file
+from ledger.repository import iter_transactions, load_transactions, save_transactions
+from ledger.services import calc_category_expense, calc_detailed_summary, calc_summary
+
+CATEGORIES = ["식비", "교통", "통신", "생활", "기타"]
+ROWS = [
+    {
+        "date": f"2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}",
+        "type": "수입" if i % 10 == 0 else "지출",
+        "category": CATEGORIES[i % len(CATEGORIES)],
+        "description": f"메모, {i}" if i % 7 == 0 else f"메모 {i}",
+        "amount": (i * 137) % 50_000 + 100,
+    }
+    for i in range(3000)
+]
+
+
+class TestLedgerAggregate(unittest.TestCase):
+    """부분 집계/합치기 테스트"""
+
+    def assert_matches_services(self, agg: LedgerAggregate, rows: list[dict]):
+        self.assertEqual(agg.summary(), calc_summary(rows))
+        self.assertEqual(agg.detailed_summary(), calc_detailed_summary(rows))
+        self.assertEqual(agg.category_expense, calc_category_expense(rows))
+
+    def test_merge_is_associative(self):
+        """조각별 집계를 합친 결과 = 한 번에 집계"""
+        parts = [LedgerAggregate().update(ROWS[i:i + 700]) for i in range(0, len(ROWS), 700)]
+        merged = LedgerAggregate()
+        for part in reversed(parts):
+            merged.merge(part)
+        self.assert_matches_services(merged, ROWS)
+
+    def test_foreign_rows_kept_apart(self):
+        """외화 행은 원화 합계에 더하지 않고 통화별 칸에 모은다"""
+        usd = [dict(ROWS[1], currency="USD"), dict(ROWS[11], currency="USD", type="수입")]
+        agg = LedgerAggregate().update(ROWS[:100] + usd)
+        self.assert_matches_services(agg, ROWS[:100])
+        self.assertEqual(agg.foreign_count, 2)
+        self.assertEqual((agg.foreign_expense, agg.foreign_income), ({"USD": ROWS[1]["amount"]}, {"USD": ROWS[11]["amount"]}))
+        with self.assertRaises(ValueError):
+            agg.merge(LedgerAggregate(currency="USD"))
+
+    def test_small_input_serial(self):
+        """min_rows보다 작으면 직렬 (워커 없이)"""
+        self.assert_matches_services(aggregate(ROWS, workers=4), ROWS)
+
+    def test_process_pool(self):
+        """워커 프로세스로 나눠도 같은 결과 (목록/청크/파일)"""
+        self.assert_matches_services(aggregate(ROWS, workers=2, min_rows=0, batch_rows=500), ROWS)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ledger.csv")
+            save_transactions(path, ROWS)
+            rows = load_transactions(path)
+            self.assert_matches_services(aggregate_chunks(iter_transactions(path, chunk_size=1000), workers=2), rows)
+            self.assert_matches_services(aggregate_file(path, workers=2, min_rows=0), rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
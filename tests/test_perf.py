@@ -0,0 +1,74 @@
+# tests/test_perf.py
+# 역할: 계측(perf) 모듈 테스트
+
+import json
+import os
+import tempfile
+import unittest
+
+from ledger import perf
+from ledger.services import calc_summary
+
+
+class TestPerf(unittest.TestCase):
+    """timed/span/capture/JSONL 저장 테스트"""
+
+    def setUp(self):
+        self.was_enabled = perf.is_enabled()  # 기본은 꺼짐 (LEDGER_PERF_DEBUG=1이면 켜짐)
+        perf.reset()
+        perf.set_enabled(True)
+
+    def tearDown(self):
+        perf.set_enabled(self.was_enabled)
+
+    def test_capture_service_and_span(self):
+        """rerun 단위 capture에 서비스 호출과 직접 만든 구간이 모두 잡힘"""
+        perf.begin_capture()
+        with perf.span("app.filter"):
+            calc_summary([{"type": "수입", "amount": 1000}])
+        spans = perf.end_capture()
+
+        names = [s.name for s in spans]
+        self.assertEqual(names, ["services.calc_summary", "app.filter"])
+        self.assertEqual(perf.stats()["histograms"]["app.filter"]["count"], 1)
+
+    def test_counter_and_disabled(self):
+        """끄면 기록하지 않음"""
+        perf.count("hits")
+        perf.set_enabled(False)
+        perf.count("hits")
+        with perf.span("off"):
+            pass
+        self.assertIs(perf.span("a"), perf.span("b"))  # 꺼져 있으면 매번 같은 빈 객체 (할당 없음)
+        perf.set_enabled(True)
+
+        stats = perf.stats()
+        self.assertEqual(stats["counters"], {"hits": 1})
+        self.assertNotIn("off", stats["histograms"])
+
+    def test_histogram_percentile(self):
+        """근사 백분위수는 버킷 상한 이내"""
+        hist = perf.Histogram()
+        for ms in [1, 1, 1, 1, 100]:
+            hist.add(ms)
+        self.assertLessEqual(hist.percentile(0.5), 1.28)
+        self.assertEqual(hist.percentile(1.0), 100)
+        hist.add(0.01)  # 상한과 같은 값은 그 버킷, 마지막 상한보다 크면 초과 버킷
+        hist.add(1e9)
+        self.assertEqual((hist.buckets[0], hist.buckets[-1]), (1, 1))
+
+    def test_dump_jsonl(self):
+        """스팬을 JSONL로 저장"""
+        with perf.span("x", rows=3):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spans.jsonl")
+            self.assertEqual(perf.dump_spans_jsonl(path), 1)
+            with open(path, encoding="utf-8") as f:
+                item = json.loads(f.readline())
+        self.assertEqual(item["name"], "x")
+        self.assertEqual(item["attrs"], {"rows": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# tests/test_recurring.py
+# 역할: 반복 거래 탐지/예정분 생성 테스트
+
+import unittest
+from datetime import date
+
+from ledger.recurring import RecurringDetector, detect_recurring, materialize_upcoming
+from ledger.store import Change
+
+
+def _tx(day: str, amount: int, description: str, category: str = "통신") -> dict:
+    return {"date": day, "type": "지출", "category": category, "description": description, "amount": amount}
+
+
+class TestDetectRecurring(unittest.TestCase):
+    """반복 거래 탐지 테스트"""
+
+    def test_monthly_with_amount_drift(self):
+        """요금이 조금씩 바뀌어도 한 금액대, 같은 가게라도 금액대가 다르면 따로"""
+        rows = [
+            _tx("2024-01-25", 55000, "SKT 요금"),
+            _tx("2024-02-26", 56000, "skt요금"),
+            _tx("2024-03-25", 55500, "SKT 요금"),
+            _tx("2024-03-25", 3000, "SKT 요금"),  # 부가서비스 (다른 금액대, 1번뿐)
+            _tx("2024-01-03", 9000, "점심", "식비"),
+            _tx("2024-01-04", 8000, "점심", "식비"),
+        ]
+        patterns = detect_recurring(rows)
+
+        self.assertEqual(len(patterns), 1)
+        p = patterns[0]
+        self.assertEqual((p.period, p.category, p.amount, p.count), ("monthly", "통신", 55500, 3))
+        self.assertEqual(p.next_date(), date(2024, 4, 26))  # 최근 3번 중 가장 늦은 날
+
+    def test_weekly_and_skipped_month(self):
+        """주간 반복, 한 달 건너뛴 월간 반복도 찾는다"""
+        weekly = [_tx(f"2024-05-{d:02d}", 12000, "필라테스", "생활") for d in (1, 8, 15, 22, 29)]
+        monthly = [_tx(day, 10900, "넷플릭스", "생활") for day in ("2024-01-10", "2024-02-10", "2024-04-10", "2024-05-10")]
+        periods = {p.description: p.period for p in detect_recurring(weekly + monthly)}
+        self.assertEqual(periods, {"필라테스": "weekly", "넷플릭스": "monthly"})
+
+    def test_incremental_update(self):
+        """새 달이 들어오면 바뀐 묶음만 다시 검사, 결과는 한 번에 찾은 것과 같다"""
+        rows = [_tx(f"2024-0{m}-05", 30000, "관리비", "생활") for m in (1, 2)]
+        detector = RecurringDetector().update(rows)
+        self.assertEqual(detector.patterns(), [])
+
+        new_month = [_tx("2024-03-05", 30000, "관리비", "생활")]
+        detector.update(new_month)
+        self.assertEqual(detector.patterns(), detect_recurring(rows + new_month))
+
+        detector.on_change(rows + new_month, Change(version=1, op="delete", indices=[2]))
+        self.assertEqual(detector.patterns(), [])
+
+
+class TestMaterializeUpcoming(unittest.TestCase):
+    """예정 반복 거래 만들기 테스트"""
+
+    def setUp(self):
+        self.rows = [_tx(f"2024-0{m}-31" if m in (1, 3) else "2024-02-29", 55000, "SKT 요금") for m in (1, 2, 3)]
+        self.patterns = detect_recurring(self.rows)
+
+    def test_month_end_clamp(self):
+        """말일 결제는 짧은 달에 그 달 말일, 이미 있는 행은 만들지 않는다"""
+        existing = self.rows + [_tx("2024-05-31", 55000, "skt 요금")]
+        upcoming = materialize_upcoming(self.patterns, until=date(2024, 6, 30), existing=existing, today=date(2024, 4, 1))
+        self.assertEqual([r["date"] for r in upcoming], ["2024-04-30", "2024-06-30"])
+        self.assertEqual(upcoming[0]["description"], "SKT 요금")
+
+    def test_foreign_currency_subscription(self):
+        """달러 구독은 달러로 묶고, 예정분에도 통화가 붙는다 (같은 숫자의 원화 행과는 따로)"""
+        usd = [dict(_tx(f"2024-0{m}-10", 15, "Netflix", "생활"), currency="usd") for m in (1, 2, 3)]
+        krw = [_tx("2024-01-10", 15, "Netflix", "생활")]
+        patterns = detect_recurring(usd + krw)
+        self.assertEqual([(p.currency, p.count) for p in patterns], [("USD", 3)])
+
+        upcoming = materialize_upcoming(patterns, until=date(2024, 5, 31), today=date(2024, 4, 1))
+        self.assertEqual([(r["date"], r["amount"], r["currency"]) for r in upcoming], [("2024-04-10", 15, "USD"), ("2024-05-10", 15, "USD")])
+        self.assertEqual(materialize_upcoming(patterns, until=date(2024, 5, 31), existing=upcoming, today=date(2024, 4, 1)), [])
+
+    def test_inactive_pattern_skipped(self):
+        """오래 끊긴 반복은 만들지 않는다"""
+        self.assertEqual(materialize_upcoming(self.patterns, until=date(2024, 12, 31), today=date(2024, 9, 1)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
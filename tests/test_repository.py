@@ -0,0 +1,301 @@
+# tests/test_repository.py
+# 역할: 저장소(Repository) 계층 테스트
+
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from ledger.csv_index import DateOffsetIndex, index_path
+from ledger.repository import (
+    WriteBehindWriter,
+    append_transactions,
+    export_monthly_report,
+    export_transactions,
+    iter_transactions,
+    load_transactions,
+    load_transactions_range,
+    save_transactions,
+    sniff_dialect,
+)
+
+SAMPLE = [
+    {"date": "2024-01-15", "type": "지출", "category": "식비", "description": "점심", "amount": 10000},
+    {"date": "2024-01-20", "type": "수입", "category": "월급", "description": "1월 급여", "amount": 3000000},
+    {"date": "2024-02-03", "type": "지출", "category": "교통", "description": "지하철", "amount": 1500},
+    {"date": "2024-02-10", "type": "지출", "category": "식비", "description": "저녁", "amount": 20000},
+]
+
+
+class RepositoryTestCase(unittest.TestCase):
+    """임시 폴더에 샘플 가계부를 만드는 공통 준비"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ledger.csv")
+        save_transactions(self.path, SAMPLE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class TestLoadSave(RepositoryTestCase):
+    """load/save 왕복 및 청크 읽기 테스트"""
+
+    def test_round_trip(self):
+        """저장한 그대로 읽힘"""
+        self.assertEqual(load_transactions(self.path), SAMPLE)
+
+    def test_bom_file(self):
+        """BOM이 붙은 파일도 읽힘"""
+        with open(self.path, "w", encoding="utf-8-sig") as f:
+            f.write("date,type,category,description,amount\n2024-01-01,지출,식비,점심,1000\n")
+        self.assertEqual(len(load_transactions(self.path)), 1)
+
+    def test_saved_with_bom(self):
+        """저장 파일은 BOM으로 시작하고(엑셀 한글), 덧붙여도 인덱스 범위 조회가 맞다"""
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(3), b"\xef\xbb\xbf")
+        append_transactions(self.path, [{"date": "2024-03-01", "type": "지출", "category": "식비", "description": "간식", "amount": 500}])
+        self.assertEqual(DateOffsetIndex.load(self.path).header_end, len(b"\xef\xbb\xbfdate,type,category,description,amount,currency\r\n"))
+        self.assertEqual([t["amount"] for t in load_transactions_range(self.path, "2024-02-01", "2024-03-31")], [1500, 20000, 500])
+
+    def test_chunks(self):
+        """chunk_size 단위로 나뉘어 나옴"""
+        chunks = list(iter_transactions(self.path, chunk_size=3))
+        self.assertEqual([len(c) for c in chunks], [3, 1])
+
+
+class TestExport(RepositoryTestCase):
+    """스트리밍 내보내기 테스트"""
+
+    def test_export_csv_with_filters(self):
+        """기간 + 구분 필터 후 CSV"""
+        out = io.StringIO()
+        count = export_transactions(
+            self.path, out, start_date="2024-01-16", end_date="2024-02-28",
+            transaction_type="지출", chunk_size=1,
+        )
+        self.assertEqual(count, 2)
+        lines = out.getvalue().strip().split("\n")
+        self.assertEqual(lines[0], "date,type,category,description,amount,currency")
+        self.assertEqual(lines[1], "2024-02-03,지출,교통,지하철,1500,")  # 원화는 통화 칸이 빈 칸
+
+    def test_export_jsonl_to_file(self):
+        """JSONL 파일로 내보내기"""
+        out_path = os.path.join(self.tmp.name, "out", "food.jsonl")
+        export_transactions(self.path, out_path, fmt="jsonl", category="식비")
+        with open(out_path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([r["amount"] for r in rows], [10000, 20000])
+
+    def test_monthly_report(self):
+        """월별 리포트 집계"""
+        out = io.StringIO()
+        count = export_monthly_report(self.path, out, chunk_size=2)
+        self.assertEqual(count, 2)
+        lines = out.getvalue().strip().split("\n")
+        self.assertEqual(lines[1], "2024-01,3000000,10000,2990000,2,0")
+        self.assertEqual(lines[2], "2024-02,0,21500,-21500,2,0")
+
+    def test_monthly_report_date_formats(self):
+        """"2024/2/20"처럼 적힌 날짜도 같은 달로 묶인다"""
+        save_transactions(self.path, SAMPLE + [{"date": "2024/2/20", "type": "지출", "category": "식비", "description": "간식", "amount": 500}])
+        out = io.StringIO()
+        self.assertEqual(export_monthly_report(self.path, out), 2)
+        self.assertEqual(out.getvalue().strip().split("\n")[2], "2024-02,0,22000,-22000,3,0")
+
+    def test_unknown_format(self):
+        """지원하지 않는 형식은 ValueError"""
+        with self.assertRaises(ValueError):
+            export_transactions(self.path, io.StringIO(), fmt="xml")
+
+
+class TestDateIndex(RepositoryTestCase):
+    """날짜 -> 바이트 위치 사이드카 인덱스 테스트"""
+
+    def test_index_written_on_save(self):
+        """저장 시 인덱스가 같이 만들어짐"""
+        index = DateOffsetIndex.load(self.path)
+        self.assertTrue(index.matches(self.path))
+        self.assertEqual(index.row_count(), len(SAMPLE))
+
+    def test_range_query(self):
+        """기간 조회 결과 = 전체 로드 후 필터"""
+        rows = load_transactions_range(self.path, "2024-01-16", "2024-02-05")
+        self.assertEqual([r["description"] for r in rows], ["1월 급여", "지하철"])
+
+    def test_append_maintains_index(self):
+        """덧붙이기 후에도 인덱스가 최신"""
+        extra = {"date": "2024-03-01", "type": "지출", "category": "통신", "description": "폰, 요금", "amount": 50000}
+        append_transactions(self.path, [extra])
+
+        self.assertTrue(DateOffsetIndex.load(self.path).matches(self.path))
+        self.assertEqual(load_transactions_range(self.path, "2024-03-01", "2024-03-31"), [extra])
+        self.assertEqual(load_transactions(self.path), SAMPLE + [extra])
+
+    def test_stale_index_rebuilt(self):
+        """파일을 직접 고쳐서 인덱스가 어긋나면 다시 만든다"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("2024-01-15,지출,식비,간식,3000\n")
+        rows = load_transactions_range(self.path, "2024-01-15", "2024-01-15")
+        self.assertEqual([r["description"] for r in rows], ["점심", "간식"])
+        self.assertTrue(os.path.exists(index_path(self.path)))
+
+
+class TestCurrency(RepositoryTestCase):
+    """선택 컬럼(currency) 테스트: 원화 행은 키 없음, 예전 5컬럼 파일도 그대로 읽고 덧붙인다"""
+
+    USD = {"date": "2024-03-02", "type": "지출", "category": "쇼핑", "description": "amazon", "amount": 25, "currency": "USD"}
+
+    def header(self) -> str:
+        with open(self.path, encoding="utf-8-sig") as f:
+            return f.readline().strip()
+
+    def test_round_trip(self):
+        """외화 행만 currency 키, 기간 조회도 같은 모양"""
+        save_transactions(self.path, SAMPLE + [{**self.USD, "currency": "usd"}])
+        self.assertEqual(self.header(), "date,type,category,description,amount,currency")
+        self.assertEqual(load_transactions(self.path), SAMPLE + [self.USD])
+        self.assertEqual(load_transactions_range(self.path, "2024-03-01", "2024-03-31"), [self.USD])
+
+    def test_legacy_file_append(self):
+        """5컬럼 파일: 원화는 그대로 덧붙이고, 외화가 오면 통화 컬럼 헤더로 다시 저장"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("date,type,category,description,amount\n2024-01-15,지출,식비,점심,10000\n")
+        append_transactions(self.path, SAMPLE[1:2])
+        self.assertEqual(self.header(), "date,type,category,description,amount")
+        self.assertEqual(load_transactions(self.path), SAMPLE[:2])
+
+        append_transactions(self.path, [self.USD])
+        self.assertEqual(self.header(), "date,type,category,description,amount,currency")
+        self.assertEqual(load_transactions(self.path), SAMPLE[:2] + [self.USD])
+
+
+class TestCompressed(unittest.TestCase):
+    """압축(.gz/.bz2/.xz) 가계부 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """확장자별로 압축 저장 후 그대로 읽힘 (인덱스는 만들지 않음)"""
+        for ext in (".gz", ".bz2", ".xz"):
+            path = os.path.join(self.tmp.name, f"ledger.csv{ext}")
+            save_transactions(path, SAMPLE)
+            with open(path, "rb") as f:
+                self.assertNotIn("date,type".encode(), f.read(64))
+            self.assertEqual(load_transactions(path), SAMPLE)
+            self.assertFalse(os.path.exists(index_path(path)))
+
+    def test_append_and_range(self):
+        """덧붙이기 후 전체/기간 조회"""
+        path = os.path.join(self.tmp.name, "ledger.csv.gz")
+        save_transactions(path, SAMPLE)
+        extra = {"date": "2024-03-01", "type": "지출", "category": "통신", "description": "폰, 요금", "amount": 50000}
+        append_transactions(path, [extra])
+
+        self.assertEqual(load_transactions(path), SAMPLE + [extra])
+        chunks = list(iter_transactions(path, chunk_size=2))
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        rows = load_transactions_range(path, "2024-01-16", "2024-02-05")
+        self.assertEqual([r["description"] for r in rows], ["1월 급여", "지하철"])
+
+
+class TestDialect(RepositoryTestCase):
+    """파일 형식 판별(sniff) 후 표준 컬럼만 읽기 테스트"""
+
+    def write(self, data: bytes):
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def test_shipped_layout(self):
+        """BOM + 빈 컬럼 + 헤더에 섞인 쓰레기 컬럼"""
+        self.write(
+            "\ufeffdate,type,category,description,amount,cd /mnt/project && cat data/ledger.csv\r\n"
+            "2024-01-15,지출,식비,점심,10000,\r\n".encode("utf-8")
+        )
+        dialect = sniff_dialect(self.path)
+        self.assertEqual((dialect.encoding, dialect.extra_columns, dialect.is_standard), ("utf-8-sig", 1, True))
+        self.assertEqual(load_transactions(self.path), SAMPLE[:1])
+
+    def test_cp949_semicolon_with_garbage_lines(self):
+        """cp949 + 세미콜론 + 헤더 앞 쓰레기 줄 + 한글/대문자 헤더 + 컬럼 순서 다름"""
+        self.write(
+            "내보내기 결과\n\n금액;Date;구분;카테고리;내용\n10000;2024-01-15;지출;식비;점심\n".encode("cp949")
+        )
+        dialect = sniff_dialect(self.path)
+        self.assertEqual((dialect.encoding, dialect.delimiter, dialect.skip_lines), ("cp949", ";", 2))
+        self.assertFalse(dialect.is_standard)
+        self.assertEqual(load_transactions(self.path), SAMPLE[:1])
+        self.assertEqual(load_transactions_range(self.path, "2024-01-01", "2024-01-31"), SAMPLE[:1])
+
+        # # 비표준 파일에 덧붙이면 표준 형식으로 다시 저장
+        append_transactions(self.path, SAMPLE[1:2])
+        self.assertTrue(sniff_dialect(self.path).is_standard)
+        self.assertEqual(load_transactions(self.path), SAMPLE[:2])
+
+    def test_no_header(self):
+        """표준 컬럼이 없으면 빈 결과"""
+        self.write(b"a,b,c\n1,2,3\n")
+        self.assertIsNone(sniff_dialect(self.path))
+        self.assertEqual(load_transactions(self.path), [])
+
+
+class TestWriteBehind(unittest.TestCase):
+    """write-behind 저장 스레드 테스트"""
+
+    def setUp(self):
+        self.writer = WriteBehindWriter(coalesce_delay=0.05)
+
+    def tearDown(self):
+        self.writer.close()
+
+    def test_coalesce_and_flush(self):
+        """연달아 넣은 같은 key 작업은 마지막 것만 실행"""
+        written = []
+        for i in range(20):
+            self.writer.submit("ledger.csv", lambda i=i: written.append(i))
+        self.assertEqual(self.writer.status("ledger.csv"), "pending")
+
+        self.assertTrue(self.writer.flush(timeout=5))
+
+        self.assertEqual(written[-1], 19)
+        self.assertLess(len(written), 20)
+        self.assertEqual(self.writer.status(), "flushed")
+
+    def test_concurrent_submits(self):
+        """여러 스레드가 동시에 넣어도 key마다 마지막 작업이 쓰이고 flush가 끝난다"""
+        written = {}
+
+        def worker(key):
+            for i in range(50):
+                self.writer.submit(key, lambda i=i: written.__setitem__(key, i))
+
+        threads = [threading.Thread(target=worker, args=(f"k{n}",)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(written, {f"k{n}": 49 for n in range(8)})
+        self.assertEqual([self.writer.status(f"k{n}") for n in range(8)], ["flushed"] * 8)
+
+    def test_error_surfaces_on_flush(self):
+        """백그라운드 오류는 flush()에서 다시 발생"""
+        def fail():
+            raise OSError("disk full")
+
+        self.writer.submit("x", fail)
+        with self.assertRaises(OSError):
+            self.writer.flush(timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# tests/test_search.py
+# 역할: 메모 검색 인덱스(초성/오타 허용) 테스트
+
+import unittest
+
+from ledger.search import DescriptionIndex, choseong, substring_distance
+from ledger.services import search_transactions
+from ledger.store import Change
+
+DESCRIPTIONS = ["지하철", "지하철 환승", "스타벅스 강남점", "GS25 편의점", "gs25편의점", "점심", "택시"]
+
+
+class TestChoseong(unittest.TestCase):
+    """초성 변환/편집 거리 테스트"""
+
+    def test_choseong(self):
+        self.assertEqual(choseong("지하철 2호선"), "ㅈㅎㅊ 2ㅎㅅ")
+
+    def test_substring_distance(self):
+        self.assertEqual(substring_distance("스타벅스", "스타벅스강남점", 2), 0)
+        self.assertEqual(substring_distance("스타벜스", "스타벅스강남점", 2), 1)
+        self.assertEqual(substring_distance("편의점", "택시", 1), 2)  # limit을 넘으면 limit + 1
+
+
+class TestDescriptionIndex(unittest.TestCase):
+    """DescriptionIndex 테스트"""
+
+    def setUp(self):
+        self.index = DescriptionIndex.build(DESCRIPTIONS + ["지하철"])
+
+    def test_substring(self):
+        """대소문자/공백 무시 부분 문자열, 같은 메모의 다른 표기도 함께"""
+        self.assertEqual(self.index.search("GS25편의"), ["GS25 편의점", "gs25편의점"])
+        self.assertEqual(self.index.search("택"), ["택시"])
+
+    def test_choseong(self):
+        """초성만/초성 섞인 검색어 (많이 쓴 메모가 앞)"""
+        self.assertEqual(self.index.search("ㅈㅎㅊ"), ["지하철", "지하철 환승"])
+        self.assertEqual(self.index.search("지ㅎ철ㅎ"), ["지하철 환승"])
+
+    def test_fuzzy(self):
+        """오타 허용은 정확히 포함하는 결과 뒤에, 짧은 검색어는 오타 허용 안 함"""
+        self.assertEqual(self.index.search("스타벜스"), ["스타벅스 강남점"])
+        self.assertEqual(self.index.search("스타벜스", fuzzy=False), [])
+        self.assertEqual(self.index.search("점싱"), [])
+
+    def test_maintained_on_change(self):
+        """저장소 변경을 반영하면 처음부터 만든 인덱스와 같은 결과"""
+        rows = [{"description": d} for d in DESCRIPTIONS]
+        index = DescriptionIndex()
+        index.on_change([], Change(version=1, op="replace", rows=rows))
+        index.on_change(rows, Change(version=2, op="delete", indices=[0, 1]))  # 지하철 2건 삭제
+        index.on_change(rows[2:], Change(version=3, op="update", updates={0: {"description": "지하 주차장"}}))
+
+        self.assertEqual(index.search("ㅈㅎ"), ["지하 주차장"])
+        self.assertEqual(index.search("스타"), [])
+        self.assertEqual(len(index), len(DescriptionIndex.build(["지하 주차장", *DESCRIPTIONS[3:]])))
+
+
+class TestSearchTransactionsFuzzy(unittest.TestCase):
+    """search_transactions(fuzzy=True) 테스트"""
+
+    def test_fuzzy_flag(self):
+        rows = [{"description": d, "amount": i} for i, d in enumerate(DESCRIPTIONS)]
+        self.assertEqual([t["amount"] for t in search_transactions(rows, "ㅈㅎㅊ", fuzzy=True)], [0, 1])
+        self.assertEqual(search_transactions(rows, "ㅈㅎㅊ"), [])  # 기본은 기존과 같은 부분 문자열 검색
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,13 +2,20 @@
 # 역할: 서비스(비즈니스 로직) 계층 테스트
 
 import unittest
+from datetime import date
+
 from ledger.services import (
+    BudgetMonitor,
+    CategoryMonthPivot,
     calc_summary,
     calc_category_expense,
     calc_budget_status,
+    calc_period_summary,
     filter_transactions_by_type,
     get_top_expense_categories,
 )
+from ledger.fx import FxRateTable
+from ledger.store import Change
 
 
 class TestCalcSummary(unittest.TestCase):
@@ -176,5 +183,147 @@ class TestTopExpenseCategories(unittest.TestCase):
         self.assertEqual(top3[2], ("통신", 30000))
 
 
+class TestCalcPeriodSummary(unittest.TestCase):
+    """기간별 합계 테스트"""
+
+    ROWS = [
+        {"date": "2023-12-31", "type": "지출", "category": "식비", "amount": 1000},
+        {"date": "2024-01-01", "type": "수입", "category": "월급", "amount": 5000},
+        {"date": "2024/04/02", "type": "지출", "category": "교통", "amount": 300},  # 다른 날짜 형식도 같은 규칙
+        {"date": "날짜 오류", "type": "지출", "category": "기타", "amount": 99},
+    ]
+
+    def test_quarter_and_week(self):
+        """분기/ISO 주로 묶고, 해석할 수 없는 날짜는 뺀다"""
+        quarters = calc_period_summary(self.ROWS, "quarter")
+        self.assertEqual(list(quarters), ["2023-Q4", "2024-Q1", "2024-Q2"])
+        self.assertEqual(quarters["2024-Q1"], {"income": 5000, "expense": 0, "balance": 5000, "count": 1})
+
+        weeks = calc_period_summary(self.ROWS, "week")
+        self.assertEqual(list(weeks), ["2023-W52", "2024-W01", "2024-W14"])
+
+    def test_unknown_period(self):
+        with self.assertRaises(ValueError):
+            calc_period_summary([], "decade")
+
+
+class TestCategoryMonthPivot(unittest.TestCase):
+    """카테고리 × 월 피벗 테스트"""
+
+    ROWS = [
+        {"date": "2024-01-05", "type": "지출", "category": "식비", "amount": 10000},
+        {"date": "2024-01-20", "type": "지출", "category": "교통", "amount": 1500},
+        {"date": "2024-02-03", "type": "지출", "category": "식비", "amount": 20000},
+        {"date": "2024-02-04", "type": "수입", "category": "월급", "amount": 3000000},
+    ]
+
+    def setUp(self):
+        self.pivot = CategoryMonthPivot.build(self.ROWS, today=date(2024, 2, 15))
+
+    def test_matrix(self):
+        """지출만 한 번에 집계 (합계 큰 카테고리가 위)"""
+        self.assertEqual(self.pivot.matrix(), {
+            "months": ["2024-01", "2024-02"],
+            "categories": ["식비", "교통"],
+            "values": [[10000, 20000], [1500, 0]],
+        })
+
+    def test_changes_update_cells(self):
+        """저장소 변경 기록을 반영한 결과 = 처음부터 다시 만든 결과"""
+        self.pivot.matrix()  # 마감된 달(1월) 열 캐시
+        new = {"date": "2024-01-07", "type": "지출", "category": "교통", "amount": 3000}
+        changes = [
+            Change(version=1, op="insert", position=0, rows=[new]),
+            Change(version=2, op="delete", indices=[3]),  # 2024-02-03 식비
+            Change(version=3, op="update", updates={1: {**self.ROWS[0], "amount": 5000}}),
+        ]
+        rows = self.pivot.apply_changes(self.ROWS, changes)
+
+        expected = CategoryMonthPivot.build(rows, today=date(2024, 2, 15)).matrix()
+        self.assertEqual(self.pivot.matrix(), expected)
+        self.assertEqual(expected["categories"], ["식비", "교통"])
+        self.assertEqual(expected["values"], [[5000], [4500]])
+
+
+class TestBudgetMonitor(unittest.TestCase):
+    """예산 카운터 + 임계값 사건 테스트"""
+
+    def setUp(self):
+        self.monitor = BudgetMonitor({"전체": 100000, "식비": 50000})
+        self.events = []
+        self.monitor.subscribe(self.events.append)
+
+    def _tx(self, amount: int, category: str = "식비", day: str = "2024-03-05") -> dict:
+        return {"date": day, "type": "지출", "category": category, "description": "", "amount": amount}
+
+    def test_threshold_events(self):
+        """80%/100%를 넘을 때만 사건, 같은 구간 안에서는 조용"""
+        self.monitor.add([self._tx(30000)])
+        self.assertEqual(self.events, [])
+
+        self.monitor.add([self._tx(10000)])  # 식비 80%
+        self.monitor.add([self._tx(1000)])  # 그대로 "경고"
+        self.monitor.add([self._tx(60000, "교통")])  # 전체 41% -> 101% (교통은 예산 없음)
+
+        self.assertEqual(
+            [(e.category, e.previous, e.status, e.threshold) for e in self.events],
+            [("식비", "정상", "경고", 0.8), ("전체", "정상", "초과", 1.0)],
+        )
+        self.assertEqual(self.monitor.spent("2024-03"), 101000)
+        self.assertEqual(self.monitor.status("2024-03", "식비")[1], "경고")
+        self.assertEqual(self.monitor.alerts("2024-03"), {("2024-03", "식비"): "경고", ("2024-03", "전체"): "초과"})
+
+    def test_store_changes(self):
+        """저장소 변경(insert/update/delete/replace) 반영 = 처음부터 센 결과"""
+        rows = [self._tx(20000), self._tx(5000, "교통"), self._tx(9000, day="2024-02-01")]
+        self.monitor.reset(rows)
+        changes = [
+            Change(version=1, op="insert", position=0, rows=[self._tx(25000)]),
+            Change(version=2, op="update", updates={1: self._tx(40000)}),  # 식비 20000 -> 40000
+            Change(version=3, op="delete", indices=[0]),
+        ]
+        rows = self.monitor.apply_changes(rows, changes)
+
+        self.assertEqual(
+            [(e.version, e.category, e.status) for e in self.events],
+            [(1, "식비", "경고"), (2, "식비", "초과"), (3, "식비", "경고")],
+        )
+        self.assertFalse(self.events[-1].escalated)
+        self.assertEqual([e.status for e in self.monitor.recent_events(2)], ["초과"])
+
+        fresh = BudgetMonitor(self.monitor.budgets)
+        fresh.reset(rows)
+        for key in [("2024-03", "식비"), ("2024-03", "교통"), ("2024-03", "전체"), ("2024-02", "전체")]:
+            self.assertEqual(self.monitor.spent(*key), fresh.spent(*key))
+        self.assertEqual(self.monitor.alerts(), fresh.alerts())
+
+        self.monitor.on_change(rows, Change(version=4, op="replace", rows=[]))
+        self.assertEqual(self.monitor.alerts(), {})
+        self.assertEqual((self.events[-1].category, self.events[-1].status), ("식비", "정상"))
+
+    def test_foreign_currency(self):
+        """외화 지출은 환율로 환산해서 세고, 환율이 없으면 합계에서 빼고 건수만 센다"""
+        usd = dict(self._tx(40), currency="USD")  # 40달러
+        self.monitor.add([self._tx(10000), usd])
+        self.assertEqual(self.monitor.spent("2024-03"), 10000)  # 40을 원화 40원처럼 더하지 않는다
+        self.assertEqual(self.monitor.unconverted_count("2024-03", "식비"), 1)
+
+        self.monitor.remove([usd])
+        self.assertEqual(self.monitor.unconverted_count("2024-03"), 0)
+
+        converted = BudgetMonitor(self.monitor.budgets, fx=FxRateTable([("2024-03-01", "USD", 1300.0)]))
+        converted.add([self._tx(10000), usd])
+        self.assertEqual(converted.spent("2024-03", "식비"), 10000 + 52000)
+        self.assertEqual(converted.unconverted_count("2024-03"), 0)
+        self.assertEqual(converted.status("2024-03", "식비")[1], "초과")
+
+    def test_set_budgets_is_silent(self):
+        """예산을 바꾸면 상태만 다시 평가 (사건 없음)"""
+        self.monitor.add([self._tx(30000)])
+        self.monitor.set_budgets({"식비": 20000})
+        self.assertEqual(self.events, [])
+        self.assertEqual(self.monitor.alerts(), {("2024-03", "식비"): "초과"})
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,109 @@
+# tests/test_sketches.py
+# 역할: 스트리밍 분포 통계(KLL 스케치/히스토그램) 테스트
+
+import pickle
+import random
+import unittest
+
+from ledger.services import calc_expense_distribution
+from ledger.sketches import Histogram, HyperLogLog, KLLSketch, SpendingDistribution, k_for_error
+
+
+def _rank(sorted_values: list[float], value: float) -> float:
+    return sum(1 for v in sorted_values if v <= value) / len(sorted_values)
+
+
+class TestKLLSketch(unittest.TestCase):
+    """KLL 스케치 테스트"""
+
+    def test_exact_when_small(self):
+        """용량보다 적게 넣으면 정확한 값"""
+        sketch = KLLSketch(seed=0)
+        sketch.update_many(range(1, 101))
+        self.assertEqual(sketch.quantile(0.5), 50)
+        self.assertEqual(sketch.quantile(1.0), 100)
+
+    def test_error_bound_after_merge(self):
+        """파티션별 스케치를 합쳐도 순위 오차 안"""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(9, 1.0) for _ in range(50_000)]
+        parts = [KLLSketch(k=200, seed=i) for i in range(4)]
+        for i, value in enumerate(values):
+            parts[i % 4].update(value)
+
+        merged = pickle.loads(pickle.dumps(parts[0]))  # 워커 프로세스 간 전달 가능
+        for part in parts[1:]:
+            merged.merge(part)
+
+        self.assertEqual(merged.n, len(values))
+        self.assertLess(sum(len(c) for c in merged.compactors), 2_000)
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            self.assertAlmostEqual(_rank(ordered, merged.quantile(q)), q, delta=merged.rank_error)
+
+    def test_k_for_error(self):
+        self.assertEqual(k_for_error(0.0165), 200)
+        with self.assertRaises(ValueError):
+            k_for_error(0)
+
+
+class TestHyperLogLog(unittest.TestCase):
+    """서로 다른 값 개수 스케치 테스트"""
+
+    def test_count_within_error(self):
+        """여러 번 나온 값은 한 번만, 오차는 relative_error의 3배 안"""
+        hll = HyperLogLog(p=12)
+        hll.update(f"가게 {i % 20_000}" for i in range(60_000))
+        self.assertAlmostEqual(hll.count(), 20_000, delta=20_000 * hll.relative_error * 3)
+
+        small = HyperLogLog().update(["스타벅스", "스타벅스", "지하철"])
+        self.assertEqual(small.count(), 2)
+
+    def test_merge_and_sparse(self):
+        """파티션별 스케치 합치기 = 한 번에 넣기 (sparse 레지스터로 합쳐도 같음)"""
+        values = [f"메모 {i}" for i in range(5_000)]
+        whole = HyperLogLog().update(values)
+        merged = HyperLogLog().update(values[:2_000]).merge(HyperLogLog().update(values[2_000:]))
+        sparse = HyperLogLog().merge_sparse(HyperLogLog().sparse(values))
+        self.assertEqual(merged.registers, whole.registers)
+        self.assertEqual(sparse.registers, whole.registers)
+        with self.assertRaises(ValueError):
+            whole.merge(HyperLogLog(p=10))
+
+
+class TestSpendingDistribution(unittest.TestCase):
+    """카테고리별 분포 테스트"""
+
+    ROWS = [
+        {"type": "지출", "category": "식비", "amount": 5000},
+        {"type": "지출", "category": "식비", "amount": 12000},
+        {"type": "지출", "category": "교통", "amount": 1500},
+        {"type": "수입", "category": "월급", "amount": 3000000},
+    ]
+
+    def test_chunks_merge(self):
+        """청크별로 만든 결과를 합치면 한 번에 만든 것과 같다"""
+        whole = SpendingDistribution(seed=0).update_many(self.ROWS)
+        merged = SpendingDistribution(seed=0).update_many(self.ROWS[:2]).merge(
+            SpendingDistribution(seed=0).update_many(self.ROWS[2:])
+        )
+        self.assertEqual(merged.summary(), whole.summary())
+        self.assertEqual(merged.category_summary(), whole.category_summary())
+
+    def test_histogram(self):
+        """금액 구간 경계 (이상/미만)"""
+        hist = Histogram([1000, 2000])
+        for value in (500, 1000, 1999, 2000):
+            hist.update(value)
+        self.assertEqual([r["count"] for r in hist.rows()], [1, 2, 1])
+
+    def test_service(self):
+        """calc_expense_distribution: 지출만 대상"""
+        dist = calc_expense_distribution(self.ROWS)
+        self.assertEqual(dist["overall"]["count"], 3)
+        self.assertEqual(dist["overall"]["median"], 5000)
+        self.assertEqual(list(dist["categories"]), ["식비", "교통"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+# tests/test_store.py
+# 역할: 공용 가계부 저장소(버전/CAS/변경분) 테스트
+
+import os
+import tempfile
+import unittest
+
+from ledger.repository import WriteBehindWriter, load_transactions, save_transactions
+from ledger.store import LedgerStore, VersionConflictError, apply_changes
+
+
+def _tx(desc: str, amount: int = 1000) -> dict:
+    return {"date": "2024-01-15", "type": "지출", "category": "식비", "description": desc, "amount": amount}
+
+
+class TestLedgerStore(unittest.TestCase):
+    """LedgerStore 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ledger.csv")
+        save_transactions(self.path, [_tx("a"), _tx("b")])
+        self.store = LedgerStore(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compare_and_swap(self):
+        """오래된 버전으로 쓰면 충돌"""
+        v0 = self.store.version
+        v1 = self.store.insert([_tx("c")], expected_version=v0)
+        self.assertEqual(v1, v0 + 1)
+
+        with self.assertRaises(VersionConflictError):
+            self.store.delete([0], expected_version=v0)
+
+        self.assertEqual([t["description"] for t in load_transactions(self.path)], ["c", "a", "b"])
+
+    def test_delta_replay(self):
+        """세션은 변경분만 받아서 같은 결과를 만든다"""
+        v0, rows = self.store.snapshot()
+
+        v = self.store.insert([_tx("c")], v0)
+        v = self.store.update({1: _tx("a", 5000)}, v)
+        v = self.store.delete([2], v)
+
+        version, changes = self.store.changes_since(v0)
+        self.assertEqual(version, v)
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(apply_changes(rows, changes), self.store.snapshot()[1])
+
+    def test_other_process_write(self):
+        """다른 프로세스(다른 저장소 객체)의 쓰기를 감지"""
+        other = LedgerStore(self.path)
+        other.insert([_tx("x")], other.version)
+
+        version, changes = self.store.changes_since(self.store.version)
+        self.assertIsNone(changes)  # 전체 다시 받기 필요
+        self.assertEqual(self.store.snapshot()[1][0]["description"], "x")
+
+    def test_view_is_copy_on_write(self):
+        """뷰는 복사 없이 공유되고, 쓰기 후에도 예전 뷰는 그대로"""
+        view = self.store.view()
+        self.assertIs(view.rows, self.store.view().rows)
+
+        self.store.insert([_tx("c")], view.version)
+
+        self.assertEqual(len(view), 2)
+        self.assertEqual(len(self.store.view()), 3)
+
+    def test_repository_write_notification(self):
+        """저장소를 거치지 않은 save_transactions도 알림으로 감지"""
+        versions = []
+        self.store.subscribe(versions.append)
+        before = self.store.version
+
+        save_transactions(self.path, [_tx("z")])
+
+        view = self.store.view()
+        self.assertGreater(view.version, before)
+        self.assertEqual([t["description"] for t in view.rows], ["z"])
+        self.assertEqual(versions, [view.version])
+
+    def test_change_hook(self):
+        """hook은 쓰기마다 (변경 전 행, 변경)을 받고, replay로 현재 전체부터 시작"""
+        seen = []
+        self.store.add_change_hook(lambda before, c: seen.append((len(before), c.op, c.version)), replay=True)
+        v0 = self.store.version
+
+        v = self.store.insert([_tx("c")], v0)
+        v = self.store.delete([0], v)
+        save_transactions(self.path, [_tx("z")])  # 저장소 밖 쓰기 -> 다시 읽기 = replace
+        self.store.view()
+
+        self.assertEqual(seen[:3], [(0, "replace", v0), (2, "insert", v0 + 1), (3, "delete", v)])
+        self.assertEqual(seen[3][:2], (2, "replace"))
+
+    def test_write_behind(self):
+        """write-behind: 메모리에는 즉시, 디스크에는 flush 후 반영"""
+        writer = WriteBehindWriter(coalesce_delay=0.05)
+        self.addCleanup(writer.close)
+        store = LedgerStore(self.path, write_behind=writer)
+
+        v = store.insert([_tx("c")], store.version)
+        v = store.insert([_tx("d")], v)
+
+        self.assertEqual(store.save_status, "pending")
+        self.assertEqual(len(store.view()), 4)  # 대기 중에도 다시 읽지 않음
+
+        self.assertTrue(store.flush(timeout=5))
+        self.assertEqual(store.save_status, "flushed")
+        self.assertEqual([t["description"] for t in load_transactions(self.path)], ["d", "c", "a", "b"])
+        self.assertEqual(LedgerStore(self.path).version, v)
+
+    def test_write_behind_full_queue(self):
+        """큐가 가득 차면 기다리지 않고 직접 쓴다 (큐에 남은 이전 버전은 덮어쓰지 않음)"""
+        writer = WriteBehindWriter(max_pending=1, coalesce_delay=0.2)
+        self.addCleanup(writer.close)
+        store = LedgerStore(self.path, write_behind=writer)
+
+        v = store.version
+        for desc in "cdef":
+            v = store.insert([_tx(desc)], v)
+
+        self.assertTrue(store.flush(timeout=5))
+        self.assertEqual(store.save_status, "flushed")
+        self.assertEqual([t["description"] for t in load_transactions(self.path)], ["f", "e", "d", "c", "a", "b"])
+        self.assertEqual(LedgerStore(self.path).version, v)
+
+    def test_write_behind_conflict_with_other_process(self):
+        """대기 중인 저장은 다른 프로세스가 먼저 쓴 파일을 덮어쓰지 않고 실패로 알린다"""
+        writer = WriteBehindWriter(coalesce_delay=0.2)
+        self.addCleanup(writer.close)
+        store = LedgerStore(self.path, write_behind=writer)
+        other = LedgerStore(self.path)  # 같은 파일을 쓰는 다른 프로세스
+
+        store.insert([_tx("mine")], store.version)
+        other.insert([_tx("theirs")], other.version)
+
+        with self.assertRaises(VersionConflictError):
+            store.flush(timeout=5)
+        self.assertEqual(store.save_status, "failed")
+        self.assertIsInstance(store.last_error, VersionConflictError)
+        self.assertEqual([t["description"] for t in load_transactions(self.path)], ["theirs", "a", "b"])
+
+        # 다음 읽기에서 디스크 내용으로 다시 읽고, 이후 쓰기는 정상
+        view = store.view()
+        self.assertEqual([t["description"] for t in view.rows], ["theirs", "a", "b"])
+        store.insert([_tx("again")], view.version)
+        self.assertTrue(store.flush(timeout=5))
+        self.assertEqual(store.save_status, "flushed")
+        self.assertEqual(load_transactions(self.path)[0]["description"], "again")
+
+    def test_write_behind_disk_error(self):
+        """디스크 저장 오류도 pending에 머물지 않고 failed로 알린다"""
+        writer = WriteBehindWriter(coalesce_delay=0.0)
+        self.addCleanup(writer.close)
+        store = LedgerStore(self.path, write_behind=writer)
+
+        def broken(*args, **kwargs):
+            raise OSError("disk full")
+
+        store._write_to_disk = broken
+        store.insert([_tx("c")], store.version)
+        with self.assertRaises(OSError):
+            store.flush(timeout=5)
+        self.assertEqual(store.save_status, "failed")
+        self.assertEqual(len(store.view()), 2)  # 디스크 내용으로 다시 읽음
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# tests/test_utils.py
+# 역할: 공용 유틸리티(날짜 차원, 금액 형식) 테스트
+
+import random
+import unittest
+from datetime import date, datetime
+
+from ledger.utils import (
+    DateDimension,
+    compact_ticks,
+    format_currency,
+    format_currency_compact,
+    format_currency_many,
+    get_month_range,
+    period_key,
+)
+
+
+class TestDateDimension(unittest.TestCase):
+    """날짜 차원 테스트"""
+
+    def setUp(self):
+        self.dim = DateDimension(holidays=["2024-02-10"])  # 설날
+
+    def test_row_fields(self):
+        """주/월/분기/요일/공휴일/월 시작·끝"""
+        row = self.dim.info("2024-02-10")
+        self.assertEqual((row.month, row.quarter, row.week, row.weekday), ("2024-02", "2024-Q1", "2024-W06", 5))
+        self.assertTrue(row.is_weekend and row.is_holiday)
+        self.assertEqual(date.fromordinal(row.month_end), date(2024, 2, 29))
+        self.assertEqual(row.days_in_month, 29)
+        self.assertTrue(self.dim.info("2024-03-01").is_holiday)  # 고정 공휴일
+        self.assertFalse(DateDimension().info("2024-02-10").is_holiday)
+
+    def test_input_forms(self):
+        """문자열(시간 포함/다른 구분자)/date/datetime은 같은 행, 해석할 수 없으면 None"""
+        row = self.dim.info("2024-01-15")
+        self.assertIs(self.dim.info("2024-01-15 09:30"), row)
+        self.assertIs(self.dim.info("2024.01.15"), row)
+        self.assertIs(self.dim.info(date(2024, 1, 15)), row)
+        self.assertIs(self.dim.info(datetime(2024, 1, 15, 9)), row)
+        self.assertIsNone(self.dim.info("15/01/2024"))
+        self.assertIsNone(self.dim.info(None))
+        self.assertIsNone(self.dim.info(["2024-01-15"]))
+
+    def test_map_column(self):
+        """열 전체 변환 (기간 단위 또는 DateInfo 속성)"""
+        values = ["2024-12-30", "2024-12-30", "오류", "2025-01-02"]
+        self.assertEqual(self.dim.map_column(values, "week"), ["2025-W01", "2025-W01", None, "2025-W01"])
+        self.assertEqual(self.dim.map_column(values, "year"), ["2024", "2024", None, "2025"])
+        self.assertEqual(self.dim.map_column(values, "is_holiday"), [False, False, None, False])
+        with self.assertRaises(ValueError):
+            self.dim.map_column(values, "decade")
+
+    def test_month_helpers(self):
+        self.assertEqual(get_month_range(2024, 12), (date(2024, 12, 1), date(2024, 12, 31)))
+        self.assertEqual(self.dim.days_in_month("2023-02"), 28)
+        self.assertEqual(self.dim.shift_month("2024-01", -2), "2023-11")
+        self.assertEqual(len(self.dim.days_between("2024-02-27", "2024-03-02")), 5)
+        self.assertEqual(period_key("2024-05-05", "quarter"), "2024-Q2")
+
+
+class TestFormatCurrencyMany(unittest.TestCase):
+    """금액 일괄 형식 테스트"""
+
+    def test_same_as_format_currency(self):
+        """표준 형식은 값마다 format_currency와 같은 문자열 (깨진 값, 실수, 반복 값 포함)"""
+        rng = random.Random(0)
+        values = [rng.randint(-10**9, 10**9) for _ in range(500)] + [rng.uniform(-1e6, 1e6) for _ in range(100)]
+        values += [None, "abc", "1000", float("nan"), True, 0, -0.5, [1]]
+        values += values  # 두 번째는 캐시에서
+        self.assertEqual(format_currency_many(values), [format_currency(v) for v in values])
+
+    def test_compact(self):
+        """만원/억원 단위 (끝의 0은 지움)"""
+        self.assertEqual(
+            format_currency_many([9000, 15000, 1500000, 250000000, -1234567, "x"], compact=True),
+            ["9,000원", "1.5만원", "150만원", "2.5억원", "-123.5만원", "0원"],
+        )
+        self.assertEqual(format_currency_compact(123456789, digits=0), "1억원")
+
+    def test_compact_ticks(self):
+        self.assertEqual(compact_ticks(1234567), ([0, 500000, 1000000, 1500000], ["0원", "50만원", "100만원", "150만원"]))
+        self.assertEqual(compact_ticks(0), ([0], ["0원"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
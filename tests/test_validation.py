@@ -0,0 +1,116 @@
+# tests/test_validation.py
+# 역할: 컬럼 단위 일괄 검증/격리 파일 테스트
+
+import csv
+import os
+import tempfile
+import unittest
+
+from ledger.models import validate_transaction_dict
+from ledger.repository import load_transactions
+from ledger.store import Change
+from ledger.validation import QualityMonitor, ValidationReport, load_validated, validate_columns, validate_transactions
+
+GOOD = {"date": "2024-01-15", "type": "지출", "category": "식비", "description": "점심", "amount": 10000}
+
+
+class TestValidateColumns(unittest.TestCase):
+    """validate_columns / validate_transactions 테스트"""
+
+    def test_error_classes(self):
+        """오류 종류별로 행 위치를 모은다"""
+        rows = [
+            GOOD,
+            {**GOOD, "type": "환불"},
+            {**GOOD, "amount": -500},
+            {**GOOD, "amount": "12,000"},
+            {**GOOD, "date": "2024-02-30"},
+            {**GOOD, "category": " "},
+            {**GOOD, "date": "2024/01/15", "type": ""},
+        ]
+        report = validate_transactions(rows)
+
+        self.assertEqual(report.rows, 7)
+        self.assertEqual(report.errors["type"], [1, 6])
+        self.assertEqual(report.errors["negative_amount"], [2])
+        self.assertEqual(report.errors["amount"], [3])
+        self.assertEqual(report.errors["date"], [4, 6])
+        self.assertEqual(report.errors["category"], [5])
+        self.assertEqual(report.valid_count, 1)
+        self.assertEqual(report.errors_by_row()[6], ["type", "date"])
+
+    def test_agrees_with_row_validator(self):
+        """구분/금액 판정은 validate_transaction_dict와 같다"""
+        rows = [GOOD, {**GOOD, "type": "x"}, {**GOOD, "amount": -1}, {**GOOD, "amount": "abc"}]
+        report = validate_transactions(rows)
+        bad = set(report.invalid_indices)
+        self.assertEqual([i not in bad for i in range(len(rows))], [validate_transaction_dict(r) for r in rows])
+
+    def test_missing_column(self):
+        report = validate_columns({"date": ["2024-01-01"], "amount": [1]})
+        self.assertEqual(report.counts, {"missing_column": 1})
+
+
+class TestLoadValidated(unittest.TestCase):
+    """load_validated 테스트"""
+
+    def test_quarantine(self):
+        """정상 행만 돌려주고 나머지는 격리 파일로"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ledger.csv")
+            quarantine = os.path.join(tmp, "quarantine.csv")
+            with open(path, "w", encoding="utf-8-sig") as f:
+                f.write("date,type,category,description,amount\n")
+                f.write("2024-01-15,지출,식비,점심,10000\n")
+                f.write("2024-01-16,지출,식비,저녁,만원\n")
+                f.write("2024-13-01,수입,월급,급여,100\n")
+
+            rows, report = load_validated(path, quarantine_path=quarantine)
+
+            self.assertEqual(rows, [GOOD])
+            self.assertEqual(report.counts, {"amount": 1, "date": 1})
+            with open(quarantine, encoding="utf-8") as f:
+                saved = list(csv.DictReader(f))
+            self.assertEqual([(r["row"], r["errors"]) for r in saved], [("2", "amount"), ("3", "date")])
+
+    def test_same_dialect_as_load_transactions(self):
+        """세미콜론/cp949/예전 한글 헤더/헤더 앞 쓰레기 줄도 load_transactions와 같이 읽는다"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ledger.csv")
+            with open(path, "w", encoding="cp949") as f:
+                f.write("내보낸 날짜: 2024-02-01\n")
+                f.write("날짜;구분;카테고리;내용;금액;통화\n")
+                f.write("2024-01-15;지출;식비;점심;10000;\n")
+                f.write("\n")
+                f.write("2024-01-16;지출;식비;cafe;7;usd\n")
+
+            rows, report = load_validated(path)
+
+            self.assertTrue(report.ok, report.counts)
+            self.assertEqual(report.rows, 2)
+            self.assertEqual(rows, load_transactions(path))
+
+
+
+class TestQualityMonitor(unittest.TestCase):
+    """증분 품질 카운터 테스트"""
+
+    def test_counts_follow_changes(self):
+        """처음 리포트에서 시작해 변경분의 행만 더하고 뺀다"""
+        bad = dict(GOOD, date="2024-13-01")
+        monitor = QualityMonitor(ValidationReport(rows=3, errors={"amount": [1], "date": []}))
+        rows = [GOOD, GOOD]
+
+        monitor.on_change(rows, Change(version=1, op="insert", rows=[bad, dict(GOOD, category="")]))
+        self.assertEqual(monitor.counts, {"amount": 1, "date": 1, "category": 1})
+
+        rows = [bad, dict(GOOD, category=""), GOOD, GOOD]
+        monitor.on_change(rows, Change(version=2, op="update", updates={0: GOOD}))
+        monitor.on_change(rows, Change(version=3, op="delete", indices=[1]))
+        self.assertEqual(monitor.counts, {"amount": 1})
+
+        monitor.on_change(rows, Change(version=4, op="replace", rows=[GOOD, bad]))
+        self.assertEqual(monitor.counts, {"date": 1})
+
+if __name__ == "__main__":
+    unittest.main()